@@ -0,0 +1,37 @@
+"""add workspace document text index
+
+Revision ID: a3c8e1f0b6d7
+Revises: f7a2b5c9d4e3
+Create Date: 2026-10-16 21:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3c8e1f0b6d7"
+down_revision: str | Sequence[str] | None = "f7a2b5c9d4e3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add the persisted text-node index beside paragraph_map.
+
+    Existing documents keep NULL and export via the DOM walk until their
+    content is next written.
+    """
+    op.add_column(
+        "workspace_document",
+        sa.Column("text_index", sa.LargeBinary(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Drop the text-node index."""
+    op.drop_column("workspace_document", "text_index")
@@ -0,0 +1,55 @@
+"""add workspace crdt update log
+
+Revision ID: b3c9d1e7f2a4
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3c9d1e7f2a4"
+down_revision: str | Sequence[str] | None = "a1b2c3d4e5f6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create the append-only workspace_crdt_update table."""
+    op.create_table(
+        "workspace_crdt_update",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "workspace_id",
+            sa.Uuid(),
+            sa.ForeignKey("workspace.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("update", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    # Composite index serves both the CASCADE delete and ordered replay.
+    op.create_index(
+        "ix_workspace_crdt_update_workspace_id",
+        "workspace_crdt_update",
+        ["workspace_id", "id"],
+    )
+
+
+def downgrade() -> None:
+    """Drop the workspace_crdt_update table.
+
+    Pending updates must be compacted into ``workspace.crdt_state``
+    before downgrading or they are lost.
+    """
+    op.drop_index(
+        "ix_workspace_crdt_update_workspace_id",
+        table_name="workspace_crdt_update",
+    )
+    op.drop_table("workspace_crdt_update")
@@ -0,0 +1,33 @@
+"""add workspace tag version
+
+Revision ID: c4d8e2f6a1b9
+Revises: b3c9d1e7f2a4
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4d8e2f6a1b9"
+down_revision: str | Sequence[str] | None = "b3c9d1e7f2a4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add the tag_version stamp bumped by every tag/group mutation."""
+    op.add_column(
+        "workspace",
+        sa.Column("tag_version", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    """Drop the tag_version column."""
+    op.drop_column("workspace", "tag_version")
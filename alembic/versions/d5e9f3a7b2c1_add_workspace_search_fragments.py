@@ -0,0 +1,56 @@
+"""add workspace search fragments
+
+Revision ID: d5e9f3a7b2c1
+Revises: c4d8e2f6a1b9
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d5e9f3a7b2c1"
+down_revision: str | Sequence[str] | None = "c4d8e2f6a1b9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create workspace_search_fragment and the search_fragments_dirty flag."""
+    op.create_table(
+        "workspace_search_fragment",
+        sa.Column(
+            "workspace_id",
+            sa.Uuid(),
+            sa.ForeignKey("workspace.id", ondelete="CASCADE"),
+            primary_key=True,
+            nullable=False,
+        ),
+        sa.Column("fragment_key", sa.String(80), primary_key=True, nullable=False),
+        sa.Column("content", sa.Text(), nullable=False, server_default=""),
+        sa.Column("tag", sa.Text(), nullable=True),
+    )
+    op.add_column(
+        "workspace",
+        sa.Column(
+            "search_fragments_dirty",
+            sa.Boolean(),
+            nullable=False,
+            server_default=sa.text("false"),
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Drop the search fragment table and flag.
+
+    search_text itself is untouched, so FTS keeps working from the last
+    aggregation; set search_dirty to force full re-extraction if needed.
+    """
+    op.drop_column("workspace", "search_fragments_dirty")
+    op.drop_table("workspace_search_fragment")
@@ -0,0 +1,85 @@
+"""add worker wake-up notify triggers
+
+Revision ID: e6f1a4b8c3d2
+Revises: d5e9f3a7b2c1
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e6f1a4b8c3d2"
+down_revision: str | Sequence[str] | None = "d5e9f3a7b2c1"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Must match promptgrimoire.db.notify.WAKEUP_CHANNEL.
+_CHANNEL = "promptgrimoire_wakeup"
+
+# (trigger name, event, table, row condition, topic)
+_TRIGGERS = (
+    (
+        "workspace_search_dirty_insert_wakeup",
+        "INSERT",
+        "workspace",
+        "NEW.search_dirty OR NEW.search_fragments_dirty",
+        "search",
+    ),
+    (
+        "workspace_search_dirty_update_wakeup",
+        "UPDATE OF search_dirty, search_fragments_dirty",
+        "workspace",
+        "(NEW.search_dirty AND NOT OLD.search_dirty) OR "
+        "(NEW.search_fragments_dirty AND NOT OLD.search_fragments_dirty)",
+        "search",
+    ),
+    ("export_job_insert_wakeup", "INSERT", "export_job", "true", "export"),
+    (
+        "wargame_team_deadline_insert_wakeup",
+        "INSERT",
+        "wargame_team",
+        "NEW.current_deadline IS NOT NULL",
+        "deadline",
+    ),
+    (
+        "wargame_team_deadline_update_wakeup",
+        "UPDATE OF current_deadline",
+        "wargame_team",
+        "NEW.current_deadline IS NOT NULL "
+        "AND NEW.current_deadline IS DISTINCT FROM OLD.current_deadline",
+        "deadline",
+    ),
+)
+
+
+def upgrade() -> None:
+    """Notify background workers when search, export or deadline work is queued.
+
+    Row-level triggers are cheap here: PostgreSQL folds identical
+    notifications raised in one transaction into a single delivery.
+    """
+    op.execute(
+        "CREATE OR REPLACE FUNCTION notify_worker_wakeup() RETURNS trigger "
+        "LANGUAGE plpgsql AS $$ BEGIN "
+        f"PERFORM pg_notify('{_CHANNEL}', TG_ARGV[0]); "
+        "RETURN NULL; "
+        "END; $$"
+    )
+    for name, event, table, condition, topic in _TRIGGERS:
+        op.execute(
+            f"CREATE TRIGGER {name} AFTER {event} ON {table} "
+            f"FOR EACH ROW WHEN ({condition}) "
+            f"EXECUTE FUNCTION notify_worker_wakeup('{topic}')"
+        )
+
+
+def downgrade() -> None:
+    """Drop the wake-up triggers; workers keep working by polling."""
+    for name, _event, table, _condition, _topic in _TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_worker_wakeup()")
@@ -0,0 +1,51 @@
+"""add export job metric table
+
+Revision ID: f7a2b5c9d4e3
+Revises: e6f1a4b8c3d2
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f7a2b5c9d4e3"
+down_revision: str | Sequence[str] | None = "e6f1a4b8c3d2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create export_job_metric for per-stage export timings."""
+    op.create_table(
+        "export_job_metric",
+        sa.Column("id", sa.Uuid(), primary_key=True, nullable=False),
+        sa.Column(
+            "job_id",
+            sa.Uuid(),
+            sa.ForeignKey("export_job.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+        sa.Column("worker_pid", sa.Integer(), nullable=False),
+        sa.Column("outcome", sa.String(20), nullable=False),
+        sa.Column("pandoc_convert_ms", sa.Integer(), nullable=True),
+        sa.Column("tex_generate_ms", sa.Integer(), nullable=True),
+        sa.Column("latex_compile_ms", sa.Integer(), nullable=True),
+        sa.Column("total_ms", sa.Integer(), nullable=False),
+        sa.Column("rss_mb", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        "ix_export_job_metric_created_at", "export_job_metric", ["created_at"]
+    )
+
+
+def downgrade() -> None:
+    """Drop export_job_metric."""
+    op.drop_index("ix_export_job_metric_created_at", table_name="export_job_metric")
+    op.drop_table("export_job_metric")
@@ -109,7 +109,7 @@ async def kick_user_handler(request: Request) -> JSONResponse:
     from promptgrimoire.auth.client_registry import disconnect_user
     from promptgrimoire.db.users import is_user_banned
 
-    if await is_user_banned(user_id):
+    if await is_user_banned(user_id, fresh=True):
         kicked = disconnect_user(user_id)
         return JSONResponse({"kicked": kicked, "was_banned": True})
 
@@ -131,11 +131,13 @@ def _register_db_lifecycle(app: object) -> None:
     from promptgrimoire.config import get_settings
     from promptgrimoire.crdt.persistence import (
         get_persistence_manager,
+        start_compaction_worker,
     )
     from promptgrimoire.db import (
         close_db,
         get_engine,
         init_db,
+        start_wakeup_listener,
         verify_schema,
     )
     from promptgrimoire.deadline_worker import (
@@ -146,12 +148,18 @@ def _register_db_lifecycle(app: object) -> None:
         start_diagnostic_logger,
     )
     from promptgrimoire.export.worker import start_export_worker
+    from promptgrimoire.pages.annotation.broadcast import (
+        start_registry_eviction_worker,
+    )
     from promptgrimoire.search_worker import start_search_worker
 
     _search_worker_task: asyncio.Task[None] | None = None
     _deadline_worker_task: asyncio.Task[None] | None = None
     _export_worker_task: asyncio.Task[None] | None = None
     _diagnostic_logger_task: asyncio.Task[None] | None = None
+    _compaction_worker_task: asyncio.Task[None] | None = None
+    _registry_eviction_task: asyncio.Task[None] | None = None
+    _wakeup_listener_task: asyncio.Task[None] | None = None
 
     @app.on_startup
     async def startup() -> None:
@@ -159,7 +167,10 @@ def _register_db_lifecycle(app: object) -> None:
             _search_worker_task, \
             _deadline_worker_task, \
             _export_worker_task, \
-            _diagnostic_logger_task
+            _diagnostic_logger_task, \
+            _compaction_worker_task, \
+            _registry_eviction_task, \
+            _wakeup_listener_task
         # Clear stale sessions from disk before accepting connections.
         # Guarantees clean auth state regardless of how the previous
         # process died (SIGTERM, OOM, crash, bare systemctl restart).
@@ -168,12 +179,21 @@ def _register_db_lifecycle(app: object) -> None:
         await verify_schema(get_engine())
         if get_settings().features.enable_search_worker:
             _search_worker_task = asyncio.create_task(
-                start_search_worker(),
+                start_search_worker(
+                    processes=get_settings().features.search_worker_processes
+                ),
             )
         _deadline_worker_task = asyncio.create_task(
             start_deadline_worker(),
         )
         _settings = get_settings()
+        _compaction_worker_task, _registry_eviction_task, _wakeup_listener_task = (
+            asyncio.create_task(start_compaction_worker()),
+            asyncio.create_task(
+                start_registry_eviction_worker(_settings.crdt_registry),
+            ),
+            asyncio.create_task(start_wakeup_listener()),
+        )
         if _settings.features.worker_in_process:
             _export_worker_task = asyncio.create_task(start_export_worker())
             log.info("export_worker_started", mode="in-process")
@@ -183,11 +203,10 @@ def _register_db_lifecycle(app: object) -> None:
                 mode="standalone",
                 reason="FEATURES__WORKER_IN_PROCESS=false",
             )
-        _app_config = _settings.app
         _diagnostic_logger_task = asyncio.create_task(
             start_diagnostic_logger(
-                interval_seconds=_app_config.diagnostic_interval_seconds,
-                memory_restart_threshold_mb=_app_config.memory_restart_threshold_mb,
+                interval_seconds=_settings.app.diagnostic_interval_seconds,
+                memory_restart_threshold_mb=_settings.app.memory_restart_threshold_mb,
             ),
         )
 
@@ -206,16 +225,29 @@ def _register_db_lifecycle(app: object) -> None:
             _search_worker_task, \
             _deadline_worker_task, \
             _export_worker_task, \
-            _diagnostic_logger_task
+            _diagnostic_logger_task, \
+            _compaction_worker_task, \
+            _registry_eviction_task, \
+            _wakeup_listener_task
         # Cancel background workers and await completion before DB teardown
         all_tasks = [
             _search_worker_task,
             _deadline_worker_task,
             _export_worker_task,
             _diagnostic_logger_task,
+            _compaction_worker_task,
+            _registry_eviction_task,
+            _wakeup_listener_task,
         ]
-        _search_worker_task = _deadline_worker_task = None
-        _export_worker_task = _diagnostic_logger_task = None
+        (
+            _search_worker_task,
+            _deadline_worker_task,
+            _export_worker_task,
+            _diagnostic_logger_task,
+            _compaction_worker_task,
+            _registry_eviction_task,
+            _wakeup_listener_task,
+        ) = (None,) * len(all_tasks)
         active = [t for t in all_tasks if t is not None]
         for t in active:
             t.cancel()
@@ -327,6 +359,7 @@ def main() -> None:
         from promptgrimoire.dev_endpoints import (
             admission_control_handler,
             block_loop_handler,
+            metrics_handler,
         )
 
         app.routes.insert(
@@ -337,6 +370,10 @@ def main() -> None:
             0,
             Route("/api/dev/block-loop", block_loop_handler, methods=["POST"]),
         )
+        app.routes.insert(
+            0,
+            Route("/api/dev/metrics", metrics_handler, methods=["GET"]),
+        )
 
     # Pre-restart flush and connection-count endpoints for zero-downtime deploy
     from promptgrimoire.pages.restart import (
@@ -351,6 +388,11 @@ def main() -> None:
         0, Route("/api/connection-count", connection_count_handler, methods=["GET"])
     )
 
+    # Word count worker processes start on first use
+    from promptgrimoire.word_count_pool import shutdown_word_count_pool
+
+    app.on_shutdown(shutdown_word_count_pool)
+
     settings = get_settings()
 
     if settings.database.url:
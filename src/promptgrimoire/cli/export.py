@@ -20,6 +20,7 @@ from rich.syntax import Syntax
 from rich.table import Table
 from sqlmodel import select
 
+from promptgrimoire.db.crdt_updates import get_workspace_crdt_state
 from promptgrimoire.db.engine import get_session
 from promptgrimoire.db.models import (
     ACLEntry,
@@ -289,7 +290,8 @@ async def _export_single_workspace(
     tags = await list_tags_for_workspace(workspace_id)
     tag_colours = {str(t.id): t.color for t in tags if t.color}
 
-    crdt_doc = _load_crdt(workspace.crdt_state) if workspace.crdt_state else None
+    crdt_state = await get_workspace_crdt_state(workspace_id)
+    crdt_doc = _load_crdt(crdt_state) if crdt_state else None
 
     highlights: list[dict] = []
     if crdt_doc is not None:
@@ -313,6 +315,7 @@ async def _export_single_workspace(
                 "html_content": doc.content or "",
                 "highlights": enriched,
                 "word_to_legal_para": legal_para_map,
+                "text_index": doc.text_index,
             }
         )
 
@@ -340,6 +343,8 @@ async def _export_single_workspace(
             workspace_id=str(workspace_id),
             notes_latex=notes_latex,
             documents=documents,
+            # A cache hit yields only the PDF, not the .tex/.log artefacts
+            use_cache=not (with_log or with_tex),
         )
         shutil.copy2(pdf_path, output_dir / pdf_path.name)
         _copy_artifacts(
@@ -383,7 +388,8 @@ async def _export_single_workspace_tex_only(
     tags = await list_tags_for_workspace(workspace_id)
     tag_colours = {str(t.id): t.color for t in tags if t.color}
 
-    crdt_doc = _load_crdt(workspace.crdt_state) if workspace.crdt_state else None
+    crdt_state = await get_workspace_crdt_state(workspace_id)
+    crdt_doc = _load_crdt(crdt_state) if crdt_state else None
 
     highlights: list[dict] = []
     if crdt_doc is not None:
@@ -407,6 +413,7 @@ async def _export_single_workspace_tex_only(
             tag_colours=tag_colours,
             output_dir=ws_export_dir,
             filename=safe_stem,
+            use_cache=True,
         )
         shutil.copy2(tex_path, output_dir / tex_path.name)
         # Copy .sty (needed for compilation)
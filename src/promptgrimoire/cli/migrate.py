@@ -114,6 +114,10 @@ async def _check_and_fix_workspace(
     Returns: ``"ok"``, ``"hydrated"``, or ``"drift"``.
     """
     from promptgrimoire.crdt.annotation_doc import AnnotationDocument
+    from promptgrimoire.db.crdt_updates import (
+        list_pending_crdt_updates,
+        merge_crdt_state,
+    )
     from promptgrimoire.db.tags import (
         list_tag_groups_for_workspace,
         list_tags_for_workspace,
@@ -121,8 +125,11 @@ async def _check_and_fix_workspace(
     from promptgrimoire.db.workspaces import save_workspace_crdt_state
 
     doc = AnnotationDocument(str(ws_id))
-    if workspace.crdt_state:
-        doc.apply_update(workspace.crdt_state)
+    crdt_state = merge_crdt_state(
+        workspace.crdt_state, await list_pending_crdt_updates(ws_id)
+    )
+    if crdt_state:
+        doc.apply_update(crdt_state)
 
     crdt_tags = doc.list_tags()
     crdt_groups = doc.list_tag_groups()
@@ -284,6 +284,8 @@ async def _seed_tags_for_activity(activity: Activity) -> None:
         if workspace:
             workspace.next_tag_order = tag_count
             workspace.next_group_order = len(group_defs)
+            # Invalidate warm registry entries so they reconcile the new tags
+            workspace.tag_version += 1
             session.add(workspace)
             await session.flush()
 
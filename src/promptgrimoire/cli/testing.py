@@ -765,6 +765,79 @@ def smoke_tests(
     )
 
 
+_BENCHMARK_FAIL_THRESHOLD = "median:25%"
+_BENCHMARK_STORAGE = Path(".benchmarks")
+
+
+def _has_benchmark_baseline() -> bool:
+    """Whether a baseline was saved on this machine and Python version."""
+    from pytest_benchmark.utils import get_machine_id
+
+    return any((_BENCHMARK_STORAGE / get_machine_id()).glob("*.json"))
+
+
+@test_app.command(
+    "bench",
+    context_settings={"allow_extra_args": True, "allow_interspersed_args": False},
+)
+def bench_tests(
+    ctx: typer.Context,
+    filter_expr: str | None = typer.Option(
+        None, "-k", "--filter", help="Pytest keyword filter expression"
+    ),
+    save: bool = typer.Option(
+        False, "--save", help="Record this run as the new baseline"
+    ),
+    threshold: str = typer.Option(
+        _BENCHMARK_FAIL_THRESHOLD,
+        "--fail-on",
+        help="Regression threshold against the baseline (pytest-benchmark syntax)",
+    ),
+) -> None:
+    """Run server-side benchmarks and compare against the stored baseline.
+
+    Baselines live in ``.benchmarks/`` (one directory per machine and
+    Python version), so compare runs on the machine that recorded them.
+    The first run on a machine records the baseline instead of comparing.
+
+    Examples:
+        grimoire test bench --save
+        grimoire test bench
+        grimoire test bench -k word_count --fail-on mean:10%
+    """
+    from promptgrimoire.cli._shared import _prepend_filter
+
+    default_args = [
+        "tests/benchmark",
+        "--benchmark-only",
+        "--benchmark-columns=min,median,max,rounds",
+        "--benchmark-sort=fullname",
+        "-p",
+        "no:randomly",
+        "-o",
+        "addopts=",
+        "-o",
+        "timeout=0",
+    ]
+    if save or not _has_benchmark_baseline():
+        if not save:
+            console.print("[yellow]No baseline for this machine; recording one.[/]")
+        default_args.append("--benchmark-save=baseline")
+    else:
+        default_args.extend(
+            ["--benchmark-compare", f"--benchmark-compare-fail={threshold}"]
+        )
+
+    sys.exit(
+        _run_pytest(
+            title="Benchmarks (server-side hot paths)",
+            log_path=Path("test-bench.log"),
+            default_args=default_args,
+            extra_args=_prepend_filter(ctx.args, filter_expr),
+        )
+    )
+
+
 @test_app.command("js")
 def js_tests() -> None:
     """Run JS unit tests (vitest)."""
@@ -0,0 +1,534 @@
+"""Synthetic load generator for live annotation sessions.
+
+Drives N concurrent browser clients against a running server.  Each client
+logs in as a load-test student (``uv run load-test-data``), opens one of
+their workspaces on ``/annotation`` and then loops weighted actions until
+the run ends: highlight a passage, comment on a card, type into the
+Milkdown response editor (one Yjs update per keystroke) and export a PDF.
+
+While the clients run, ``/api/dev/metrics`` is sampled once a second for
+event-loop lag, admission queue depth and DB pool usage.  The report gives
+p50/p99/max latency per action next to those server-side figures.
+
+Requires:
+  - A running server with DEV__AUTH_MOCK=true (mock login, dev metrics)
+  - DATABASE__URL pointing at the same database, seeded with load-test data
+  - Playwright browsers installed (playwright install chromium)
+
+Usage:
+    uv run load-test-run                              # 20 clients, 2 minutes
+    uv run load-test-run --clients 60 --duration 300 --ramp-up 60
+    uv run load-test-run --no-export                  # skip PDF exports
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import math
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlencode
+
+import httpx
+import typer
+from rich.console import Console
+from rich.table import Table
+from sqlalchemy import func
+from sqlmodel import select
+
+from promptgrimoire.config import get_settings
+from promptgrimoire.db.engine import close_db, get_session, init_db
+from promptgrimoire.db.models import ACLEntry, User, WorkspaceDocument
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from playwright.async_api import Browser, Page
+
+console = Console()
+
+# Relative weights of the actions a client picks between page loads.
+_ACTION_WEIGHTS: dict[str, int] = {
+    "highlight": 4,
+    "comment": 3,
+    "respond": 3,
+    "export": 1,
+}
+
+_METRICS_PATH = "/api/dev/metrics"
+_ACTION_TIMEOUT_MS = 30_000
+_EXPORT_TIMEOUT_MS = 180_000
+
+# Scrolls a character range into view and returns mouse coordinates for a
+# drag selection across it -- the async counterpart of
+# ``promptgrimoire.docs.helpers.select_chars``.
+_SELECTION_COORDS_JS = """([startChar, endChar]) => {
+    const container = document.querySelector('[data-testid="doc-container"]');
+    if (!container || typeof walkTextNodes === 'undefined') return null;
+    const nodes = walkTextNodes(container);
+    const sr = charOffsetToRange(nodes, startChar, endChar);
+    if (!sr) return null;
+    const r = document.createRange();
+    r.setStart(sr.startContainer, sr.startOffset);
+    r.setEnd(sr.endContainer, sr.endOffset);
+    const rect = r.getBoundingClientRect();
+    window.scrollTo(0, rect.top + window.scrollY - window.innerHeight / 2);
+    const startRect = charOffsetToRect(nodes, startChar);
+    const endRect = charOffsetToRect(nodes, endChar);
+    if (startRect.width === 0 && startRect.height === 0) return null;
+    if (endRect.width === 0 && endRect.height === 0) return null;
+    return {
+        startX: startRect.left + 1,
+        startY: startRect.top + startRect.height / 2,
+        endX: endRect.right - 1,
+        endY: endRect.top + endRect.height / 2,
+    };
+}"""
+
+_CARDS_EPOCH_JS = "() => window.__annotationCardsEpoch || 0"
+
+_RESPONSE_WORDS = (
+    "the",
+    "court",
+    "held",
+    "that",
+    "duty",
+    "of",
+    "care",
+    "extends",
+    "to",
+    "foreseeable",
+    "harm",
+    "although",
+    "reasoning",
+    "on",
+    "causation",
+    "remains",
+    "contested",
+)
+
+
+@dataclass
+class LoadRunResults:
+    """Latencies and failures recorded by the clients, plus server samples."""
+
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    server: list[dict[str, Any]] = field(default_factory=list)
+
+    def record(self, action: str, started: float) -> None:
+        """Record the latency of *action* begun at ``perf_counter()`` *started*."""
+        self.latencies[action].append((time.perf_counter() - started) * 1000.0)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of *values* (``pct`` in 0-100)."""
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100.0 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarise_latencies(results: LoadRunResults) -> list[dict[str, Any]]:
+    """One row per action: count, errors, p50, p99 and max in milliseconds."""
+    actions = sorted(set(results.latencies) | set(results.errors))
+    return [
+        {
+            "action": action,
+            "count": len(results.latencies.get(action, [])),
+            "errors": results.errors.get(action, 0),
+            "p50_ms": percentile(results.latencies.get(action, []), 50),
+            "p99_ms": percentile(results.latencies.get(action, []), 99),
+            "max_ms": max(results.latencies.get(action, []), default=math.nan),
+        }
+        for action in actions
+    ]
+
+
+def summarise_server(samples: list[dict[str, Any]]) -> dict[str, float | int | None]:
+    """Reduce ``/api/dev/metrics`` samples to the figures in the report.
+
+    Pool saturation is checked-out connections over capacity (0-1);
+    admission and pool fields are None when the server reported neither.
+    """
+    lags = [s["event_loop_lag_ms"] for s in samples]
+    queue_depths = [s["admission"]["queue_depth"] for s in samples if s["admission"]]
+    saturation = [
+        s["db_pool"]["checked_out"] / s["db_pool"]["capacity"]
+        for s in samples
+        if s["db_pool"] and s["db_pool"]["capacity"]
+    ]
+    return {
+        "samples": len(samples),
+        "lag_p50_ms": percentile(lags, 50),
+        "lag_p99_ms": percentile(lags, 99),
+        "lag_max_ms": max(lags, default=math.nan),
+        "clients_max": max((s["clients_connected"] for s in samples), default=0),
+        "queue_depth_max": max(queue_depths) if queue_depths else None,
+        "pool_saturation_max": max(saturation) if saturation else None,
+    }
+
+
+async def _load_client_workspaces(count: int) -> list[tuple[str, UUID]]:
+    """Pick *count* load-test students with one document-bearing workspace each."""
+    await init_db()
+    try:
+        async with get_session() as session:
+            rows = await session.exec(
+                select(User.email, func.min(ACLEntry.workspace_id))
+                .join(ACLEntry, ACLEntry.user_id == User.id)  # type: ignore[arg-type]  # SQLAlchemy join expression, not a plain column
+                .join(
+                    WorkspaceDocument,
+                    WorkspaceDocument.workspace_id == ACLEntry.workspace_id,  # type: ignore[arg-type]  # SQLAlchemy join expression, not a plain column
+                )
+                .where(
+                    User.email.like("loadtest-%@test.local"),  # type: ignore[union-attr]  # SQLAlchemy column expression
+                    ACLEntry.permission == "owner",
+                )
+                .group_by(User.email)
+                .order_by(User.email)
+                .limit(count)
+            )
+            return [(email, workspace_id) for email, workspace_id in rows.all()]
+    finally:
+        await close_db()
+
+
+async def _open_workspace(
+    page: Page, base_url: str, email: str, workspace_id: UUID, results: LoadRunResults
+) -> None:
+    """Log in, load the annotation page and wait for the text walker."""
+    login_query = urlencode({"token": f"mock-token-{email}"})
+    await page.goto(f"{base_url}/auth/callback?{login_query}")
+    await page.wait_for_url(lambda url: "/auth/callback" not in url, timeout=30_000)
+
+    started = time.perf_counter()
+    page_query = urlencode({"workspace_id": str(workspace_id)})
+    await page.goto(f"{base_url}/annotation?{page_query}")
+    if "/queue" in page.url:
+        # Admission gate is full -- time the wait separately from the load.
+        await page.wait_for_url(lambda url: "/queue" not in url, timeout=0)
+        results.record("admission_wait", started)
+        started = time.perf_counter()
+    await page.wait_for_function(
+        "() => window.__loadComplete === true"
+        " && window._textNodes && window._textNodes.length > 0",
+        timeout=120_000,
+    )
+    results.record("page_load", started)
+
+
+async def _wait_for_card_rebuild(page: Page, epoch_before: int) -> None:
+    await page.wait_for_function(
+        f"() => (window.__annotationCardsEpoch || 0) > {epoch_before}",
+        timeout=_ACTION_TIMEOUT_MS,
+    )
+
+
+async def _highlight(page: Page, rng: random.Random, results: LoadRunResults) -> None:
+    """Drag-select a random passage and tag it from the highlight menu."""
+    doc_length = await page.evaluate(
+        "() => document.querySelector('[data-testid=\"doc-container\"]')"
+        ".textContent.length"
+    )
+    start = rng.randrange(max(doc_length - 80, 1))
+    coords = await page.evaluate(_SELECTION_COORDS_JS, [start, start + 40])
+    if coords is None:
+        msg = f"no on-screen coordinates for chars {start}-{start + 40}"
+        raise RuntimeError(msg)
+    await page.mouse.click(coords["startX"], coords["startY"])
+    await page.mouse.down()
+    await page.mouse.move(coords["endX"], coords["endY"])
+    await page.mouse.up()
+
+    tag_buttons = page.locator(
+        '[data-testid="highlight-menu"] [data-testid="highlight-menu-tag-btn"]'
+    )
+    await tag_buttons.first.wait_for(state="visible", timeout=_ACTION_TIMEOUT_MS)
+    epoch_before = await page.evaluate(_CARDS_EPOCH_JS)
+    started = time.perf_counter()
+    await tag_buttons.nth(rng.randrange(await tag_buttons.count())).click()
+    await _wait_for_card_rebuild(page, epoch_before)
+    results.record("highlight", started)
+
+
+async def _comment(page: Page, rng: random.Random, results: LoadRunResults) -> None:
+    """Post a comment on a random annotation card (highlights first if none)."""
+    cards = page.locator("[data-testid='annotation-card']")
+    if await cards.count() == 0:
+        await _highlight(page, rng, results)
+    card = cards.nth(rng.randrange(await cards.count()))
+    detail = card.get_by_test_id("card-detail")
+    if not await detail.is_visible():
+        await card.get_by_test_id("expand-btn").click()
+        await detail.wait_for(state="visible", timeout=_ACTION_TIMEOUT_MS)
+    await card.get_by_test_id("comment-input").fill(
+        " ".join(rng.choices(_RESPONSE_WORDS, k=12))
+    )
+    epoch_before = await page.evaluate(_CARDS_EPOCH_JS)
+    started = time.perf_counter()
+    await card.get_by_test_id("post-comment-btn").click()
+    await _wait_for_card_rebuild(page, epoch_before)
+    results.record("comment", started)
+
+
+async def _respond(page: Page, rng: random.Random, results: LoadRunResults) -> None:
+    """Open the Respond tab, type a sentence, and return to the source tab."""
+    started = time.perf_counter()
+    await page.get_by_test_id("tab-respond").click()
+    editor = page.locator(
+        '[data-testid="milkdown-editor-container"] [contenteditable="true"]'
+    )
+    await editor.wait_for(state="visible", timeout=_ACTION_TIMEOUT_MS)
+    results.record("respond_tab", started)
+
+    await editor.click()
+    await page.keyboard.press("End")
+    sentence = " ".join(rng.choices(_RESPONSE_WORDS, k=10))
+    # Per-keystroke typing so each character is its own Yjs update
+    await page.keyboard.type(f" {sentence}.", delay=40)
+
+    started = time.perf_counter()
+    await page.get_by_test_id("tab-source-1").click()
+    await page.wait_for_function(
+        "() => window._textNodes && window._textNodes.length > 0",
+        timeout=_ACTION_TIMEOUT_MS,
+    )
+    results.record("source_tab", started)
+
+
+async def _export(page: Page, _rng: random.Random, results: LoadRunResults) -> None:
+    """Export a PDF and wait for the download button to appear."""
+    # Mark any download button from an earlier export so we wait for a new one
+    await page.evaluate(
+        "() => document.querySelectorAll('[data-testid=\"export-download-btn\"]')"
+        ".forEach(el => el.dataset.loadRunSeen = '1')"
+    )
+    started = time.perf_counter()
+    await page.get_by_test_id("export-pdf-btn").click()
+    export_anyway = page.get_by_test_id("wc-export-anyway-btn")
+    fresh_download = page.locator(
+        '[data-testid="export-download-btn"]:not([data-load-run-seen])'
+    )
+    await export_anyway.or_(fresh_download).first.wait_for(
+        state="visible", timeout=_EXPORT_TIMEOUT_MS
+    )
+    if await export_anyway.is_visible():
+        await export_anyway.click()
+    await fresh_download.wait_for(state="visible", timeout=_EXPORT_TIMEOUT_MS)
+    results.record("export", started)
+
+
+_ACTIONS = {
+    "highlight": _highlight,
+    "comment": _comment,
+    "respond": _respond,
+    "export": _export,
+}
+
+
+async def _run_client(
+    browser: Browser,
+    base_url: str,
+    session: tuple[str, UUID],
+    *,
+    start_delay: float,
+    deadline: float,
+    think_time: float,
+    actions: dict[str, int],
+    results: LoadRunResults,
+) -> None:
+    """One simulated student: open the workspace, then act until *deadline*."""
+    await asyncio.sleep(start_delay)
+    email, workspace_id = session
+    rng = random.Random(email)
+    context = await browser.new_context()
+    page = await context.new_page()
+    try:
+        try:
+            await _open_workspace(page, base_url, email, workspace_id, results)
+        except Exception as exc:
+            results.errors["page_load"] += 1
+            console.print(f"[red]{email}: page load failed:[/] {exc}")
+            return
+
+        names, weights = list(actions), list(actions.values())
+        while time.monotonic() < deadline:
+            await asyncio.sleep(rng.uniform(0.5, 1.5) * think_time)
+            action = rng.choices(names, weights)[0]
+            try:
+                await _ACTIONS[action](page, rng, results)
+            except Exception as exc:
+                results.errors[action] += 1
+                console.print(f"[yellow]{email}: {action} failed:[/] {exc}")
+                await page.keyboard.press("Escape")
+    finally:
+        await context.close()
+
+
+async def _sample_metrics(
+    http: httpx.AsyncClient, stop: asyncio.Event, results: LoadRunResults
+) -> None:
+    """Poll the dev metrics endpoint once a second until *stop* is set."""
+    while not stop.is_set():
+        try:
+            response = await http.get(_METRICS_PATH)
+            response.raise_for_status()
+            results.server.append(response.json())
+        except httpx.HTTPError as exc:
+            console.print(f"[yellow]metrics sample failed:[/] {exc}")
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(stop.wait(), timeout=1.0)
+
+
+async def _async_load_test_run(
+    base_url: str,
+    *,
+    clients: int,
+    duration: float,
+    ramp_up: float,
+    think_time: float,
+    actions: dict[str, int],
+) -> LoadRunResults:
+    from playwright.async_api import (  # noqa: PLC0415 -- heavy, only needed here
+        async_playwright,
+    )
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=10.0) as http:
+        try:
+            (await http.get(_METRICS_PATH)).raise_for_status()
+        except httpx.HTTPError as exc:
+            console.print(
+                f"[red]Error:[/] {base_url}{_METRICS_PATH} unavailable ({exc})."
+                " Is the server running with DEV__AUTH_MOCK=true?"
+            )
+            sys.exit(1)
+
+        sessions = await _load_client_workspaces(clients)
+        if not sessions:
+            console.print("[red]Error:[/] no load-test workspaces; run load-test-data")
+            sys.exit(1)
+        if len(sessions) < clients:
+            console.print(
+                f"[yellow]Only {len(sessions)} load-test students have"
+                " workspaces; running that many clients[/]"
+            )
+
+        results = LoadRunResults()
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(_sample_metrics(http, stop, results))
+        # Async API: one browser, one context per client, all on one loop --
+        # the sync API used elsewhere would need a thread per client.
+        async with async_playwright() as pw:
+            browser = await pw.chromium.launch()
+            deadline = time.monotonic() + ramp_up + duration
+            await asyncio.gather(
+                *(
+                    _run_client(
+                        browser,
+                        base_url,
+                        session,
+                        start_delay=ramp_up * n / len(sessions),
+                        deadline=deadline,
+                        think_time=think_time,
+                        actions=actions,
+                        results=results,
+                    )
+                    for n, session in enumerate(sessions)
+                )
+            )
+            await browser.close()
+        stop.set()
+        await sampler
+    return results
+
+
+def _fmt(value: float | None, spec: str = ".0f") -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "-"
+    return format(value, spec)
+
+
+def _print_report(results: LoadRunResults) -> None:
+    table = Table(title="Client latency (ms)")
+    for column in ("action", "count", "errors", "p50", "p99", "max"):
+        table.add_column(column, justify="left" if column == "action" else "right")
+    for row in summarise_latencies(results):
+        table.add_row(
+            row["action"],
+            str(row["count"]),
+            str(row["errors"]),
+            _fmt(row["p50_ms"]),
+            _fmt(row["p99_ms"]),
+            _fmt(row["max_ms"]),
+        )
+    console.print(table)
+
+    server = summarise_server(results.server)
+    table = Table(title=f"Server ({server['samples']} samples, 1/s)")
+    table.add_column("metric")
+    table.add_column("value", justify="right")
+    table.add_row("event-loop lag p50 (ms)", _fmt(server["lag_p50_ms"], ".1f"))
+    table.add_row("event-loop lag p99 (ms)", _fmt(server["lag_p99_ms"], ".1f"))
+    table.add_row("event-loop lag max (ms)", _fmt(server["lag_max_ms"], ".1f"))
+    table.add_row("connected clients max", _fmt(server["clients_max"], "d"))
+    table.add_row("admission queue depth max", _fmt(server["queue_depth_max"], "d"))
+    table.add_row("DB pool saturation max", _fmt(server["pool_saturation_max"], ".0%"))
+    console.print(table)
+
+
+def _main(
+    *,
+    clients: int = typer.Option(20, "--clients", "-n", help="Concurrent clients"),
+    duration: float = typer.Option(
+        120.0, "--duration", help="Seconds to run after ramp-up"
+    ),
+    ramp_up: float = typer.Option(
+        30.0, "--ramp-up", help="Seconds over which clients join"
+    ),
+    think_time: float = typer.Option(
+        2.0, "--think-time", help="Mean pause between a client's actions (s)"
+    ),
+    base_url: str = typer.Option(
+        "http://127.0.0.1:8080", "--base-url", help="Server under test"
+    ),
+    export: bool = typer.Option(
+        True, "--export/--no-export", help="Include PDF exports"
+    ),
+) -> None:
+    """Drive concurrent annotation sessions and report latency and server load."""
+    if not get_settings().database.url:
+        console.print("[red]Error:[/] DATABASE__URL not set")
+        sys.exit(1)
+
+    actions = {
+        name: weight
+        for name, weight in _ACTION_WEIGHTS.items()
+        if export or name != "export"
+    }
+    console.print(
+        f"Load run: {clients} clients against {base_url},"
+        f" {ramp_up:.0f}s ramp-up + {duration:.0f}s"
+    )
+    results = asyncio.run(
+        _async_load_test_run(
+            base_url.rstrip("/"),
+            clients=clients,
+            duration=duration,
+            ramp_up=ramp_up,
+            think_time=think_time,
+            actions=actions,
+        )
+    )
+    _print_report(results)
+
+
+def load_test_run() -> None:
+    """Entry point for ``uv run load-test-run``."""
+    typer.run(_main)
@@ -514,6 +514,8 @@ async def _seed_tags_for_template(workspace_id: UUID) -> list[str]:
         if workspace:
             workspace.next_tag_order = len(tag_ids)
             workspace.next_group_order = len(TAG_GROUP_DEFS)
+            # Invalidate warm registry entries so they reconcile the new tags
+            workspace.tag_version += 1
             session.add(workspace)
             await session.flush()
 
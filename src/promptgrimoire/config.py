@@ -70,6 +70,7 @@ class DatabaseConfig(BaseModel):
     """
 
     url: str | None = None
+    listen_url: str | None = None
     use_null_pool: bool = False
     pool_size: int = 80
     max_overflow: int = 15
@@ -110,6 +111,7 @@ class AppConfig(BaseModel):
     reload: bool = True
     diagnostic_interval_seconds: int = 300
     memory_restart_threshold_mb: int = 3072
+    presence_flush_ms: int = 50
     tagline: str = "Collaborative text annotation tool."
 
 
@@ -120,13 +122,39 @@ class FeaturesConfig(BaseModel):
     roleplay_require_privileged: bool = True
     enable_file_upload: bool = True
     enable_search_worker: bool = True
+    search_worker_processes: int = 0
+    word_count_processes: int = 0
     worker_in_process: bool = True
 
 
 class ExportConfig(BaseModel):
-    """Export pipeline configuration."""
+    """Export pipeline configuration.
+
+    ``worker_processes`` > 1 makes the standalone worker supervise that many
+    child processes, each claiming jobs independently.  A child exits after
+    a job once its RSS exceeds ``worker_max_rss_mb`` (0 disables) and is
+    replaced by the supervisor.
+
+    ``cache_max_mb`` bounds the content-addressed export cache
+    (export/cache.py); 0 disables it.  ``cache_dir`` defaults to a
+    directory under the system temp dir.
+
+    ``warm_toolchain`` runs one throwaway export when the standalone worker
+    starts, so Pandoc and LuaLaTeX font caches are built before the first
+    real job (export/warmup.py).
+
+    ``predict_margin_overflow`` routes all annotations to endnotes before
+    the first LaTeX pass when export/overflow.py estimates the margin
+    cannot hold them, instead of compiling twice.
+    """
 
     max_concurrent_compilations: int = 2
+    worker_processes: int = 1
+    worker_max_rss_mb: int = 0
+    cache_dir: Path | None = None
+    cache_max_mb: int = 1024
+    warm_toolchain: bool = True
+    predict_margin_overflow: bool = True
 
 
 class AdmissionConfig(BaseModel):
@@ -141,6 +169,32 @@ class AdmissionConfig(BaseModel):
     ticket_validity_seconds: int = 600
 
 
+class CrdtRegistryConfig(BaseModel):
+    """In-memory CRDT document cache policy.
+
+    Zero disables the corresponding limit.  Workspaces with connected
+    clients are never evicted.
+    """
+
+    idle_seconds: int = 1800
+    max_documents: int = 500
+    max_bytes: int = 0
+    sweep_interval_seconds: int = 60
+
+
+class AccessCacheConfig(BaseModel):
+    """In-process cache of resolved permissions and ban state.
+
+    Mutations invalidate entries explicitly (across processes via
+    NOTIFY); the TTLs bound staleness for anything not tracked.  A TTL
+    of zero disables that cache.
+    """
+
+    permission_ttl_seconds: float = 30.0
+    ban_ttl_seconds: float = 10.0
+    max_entries: int = 10000
+
+
 class I18nConfig(BaseModel):
     """Internationalisation labels."""
 
@@ -336,6 +390,8 @@ class Settings(BaseSettings):
     help: HelpConfig = HelpConfig()
     admission: AdmissionConfig = AdmissionConfig()
     idle: IdleConfig = IdleConfig()
+    crdt_registry: CrdtRegistryConfig = CrdtRegistryConfig()
+    access_cache: AccessCacheConfig = AccessCacheConfig()
 
     @model_validator(mode="after")
     def _apply_branch_db_suffix(self) -> Settings:
@@ -7,24 +7,51 @@ and comment threads across multiple connected clients.
 
 from __future__ import annotations
 
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from contextvars import ContextVar
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 from uuid import uuid4
 
 import structlog
-from pycrdt import Awareness, Doc, Map, Text, TransactionEvent, XmlFragment
+from pycrdt import (
+    Awareness,
+    Doc,
+    Map,
+    MapEvent,
+    Text,
+    TextEvent,
+    TransactionEvent,
+    XmlFragment,
+)
+
+from promptgrimoire.crdt.highlight_index import HighlightIndex
+from promptgrimoire.crdt.search_fragments import (
+    GENERAL_NOTES_FRAGMENT,
+    HIGHLIGHT_FRAGMENT_PREFIX,
+    RESPONSE_DRAFT_FRAGMENT,
+    SearchFragment,
+    highlight_search_fragment,
+)
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterator
     from uuid import UUID
 
+    from pycrdt import Transaction
+
     from promptgrimoire.db.models import Tag, TagGroup, Workspace
 
 logger = structlog.get_logger()
 # Async-safe storage for the origin client ID during updates.
 _origin_var: ContextVar[str | None] = ContextVar("annotation_origin", default=None)
 
+# Highlight ids remembered by the change journal; older changes force a
+# full highlight push to clients that have not caught up.
+_HIGHLIGHT_JOURNAL_MAX = 10_000
+
 # Pre-defined colors for client cursors/selections (colorblind-friendly)
 CLIENT_COLORS = [
     "#2196F3",  # Blue
@@ -76,9 +103,55 @@ class AnnotationDocument:
         self._clients: dict[str, Any] = {}
         self._next_color_index = 0
         self._broadcast_callback: Callable[[bytes, str | None], None] | None = None
+        # Incremental updates awaiting append-only persistence; None until
+        # enable_update_log() so the initial DB load is not re-logged.
+        self._update_log: list[bytes] | None = None
+        # ``workspace.tag_version`` this doc was last reconciled against;
+        # None forces reconciliation on the next registry hit.
+        self.tag_version: int | None = None
+        # Search fragment keys changed since the last drain; None means
+        # every fragment must be rebuilt (nothing persisted yet).
+        self._search_changes: set[str] | None = None
+        # Encoded full state, shared by every joiner until the next update.
+        self._snapshot: bytes | None = None
+        # Open transactions entered through transaction(); observers only
+        # run when the outermost one commits.
+        self._txn_depth = 0
+        # Highlight ids in order of their last change, with that change's
+        # sequence number, so clients can fetch only what they missed.
+        self._highlight_seq = 0
+        self._highlight_journal: OrderedDict[str, int] = OrderedDict()
+        self._highlight_journal_floor = 0
+        # Sorted and grouped views of the highlights Map, kept current by
+        # _on_highlights_change so queries don't rescan and re-sort it.
+        self._highlight_index = HighlightIndex()
 
         # Set up observer to broadcast changes
         self.doc.observe(self._on_update)
+        # Track which searchable parts change, for incremental search_text.
+        # Hold the root types: subscriptions die with their Python wrapper.
+        self._search_roots = (
+            self.highlights,
+            self.general_notes,
+            self.response_draft_markdown,
+        )
+        self._search_roots[0].observe(self._on_highlights_change)
+        self._search_roots[1].observe(self._on_general_notes_change)
+        self._search_roots[2].observe(self._on_response_draft_change)
+
+    @contextmanager
+    def transaction(self, origin: Any = None) -> Iterator[Transaction]:
+        """Group edits into one transaction on the underlying doc.
+
+        Use this rather than ``self.doc.transaction()`` so cached reads
+        (full state, highlight index) know that edits are pending.
+        """
+        self._txn_depth += 1
+        try:
+            with self.doc.transaction(origin=origin) as txn:
+                yield txn
+        finally:
+            self._txn_depth -= 1
 
     @property
     def highlights(self) -> Map:
@@ -215,10 +288,126 @@ class AnnotationDocument:
 
     def _on_update(self, event: TransactionEvent) -> None:
         """Handle document updates and broadcast to clients."""
+        self._snapshot = None
+        if self._update_log is not None:
+            self._update_log.append(event.update)
         if self._broadcast_callback is not None:
             origin = _origin_var.get()
             self._broadcast_callback(event.update, origin)
 
+    # --- Incremental update log ---
+
+    def enable_update_log(self) -> None:
+        """Start capturing incremental updates for append-only persistence.
+
+        Called by the registry once the document has been loaded from the
+        database, so the load itself is not captured as a pending update.
+        """
+        if self._update_log is None:
+            self._update_log = []
+
+    def drain_pending_updates(self) -> list[bytes]:
+        """Return and clear the updates captured since the last drain.
+
+        Returns:
+            Update bytes in the order they were applied, or an empty list
+            when logging is disabled or nothing changed.
+        """
+        if not self._update_log:
+            return []
+        updates = self._update_log
+        self._update_log = []
+        return updates
+
+    def restore_pending_updates(self, updates: list[bytes]) -> None:
+        """Put drained updates back at the front of the log.
+
+        Used when appending them to the database failed, so the next save
+        retries them ahead of anything captured in the meantime.
+        """
+        if self._update_log is not None and updates:
+            self._update_log[:0] = updates
+
+    # --- Search fragment tracking ---
+
+    def _note_search_change(self, key: str) -> None:
+        if self._search_changes is not None:
+            self._search_changes.add(key)
+
+    def _on_highlights_change(self, event: MapEvent) -> None:
+        journal = self._highlight_journal
+        for highlight_id, change in event.keys.items():
+            value = change.get("newValue")
+            if isinstance(value, dict):
+                self._highlight_index.put(highlight_id, value)
+            else:
+                self._highlight_index.discard(highlight_id)
+            self._note_search_change(f"{HIGHLIGHT_FRAGMENT_PREFIX}{highlight_id}")
+            self._highlight_seq += 1
+            journal[highlight_id] = self._highlight_seq
+            journal.move_to_end(highlight_id)
+        while len(journal) > _HIGHLIGHT_JOURNAL_MAX:
+            _, self._highlight_journal_floor = journal.popitem(last=False)
+
+    def _on_general_notes_change(self, _event: TextEvent) -> None:
+        self._note_search_change(GENERAL_NOTES_FRAGMENT)
+
+    def _on_response_draft_change(self, _event: TextEvent) -> None:
+        self._note_search_change(RESPONSE_DRAFT_FRAGMENT)
+
+    def drain_search_changes(self) -> set[str] | None:
+        """Return and clear the search fragment keys changed since last drain.
+
+        Returns:
+            Changed fragment keys, or None when every fragment must be
+            rebuilt (first drain after load, or after a failed write).
+        """
+        changes = self._search_changes
+        self._search_changes = set()
+        return changes
+
+    def restore_search_changes(self, changes: set[str] | None) -> None:
+        """Merge drained changes back after their write failed."""
+        if changes is None or self._search_changes is None:
+            self._search_changes = None
+        else:
+            self._search_changes |= changes
+
+    def build_search_fragments(
+        self, keys: set[str] | None
+    ) -> dict[str, SearchFragment | None]:
+        """Build current search fragments for *keys*.
+
+        Args:
+            keys: Fragment keys to build, or None for every fragment.
+
+        Returns:
+            Mapping of fragment key to fragment; None marks a fragment
+            whose highlight was removed or whose text field is empty.
+        """
+        if keys is None:
+            keys = {
+                f"{HIGHLIGHT_FRAGMENT_PREFIX}{highlight_id}"
+                for highlight_id in self.highlights
+            } | {GENERAL_NOTES_FRAGMENT, RESPONSE_DRAFT_FRAGMENT}
+        fragments: dict[str, SearchFragment | None] = {}
+        for key in keys:
+            if key.startswith(HIGHLIGHT_FRAGMENT_PREFIX):
+                highlight = self.highlights.get(
+                    key.removeprefix(HIGHLIGHT_FRAGMENT_PREFIX)
+                )
+                fragments[key] = (
+                    highlight_search_fragment(highlight) if highlight else None
+                )
+            else:
+                field_text = (
+                    self.get_general_notes()
+                    if key == GENERAL_NOTES_FRAGMENT
+                    else self.get_response_draft_markdown()
+                )
+                fragments[key] = SearchFragment(field_text) if field_text else None
+        return fragments
+
     # --- Highlight operations ---
 
     def add_highlight(
@@ -374,12 +563,22 @@ class AnnotationDocument:
         """
         return self.highlights.get(highlight_id)
 
+    def _current_index(self) -> HighlightIndex | None:
+        """The highlight index, or None while a ``transaction()`` is open.
+
+        The index is updated when a transaction commits, so inside one it
+        may not reflect the transaction's own edits yet.
+        """
+        return None if self._txn_depth else self._highlight_index
+
     def get_all_highlights(self) -> list[dict[str, Any]]:
         """Get all highlights in the document.
 
         Returns:
             List of highlight data dicts, sorted by start_char.
         """
+        if (index := self._current_index()) is not None:
+            return index.all()
         highlights = list(self.highlights.values())
         return sorted(highlights, key=lambda h: h.get("start_char", 0))
 
@@ -392,11 +591,80 @@ class AnnotationDocument:
         Returns:
             List of highlight data dicts for that document, sorted by start_char.
         """
+        if (index := self._current_index()) is not None:
+            return index.for_document(document_id)
         highlights = [
             h for h in self.highlights.values() if h.get("document_id") == document_id
         ]
         return sorted(highlights, key=lambda h: h.get("start_char", 0))
 
+    def count_highlights_for_document(self, document_id: str) -> int:
+        """Count the highlights belonging to a specific document."""
+        if (index := self._current_index()) is not None:
+            return index.count_for_document(document_id)
+        return len(self.get_highlights_for_document(document_id))
+
+    def get_highlight_ids_with_tag(self, tag: str) -> set[str]:
+        """Get IDs of highlights whose ``tag`` field is *tag*.
+
+        Unlike :meth:`get_tag_highlights`, which reads the ordered list
+        stored on the tag, this reflects the highlights themselves.
+        """
+        if (index := self._current_index()) is not None:
+            return index.ids_for_tag(tag)
+        return {hl_id for hl_id, hl in self.highlights.items() if hl.get("tag") == tag}
+
+    def get_highlights_overlapping(
+        self, start_char: int, end_char: int, document_id: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Get highlights overlapping characters ``[start_char, end_char)``.
+
+        Args:
+            start_char: First character of the range.
+            end_char: One past the last character of the range.
+            document_id: Restrict to one document; None searches all.
+
+        Returns:
+            List of highlight data dicts, sorted by start_char.
+        """
+        if (index := self._current_index()) is not None:
+            return index.overlapping(start_char, end_char, document_id)
+        if document_id is None:
+            candidates = self.get_all_highlights()
+        else:
+            candidates = self.get_highlights_for_document(document_id)
+        return [
+            hl
+            for hl in candidates
+            if hl.get("start_char", 0) < end_char and hl.get("end_char", 0) > start_char
+        ]
+
+    @property
+    def highlight_seq(self) -> int:
+        """Sequence number of the latest highlight add, change or removal."""
+        return self._highlight_seq
+
+    def highlight_changes_since(self, seq: int) -> list[str] | None:
+        """Get IDs of highlights added, changed or removed after *seq*.
+
+        Cost is proportional to the number of changes, not highlights.
+
+        Args:
+            seq: A value previously read from :attr:`highlight_seq`.
+
+        Returns:
+            Changed highlight IDs, most recent first, or None when the
+            journal no longer reaches back to *seq*.
+        """
+        if seq < self._highlight_journal_floor:
+            return None
+        changed = []
+        for highlight_id, changed_at in reversed(self._highlight_journal.items()):
+            if changed_at <= seq:
+                break
+            changed.append(highlight_id)
+        return changed
+
     def get_tag_highlights(self, tag_id: str) -> list[str]:
         """Get ordered highlight IDs for a tag from the tags Map.
 
@@ -781,8 +1049,39 @@ class AnnotationDocument:
     # --- Serialization ---
 
     def get_full_state(self) -> bytes:
-        """Get the full document state for syncing to new clients."""
-        return self.doc.get_update()
+        """Get the full document state for syncing to new clients.
+
+        The encoding is cached until the next update, so clients joining
+        an unchanged document share one snapshot.
+        """
+        if self._txn_depth:
+            # The observer has not run yet: encode pending edits, don't cache.
+            return self.doc.get_update()
+        if self._snapshot is None:
+            self._snapshot = self.doc.get_update()
+        return self._snapshot
+
+    def get_state_vector(self) -> bytes:
+        """Get the document's state vector (what it has seen per client)."""
+        return self.doc.get_state()
+
+    def get_update_since(self, state_vector: bytes | None) -> bytes:
+        """Get only the operations missing from a peer's *state_vector*.
+
+        Used for late joiners and reconnects that already hold part of the
+        document. An absent or undecodable state vector falls back to the
+        full state.
+
+        Args:
+            state_vector: The peer's encoded Yjs state vector, if known.
+        """
+        if not state_vector:
+            return self.get_full_state()
+        try:
+            return self.doc.get_update(state_vector)
+        except ValueError:
+            logger.warning("crdt_state_vector_invalid", doc_id=self.doc_id)
+            return self.get_full_state()
 
     def apply_update(self, update: bytes, origin_client_id: str | None = None) -> None:
         """Apply an update from a client.
@@ -961,13 +1260,96 @@ async def _ensure_crdt_tag_consistency(
             )
 
 
+async def _refresh_cached(
+    doc: AnnotationDocument,
+    workspace_id: UUID,
+    workspace: Workspace | None,
+    tags: list[Tag] | None,
+    tag_groups: list[TagGroup] | None,
+) -> None:
+    """Reconcile a cached document's tags if the workspace's changed.
+
+    Compares the workspace's ``tag_version`` (from *workspace* when
+    pre-fetched) with the version *doc* was last reconciled at.
+    """
+    from promptgrimoire.db.tags import get_workspace_tag_version
+
+    tag_version = (
+        workspace.tag_version
+        if workspace is not None
+        else await get_workspace_tag_version(workspace_id)
+    )
+    if tag_version is None or tag_version != doc.tag_version:
+        # Re-sync with DB to pick up out-of-band tag changes
+        await _ensure_crdt_tag_consistency(
+            doc, workspace_id, tags=tags, tag_groups=tag_groups
+        )
+        doc.tag_version = tag_version
+
+
+async def _load_state(
+    doc: AnnotationDocument,
+    workspace_id: UUID,
+    workspace: Workspace | None,
+    pending_updates: list[bytes] | None,
+) -> Workspace | None:
+    """Apply the workspace's stored CRDT state to a freshly created *doc*.
+
+    The snapshot is merged with any uncompacted update-log rows; either
+    is fetched only when not pre-fetched.  Load failures are logged and
+    leave *doc* empty.
+
+    Returns:
+        The workspace, or None if it does not exist or could not be fetched.
+    """
+    try:
+        from promptgrimoire.db.crdt_updates import (
+            list_pending_crdt_updates,
+            merge_crdt_state,
+        )
+
+        if workspace is None:
+            from promptgrimoire.db.workspaces import get_workspace
+
+            workspace = await get_workspace(workspace_id)
+        if workspace is not None:
+            if pending_updates is None:
+                pending_updates = await list_pending_crdt_updates(workspace_id)
+            crdt_state = merge_crdt_state(workspace.crdt_state, pending_updates)
+            if crdt_state:
+                doc.apply_update(crdt_state)
+                logger.debug("Loaded workspace %s from database", workspace_id)
+    except Exception:
+        logger.exception("Failed to load workspace %s from database", workspace_id)
+    return workspace
+
+
 # Registry for managing multiple annotation documents
 class AnnotationDocumentRegistry:
-    """Registry for managing multiple annotation documents by ID."""
+    """Registry for managing multiple annotation documents by ID.
+
+    Documents are kept in least-recently-used order.  ``evict()`` applies
+    the cache policy (idle TTL, document cap, encoded-size budget) and is
+    driven by a periodic sweeper; hit/miss/eviction counters are exposed
+    via ``stats()`` for the diagnostics snapshot.
+    """
+
+    # Never evict a document touched this recently, so a page that has
+    # loaded the doc but not yet registered presence keeps it.
+    eviction_grace_seconds: float = 60.0
 
     def __init__(self) -> None:
         """Initialize an empty registry."""
-        self._documents: dict[str, AnnotationDocument] = {}
+        self._documents: OrderedDict[str, AnnotationDocument] = OrderedDict()
+        self._last_access: dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _touch(self, doc_id: str) -> None:
+        """Mark a document as most recently used."""
+        self._documents.move_to_end(doc_id)
+        self._last_access[doc_id] = time.monotonic()
 
     def get_or_create(self, doc_id: str) -> AnnotationDocument:
         """Get an existing document or create a new one (in-memory only).
@@ -980,19 +1362,34 @@ class AnnotationDocumentRegistry:
         """
         if doc_id not in self._documents:
             self._documents[doc_id] = AnnotationDocument(doc_id)
+        self._touch(doc_id)
         return self._documents[doc_id]
 
     async def get_or_create_for_workspace(
-        self, workspace_id: UUID, *, workspace: Workspace | None = None
+        self,
+        workspace_id: UUID,
+        *,
+        workspace: Workspace | None = None,
+        pending_updates: list[bytes] | None = None,
+        tags: list[Tag] | None = None,
+        tag_groups: list[TagGroup] | None = None,
     ) -> AnnotationDocument:
         """Get existing document for workspace, load from DB, or create new.
 
-        Loads CRDT state from Workspace.crdt_state.
+        Loads CRDT state from Workspace.crdt_state merged with any
+        uncompacted ``workspace_crdt_update`` rows.  On a cache hit the
+        tag reconciliation is skipped when the workspace's ``tag_version``
+        still matches the version the document was last reconciled at.
 
         Args:
             workspace_id: The workspace UUID.
-            workspace: Pre-fetched Workspace object. When provided and has
-                crdt_state, the DB fetch is skipped (saving a query).
+            workspace: Pre-fetched Workspace object. When provided, the
+                workspace fetch (and on a cache hit, the tag version
+                lookup) is skipped.
+            pending_updates: Pre-fetched uncompacted update log. When
+                provided, the log query is skipped on a cache miss.
+            tags: Pre-fetched workspace tags for reconciliation.
+            tag_groups: Pre-fetched workspace tag groups for reconciliation.
 
         Returns:
             The AnnotationDocument instance, restored from DB if available.
@@ -1001,32 +1398,32 @@ class AnnotationDocumentRegistry:
         doc_id = f"ws-{workspace_id}"
 
         if doc_id in self._documents:
+            self.hits += 1
+            self._touch(doc_id)
             doc = self._documents[doc_id]
-            # Re-sync with DB to pick up out-of-band updates (e.g. test seeds)
-            await _ensure_crdt_tag_consistency(doc, workspace_id)
+            await _refresh_cached(doc, workspace_id, workspace, tags, tag_groups)
             return doc
 
-        # Try to load from Workspace
+        self.misses += 1
+
         from promptgrimoire.crdt.persistence import get_persistence_manager
 
         doc = AnnotationDocument(doc_id)
+        workspace = await _load_state(doc, workspace_id, workspace, pending_updates)
 
-        try:
-            ws = workspace
-            if ws is None:
-                from promptgrimoire.db.workspaces import get_workspace
-
-                ws = await get_workspace(workspace_id)
-            if ws and ws.crdt_state:
-                doc.apply_update(ws.crdt_state)
-                logger.debug("Loaded workspace %s from database", workspace_id)
-        except Exception:
-            logger.exception("Failed to load workspace %s from database", workspace_id)
+        # Ensure CRDT tag maps are consistent with DB.  The version is read
+        # before reconciling, so a concurrent tag edit leaves the doc stale
+        # and the next hit reconciles again.
+        await _ensure_crdt_tag_consistency(
+            doc, workspace_id, tags=tags, tag_groups=tag_groups
+        )
+        doc.tag_version = workspace.tag_version if workspace is not None else None
 
-        # Ensure CRDT tag maps are consistent with DB
-        await _ensure_crdt_tag_consistency(doc, workspace_id)
+        # Only edits made from here on are logged for incremental persistence
+        doc.enable_update_log()
 
         self._documents[doc_id] = doc
+        self._touch(doc_id)
 
         # Register with persistence manager
         get_persistence_manager().register_document(doc)
@@ -1053,6 +1450,7 @@ class AnnotationDocumentRegistry:
         Returns:
             True if document was found and removed.
         """
+        self._last_access.pop(doc_id, None)
         return self._documents.pop(doc_id, None) is not None
 
     def list_ids(self) -> list[str]:
@@ -1069,4 +1467,126 @@ class AnnotationDocumentRegistry:
         """
         count = len(self._documents)
         self._documents.clear()
+        self._last_access.clear()
         return count
+
+    def stats(self) -> dict[str, int]:
+        """Return cache counters for the diagnostics snapshot."""
+        return {
+            "size": len(self._documents),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _select_victims(
+        self,
+        *,
+        idle_seconds: float,
+        max_documents: int,
+        max_bytes: int,
+        is_pinned: Callable[[str], bool],
+        now: float,
+    ) -> list[str]:
+        """Choose documents to evict, least recently used first.
+
+        Only workspace documents (``ws-`` prefix) that are not pinned and
+        have not been touched within ``eviction_grace_seconds`` qualify.
+        """
+        candidates = [
+            doc_id
+            for doc_id in self._documents
+            if doc_id.startswith("ws-")
+            and not is_pinned(doc_id)
+            and now - self._last_access.get(doc_id, 0.0) >= self.eviction_grace_seconds
+        ]
+        victims: list[str] = []
+        if idle_seconds > 0:
+            victims = [
+                doc_id
+                for doc_id in candidates
+                if now - self._last_access.get(doc_id, 0.0) >= idle_seconds
+            ]
+        idle = set(victims)
+        remaining = [doc_id for doc_id in candidates if doc_id not in idle]
+
+        if max_documents > 0:
+            excess = len(self._documents) - len(victims) - max_documents
+            while excess > 0 and remaining:
+                victims.append(remaining.pop(0))
+                excess -= 1
+
+        if max_bytes > 0 and remaining:
+            evicting = set(victims)
+            sizes = {
+                doc_id: len(doc.get_full_state())
+                for doc_id, doc in self._documents.items()
+                if doc_id not in evicting
+            }
+            total = sum(sizes.values())
+            while total > max_bytes and remaining:
+                doc_id = remaining.pop(0)
+                total -= sizes[doc_id]
+                victims.append(doc_id)
+        return victims
+
+    async def evict(
+        self,
+        *,
+        idle_seconds: float = 0,
+        max_documents: int = 0,
+        max_bytes: int = 0,
+        is_pinned: Callable[[str], bool] | None = None,
+    ) -> int:
+        """Apply the cache policy, persisting each document before eviction.
+
+        Args:
+            idle_seconds: Evict documents not accessed for this long
+                (0 disables the idle TTL).
+            max_documents: Evict least-recently-used documents until at
+                most this many remain (0 disables the cap).
+            max_bytes: Evict least-recently-used documents until the total
+                encoded state size fits (0 disables the budget).
+            is_pinned: Returns True for documents that must stay resident,
+                e.g. workspaces with connected clients.
+
+        Returns:
+            Number of documents evicted.
+        """
+        from uuid import UUID
+
+        from promptgrimoire.crdt.persistence import get_persistence_manager
+
+        started = time.monotonic()
+        victims = self._select_victims(
+            idle_seconds=idle_seconds,
+            max_documents=max_documents,
+            max_bytes=max_bytes,
+            is_pinned=is_pinned or (lambda _doc_id: False),
+            now=started,
+        )
+        pm = get_persistence_manager()
+        evicted = 0
+        for doc_id in victims:
+            workspace_id = UUID(doc_id.removeprefix("ws-"))
+            await pm.force_persist_workspace(workspace_id)
+            # A client may have reopened the workspace while we awaited,
+            # or the save failed and the doc still holds unsaved edits.
+            if (
+                doc_id not in self._documents
+                or self._last_access.get(doc_id, 0.0) > started
+                or (is_pinned is not None and is_pinned(doc_id))
+                or pm.is_workspace_dirty(workspace_id)
+            ):
+                continue
+            pm.evict_workspace(workspace_id, doc_id)
+            self.remove(doc_id)
+            self.evictions += 1
+            evicted += 1
+        if evicted:
+            logger.info(
+                "crdt_registry_evicted",
+                evicted=evicted,
+                remaining=len(self._documents),
+            )
+        return evicted
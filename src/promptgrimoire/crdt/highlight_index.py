@@ -0,0 +1,140 @@
+"""Secondary indexes over an annotation document's highlights.
+
+``AnnotationDocument`` keeps one :class:`HighlightIndex` current from its
+``highlights`` Map observer, so the page refresh, organise, respond and
+export queries read sorted, pre-grouped highlights instead of
+deserialising and re-sorting the whole Map on every call.
+
+Highlights are kept in lists sorted by ``(start_char, id)``: one for the
+workspace and one per document.  Overlap queries bisect those lists; a
+highlight overlapping ``[start, end)`` begins before ``end`` and no
+earlier than ``start`` minus the longest highlight in the list.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from typing import Any
+
+type _Key = tuple[float, str]
+
+
+class _SortedHighlights:
+    """Highlight keys sorted by start, with the longest span seen."""
+
+    def __init__(self) -> None:
+        self.keys: list[_Key] = []
+        # Only grows: a stale, larger bound widens the scan, never misses.
+        self.max_span = 0.0
+
+    def add(self, key: _Key, span: float) -> None:
+        insort(self.keys, key)
+        self.max_span = max(self.max_span, span)
+
+    def remove(self, key: _Key) -> None:
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            del self.keys[i]
+
+    def overlapping(self, start: float, end: float) -> list[_Key]:
+        lo = bisect_left(self.keys, (start - self.max_span, ""))
+        hi = bisect_left(self.keys, (end, ""))
+        return self.keys[lo:hi]
+
+
+def _key(highlight: dict[str, Any], highlight_id: str) -> _Key:
+    return (highlight.get("start_char", 0), highlight_id)
+
+
+def _span(highlight: dict[str, Any]) -> float:
+    return highlight.get("end_char", 0) - highlight.get("start_char", 0)
+
+
+class HighlightIndex:
+    """Highlights by id, sorted by start_char, and grouped by document and tag.
+
+    Query results are shallow copies, like the dicts the ``highlights``
+    Map itself returns, so callers may annotate them freely.
+    """
+
+    def __init__(self) -> None:
+        self._by_id: dict[str, dict[str, Any]] = {}
+        self._all = _SortedHighlights()
+        self._by_document: dict[str | None, _SortedHighlights] = {}
+        self._by_tag: dict[str | None, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def put(self, highlight_id: str, highlight: dict[str, Any]) -> None:
+        """Index *highlight*, replacing any previous value for its id."""
+        self.discard(highlight_id)
+        self._by_id[highlight_id] = highlight
+        key, span = _key(highlight, highlight_id), _span(highlight)
+        self._all.add(key, span)
+        document_id = highlight.get("document_id")
+        self._by_document.setdefault(document_id, _SortedHighlights()).add(key, span)
+        self._by_tag.setdefault(highlight.get("tag"), set()).add(highlight_id)
+
+    def discard(self, highlight_id: str) -> None:
+        """Drop *highlight_id* from every index, if present."""
+        highlight = self._by_id.pop(highlight_id, None)
+        if highlight is None:
+            return
+        key = _key(highlight, highlight_id)
+        self._all.remove(key)
+        document_id = highlight.get("document_id")
+        by_document = self._by_document[document_id]
+        by_document.remove(key)
+        if not by_document.keys:
+            del self._by_document[document_id]
+        tag = highlight.get("tag")
+        tag_ids = self._by_tag[tag]
+        tag_ids.discard(highlight_id)
+        if not tag_ids:
+            del self._by_tag[tag]
+
+    def _resolve(self, keys: list[_Key]) -> list[dict[str, Any]]:
+        return [dict(self._by_id[highlight_id]) for _, highlight_id in keys]
+
+    def all(self) -> list[dict[str, Any]]:
+        """Every highlight, sorted by start_char."""
+        return self._resolve(self._all.keys)
+
+    def for_document(self, document_id: str | None) -> list[dict[str, Any]]:
+        """Highlights of *document_id*, sorted by start_char."""
+        by_document = self._by_document.get(document_id)
+        return self._resolve(by_document.keys) if by_document else []
+
+    def count_for_document(self, document_id: str | None) -> int:
+        """Number of highlights in *document_id*."""
+        by_document = self._by_document.get(document_id)
+        return len(by_document.keys) if by_document else 0
+
+    def ids_for_tag(self, tag: str | None) -> set[str]:
+        """IDs of highlights whose ``tag`` field is *tag*."""
+        return set(self._by_tag.get(tag, ()))
+
+    def overlapping(
+        self, start: float, end: float, document_id: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Highlights overlapping chars ``[start, end)``, sorted by start_char.
+
+        Args:
+            start: First character of the range.
+            end: One past the last character of the range.
+            document_id: Restrict to one document; None searches all.
+        """
+        if document_id is None:
+            candidates = self._all
+        else:
+            candidates = self._by_document.get(document_id)
+            if candidates is None:
+                return []
+        return self._resolve(
+            [
+                key
+                for key in candidates.overlapping(start, end)
+                if self._by_id[key[1]].get("end_char", 0) > start
+            ]
+        )
@@ -2,11 +2,26 @@
 
 Coordinates saving CRDT document state to PostgreSQL with debouncing
 to avoid overwhelming the database during rapid edits.
+
+Debounced saves append only the incremental update captured since the
+previous save to ``workspace_crdt_update``.  Full snapshots of
+``workspace.crdt_state`` are written on the first save of a document in
+this process, every ``compact_after_updates`` appends, and on forced
+persistence (client disconnect, pre-restart drain, shutdown).
+
+Flushing every dirty workspace at once (pre-restart drain, shutdown)
+writes snapshots in batches with a single ``UPDATE ... FROM (VALUES ...)``
+per batch and records each batch's latency in a small histogram.
+
+Every save also carries the document's search fragment changes
+(``SearchFragmentPatch``), so search_text is patched from the fragments
+that changed instead of re-extracted from the whole CRDT state.
 """
 
 from __future__ import annotations
 
 import asyncio
+import time
 from typing import TYPE_CHECKING
 
 import structlog
@@ -15,20 +30,48 @@ if TYPE_CHECKING:
     from uuid import UUID
 
     from promptgrimoire.crdt.annotation_doc import AnnotationDocument
+    from promptgrimoire.db.search_fragments import SearchFragmentPatch
+
+    # Document, its drained search changes, and the patch built from them
+    _SearchCapture = tuple[AnnotationDocument, set[str] | None, SearchFragmentPatch]
 
 logger = structlog.get_logger()
 
+# Upper bounds (ms) of the batched flush latency histogram buckets
+FLUSH_LATENCY_BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 5000)
+
+
+def _search_fragment_patch(
+    doc: AnnotationDocument, changes: set[str] | None
+) -> SearchFragmentPatch:
+    """Build the fragment patch for search changes drained from *doc*."""
+    from promptgrimoire.db.search_fragments import SearchFragmentPatch
+
+    return SearchFragmentPatch(
+        doc.build_search_fragments(changes), replace=changes is None
+    )
+
 
 class PersistenceManager:
     """Manages debounced persistence of CRDT documents to database.
 
     Attributes:
         debounce_seconds: Delay before persisting (class attr, override in tests).
+        compact_after_updates: Appended updates before a debounced save
+            writes a full snapshot instead (class attr, override in tests).
+        flush_batch_size: Workspaces per multi-row UPDATE when flushing
+            all dirty workspaces (class attr, override in tests).
+        flush_concurrency: Maximum batches written concurrently.
         _doc_registry: Dict of doc_id -> AnnotationDocument for accessing documents.
     """
 
     # Debounce interval - override in tests for faster execution
     debounce_seconds: float = 5.0
+    # Log length at which a debounced save compacts to a full snapshot
+    compact_after_updates: int = 50
+    # Batched flush of all dirty workspaces (shutdown, pre-restart drain)
+    flush_batch_size: int = 100
+    flush_concurrency: int = 4
 
     def __init__(self) -> None:
         """Initialize the persistence manager."""
@@ -38,6 +81,13 @@ class PersistenceManager:
         self._workspace_dirty: dict[UUID, str] = {}  # workspace_id -> doc_id
         self._workspace_pending_saves: dict[UUID, asyncio.Task[None]] = {}
         self._workspace_last_editors: dict[UUID, str | None] = {}
+        # workspace_id -> updates appended since our last full snapshot.
+        # Absent until this process has written a snapshot for the workspace.
+        self._workspace_log_lengths: dict[UUID, int] = {}
+        # Batch writes per FLUSH_LATENCY_BUCKETS_MS bucket, plus overflow
+        self._flush_latency_counts: list[int] = [0] * (
+            len(FLUSH_LATENCY_BUCKETS_MS) + 1
+        )
 
     def register_document(self, doc: AnnotationDocument) -> None:
         """Register a document for persistence tracking.
@@ -100,7 +150,7 @@ class PersistenceManager:
         """Wait for debounce period then persist workspace."""
         try:
             await asyncio.sleep(self.debounce_seconds)
-            await self._persist_workspace(workspace_id)
+            await self._persist_workspace(workspace_id, incremental=True)
         except asyncio.CancelledError:
             logger.debug(
                 "crdt_save_superseded",
@@ -108,8 +158,16 @@ class PersistenceManager:
                 workspace_id=str(workspace_id),
             )
 
-    async def _persist_workspace(self, workspace_id: UUID) -> None:
-        """Persist CRDT state to Workspace table."""
+    async def _persist_workspace(
+        self, workspace_id: UUID, *, incremental: bool = False
+    ) -> None:
+        """Persist CRDT state to Workspace table.
+
+        Args:
+            workspace_id: The workspace UUID.
+            incremental: Append the pending update to the log when allowed
+                instead of rewriting the full snapshot.
+        """
         from uuid import UUID as UUIDType
 
         # Handle string UUIDs gracefully
@@ -127,20 +185,91 @@ class PersistenceManager:
             )
             return
 
+        search_changes = doc.drain_search_changes()
+        search = _search_fragment_patch(doc, search_changes)
+        success = False
         try:
+            logged = self._workspace_log_lengths.get(workspace_id)
+            if (
+                incremental
+                and logged is not None
+                and logged < self.compact_after_updates
+            ):
+                appended = await self._append_workspace_update(
+                    workspace_id, doc, search
+                )
+                if appended is not None:
+                    success = appended
+                    self._finish_persist(workspace_id, success)
+                    return
+
             from promptgrimoire.db.workspaces import save_workspace_crdt_state
 
+            # The snapshot supersedes everything captured so far.  Forget
+            # the log length first so a failed save forces the next save
+            # to be a full snapshot rather than appending after a gap.
+            self._workspace_log_lengths.pop(workspace_id, None)
+            doc.drain_pending_updates()
             crdt_state = doc.get_full_state()
-            success = await save_workspace_crdt_state(workspace_id, crdt_state)
-
+            success = await save_workspace_crdt_state(
+                workspace_id, crdt_state, search=search
+            )
             if success:
-                self._workspace_dirty.pop(workspace_id, None)
-                logger.debug("Persisted workspace %s", workspace_id)
-            else:
-                logger.warning("Workspace %s not found for persistence", workspace_id)
+                self._workspace_log_lengths[workspace_id] = 0
+            self._finish_persist(workspace_id, success)
 
         except Exception:
             logger.exception("Failed to persist workspace %s", workspace_id)
+        finally:
+            if not success:
+                # The fragment patch was not written; retry it next save
+                doc.restore_search_changes(search_changes)
+
+    async def _append_workspace_update(
+        self,
+        workspace_id: UUID,
+        doc: AnnotationDocument,
+        search: SearchFragmentPatch,
+    ) -> bool | None:
+        """Append the doc's pending updates to the log as one merged update.
+
+        Returns:
+            The append result, or None when nothing was captured and the
+            caller should fall back to a full snapshot.
+        """
+        from pycrdt import merge_updates
+
+        from promptgrimoire.db.crdt_updates import append_workspace_crdt_update
+
+        updates = doc.drain_pending_updates()
+        if not updates:
+            return None
+        update = updates[0] if len(updates) == 1 else merge_updates(*updates)
+        try:
+            success = await append_workspace_crdt_update(
+                workspace_id, update, search=search
+            )
+        except Exception:
+            # Keep the updates so the next save retries them
+            doc.restore_pending_updates(updates)
+            raise
+        if success:
+            self._workspace_log_lengths[workspace_id] = (
+                self._workspace_log_lengths.get(workspace_id, 0) + 1
+            )
+        return success
+
+    def _finish_persist(self, workspace_id: UUID, success: bool) -> None:
+        """Clear the dirty marker after a save, or log a missing workspace."""
+        if success:
+            self._workspace_dirty.pop(workspace_id, None)
+            logger.debug("Persisted workspace %s", workspace_id)
+        else:
+            logger.warning("Workspace %s not found for persistence", workspace_id)
+
+    def is_workspace_dirty(self, workspace_id: UUID) -> bool:
+        """Return True if the workspace has edits not yet persisted."""
+        return workspace_id in self._workspace_dirty
 
     async def force_persist_workspace(self, workspace_id: UUID) -> None:
         """Immediately persist a workspace's CRDT state.
@@ -162,10 +291,101 @@ class PersistenceManager:
         await self._persist_workspace(workspace_id)
 
     async def persist_all_dirty_workspaces(self) -> None:
-        """Persist all dirty workspaces immediately."""
+        """Persist all dirty workspaces immediately as batched snapshots.
+
+        Every dirty document is encoded up front, then written in batches
+        of ``flush_batch_size`` with one multi-row UPDATE per batch and at
+        most ``flush_concurrency`` batches in flight.  A failed batch leaves
+        its workspaces dirty for the next save.
+        """
         workspace_ids = list(self._workspace_dirty.keys())
         for workspace_id in workspace_ids:
-            await self.force_persist_workspace(workspace_id)
+            task = self._workspace_pending_saves.pop(workspace_id, None)
+            if task is not None:
+                task.cancel()
+
+        states: dict[UUID, bytes] = {}
+        search: dict[UUID, _SearchCapture] = {}
+        for workspace_id in workspace_ids:
+            doc_id = self._workspace_dirty.get(workspace_id)
+            doc = self._doc_registry.get(doc_id) if doc_id is not None else None
+            if doc is None:
+                logger.warning(
+                    "Document %s not found for workspace %s", doc_id, workspace_id
+                )
+                continue
+            self._workspace_log_lengths.pop(workspace_id, None)
+            doc.drain_pending_updates()
+            states[workspace_id] = doc.get_full_state()
+            changes = doc.drain_search_changes()
+            search[workspace_id] = (doc, changes, _search_fragment_patch(doc, changes))
+
+        if not states:
+            return
+
+        items = list(states.items())
+        size = max(1, self.flush_batch_size)
+        batches = [dict(items[i : i + size]) for i in range(0, len(items), size)]
+        semaphore = asyncio.Semaphore(max(1, self.flush_concurrency))
+        started = time.monotonic()
+        await asyncio.gather(
+            *(self._flush_batch(batch, search, semaphore) for batch in batches)
+        )
+        logger.info(
+            "crdt_flush_completed",
+            workspaces=len(states),
+            batches=len(batches),
+            duration_ms=round((time.monotonic() - started) * 1000, 1),
+            latency_histogram=self.flush_latency_histogram(),
+        )
+
+    async def _flush_batch(
+        self,
+        batch: dict[UUID, bytes],
+        search: dict[UUID, _SearchCapture],
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        """Write one batch of snapshots and record its latency."""
+        from promptgrimoire.db.workspaces import save_workspace_crdt_states
+
+        saved: set[UUID] | None = None
+        async with semaphore:
+            started = time.monotonic()
+            try:
+                saved = await save_workspace_crdt_states(
+                    batch, search={wid: search[wid][2] for wid in batch}
+                )
+            except Exception:
+                logger.exception("Failed to persist batch of %d workspaces", len(batch))
+            finally:
+                self._record_flush_latency(time.monotonic() - started)
+
+        for workspace_id in batch:
+            if saved is not None and workspace_id in saved:
+                self._workspace_log_lengths[workspace_id] = 0
+            else:
+                doc, changes, _patch = search[workspace_id]
+                doc.restore_search_changes(changes)
+            if saved is not None:
+                self._finish_persist(workspace_id, workspace_id in saved)
+
+    def _record_flush_latency(self, seconds: float) -> None:
+        """Add one batch write to the flush-latency histogram."""
+        elapsed_ms = seconds * 1000
+        for i, bound in enumerate(FLUSH_LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self._flush_latency_counts[i] += 1
+                return
+        self._flush_latency_counts[-1] += 1
+
+    def flush_latency_histogram(self) -> dict[str, int]:
+        """Return batch-write counts keyed by latency bucket upper bound.
+
+        Keys are ``"le_<ms>"`` for each bound in ``FLUSH_LATENCY_BUCKETS_MS``
+        plus ``"le_inf"`` for slower writes.  Counts are not cumulative.
+        """
+        keys = [f"le_{bound}" for bound in FLUSH_LATENCY_BUCKETS_MS] + ["le_inf"]
+        return dict(zip(keys, self._flush_latency_counts, strict=True))
 
     def evict_workspace(self, workspace_id: UUID, doc_id: str) -> None:
         """Remove all state for a workspace after its last client disconnects.
@@ -175,6 +395,7 @@ class PersistenceManager:
         - Dirty marker from ``_workspace_dirty``
         - Pending save task from ``_workspace_pending_saves`` (cancelled)
         - Last editor from ``_workspace_last_editors``
+        - Update-log length from ``_workspace_log_lengths``
 
         Call this AFTER ``force_persist_workspace`` has saved any pending state.
 
@@ -190,6 +411,7 @@ class PersistenceManager:
         self.unregister_document(doc_id)
         self._workspace_dirty.pop(workspace_id, None)
         self._workspace_last_editors.pop(workspace_id, None)
+        self._workspace_log_lengths.pop(workspace_id, None)
         # Cancel and remove any pending save task (should already be done
         # by force_persist_workspace, but be defensive)
         task = self._workspace_pending_saves.pop(workspace_id, None)
@@ -210,3 +432,33 @@ def get_persistence_manager() -> PersistenceManager:
     if _persistence_manager is None:
         _persistence_manager = PersistenceManager()
     return _persistence_manager
+
+
+async def start_compaction_worker(
+    interval_seconds: float = 300.0,
+    min_updates: int = 1,
+) -> None:
+    """Periodically fold the CRDT update log into workspace snapshots.
+
+    Live documents compact themselves every ``compact_after_updates``
+    saves and on disconnect; this loop catches everything else (workspaces
+    whose last save was an append, rows left by a crashed process).
+
+    Parameters
+    ----------
+    interval_seconds : float
+        Sleep duration between compaction passes.
+    min_updates : int
+        Minimum pending updates before a workspace is compacted.
+    """
+    from promptgrimoire.db.crdt_updates import compact_workspace_crdt_updates
+
+    logger.info("CRDT compaction worker started (interval=%.1fs)", interval_seconds)
+    while True:
+        try:
+            compacted = await compact_workspace_crdt_updates(min_updates=min_updates)
+            if compacted:
+                logger.info("Compacted CRDT update log for %d workspaces", compacted)
+        except Exception:
+            logger.exception("CRDT compaction worker iteration failed")
+        await asyncio.sleep(interval_seconds)
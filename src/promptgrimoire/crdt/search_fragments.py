@@ -0,0 +1,46 @@
+"""Per-part searchable text of an annotation document.
+
+A workspace's ``search_text`` is the concatenation of one fragment per
+highlight (highlight text plus comment texts, with its tag) and one per
+collaborative text field.  The live ``AnnotationDocument`` tracks which
+fragments change so persistence can patch ``workspace_search_fragment``
+rows instead of re-extracting the whole document.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+# Fragment keys: one per highlight, plus one per collaborative text field
+HIGHLIGHT_FRAGMENT_PREFIX = "highlight:"
+RESPONSE_DRAFT_FRAGMENT = "response_draft_markdown"
+GENERAL_NOTES_FRAGMENT = "general_notes"
+
+
+@dataclass(frozen=True)
+class SearchFragment:
+    """Searchable text for one highlight or text field.
+
+    Attributes:
+        content: Highlight text and comment texts, or the field's text.
+        tag: Raw highlight tag (UUID string or legacy name); resolved to
+            a display name when fragments are aggregated.
+    """
+
+    content: str
+    tag: str | None = None
+
+
+def highlight_search_fragment(highlight: Mapping[str, Any]) -> SearchFragment:
+    """Build the search fragment for one highlight dict."""
+    parts: list[str] = []
+    if hl_text := highlight.get("text", ""):
+        parts.append(hl_text)
+    for comment in highlight.get("comments", []):
+        if comment_text := comment.get("text", ""):
+            parts.append(comment_text)
+    return SearchFragment("\n".join(parts), highlight.get("tag") or None)
@@ -45,6 +45,11 @@ from promptgrimoire.db.courses import (
     update_course,
     update_user_role,
 )
+from promptgrimoire.db.crdt_updates import (
+    append_workspace_crdt_update,
+    compact_workspace_crdt_updates,
+    get_workspace_crdt_state,
+)
 from promptgrimoire.db.engine import close_db, get_engine, get_session, init_db
 from promptgrimoire.db.enrolment import (
     EnrolmentReport,
@@ -67,6 +72,7 @@ from promptgrimoire.db.exceptions import (
 from promptgrimoire.db.export_jobs import (
     claim_next_job,
     cleanup_expired_jobs,
+    cleanup_job_metrics,
     complete_job,
     create_export_job,
     fail_job,
@@ -74,6 +80,7 @@ from promptgrimoire.db.export_jobs import (
     get_active_job_for_user,
     get_job,
     get_job_by_token,
+    record_job_metric,
 )
 from promptgrimoire.db.models import (
     ACLEntry,
@@ -82,6 +89,7 @@ from promptgrimoire.db.models import (
     CourseEnrollment,
     CourseRoleRef,
     ExportJob,
+    ExportJobMetric,
     ExportJobStatus,
     Permission,
     Tag,
@@ -92,9 +100,16 @@ from promptgrimoire.db.models import (
     WargameTeam,
     Week,
     Workspace,
+    WorkspaceCRDTUpdate,
     WorkspaceDocument,
+    WorkspaceSearchFragment,
 )
+from promptgrimoire.db.notify import start_wakeup_listener
 from promptgrimoire.db.roles import get_staff_roles
+from promptgrimoire.db.search_fragments import (
+    SearchFragmentPatch,
+    refresh_search_text_from_fragments,
+)
 from promptgrimoire.db.tags import (
     create_tag,
     create_tag_group,
@@ -160,6 +175,7 @@ from promptgrimoire.db.workspaces import (
     place_workspace_in_activity,
     place_workspace_in_course,
     save_workspace_crdt_state,
+    save_workspace_crdt_states,
     update_workspace_sharing,
 )
 
@@ -176,12 +192,14 @@ __all__ = [
     "DuplicateNameError",
     "EnrolmentReport",
     "ExportJob",
+    "ExportJobMetric",
     "ExportJobStatus",
     "OwnershipError",
     "Permission",
     "PlacementContext",
     "ProtectedDocumentError",
     "RosterReport",
+    "SearchFragmentPatch",
     "SharePermissionError",
     "StudentIdConflictError",
     "Tag",
@@ -194,16 +212,21 @@ __all__ = [
     "WargameTeam",
     "Week",
     "Workspace",
+    "WorkspaceCRDTUpdate",
     "WorkspaceDocument",
+    "WorkspaceSearchFragment",
     "ZeroEditorError",
     "add_document",
+    "append_workspace_crdt_update",
     "archive_course",
     "bulk_enrol",
     "check_clone_eligibility",
     "claim_next_job",
     "cleanup_expired_jobs",
+    "cleanup_job_metrics",
     "clone_workspace_from_activity",
     "close_db",
+    "compact_workspace_crdt_updates",
     "complete_job",
     "create_activity",
     "create_course",
@@ -242,6 +265,7 @@ __all__ = [
     "get_user_by_stytch_id",
     "get_user_workspace_for_activity",
     "get_workspace",
+    "get_workspace_crdt_state",
     "grant_permission",
     "grant_share",
     "grant_team_permission",
@@ -273,6 +297,8 @@ __all__ = [
     "make_workspace_loose",
     "place_workspace_in_activity",
     "place_workspace_in_course",
+    "record_job_metric",
+    "refresh_search_text_from_fragments",
     "remove_team_member",
     "rename_team",
     "reorder_documents",
@@ -284,7 +310,9 @@ __all__ = [
     "revoke_team_permission",
     "run_alembic_upgrade",
     "save_workspace_crdt_state",
+    "save_workspace_crdt_states",
     "set_admin",
+    "start_wakeup_listener",
     "unenroll_user",
     "update_activity",
     "update_course",
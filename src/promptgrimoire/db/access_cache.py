@@ -0,0 +1,178 @@
+"""Short-TTL in-process cache for resolved permissions and ban state.
+
+``resolve_permission()`` and ``is_user_banned()`` answer from here when
+they can.  Entries expire after ``ACCESS_CACHE__PERMISSION_TTL_SECONDS``
+and ``ACCESS_CACHE__BAN_TTL_SECONDS``.  Mutations that change an answer
+also drop it explicitly:
+
+- ``set_banned()``: the user's ban state.
+- ``grant_permission()``, ``revoke_permission()``, ``grant_share()``:
+  the (workspace, user) permission.
+- Enrolment changes: every cached permission of the user.
+- ``update_workspace_sharing()``: every cached permission on the workspace.
+
+Other processes (CLI, export workers, a second server) learn about
+mutations through ``pg_notify`` on the wake-up channel (see
+``db/notify.py``).  The notification is queued in the mutating
+transaction, so it is delivered only on commit.  Course and activity
+setting changes are not tracked and take up to one TTL to apply.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
+
+from sqlalchemy import text
+
+from promptgrimoire.config import get_settings
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+INVALIDATION_PREFIX = "access:"
+
+# Invalidation kinds and the IDs each carries
+BAN = "ban"  # user_id
+PERMISSION = "acl"  # workspace_id, user_id
+USER_PERMISSIONS = "user"  # user_id
+WORKSPACE_PERMISSIONS = "workspace"  # workspace_id
+
+_MISSING = object()
+
+
+class _TTLCache:
+    """Dict of key -> (expiry, value) with hit/miss counters.
+
+    Values may be None, so lookups return ``_MISSING`` on a miss.  When
+    full, expired entries are swept first, then the oldest insertions go.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[Any, tuple[float, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self.misses += 1
+            return _MISSING
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Any, value: Any, ttl: float, max_entries: int) -> None:
+        now = time.monotonic()
+        if len(self._entries) >= max_entries:
+            self._entries = {k: e for k, e in self._entries.items() if e[0] > now}
+            while len(self._entries) >= max_entries:
+                del self._entries[next(iter(self._entries))]
+        self._entries[key] = (now + ttl, value)
+
+    def discard(self, key: Any) -> None:
+        self._entries.pop(key, None)
+
+    def discard_where(self, predicate: Callable[[Any], bool]) -> None:
+        for key in [k for k in self._entries if predicate(k)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_permissions = _TTLCache()  # (workspace_id, user_id) -> permission or None
+_bans = _TTLCache()  # user_id -> bool
+
+# Bumped by every invalidation.  A load that started before an
+# invalidation may have read the old row, so its result is not stored.
+_generation = 0
+
+
+async def _cached(
+    cache: _TTLCache,
+    key: Any,
+    ttl: float,
+    load: Callable[[], Awaitable[Any]],
+) -> Any:
+    if ttl <= 0:
+        return await load()
+    value = cache.get(key)
+    if value is not _MISSING:
+        return value
+    generation = _generation
+    value = await load()
+    if generation == _generation:
+        cache.put(key, value, ttl, get_settings().access_cache.max_entries)
+    return value
+
+
+async def cached_permission(
+    workspace_id: UUID,
+    user_id: UUID,
+    load: Callable[[], Awaitable[str | None]],
+) -> str | None:
+    """Return the cached permission, or call *load* and cache its result."""
+    ttl = get_settings().access_cache.permission_ttl_seconds
+    return await _cached(_permissions, (workspace_id, user_id), ttl, load)
+
+
+async def cached_ban(user_id: UUID, load: Callable[[], Awaitable[bool]]) -> bool:
+    """Return the cached ban state, or call *load* and cache its result."""
+    ttl = get_settings().access_cache.ban_ttl_seconds
+    return await _cached(_bans, user_id, ttl, load)
+
+
+def invalidate(kind: str, *ids: UUID) -> None:
+    """Drop cached entries in this process.
+
+    Call after the mutating transaction has committed, so a concurrent
+    load cannot re-cache the pre-commit value.  Unknown kinds are
+    ignored, like unknown wake-up topics.
+    """
+    global _generation  # noqa: PLW0603
+    _generation += 1
+    if kind == BAN:
+        _bans.discard(ids[0])
+    elif kind == PERMISSION:
+        _permissions.discard((ids[0], ids[1]))
+    elif kind == USER_PERMISSIONS:
+        _permissions.discard_where(lambda key: key[1] == ids[0])
+    elif kind == WORKSPACE_PERMISSIONS:
+        _permissions.discard_where(lambda key: key[0] == ids[0])
+
+
+def invalidate_all() -> None:
+    """Drop every cached entry (e.g. after missing notifications)."""
+    global _generation  # noqa: PLW0603
+    _generation += 1
+    _permissions.clear()
+    _bans.clear()
+
+
+async def queue_invalidation(session: AsyncSession, kind: str, *ids: UUID) -> None:
+    """NOTIFY other processes of an invalidation when *session* commits."""
+    # Deferred: notify imports this module
+    from promptgrimoire.db.notify import WAKEUP_CHANNEL  # noqa: PLC0415
+
+    payload = ":".join([INVALIDATION_PREFIX + kind, *(str(i) for i in ids)])
+    await session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": WAKEUP_CHANNEL, "payload": payload},
+    )
+
+
+def apply_invalidation(payload: str) -> None:
+    """Apply an ``access:<kind>:<id>[:<id>]`` notification payload."""
+    kind, *ids = payload.removeprefix(INVALIDATION_PREFIX).split(":")
+    invalidate(kind, *(UUID(i) for i in ids))
+
+
+def stats() -> dict[str, dict[str, int]]:
+    """Size and hit/miss counters for the diagnostic snapshot."""
+    return {"permission": _permissions.stats(), "ban": _bans.stats()}
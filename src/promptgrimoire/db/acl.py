@@ -13,6 +13,7 @@ import sqlalchemy as sa
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlmodel import select
 
+from promptgrimoire.db import access_cache
 from promptgrimoire.db.engine import get_session
 from promptgrimoire.db.exceptions import SharePermissionError
 from promptgrimoire.db.models import (
@@ -61,6 +62,9 @@ async def grant_permission(
         )
         await session.execute(stmt)
         await session.flush()
+        await access_cache.queue_invalidation(
+            session, access_cache.PERMISSION, workspace_id, user_id
+        )
 
         entry = await session.exec(
             select(ACLEntry).where(
@@ -68,7 +72,10 @@ async def grant_permission(
                 ACLEntry.user_id == user_id,
             )
         )
-        return entry.one()
+        granted = entry.one()
+
+    access_cache.invalidate(access_cache.PERMISSION, workspace_id, user_id)
+    return granted
 
 
 async def revoke_permission(
@@ -95,7 +102,11 @@ async def revoke_permission(
             return False
         await session.delete(row)
         await session.flush()
+        await access_cache.queue_invalidation(
+            session, access_cache.PERMISSION, workspace_id, user_id
+        )
 
+    access_cache.invalidate(access_cache.PERMISSION, workspace_id, user_id)
     if on_revoke is not None:
         await on_revoke(workspace_id, user_id)
 
@@ -361,12 +372,21 @@ async def resolve_permission(workspace_id: UUID, user_id: UUID) -> str | None:
     Admin bypass is NOT checked here -- that belongs at the page level
     via is_privileged_user().
 
+    Results are cached briefly per (workspace, user); see
+    ``db/access_cache.py`` for what invalidates them.
+
     Returns:
         Permission name string (e.g., "owner", "editor", "viewer") or None
         if denied.
     """
-    async with get_session() as session:
-        return await _resolve_permission_with_session(session, workspace_id, user_id)
+
+    async def load() -> str | None:
+        async with get_session() as session:
+            return await _resolve_permission_with_session(
+                session, workspace_id, user_id
+            )
+
+    return await access_cache.cached_permission(workspace_id, user_id, load)
 
 
 async def grant_share(
@@ -421,9 +441,15 @@ async def grant_share(
         await _validate_share_grantor(
             session, workspace_id, grantor_id, sharing_allowed, grantor_is_staff
         )
-        return await _upsert_share_entry(
+        entry = await _upsert_share_entry(
             session, workspace_id, recipient_id, permission
         )
+        await access_cache.queue_invalidation(
+            session, access_cache.PERMISSION, workspace_id, recipient_id
+        )
+
+    access_cache.invalidate(access_cache.PERMISSION, workspace_id, recipient_id)
+    return entry
 
 
 async def _validate_share_grantor(
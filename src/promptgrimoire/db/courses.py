@@ -11,6 +11,7 @@ from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
 
+from promptgrimoire.db import access_cache
 from promptgrimoire.db.engine import get_session
 from promptgrimoire.db.exceptions import DeletionBlockedError, DuplicateEnrollmentError
 from promptgrimoire.db.models import (
@@ -291,7 +292,10 @@ async def enroll_user(
         DuplicateEnrollmentError: If user is already enrolled in this course.
     """
     async with get_session() as session:
-        return await _enroll_user_with_session(session, course_id, user_id, role)
+        enrollment = await _enroll_user_with_session(session, course_id, user_id, role)
+
+    access_cache.invalidate(access_cache.USER_PERMISSIONS, user_id)
+    return enrollment
 
 
 async def _enroll_user_with_session(
@@ -302,6 +306,9 @@ async def _enroll_user_with_session(
 ) -> CourseEnrollment:
     """Enrol a user within a caller-owned session.
 
+    Queues a permission-cache invalidation for the user; it is delivered
+    when the caller commits.
+
     Raises:
         DuplicateEnrollmentError: If already enrolled.
     """
@@ -328,6 +335,9 @@ async def _enroll_user_with_session(
             raise DuplicateEnrollmentError(course_id, user_id) from e
         raise
     await session.refresh(enrollment)
+    await access_cache.queue_invalidation(
+        session, access_cache.USER_PERMISSIONS, user_id
+    )
     return enrollment
 
 
@@ -444,7 +454,12 @@ async def unenroll_user(
         if not enrollment:
             return False
         await session.delete(enrollment)
-        return True
+        await access_cache.queue_invalidation(
+            session, access_cache.USER_PERMISSIONS, user_id
+        )
+
+    access_cache.invalidate(access_cache.USER_PERMISSIONS, user_id)
+    return True
 
 
 async def update_user_role(
@@ -475,7 +490,12 @@ async def update_user_role(
         session.add(enrollment)
         await session.flush()
         await session.refresh(enrollment)
-        return enrollment
+        await access_cache.queue_invalidation(
+            session, access_cache.USER_PERMISSIONS, user_id
+        )
+
+    access_cache.invalidate(access_cache.USER_PERMISSIONS, user_id)
+    return enrollment
 
 
 _ZERO_WORKSPACE_SQL = """\
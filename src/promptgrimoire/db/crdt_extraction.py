@@ -3,11 +3,22 @@
 Provides the pure extraction function used by the search worker to
 populate workspace.search_text from CRDT state.  The actual FTS
 query lives in db/navigator.py (search_navigator).
+
+Extraction hydrates a bare ``pycrdt.Doc`` with only the root types it
+reads -- no ``AnnotationDocument``, Awareness, or observers -- so it is
+cheap enough to run for whole batches and safe to run in a worker
+process.
+
+Highlights are rendered with ``highlight_search_fragment`` so the full
+extraction matches what the live document maintains incrementally in
+``workspace_search_fragment``.
 """
 
 from __future__ import annotations
 
-from promptgrimoire.crdt.annotation_doc import AnnotationDocument
+from pycrdt import Doc, Map, Text
+
+from promptgrimoire.crdt.search_fragments import highlight_search_fragment
 
 
 def extract_searchable_text(
@@ -38,31 +49,29 @@ def extract_searchable_text(
     if crdt_state is None:
         return ""
 
-    doc = AnnotationDocument("extraction-tmp")
+    doc = Doc()
+    highlights = doc.get("highlights", type=Map)
+    response_draft = doc.get("response_draft_markdown", type=Text)
+    general_notes = doc.get("general_notes", type=Text)
     doc.apply_update(crdt_state)
 
     parts: list[str] = []
 
-    # Extract from highlights: text, resolved tags, comments
-    for highlight in doc.get_all_highlights():
-        if hl_text := highlight.get("text", ""):
-            parts.append(hl_text)
-
-        if tag := highlight.get("tag", ""):
-            parts.append(tag_names.get(tag, tag))
-
-        for comment in highlight.get("comments", []):
-            if comment_text := comment.get("text", ""):
-                parts.append(comment_text)
+    # Extract from highlights: text, comments, resolved tags.  Order is
+    # irrelevant to FTS, so highlights are not sorted by position.
+    for highlight in highlights.values():
+        fragment = highlight_search_fragment(highlight)
+        if fragment.content:
+            parts.append(fragment.content)
+        if fragment.tag:
+            parts.append(tag_names.get(fragment.tag, fragment.tag))
 
     # Response draft markdown (Tab 3)
-    response_draft = doc.get_response_draft_markdown()
-    if response_draft:
-        parts.append(response_draft)
+    if response_draft_text := str(response_draft):
+        parts.append(response_draft_text)
 
     # General notes
-    general_notes = doc.get_general_notes()
-    if general_notes:
-        parts.append(general_notes)
+    if general_notes_text := str(general_notes):
+        parts.append(general_notes_text)
 
     return "\n".join(parts)
@@ -0,0 +1,270 @@
+"""Append-only CRDT update log with background compaction.
+
+Debounced saves append the small incremental pycrdt update captured by
+``AnnotationDocument`` to ``workspace_crdt_update`` rather than rewriting
+the whole ``workspace.crdt_state`` blob.  The authoritative state of a
+workspace is therefore the snapshot column merged with its pending log
+rows in ``id`` order.  Compaction folds the log back into the snapshot.
+
+Readers that deserialise persisted CRDT state (registry load, deletion
+guards, search extraction, CLI export) must go through
+``load_crdt_state_with_session`` / ``get_workspace_crdt_state`` so they
+see updates that have not yet been compacted.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+import structlog
+from pycrdt import merge_updates
+from sqlalchemy import text
+
+from promptgrimoire.db.engine import get_session
+from promptgrimoire.db.search_fragments import write_search_fragments_with_session
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    from promptgrimoire.db.models import Workspace
+    from promptgrimoire.db.search_fragments import SearchFragmentPatch
+
+logger = structlog.get_logger()
+
+
+def merge_crdt_state(snapshot: bytes | None, updates: list[bytes]) -> bytes | None:
+    """Merge a snapshot with pending incremental updates.
+
+    Pure function: no Doc is constructed, the updates are merged at the
+    binary level by ``pycrdt.merge_updates``.
+
+    Args:
+        snapshot: Persisted ``workspace.crdt_state`` bytes, or None.
+        updates: Pending update bytes in replay order.
+
+    Returns:
+        A single update equivalent to applying the snapshot followed by
+        every update, or ``snapshot`` unchanged when there are no updates.
+    """
+    if not updates:
+        return snapshot
+    parts = [snapshot, *updates] if snapshot else list(updates)
+    if len(parts) == 1:
+        return parts[0]
+    return merge_updates(*parts)
+
+
+async def load_pending_crdt_updates(
+    session: AsyncSession, workspace_id: UUID
+) -> list[tuple[int, bytes]]:
+    """Return ``(id, update)`` pairs for a workspace's uncompacted updates."""
+    result = await session.execute(
+        text(
+            'SELECT id, "update" FROM workspace_crdt_update '
+            "WHERE workspace_id = :ws_id ORDER BY id"
+        ),
+        {"ws_id": workspace_id},
+    )
+    return [(row[0], bytes(row[1])) for row in result.fetchall()]
+
+
+async def load_crdt_state_with_session(
+    session: AsyncSession, workspace: Workspace
+) -> tuple[bytes | None, int | None]:
+    """Return the merged CRDT state for a workspace inside *session*.
+
+    Returns:
+        ``(state, last_update_id)`` where *state* is the snapshot merged
+        with all pending log rows (None if the workspace has never been
+        persisted) and *last_update_id* is the highest log row folded in,
+        or None if the log was empty.  Pass *last_update_id* to
+        ``discard_crdt_updates_with_session`` after writing a new
+        snapshot derived from *state*.
+    """
+    pending = await load_pending_crdt_updates(session, workspace.id)
+    if not pending:
+        return workspace.crdt_state, None
+    state = merge_crdt_state(workspace.crdt_state, [u for _id, u in pending])
+    return state, pending[-1][0]
+
+
+async def discard_crdt_updates_with_session(
+    session: AsyncSession,
+    workspace_id: UUID,
+    up_to_id: int | None = None,
+) -> None:
+    """Delete log rows superseded by a freshly written snapshot.
+
+    Args:
+        session: Session in which the snapshot was written.
+        workspace_id: The workspace UUID.
+        up_to_id: Delete only rows with ``id <= up_to_id``.  None deletes
+            every row -- only correct when the snapshot came from the live
+            in-memory document, which already contains every logged update.
+    """
+    if up_to_id is None:
+        await session.execute(
+            text("DELETE FROM workspace_crdt_update WHERE workspace_id = :ws_id"),
+            {"ws_id": workspace_id},
+        )
+        return
+    await session.execute(
+        text(
+            "DELETE FROM workspace_crdt_update "
+            "WHERE workspace_id = :ws_id AND id <= :up_to_id"
+        ),
+        {"ws_id": workspace_id, "up_to_id": up_to_id},
+    )
+
+
+async def get_workspace_crdt_state(workspace_id: UUID) -> bytes | None:
+    """Load a workspace's CRDT state including uncompacted updates.
+
+    Args:
+        workspace_id: The workspace UUID.
+
+    Returns:
+        Merged state bytes, or None if the workspace does not exist or
+        has no persisted CRDT state.
+    """
+    from promptgrimoire.db.models import Workspace  # noqa: PLC0415
+
+    async with get_session() as session:
+        workspace = await session.get(Workspace, workspace_id)
+        if workspace is None:
+            return None
+        state, _last_id = await load_crdt_state_with_session(session, workspace)
+        return state
+
+
+async def list_pending_crdt_updates(workspace_id: UUID) -> list[bytes]:
+    """Return a workspace's uncompacted update bytes in replay order.
+
+    For callers that already hold the ``Workspace`` row (and its snapshot)
+    from an earlier query and only need the log on top.
+    """
+    async with get_session() as session:
+        pending = await load_pending_crdt_updates(session, workspace_id)
+    return [u for _id, u in pending]
+
+
+async def append_workspace_crdt_update(
+    workspace_id: UUID,
+    update: bytes,
+    *,
+    search: SearchFragmentPatch | None = None,
+) -> bool:
+    """Append an incremental CRDT update to the workspace log.
+
+    Also bumps ``updated_at`` and flags the workspace for search exactly
+    as a full snapshot save does, so downstream consumers cannot tell the
+    difference.
+
+    Args:
+        workspace_id: The workspace UUID.
+        update: Serialized pycrdt update bytes.
+        search: Search fragment changes from the live document.  When
+            given they are written in the same transaction instead of
+            setting ``search_dirty``.
+
+    Returns:
+        True if the workspace exists and the update was logged.
+    """
+    async with get_session() as session:
+        result = await session.execute(
+            text(
+                "UPDATE workspace "
+                "SET updated_at = :now, search_dirty = search_dirty OR :full "
+                "WHERE id = :ws_id RETURNING id"
+            ),
+            {"ws_id": workspace_id, "now": datetime.now(UTC), "full": search is None},
+        )
+        if result.first() is None:
+            return False
+        await session.execute(
+            text(
+                "INSERT INTO workspace_crdt_update "
+                '  (workspace_id, "update", created_at) '
+                "VALUES (:ws_id, :update, :now)"
+            ),
+            {"ws_id": workspace_id, "update": update, "now": datetime.now(UTC)},
+        )
+        if search is not None:
+            await write_search_fragments_with_session(session, workspace_id, search)
+        return True
+
+
+async def _compact_one(workspace_id: UUID) -> int:
+    """Fold one workspace's log into its snapshot.  Returns rows folded.
+
+    Takes a row lock on the workspace first so a concurrent full snapshot
+    save cannot be overwritten by an older snapshot-plus-log merge.
+    """
+    async with get_session() as session:
+        row = (
+            await session.execute(
+                text("SELECT crdt_state FROM workspace WHERE id = :ws_id FOR UPDATE"),
+                {"ws_id": workspace_id},
+            )
+        ).first()
+        if row is None:
+            return 0
+        pending = await load_pending_crdt_updates(session, workspace_id)
+        if not pending:
+            return 0
+        snapshot = bytes(row[0]) if row[0] is not None else None
+        merged = merge_crdt_state(snapshot, [u for _id, u in pending])
+        await session.execute(
+            text("UPDATE workspace SET crdt_state = :state WHERE id = :ws_id"),
+            {"state": merged, "ws_id": workspace_id},
+        )
+        await discard_crdt_updates_with_session(
+            session, workspace_id, up_to_id=pending[-1][0]
+        )
+        return len(pending)
+
+
+async def compact_workspace_crdt_updates(
+    *, min_updates: int = 1, limit: int = 100
+) -> int:
+    """Fold pending log rows into ``workspace.crdt_state``.
+
+    Args:
+        min_updates: Only compact workspaces with at least this many
+            pending updates.
+        limit: Maximum workspaces to compact per call.
+
+    Returns:
+        Number of workspaces compacted.
+    """
+    async with get_session() as session:
+        result = await session.execute(
+            text(
+                "SELECT workspace_id FROM workspace_crdt_update "
+                "GROUP BY workspace_id "
+                "HAVING count(*) >= :min_updates "
+                "ORDER BY min(id) "
+                "LIMIT :limit"
+            ),
+            {"min_updates": min_updates, "limit": limit},
+        )
+        workspace_ids = [row[0] for row in result.fetchall()]
+
+    compacted = 0
+    for workspace_id in workspace_ids:
+        try:
+            folded = await _compact_one(workspace_id)
+        except Exception:
+            logger.exception(
+                "Failed to compact CRDT update log for workspace %s", workspace_id
+            )
+            continue
+        if folded:
+            compacted += 1
+            logger.debug(
+                "crdt_log_compacted", workspace_id=str(workspace_id), updates=folded
+            )
+    return compacted
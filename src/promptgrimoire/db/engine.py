@@ -15,7 +15,7 @@ from typing import TYPE_CHECKING
 import structlog
 from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, QueuePool
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from promptgrimoire.config import get_settings
@@ -268,6 +268,24 @@ async def log_pool_and_pg_stats() -> None:
         _pool_logger.warning("Failed to query pg_stat views", exc_info=True)
 
 
+def pool_usage() -> dict[str, int] | None:
+    """Return checked-out connections against pool capacity.
+
+    Capacity is ``pool_size + max_overflow``.  Returns None before
+    ``init_db()`` and under ``NullPool``, which has no fixed capacity.
+    """
+    if _state.engine is None:
+        return None
+    pool = _state.engine.sync_engine.pool
+    if not isinstance(pool, QueuePool):
+        return None
+    return {
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "capacity": pool.size() + pool._max_overflow,
+    }
+
+
 async def close_db() -> None:
     """Close database connections.
 
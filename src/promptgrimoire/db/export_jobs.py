@@ -1,7 +1,8 @@
 """CRUD operations for ExportJob.
 
 Provides async database functions for the PDF export queue:
-enqueue, claim (FOR UPDATE SKIP LOCKED), complete, fail, and cleanup.
+enqueue, claim (FOR UPDATE SKIP LOCKED), complete, fail, and cleanup,
+plus per-job worker metrics.
 """
 
 from __future__ import annotations
@@ -19,7 +20,7 @@ from sqlmodel import col, select
 
 from promptgrimoire.db.engine import get_session
 from promptgrimoire.db.exceptions import BusinessLogicError
-from promptgrimoire.db.models import ExportJob
+from promptgrimoire.db.models import ExportJob, ExportJobMetric
 
 if TYPE_CHECKING:
     from uuid import UUID
@@ -265,3 +266,22 @@ async def cleanup_expired_jobs(cutoff: datetime) -> int:
             )
 
     return count
+
+
+async def record_job_metric(metric: ExportJobMetric) -> None:
+    """Store per-stage timings and memory use for a processed job."""
+    async with get_session() as session:
+        session.add(metric)
+
+
+async def cleanup_job_metrics(cutoff: datetime) -> int:
+    """Delete export metrics recorded before *cutoff*.
+
+    Returns the count of deleted rows.
+    """
+    async with get_session() as session:
+        stmt = sa.delete(ExportJobMetric).where(
+            col(ExportJobMetric.created_at) < cutoff,
+        )
+        result = await session.exec(stmt)
+        return result.rowcount
@@ -591,6 +591,9 @@ class Workspace(SQLModel, table=True):
     )
     next_tag_order: int = Field(default=0)
     next_group_order: int = Field(default=0)
+    # Bumped by every tag/group mutation in db/tags.py; lets the CRDT
+    # registry skip tag reconciliation when nothing has changed.
+    tag_version: int = Field(default=0)
     enable_save_as_draft: bool = Field(default=False)
     title: str | None = Field(default=None, sa_column=Column(sa.Text(), nullable=True))
     shared_with_class: bool = Field(default=False)
@@ -604,6 +607,13 @@ class Workspace(SQLModel, table=True):
         default=True,
         sa_column=Column(sa.Boolean(), nullable=False, server_default="true"),
     )
+    # Set when a live document has patched WorkspaceSearchFragment rows;
+    # the search worker re-aggregates search_text from the fragments
+    # without deserialising the CRDT state.
+    search_fragments_dirty: bool = Field(
+        default=False,
+        sa_column=Column(sa.Boolean(), nullable=False, server_default="false"),
+    )
     created_at: datetime = Field(
         default_factory=_utcnow, sa_column=_timestamptz_column()
     )
@@ -620,6 +630,73 @@ class Workspace(SQLModel, table=True):
         return self
 
 
+class WorkspaceCRDTUpdate(SQLModel, table=True):
+    """Append-only log of incremental CRDT updates for a workspace.
+
+    Debounced saves append the small pycrdt update produced since the
+    previous save instead of rewriting ``Workspace.crdt_state``.  Rows are
+    folded into the snapshot column by compaction and then deleted, so the
+    authoritative state is always ``crdt_state`` merged with the rows here
+    in ``id`` order.
+
+    Attributes:
+        id: Monotonic bigint primary key (defines replay order).
+        workspace_id: FK to Workspace (CASCADE DELETE).
+        update: Serialized pycrdt update bytes.
+        created_at: Timestamp when the update was appended.
+    """
+
+    __tablename__ = "workspace_crdt_update"
+    __table_args__ = (
+        sa.Index("ix_workspace_crdt_update_workspace_id", "workspace_id", "id"),
+    )
+
+    id: int | None = Field(
+        default=None,
+        sa_column=Column(sa.BigInteger(), primary_key=True, autoincrement=True),
+    )
+    workspace_id: UUID = Field(sa_column=_cascade_fk_column("workspace.id"))
+    update: bytes = Field(sa_column=Column(sa.LargeBinary(), nullable=False))
+    created_at: datetime = Field(
+        default_factory=_utcnow, sa_column=_timestamptz_column()
+    )
+
+
+class WorkspaceSearchFragment(SQLModel, table=True):
+    """Searchable text of one part of a workspace's CRDT document.
+
+    Written by the live ``AnnotationDocument`` as highlights, comments and
+    text fields change, so ``Workspace.search_text`` can be rebuilt by
+    concatenating fragments instead of re-extracting the whole document.
+    Tag names are resolved at aggregation time from ``tag``.
+
+    Attributes:
+        workspace_id: FK to Workspace (CASCADE DELETE).
+        fragment_key: ``highlight:<id>``, ``response_draft_markdown`` or
+            ``general_notes``.
+        content: Extracted text (highlight text and comments, or field text).
+        tag: Highlight tag UUID string (or legacy tag name), if any.
+    """
+
+    __tablename__ = "workspace_search_fragment"
+
+    workspace_id: UUID = Field(
+        sa_column=Column(
+            Uuid(),
+            ForeignKey("workspace.id", ondelete="CASCADE"),
+            primary_key=True,
+            nullable=False,
+        )
+    )
+    fragment_key: str = Field(
+        sa_column=Column(String(80), primary_key=True, nullable=False)
+    )
+    content: str = Field(
+        default="", sa_column=Column(sa.Text(), nullable=False, server_default="")
+    )
+    tag: str | None = Field(default=None, sa_column=Column(sa.Text(), nullable=True))
+
+
 class WorkspaceDocument(SQLModel, table=True):
     """A document within a workspace (source text, draft, AI conversation, etc.).
 
@@ -636,6 +713,9 @@ class WorkspaceDocument(SQLModel, table=True):
             mode (AustLII documents with ``<li value>`` attributes).
         paragraph_map: Maps char-offset (string key) to paragraph number. Empty dict
             is the safe default for documents without a computed map.
+        text_index: Packed text-node offset index of the export HTML (see
+            ``export.text_index``), rebuilt whenever ``content`` is written.
+            NULL means exports fall back to walking the DOM.
         source_document_id: Nullable FK to the template document this was
             cloned from. NULL for user-uploaded documents or when the
             source is deleted (ON DELETE SET NULL).
@@ -661,6 +741,9 @@ class WorkspaceDocument(SQLModel, table=True):
         default_factory=dict,
         sa_column=Column(sa.JSON(), nullable=False, server_default="{}"),
     )
+    text_index: bytes | None = Field(
+        default=None, sa_column=Column(sa.LargeBinary(), nullable=True)
+    )
     source_document_id: UUID | None = Field(
         default=None,
         sa_column=_set_null_fk_column("workspace_document.id"),
@@ -893,6 +976,33 @@ class ExportJob(SQLModel, table=True):
     )
 
 
+class ExportJobMetric(SQLModel, table=True):
+    """Per-job timings and memory use recorded by the export worker.
+
+    One row per processed job.  ``job_id`` is set to NULL when the job is
+    cleaned up so capacity history outlives the 24-hour job retention.
+    Stage columns are NULL when the job failed before reaching the stage.
+    """
+
+    __tablename__ = "export_job_metric"
+    __table_args__ = (sa.Index("ix_export_job_metric_created_at", "created_at"),)
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    job_id: UUID | None = Field(
+        default=None, sa_column=_set_null_fk_column("export_job.id")
+    )
+    worker_pid: int
+    outcome: str = Field(max_length=20)
+    pandoc_convert_ms: int | None = None
+    tex_generate_ms: int | None = None
+    latex_compile_ms: int | None = None
+    total_ms: int
+    rss_mb: int | None = None
+    created_at: datetime = Field(
+        default_factory=_utcnow, sa_column=_timestamptz_column()
+    )
+
+
 class StudentGroupMembership(SQLModel, table=True):
     """Maps a User to a StudentGroup."""
 
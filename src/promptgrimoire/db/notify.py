@@ -0,0 +1,172 @@
+"""PostgreSQL LISTEN/NOTIFY wake-ups for background workers.
+
+Database triggers (migration e6f1a4b8c3d2) call ``pg_notify`` on
+:data:`WAKEUP_CHANNEL` with a topic payload whenever work is queued:
+
+- ``search``: ``workspace.search_dirty`` or ``search_fragments_dirty``
+  becomes true.
+- ``export``: an ``export_job`` row is inserted.
+- ``deadline``: ``wargame_team.current_deadline`` is set or changed.
+
+Payloads starting with ``access:`` are permission/ban cache
+invalidations queued by application code (see ``db/access_cache.py``)
+and are applied to the cache instead of waking a worker.
+
+One dedicated connection per process LISTENs on the channel and sets a
+per-topic event.  Workers call :func:`wait_for_wakeup` where they used to
+``asyncio.sleep``; the timeout stays as a safety-net poll, so a missed
+notification (listener reconnecting, no listener in this process) only
+delays work to the old polling interval.
+
+LISTEN needs a session-scoped connection.  Behind PgBouncer in
+transaction mode, point ``DATABASE__LISTEN_URL`` at PostgreSQL directly.
+NOTIFY itself is transactional and works through any pooler.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import weakref
+
+import asyncpg
+import structlog
+
+from promptgrimoire.config import get_settings
+from promptgrimoire.db import access_cache
+from promptgrimoire.db.engine import get_database_url
+
+logger = structlog.get_logger()
+
+WAKEUP_CHANNEL = "promptgrimoire_wakeup"
+
+SEARCH_TOPIC = "search"
+EXPORT_TOPIC = "export"
+DEADLINE_TOPIC = "deadline"
+WAKEUP_TOPICS = (SEARCH_TOPIC, EXPORT_TOPIC, DEADLINE_TOPIC)
+
+# asyncio.Event binds to the loop it first blocks on, so events are kept
+# per loop (tests run each case on a fresh loop).
+_events: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, asyncio.Event]
+] = weakref.WeakKeyDictionary()
+
+
+def _event(topic: str) -> asyncio.Event:
+    loop = asyncio.get_running_loop()
+    return _events.setdefault(loop, {}).setdefault(topic, asyncio.Event())
+
+
+def signal_wakeup(topic: str) -> None:
+    """Wake any local worker waiting on *topic*.
+
+    Unknown topics are accepted so a newer schema can add triggers
+    before every process knows about them.
+    """
+    _event(topic).set()
+
+
+async def wait_for_wakeup(topic: str, timeout: float) -> bool:
+    """Wait up to *timeout* seconds for a wake-up on *topic*.
+
+    Returns:
+        True if woken by a notification, False if the timeout elapsed.
+    """
+    event = _event(topic)
+    with contextlib.suppress(TimeoutError):
+        async with asyncio.timeout(timeout):
+            await event.wait()
+    woken = event.is_set()
+    event.clear()
+    return woken
+
+
+def _listen_dsn() -> str:
+    """Return a libpq-style DSN for the LISTEN connection."""
+    url = get_settings().database.listen_url or get_database_url()
+    # asyncpg.connect() takes plain postgresql:// DSNs, not SQLAlchemy URLs.
+    return url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+def _on_notification(_conn: object, _pid: int, _channel: str, payload: object) -> None:
+    topic = str(payload)
+    if not topic.startswith(access_cache.INVALIDATION_PREFIX):
+        signal_wakeup(topic)
+        return
+    try:
+        access_cache.apply_invalidation(topic)
+    except ValueError, IndexError:
+        # A payload this process cannot parse: drop everything rather
+        # than risk keeping the entry it meant to invalidate.
+        logger.warning("access_invalidation_unparsed", payload=topic)
+        access_cache.invalidate_all()
+
+
+async def _await_connection_loss(
+    conn: asyncpg.Connection, lost: asyncio.Event, keepalive_interval: float
+) -> None:
+    """Return once *lost* is set, probing *conn* while it sits idle."""
+    while not lost.is_set():
+        with contextlib.suppress(TimeoutError):
+            async with asyncio.timeout(keepalive_interval):
+                await lost.wait()
+        if not lost.is_set():
+            # Half-open TCP connections never fire the termination
+            # listener; a round trip surfaces them as errors.
+            await conn.fetchval("SELECT 1")
+
+
+async def _listen_until_lost(keepalive_interval: float) -> None:
+    """Connect, LISTEN on :data:`WAKEUP_CHANNEL` until the connection drops.
+
+    Wakes all topics and clears the access cache once listening, since
+    notifications sent before then are lost.  Connection and probe
+    failures propagate; the connection is always closed.
+    """
+    conn = await asyncpg.connect(_listen_dsn())
+    try:
+        lost = asyncio.Event()
+        conn.add_termination_listener(lambda _c, lost=lost: lost.set())
+        await conn.add_listener(WAKEUP_CHANNEL, _on_notification)
+        logger.info("wakeup_listener_connected", channel=WAKEUP_CHANNEL)
+        for topic in WAKEUP_TOPICS:
+            signal_wakeup(topic)
+        access_cache.invalidate_all()
+        await _await_connection_loss(conn, lost, keepalive_interval)
+    finally:
+        if not conn.is_closed():
+            conn.terminate()
+
+
+async def start_wakeup_listener(
+    reconnect_delay: float = 5.0,
+    keepalive_interval: float = 60.0,
+) -> None:
+    """Hold a LISTEN connection and fan notifications out to local workers.
+
+    Reconnects after ``reconnect_delay`` seconds on failure.  Every
+    (re)connect wakes all topics and clears the access cache because
+    notifications sent while disconnected are lost.
+
+    Parameters
+    ----------
+    reconnect_delay : float
+        Seconds to wait before reconnecting after a failure.
+    keepalive_interval : float
+        Seconds between liveness probes on an idle connection.
+    """
+    logger.info("wakeup_listener_started", channel=WAKEUP_CHANNEL)
+    while True:
+        try:
+            await _listen_until_lost(keepalive_interval)
+            logger.warning("wakeup_listener_disconnected")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning(
+                "wakeup_listener_failed",
+                retry_in=reconnect_delay,
+                exc_info=True,
+            )
+        # Workers fall back to polling until the listener is back.
+        await asyncio.sleep(reconnect_delay)
@@ -0,0 +1,164 @@
+"""Incrementally maintained search fragments for workspace FTS.
+
+Live documents patch ``workspace_search_fragment`` rows as part of each
+CRDT save and set ``workspace.search_fragments_dirty`` instead of
+``search_dirty``.  The search worker then rebuilds ``search_text`` for
+those workspaces by concatenating fragments in SQL -- no CRDT state is
+deserialised.  Writes made without a live document (CLI, migrations,
+cloning) still set ``search_dirty`` and go through full extraction.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from sqlalchemy import text
+
+from promptgrimoire.db.engine import get_session
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    from promptgrimoire.crdt.search_fragments import SearchFragment
+
+
+@dataclass(frozen=True)
+class SearchFragmentPatch:
+    """Fragment changes captured by a live document since its last save.
+
+    Attributes:
+        fragments: Fragment key to new fragment; None deletes the row.
+        replace: Delete every existing fragment first (first save after
+            the document was loaded, or after a failed patch).
+    """
+
+    fragments: dict[str, SearchFragment | None]
+    replace: bool = False
+
+    @property
+    def has_changes(self) -> bool:
+        """True when applying the patch can change ``search_text``."""
+        return self.replace or bool(self.fragments)
+
+
+async def write_search_fragments_with_session(
+    session: AsyncSession, workspace_id: UUID, patch: SearchFragmentPatch
+) -> None:
+    """Apply *patch* to a workspace's fragments inside *session*.
+
+    Callers must already hold the workspace row lock (by updating the
+    row first) so the worker never aggregates a half-applied patch.
+    """
+    if not patch.has_changes:
+        return
+
+    if patch.replace:
+        await session.execute(
+            text("DELETE FROM workspace_search_fragment WHERE workspace_id = :ws_id"),
+            {"ws_id": workspace_id},
+        )
+    else:
+        removed = [key for key, frag in patch.fragments.items() if frag is None]
+        if removed:
+            await session.execute(
+                text(
+                    "DELETE FROM workspace_search_fragment "
+                    "WHERE workspace_id = :ws_id AND fragment_key = ANY(:keys)"
+                ),
+                {"ws_id": workspace_id, "keys": removed},
+            )
+
+    params: dict[str, object] = {"ws_id": workspace_id}
+    rows: list[str] = []
+    for i, (key, frag) in enumerate(patch.fragments.items()):
+        if frag is None:
+            continue
+        rows.append(f"(:ws_id, :key_{i}, :content_{i}, :tag_{i})")
+        params |= {f"key_{i}": key, f"content_{i}": frag.content, f"tag_{i}": frag.tag}
+    if rows:
+        await session.execute(
+            text(
+                "INSERT INTO workspace_search_fragment "
+                "  (workspace_id, fragment_key, content, tag) "
+                f"VALUES {', '.join(rows)} "
+                "ON CONFLICT (workspace_id, fragment_key) DO UPDATE "
+                "SET content = EXCLUDED.content, tag = EXCLUDED.tag"
+            ),
+            params,
+        )
+
+    await session.execute(
+        text("UPDATE workspace SET search_fragments_dirty = true WHERE id = :ws_id"),
+        {"ws_id": workspace_id},
+    )
+
+
+async def mark_tag_names_changed_with_session(
+    session: AsyncSession, workspace_id: UUID
+) -> None:
+    """Queue a ``search_text`` rebuild after a tag was renamed or deleted.
+
+    Fragments store raw tag UUIDs and names are resolved at aggregation
+    time, so re-aggregating is enough.  Workspaces without fragment rows
+    have never been patched and fall back to full extraction.
+    """
+    await session.execute(
+        text(
+            "UPDATE workspace w SET "
+            "  search_fragments_dirty = w.search_fragments_dirty OR f.has_rows, "
+            "  search_dirty = w.search_dirty OR NOT f.has_rows "
+            "FROM (SELECT EXISTS ("
+            "  SELECT 1 FROM workspace_search_fragment "
+            "  WHERE workspace_id = :ws_id) AS has_rows) f "
+            "WHERE w.id = :ws_id"
+        ),
+        {"ws_id": workspace_id},
+    )
+
+
+async def refresh_search_text_from_fragments(batch_size: int = 500) -> int:
+    """Rebuild ``search_text`` from fragments for patched workspaces.
+
+    Only workspaces with ``search_fragments_dirty`` and without
+    ``search_dirty`` are handled; the latter need full extraction.  Tag
+    UUIDs are resolved to names here, falling back to the raw value for
+    legacy tags, and titles are prepended as in full extraction.
+
+    Args:
+        batch_size: Maximum number of workspaces to refresh per call.
+
+    Returns:
+        Count of workspaces refreshed.
+    """
+    async with get_session() as session:
+        # Locking the rows serialises against concurrent fragment patches,
+        # which update the workspace row before touching fragments.
+        result = await session.execute(
+            text(
+                "WITH target AS ("
+                "  SELECT id FROM workspace "
+                "  WHERE search_fragments_dirty = true AND search_dirty = false "
+                "  LIMIT :batch_size FOR UPDATE SKIP LOCKED"
+                ") "
+                "UPDATE workspace w SET "
+                "  search_fragments_dirty = false, "
+                "  search_text = concat_ws(E'\\n', "
+                "    NULLIF(trim(COALESCE(w.title, '') || ' ' || COALESCE("
+                "      (SELECT a.title FROM activity a WHERE a.id = w.activity_id),"
+                "      '')), ''), "
+                "    (SELECT string_agg(concat_ws(E'\\n', "
+                "         NULLIF(f.content, ''), COALESCE(t.name, f.tag)), "
+                "         E'\\n' ORDER BY f.fragment_key) "
+                "       FROM workspace_search_fragment f "
+                "       LEFT JOIN tag t "
+                "         ON t.workspace_id = f.workspace_id AND t.id::text = f.tag "
+                "      WHERE f.workspace_id = w.id)) "
+                "FROM target WHERE w.id = target.id "
+                "RETURNING w.id"
+            ),
+            {"batch_size": batch_size},
+        )
+        return len(result.fetchall())
@@ -29,6 +29,7 @@ from promptgrimoire.db.exceptions import (
     TagLockedError,
 )
 from promptgrimoire.db.models import Tag, TagGroup
+from promptgrimoire.db.search_fragments import mark_tag_names_changed_with_session
 
 logger = structlog.get_logger()
 if TYPE_CHECKING:
@@ -88,6 +89,29 @@ async def _check_tag_creation_permission(workspace_id: UUID) -> None:
         raise TagCreationDeniedError(msg)
 
 
+async def _bump_tag_version(session: AsyncSession, workspace_id: UUID) -> None:
+    """Mark the workspace's tag set as changed.
+
+    Every tag/group mutation calls this in its own transaction so that
+    ``AnnotationDocumentRegistry`` can tell whether a cached CRDT doc
+    still matches the DB without re-listing tags.
+    """
+    await session.execute(
+        text("UPDATE workspace SET tag_version = tag_version + 1 WHERE id = :ws_id"),
+        {"ws_id": str(workspace_id)},
+    )
+
+
+async def get_workspace_tag_version(workspace_id: UUID) -> int | None:
+    """Return the workspace's tag version stamp, or None if not found."""
+    async with get_session() as session:
+        result = await session.execute(
+            text("SELECT tag_version FROM workspace WHERE id = :ws_id"),
+            {"ws_id": str(workspace_id)},
+        )
+        return result.scalar_one_or_none()
+
+
 # ── TagGroup CRUD ────────────────────────────────────────────────────
 
 
@@ -123,7 +147,8 @@ async def create_tag_group(
     async with get_session() as session:
         result = await session.execute(
             text(
-                "UPDATE workspace SET next_group_order = next_group_order + 1 "
+                "UPDATE workspace SET next_group_order = next_group_order + 1, "
+                "tag_version = tag_version + 1 "
                 "WHERE id = :ws_id RETURNING next_group_order - 1"
             ),
             {"ws_id": str(workspace_id)},
@@ -238,6 +263,7 @@ async def update_tag_group(
             group.color = color  # type: ignore[assignment]  -- sentinel pattern
 
         session.add(group)
+        await _bump_tag_version(session, group.workspace_id)
         duplicate = await _flush_or_detect_duplicate(
             session,
             "uq_tag_group_workspace_name",
@@ -286,6 +312,7 @@ async def delete_tag_group(
         if tag_count > 0:
             raise HasChildTagsError(group_id, tag_count)
 
+        await _bump_tag_version(session, group.workspace_id)
         await session.delete(group)
 
     if crdt_doc is not None:
@@ -354,7 +381,8 @@ async def create_tag(
     async with get_session() as session:
         result = await session.execute(
             text(
-                "UPDATE workspace SET next_tag_order = next_tag_order + 1 "
+                "UPDATE workspace SET next_tag_order = next_tag_order + 1, "
+                "tag_version = tag_version + 1 "
                 "WHERE id = :ws_id RETURNING next_tag_order - 1"
             ),
             {"ws_id": str(workspace_id)},
@@ -518,6 +546,9 @@ async def update_tag(
         )
 
         session.add(tag)
+        await _bump_tag_version(session, tag.workspace_id)
+        if name is not ...:
+            await mark_tag_names_changed_with_session(session, tag.workspace_id)
         duplicate_name = await _flush_or_detect_duplicate(
             session,
             "uq_tag_workspace_name",
@@ -559,9 +590,10 @@ async def delete_tag(
     intentional to avoid holding a transaction across the CRDT serialisation.
 
     Guard behaviour: The highlight count is read from the persisted CRDT
-    state inside the first session. If ``crdt_state`` is None (workspace
-    has no persisted annotations), the guard is skipped and deletion
-    proceeds directly to CRDT cleanup and row deletion.
+    state (snapshot plus pending update log) inside the first session. If
+    there is no persisted state (workspace has no annotations), the guard
+    is skipped and deletion proceeds directly to CRDT cleanup and row
+    deletion.
     """
     async with get_session() as session:
         tag = await session.get(Tag, tag_id)
@@ -579,17 +611,22 @@ async def delete_tag(
         from promptgrimoire.db.models import Workspace
 
         workspace = await session.get(Workspace, workspace_id)
-        if workspace and workspace.crdt_state:
+        guard_state = None
+        if workspace:
+            from promptgrimoire.db.crdt_updates import load_crdt_state_with_session
+
+            guard_state, _last_id = await load_crdt_state_with_session(
+                session, workspace
+            )
+        if guard_state:
             from promptgrimoire.crdt.annotation_doc import (
                 AnnotationDocument as AnnotationDocumentCls,
             )
 
             guard_doc = AnnotationDocumentCls("guard-tmp")
-            guard_doc.apply_update(workspace.crdt_state)
+            guard_doc.apply_update(guard_state)
             tag_str = str(tag_id_for_cleanup)
-            highlight_count = sum(
-                1 for hl in guard_doc.get_all_highlights() if hl.get("tag") == tag_str
-            )
+            highlight_count = len(guard_doc.get_highlight_ids_with_tag(tag_str))
             if highlight_count > 0:
                 raise HasHighlightsError(tag_id_for_cleanup, highlight_count)
 
@@ -602,6 +639,8 @@ async def delete_tag(
     async with get_session() as session:
         tag_row = await session.get(Tag, tag_id_for_cleanup)
         if tag_row:
+            await _bump_tag_version(session, tag_row.workspace_id)
+            await mark_tag_names_changed_with_session(session, tag_row.workspace_id)
             await session.delete(tag_row)
             return True
     return False
@@ -692,7 +731,10 @@ async def reorder_tags(
 
         # Sync counter so next create_tag() uses the correct index
         await session.execute(
-            text("UPDATE workspace SET next_tag_order = :count WHERE id = :ws_id"),
+            text(
+                "UPDATE workspace SET next_tag_order = :count, "
+                "tag_version = tag_version + 1 WHERE id = :ws_id"
+            ),
             {"count": len(tag_ids), "ws_id": str(workspace_id)},
         )
 
@@ -736,7 +778,10 @@ async def reorder_tag_groups(
 
         # Sync counter so next create_tag_group() uses the correct index
         await session.execute(
-            text("UPDATE workspace SET next_group_order = :count WHERE id = :ws_id"),
+            text(
+                "UPDATE workspace SET next_group_order = :count, "
+                "tag_version = tag_version + 1 WHERE id = :ws_id"
+            ),
             {"count": len(group_ids), "ws_id": str(workspace_id)},
         )
 
@@ -952,6 +997,8 @@ async def import_tags_from_workspace(
         )
 
         # Counter bumps
+        if result_obj.created_groups or result_obj.created_tags:
+            await _bump_tag_version(session, target_workspace_id)
         if result_obj.created_groups:
             await session.execute(
                 text(
@@ -1035,9 +1082,7 @@ def _cleanup_crdt_highlights_on_doc(
     back to DB -- the persistence layer handles that via the observer.
     """
     tag_str = str(tag_id)
-    to_remove = [
-        hl["id"] for hl in doc.get_all_highlights() if hl.get("tag") == tag_str
-    ]
+    to_remove = doc.get_highlight_ids_with_tag(tag_str)
 
     for hl_id in to_remove:
         try:
@@ -1062,21 +1107,28 @@ async def _cleanup_crdt_highlights_from_db(
     from promptgrimoire.crdt.annotation_doc import (
         AnnotationDocument as AnnotationDocumentCls,
     )
+    from promptgrimoire.db.crdt_updates import (
+        discard_crdt_updates_with_session,
+        load_crdt_state_with_session,
+    )
     from promptgrimoire.db.models import Workspace
 
     async with get_session() as session:
         workspace = await session.get(Workspace, workspace_id)
-        if not workspace or not workspace.crdt_state:
+        if not workspace:
+            return 0
+        crdt_state, last_update_id = await load_crdt_state_with_session(
+            session, workspace
+        )
+        if not crdt_state:
             return 0
 
         doc = AnnotationDocumentCls("cleanup-tmp")
-        doc.apply_update(workspace.crdt_state)
+        doc.apply_update(crdt_state)
 
         # Collect highlight IDs matching this tag
         tag_str = str(tag_id)
-        to_remove = [
-            hl["id"] for hl in doc.get_all_highlights() if hl.get("tag") == tag_str
-        ]
+        to_remove = doc.get_highlight_ids_with_tag(tag_str)
 
         # Remove matching highlights (best-effort: skip corrupted entries)
         for hl_id in to_remove:
@@ -1090,9 +1142,13 @@ async def _cleanup_crdt_highlights_from_db(
         # Remove the tag from the tags Map (matches _cleanup_crdt_highlights_on_doc)
         doc.delete_tag(tag_id)
 
-        # Save updated state
+        # Save updated state (folds in any pending update log rows)
         workspace.crdt_state = doc.get_full_state()
         session.add(workspace)
+        if last_update_id is not None:
+            await discard_crdt_updates_with_session(
+                session, workspace_id, up_to_id=last_update_id
+            )
         await session.flush()
 
         return len(to_remove)
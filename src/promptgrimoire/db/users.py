@@ -17,6 +17,7 @@ if TYPE_CHECKING:
 
     from sqlmodel.ext.asyncio.session import AsyncSession
 
+from promptgrimoire.db import access_cache
 from promptgrimoire.db.engine import get_session
 from promptgrimoire.db.models import User
 
@@ -238,18 +239,31 @@ async def set_banned(user_id: UUID, is_banned: bool) -> User | None:
         session.add(user)
         await session.flush()
         await session.refresh(user)
-        return user
+        await access_cache.queue_invalidation(session, access_cache.BAN, user_id)
+
+    access_cache.invalidate(access_cache.BAN, user_id)
+    return user
 
 
-async def is_user_banned(user_id: UUID) -> bool:
+async def is_user_banned(user_id: UUID, *, fresh: bool = False) -> bool:
     """Check if a user is currently banned.
 
     Lightweight query -- returns only the boolean flag, not the full User object.
-    Used by page_route decorator and kick endpoint.
+    Used by page_route decorator and kick endpoint.  The answer is cached
+    for ``ACCESS_CACHE__BAN_TTL_SECONDS``; pass ``fresh=True`` to read the
+    database regardless.
     """
-    async with get_session() as session:
-        result = await session.exec(select(User.is_banned).where(User.id == user_id))
-        return result.one_or_none() or False
+    if fresh:
+        access_cache.invalidate(access_cache.BAN, user_id)
+
+    async def load() -> bool:
+        async with get_session() as session:
+            result = await session.exec(
+                select(User.is_banned).where(User.id == user_id)
+            )
+            return result.one_or_none() or False
+
+    return await access_cache.cached_ban(user_id, load)
 
 
 async def get_banned_users() -> list[User]:
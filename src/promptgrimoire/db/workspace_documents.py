@@ -5,6 +5,7 @@ Provides async database functions for document management within workspaces.
 
 from __future__ import annotations
 
+import asyncio
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any, cast
 
@@ -25,6 +26,15 @@ if TYPE_CHECKING:
     from uuid import UUID
 
 
+def _build_text_index(content: str) -> bytes | None:
+    """Build the export text-node index stored beside ``paragraph_map``."""
+    # Lazy import: the export package pulls in Pandoc/LaTeX helpers that
+    # the rest of the db layer never needs.
+    from promptgrimoire.export.text_index import build_text_index
+
+    return build_text_index(content)
+
+
 async def add_document(
     workspace_id: UUID,
     type: str,
@@ -52,6 +62,7 @@ async def add_document(
     Returns:
         The created WorkspaceDocument.
     """
+    text_index = await asyncio.to_thread(_build_text_index, content)
     async with get_session() as session:
         # Get next order_index
         result = await session.exec(
@@ -71,6 +82,7 @@ async def add_document(
             order_index=next_index,
             auto_number_paragraphs=auto_number_paragraphs,
             paragraph_map=paragraph_map if paragraph_map is not None else {},
+            text_index=text_index,
         )
         session.add(doc)
         await session.flush()
@@ -97,9 +109,10 @@ async def get_document(document_id: UUID) -> WorkspaceDocument | None:
 async def list_document_headers(workspace_id: UUID) -> list[WorkspaceDocument]:
     """List document metadata without content, ordered by order_index.
 
-    Returns WorkspaceDocument objects with the ``content`` column deferred.
-    Accessing ``.content`` on these objects raises ``DetachedInstanceError``
-    because the session is closed before return.
+    Returns WorkspaceDocument objects with the ``content`` and
+    ``text_index`` columns deferred.  Accessing ``.content`` on these
+    objects raises ``DetachedInstanceError`` because the session is
+    closed before return.
 
     Use ``get_document()`` to fetch a single document with full content,
     or ``list_documents()`` for export paths that need all content.
@@ -109,7 +122,8 @@ async def list_document_headers(workspace_id: UUID) -> list[WorkspaceDocument]:
             select(WorkspaceDocument)
             .where(WorkspaceDocument.workspace_id == workspace_id)
             .options(
-                defer(cast("QueryableAttribute[Any]", WorkspaceDocument.content))
+                defer(cast("QueryableAttribute[Any]", WorkspaceDocument.content)),
+                defer(cast("QueryableAttribute[Any]", WorkspaceDocument.text_index)),
             )  # SQLModel exposes str; cast for ty
             .order_by("order_index")
         )
@@ -180,7 +194,7 @@ async def update_document_content(
     content: str,
     workspace_id: UUID,
 ) -> WorkspaceDocument:
-    """Replace a document's HTML content and rebuild its paragraph map.
+    """Replace a document's HTML content and rebuild its paragraph map and index.
 
     Sets ``search_dirty=True`` on the parent workspace so the FTS
     background worker re-indexes the updated text.
@@ -197,6 +211,7 @@ async def update_document_content(
         ValueError: If the document is not found.
         ValueError: If workspace_id does not match the document's workspace.
     """
+    text_index = await asyncio.to_thread(_build_text_index, content)
     async with get_session() as session:
         result = await session.exec(
             select(WorkspaceDocument).where(WorkspaceDocument.id == document_id)
@@ -217,6 +232,7 @@ async def update_document_content(
         doc.paragraph_map = build_paragraph_map_for_json(
             content, auto_number=doc.auto_number_paragraphs
         )
+        doc.text_index = text_index
         session.add(doc)
 
         workspace = await session.get(Workspace, workspace_id)
@@ -261,9 +277,9 @@ async def delete_document(document_id: UUID, *, user_id: UUID) -> bool:
         HasAnnotationsError: If the document has one or more CRDT highlights.
 
     Guard behaviour: The annotation count is read from the persisted CRDT
-    state inside the same session as the document load. If ``crdt_state``
-    is None (workspace has no persisted annotations), the guard is skipped
-    and deletion proceeds normally.
+    state (snapshot plus pending update log) inside the same session as
+    the document load. If there is no persisted state (workspace has no
+    annotations), the guard is skipped and deletion proceeds normally.
     """
     async with get_session() as session:
         result = await session.exec(
@@ -295,16 +311,21 @@ async def delete_document(document_id: UUID, *, user_id: UUID) -> bool:
 
         # Guard: count annotations from DB-persisted CRDT state (same session)
         workspace = await session.get(Workspace, doc.workspace_id)
-        if workspace and workspace.crdt_state:
+        crdt_state = None
+        if workspace:
+            from promptgrimoire.db.crdt_updates import load_crdt_state_with_session
+
+            crdt_state, _last_id = await load_crdt_state_with_session(
+                session, workspace
+            )
+        if crdt_state:
             from promptgrimoire.crdt.annotation_doc import (
                 AnnotationDocument as AnnotationDocumentCls,
             )
 
             count_doc = AnnotationDocumentCls("count-doc-tmp")
-            count_doc.apply_update(workspace.crdt_state)
-            annotation_count = len(
-                count_doc.get_highlights_for_document(str(document_id))
-            )
+            count_doc.apply_update(crdt_state)
+            annotation_count = count_doc.count_highlights_for_document(str(document_id))
             if annotation_count > 0:
                 raise HasAnnotationsError(document_id, annotation_count)
 
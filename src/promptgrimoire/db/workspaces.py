@@ -12,9 +12,17 @@ from typing import TYPE_CHECKING, Any, Literal
 from uuid import UUID
 
 import structlog
-from sqlalchemy import exists, func, text
-from sqlmodel import select
-
+from sqlalchemy import String, exists, func, literal, text
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel import SQLModel, select
+
+from promptgrimoire.db import access_cache
+from promptgrimoire.db.crdt_updates import (
+    discard_crdt_updates_with_session,
+    load_crdt_state_with_session,
+)
 from promptgrimoire.db.engine import get_session
 from promptgrimoire.db.exceptions import OwnershipError
 from promptgrimoire.db.models import (
@@ -28,13 +36,17 @@ from promptgrimoire.db.models import (
     User,
     Week,
     Workspace,
+    WorkspaceCRDTUpdate,
+    WorkspaceDocument,
 )
 from promptgrimoire.db.roles import get_staff_roles
+from promptgrimoire.db.search_fragments import write_search_fragments_with_session
 
 if TYPE_CHECKING:
     from sqlmodel.ext.asyncio.session import AsyncSession
 
     from promptgrimoire.crdt.annotation_doc import AnnotationDocument
+    from promptgrimoire.db.search_fragments import SearchFragmentPatch
 
 logger = structlog.get_logger()
 
@@ -225,7 +237,7 @@ class WorkspaceExportMetadata:
 
 @dataclass(frozen=True)
 class AnnotationContext:
-    """All data needed for annotation page load, resolved in a single session.
+    """All data needed for annotation page load, resolved in a single query.
 
     Replaces 5+ separate DB function calls that each opened their own session:
     - get_workspace()
@@ -248,203 +260,255 @@ class AnnotationContext:
     tag_groups: list[TagGroup]
 
 
-async def _resolve_enrollment_permission(
-    session: AsyncSession,
-    workspace: Workspace,
-    course_id: UUID,
-    user_id: UUID,
-) -> str | None:
-    """Derive permission from course enrollment for a single user.
+@dataclass(frozen=True)
+class AnnotationPageData:
+    """Everything the annotation page reads from the DB before building UI.
 
-    Returns the derived permission string or None if the user has no
-    enrollment-based access. Extracted from resolve_annotation_context
-    to keep branch/statement counts within linter limits.
+    Returned by :func:`load_annotation_page` from a single SQL statement.
     """
-    enrollment_result = await session.exec(
-        select(CourseEnrollment).where(
-            CourseEnrollment.course_id == course_id,
-            CourseEnrollment.user_id == user_id,
-        )
-    )
-    enrollment = enrollment_result.one_or_none()
-    if enrollment is None:
-        return None
 
-    course = await session.get(Course, course_id)
-    if course is None:
-        return None
+    context: AnnotationContext
+    documents: list[WorkspaceDocument]
+    """Document headers ordered by ``order_index``.
 
-    staff_roles = await get_staff_roles()
-    if enrollment.role in staff_roles:
+    ``content`` and ``text_index`` are unloaded, as with
+    ``list_document_headers()``.
+    """
+    pending_crdt_updates: list[bytes]
+    """Uncompacted ``workspace_crdt_update`` rows in replay order."""
+
+
+def _enrollment_permission(
+    workspace: Workspace,
+    course: Course,
+    activity: Activity | None,
+    role: str,
+    staff_roles: frozenset[str],
+) -> str | None:
+    """Derive permission from a user's course enrollment role.
+
+    Staff get the course's instructor permission.  Students get "peer"
+    on workspaces shared with the class, if the activity (or course
+    default) allows sharing.
+    """
+    if role in staff_roles:
         return course.default_instructor_permission
 
     if not workspace.shared_with_class:
         return None
 
-    # Activity override for allow_sharing (identity map absorbs re-fetch)
-    activity_override = None
-    if workspace.activity_id is not None:
-        activity = await session.get(Activity, workspace.activity_id)
-        if activity is not None:
-            activity_override = activity.allow_sharing
+    activity_override = activity.allow_sharing if activity is not None else None
     allow_sharing = resolve_tristate(activity_override, course.default_allow_sharing)
     return "peer" if allow_sharing else None
 
 
-async def _resolve_effective_permission(
-    session: AsyncSession,
-    workspace: Workspace,
-    placement: PlacementContext,
-    user_id: UUID,
+def _highest_permission(
+    explicit: str | None,
+    derived: str | None,
+    levels: dict[str, int],
 ) -> str | None:
-    """Resolve the effective permission for a user on a workspace.
+    """Pick the higher of an explicit ACL and an enrollment-derived permission."""
+    if explicit and derived:
+        return explicit if levels[explicit] >= levels[derived] else derived
+    return explicit or derived
 
-    Combines explicit ACL lookup with enrollment-derived access,
-    picking the highest permission level. Returns None if no access.
-    Extracted from resolve_annotation_context to keep branch/statement
-    counts within linter limits.
-    """
-    # Explicit ACL lookup
-    explicit_result = await session.exec(
-        select(ACLEntry).where(
-            ACLEntry.workspace_id == workspace.id,
-            ACLEntry.user_id == user_id,
-        )
-    )
-    explicit = explicit_result.one_or_none()
-
-    # Enrollment-derived access
-    course_id = placement.course_id
-    if course_id is None and workspace.course_id is not None:
-        course_id = workspace.course_id
 
-    derived_permission: str | None = None
-    if course_id is not None:
-        derived_permission = await _resolve_enrollment_permission(
-            session, workspace, course_id, user_id
-        )
+def _workspace_rows_jsonb(
+    model: Any,
+    *,
+    exclude: tuple[str, ...] = (),
+) -> Any:
+    """Scalar subquery aggregating a workspace's *model* rows into JSONB.
 
-    # Highest wins
-    if explicit and derived_permission:
-        level_result = await session.exec(
-            select(Permission.name, Permission.level).where(
-                Permission.name.in_([explicit.permission, derived_permission])  # type: ignore[unresolved-attribute]  -- Column has in_ at runtime
-            )
+    Rows are ordered by ``order_index`` and correlate to the enclosing
+    ``Workspace``.  Columns named in *exclude* are dropped from each row.
+    """
+    table = model.__table__
+    row = func.to_jsonb(table.table_valued())
+    for column in exclude:
+        row = row.op("-")(literal(column, String))
+    return (
+        select(
+            func.jsonb_agg(aggregate_order_by(row, table.c.order_index), type_=JSONB)
         )
-        levels = dict(level_result.all())
-        e_level = levels[explicit.permission]
-        d_level = levels[derived_permission]
-        return explicit.permission if e_level >= d_level else derived_permission
-    if explicit:
-        return explicit.permission
-    return derived_permission
+        .where(table.c.workspace_id == Workspace.id)
+        .scalar_subquery()
+    )
 
 
-async def _resolve_privileged_user_ids(
-    session: AsyncSession,
-    workspace: Workspace,
-    placement: PlacementContext,
-) -> frozenset[str]:
-    """Collect string-form user IDs for staff and admin users.
+def _detached_from_jsonb[M: SQLModel](
+    model: type[M], row: dict[str, Any], **deferred: Any
+) -> M:
+    """Rebuild a detached ORM instance from one ``to_jsonb`` row.
 
-    Staff are resolved from course enrollment; admins from the User table.
-    Returns a frozenset suitable for AnnotationContext.privileged_user_ids.
+    *deferred* gives placeholders for columns the query left out.  They
+    are dropped again after validation so the attributes stay unloaded
+    and raise ``DetachedInstanceError`` on access, like ``defer()``.
     """
-    staff_ids: set[str] = set()
-    priv_course_id = placement.course_id or workspace.course_id
-    if priv_course_id is not None:
-        staff_roles = await get_staff_roles()
-        staff_result = await session.exec(
-            select(CourseEnrollment.user_id).where(
-                CourseEnrollment.course_id == priv_course_id,
-                CourseEnrollment.role.in_(staff_roles),  # type: ignore[unresolved-attribute]  -- Column has in_ at runtime
-            )
-        )
-        staff_ids = {str(uid) for uid in staff_result.all()}
-
-    admin_result = await session.exec(
-        select(User.id).where(User.is_admin == True)  # noqa: E712
-    )
-    admin_ids = {str(uid) for uid in admin_result.all()}
-    return frozenset(staff_ids | admin_ids)
+    instance = model.model_validate(row, update=deferred)
+    loaded = sa_inspect(instance).dict
+    for name in deferred:
+        loaded.pop(name, None)
+    make_transient_to_detached(instance)
+    return instance
 
 
-async def resolve_annotation_context(
+async def load_annotation_page(
     workspace_id: UUID,
     user_id: UUID,
     *,
     is_admin: bool = False,
-) -> AnnotationContext | None:
-    """Resolve all data needed for annotation page load in a single session.
+) -> AnnotationPageData | None:
+    """Load everything the annotation page needs in one round trip.
+
+    One statement fetches the workspace, its placement chain, the user's
+    explicit ACL entry and enrollment role, staff and admin IDs,
+    permission levels, tags, tag groups, document headers and pending
+    CRDT updates.  Permission and placement are then resolved in Python
+    by the same rules as before.
 
     Returns None if workspace does not exist.
     """
-    async with get_session() as session:
-        # 1. Workspace + template flag in a single query
-        template_exists = exists(
-            select(Activity.id).where(Activity.template_workspace_id == workspace_id)
+    staff_roles = await get_staff_roles()  # cached after first call
+
+    template_exists = exists(
+        select(Activity.id).where(Activity.template_workspace_id == workspace_id)
+    )
+    explicit_permission = (
+        select(ACLEntry.permission)
+        .where(ACLEntry.workspace_id == Workspace.id, ACLEntry.user_id == user_id)
+        .scalar_subquery()
+    )
+    enrollment_role = (
+        select(CourseEnrollment.role)
+        .where(
+            CourseEnrollment.course_id == Course.id,
+            CourseEnrollment.user_id == user_id,
         )
-        ws_result = await session.exec(
-            select(Workspace, template_exists.label("is_template")).where(
-                Workspace.id == workspace_id
+        .scalar_subquery()
+    )
+    staff_ids = (
+        select(func.array_agg(CourseEnrollment.user_id))
+        .where(
+            CourseEnrollment.course_id == Course.id,
+            CourseEnrollment.role.in_(staff_roles),  # type: ignore[unresolved-attribute]  -- Column has in_ at runtime
+        )
+        .scalar_subquery()
+    )
+    admin_ids = (
+        select(func.array_agg(User.id))
+        .where(User.is_admin == True)  # noqa: E712
+        .scalar_subquery()
+    )
+    permission_levels = select(
+        func.jsonb_object_agg(Permission.name, Permission.level, type_=JSONB)
+    ).scalar_subquery()
+    pending_updates = (
+        select(
+            func.array_agg(
+                aggregate_order_by(
+                    WorkspaceCRDTUpdate.update,
+                    WorkspaceCRDTUpdate.id,  # type: ignore[arg-type]  -- Column expression valid at runtime
+                )
             )
         )
-        ws_row = ws_result.first()
-        if ws_row is None:
-            return None
-
-        workspace, is_template = ws_row
+        .where(WorkspaceCRDTUpdate.workspace_id == Workspace.id)
+        .scalar_subquery()
+    )
 
-        # 2. Hierarchy resolution — reuse existing private helpers
-        if workspace.activity_id is not None:
-            placement = await _resolve_activity_placement(
-                session, workspace.activity_id
+    async with get_session() as session:
+        result = await session.exec(
+            select(
+                Workspace,
+                template_exists.label("is_template"),
+                Activity,
+                Week,
+                Course,
+                explicit_permission.label("explicit_permission"),
+                enrollment_role.label("enrollment_role"),
+                staff_ids.label("staff_ids"),
+                admin_ids.label("admin_ids"),
+                permission_levels.label("permission_levels"),
+                _workspace_rows_jsonb(Tag).label("tags"),
+                _workspace_rows_jsonb(TagGroup).label("tag_groups"),
+                _workspace_rows_jsonb(
+                    WorkspaceDocument, exclude=("content", "text_index")
+                ).label("documents"),
+                pending_updates.label("pending_updates"),
             )
-        elif workspace.course_id is not None:
-            placement = await _resolve_course_placement(session, workspace.course_id)
-        else:
-            placement = PlacementContext(placement_type="loose")
-        if is_template:
-            placement = replace(placement, is_template=True)
-
-        # 3. Permission resolution (inline to avoid double-fetch)
-        if is_admin:
-            permission: str | None = "owner"
-        else:
-            permission = await _resolve_effective_permission(
-                session, workspace, placement, user_id
+            .outerjoin(Activity, Activity.id == Workspace.activity_id)  # type: ignore[arg-type]  -- Column == returns ColumnElement
+            .outerjoin(Week, Week.id == Activity.week_id)  # type: ignore[arg-type]  -- Column == returns ColumnElement
+            .outerjoin(
+                Course,
+                Course.id == func.coalesce(Week.course_id, Workspace.course_id),  # type: ignore[arg-type]  -- Column == returns ColumnElement
             )
-
-        # 4. Privileged user IDs (staff + admins)
-        privileged_user_ids = await _resolve_privileged_user_ids(
-            session, workspace, placement
+            .where(Workspace.id == workspace_id)
         )
+        row = result.first()
+    if row is None:
+        return None
 
-        # 5. Tags and tag groups
-        tags_result = await session.exec(
-            select(Tag)
-            .where(Tag.workspace_id == workspace_id)
-            .order_by(Tag.order_index)  # type: ignore[arg-type]  -- Column expression valid at runtime
-        )
-        tags = list(tags_result.all())
-
-        groups_result = await session.exec(
-            select(TagGroup)
-            .where(TagGroup.workspace_id == workspace_id)
-            .order_by(TagGroup.order_index)  # type: ignore[arg-type]  -- Column expression valid at runtime
+    workspace, is_template, activity, week, course = row[:5]
+
+    if workspace.activity_id is not None and activity and week and course:
+        placement = _activity_placement(activity, week, course)
+    elif workspace.course_id is not None and course is not None:
+        placement = _course_placement(course)
+    else:
+        placement = PlacementContext(placement_type="loose")
+    if is_template:
+        placement = replace(placement, is_template=True)
+
+    if is_admin:
+        permission: str | None = "owner"
+    else:
+        derived = (
+            _enrollment_permission(
+                workspace, course, activity, row.enrollment_role, staff_roles
+            )
+            if course is not None and row.enrollment_role is not None
+            else None
         )
-        tag_groups = list(groups_result.all())
-
-        # 6. Return
-        return AnnotationContext(
-            workspace=workspace,
-            permission=permission,
-            placement=placement,
-            privileged_user_ids=privileged_user_ids,
-            tags=tags,
-            tag_groups=tag_groups,
+        permission = _highest_permission(
+            row.explicit_permission, derived, row.permission_levels or {}
         )
 
+    privileged_user_ids = frozenset(
+        str(uid) for uid in [*(row.staff_ids or []), *(row.admin_ids or [])]
+    )
+
+    context = AnnotationContext(
+        workspace=workspace,
+        permission=permission,
+        placement=placement,
+        privileged_user_ids=privileged_user_ids,
+        tags=[_detached_from_jsonb(Tag, t) for t in row.tags or []],
+        tag_groups=[_detached_from_jsonb(TagGroup, g) for g in row.tag_groups or []],
+    )
+    return AnnotationPageData(
+        context=context,
+        documents=[
+            _detached_from_jsonb(WorkspaceDocument, d, content="", text_index=None)
+            for d in row.documents or []
+        ],
+        pending_crdt_updates=list(row.pending_updates or []),
+    )
+
+
+async def resolve_annotation_context(
+    workspace_id: UUID,
+    user_id: UUID,
+    *,
+    is_admin: bool = False,
+) -> AnnotationContext | None:
+    """Resolve all data needed for annotation page load in a single query.
+
+    Returns None if workspace does not exist.  See
+    :func:`load_annotation_page` for the documents and CRDT log as well.
+    """
+    page = await load_annotation_page(workspace_id, user_id, is_admin=is_admin)
+    return page.context if page is not None else None
+
 
 async def get_workspace_export_metadata(
     workspace_id: UUID,
@@ -543,26 +607,10 @@ def resolve_tristate(override: bool | None, default: bool) -> bool:
     return default
 
 
-async def _resolve_activity_placement(
-    session: AsyncSession,
-    activity_id: UUID,
+def _activity_placement(
+    activity: Activity, week: Week, course: Course
 ) -> PlacementContext:
-    """Walk Activity -> Week -> Course chain in a single JOIN query.
-
-    Falls back to loose placement if any link in the chain is missing.
-    """
-    result = await session.exec(
-        select(Activity, Week, Course)
-        .join(Week, Activity.week_id == Week.id)  # type: ignore[arg-type]  -- Column == returns ColumnElement
-        .join(Course, Week.course_id == Course.id)  # type: ignore[arg-type]  -- Column == returns ColumnElement
-        .where(Activity.id == activity_id)
-    )
-    row = result.first()
-    if row is None:
-        return PlacementContext(placement_type="loose")
-
-    activity, week, course = row
-
+    """Build an activity placement, resolving overrides against the course."""
     return PlacementContext(
         placement_type="activity",
         activity_title=activity.title,
@@ -591,18 +639,12 @@ async def _resolve_activity_placement(
     )
 
 
-async def _resolve_course_placement(
-    session: AsyncSession,
-    course_id: UUID,
-) -> PlacementContext:
-    """Resolve Course placement. Falls back to loose on orphan.
+def _course_placement(course: Course) -> PlacementContext:
+    """Build a course placement from the course defaults alone.
 
     Propagates all course-level defaults (copy_protection, allow_sharing,
     anonymous_sharing) since there is no Activity to override them.
     """
-    course = await session.get(Course, course_id)
-    if course is None:
-        return PlacementContext(placement_type="loose")
     return PlacementContext(
         placement_type="course",
         course_code=course.code,
@@ -614,6 +656,39 @@ async def _resolve_course_placement(
     )
 
 
+async def _resolve_activity_placement(
+    session: AsyncSession,
+    activity_id: UUID,
+) -> PlacementContext:
+    """Walk Activity -> Week -> Course chain in a single JOIN query.
+
+    Falls back to loose placement if any link in the chain is missing.
+    """
+    result = await session.exec(
+        select(Activity, Week, Course)
+        .join(Week, Activity.week_id == Week.id)  # type: ignore[arg-type]  -- Column == returns ColumnElement
+        .join(Course, Week.course_id == Course.id)  # type: ignore[arg-type]  -- Column == returns ColumnElement
+        .where(Activity.id == activity_id)
+    )
+    row = result.first()
+    if row is None:
+        return PlacementContext(placement_type="loose")
+
+    activity, week, course = row
+    return _activity_placement(activity, week, course)
+
+
+async def _resolve_course_placement(
+    session: AsyncSession,
+    course_id: UUID,
+) -> PlacementContext:
+    """Resolve Course placement. Falls back to loose on orphan."""
+    course = await session.get(Course, course_id)
+    if course is None:
+        return PlacementContext(placement_type="loose")
+    return _course_placement(course)
+
+
 async def create_workspace() -> Workspace:
     """Create a new workspace.
 
@@ -679,27 +754,106 @@ async def delete_workspace(workspace_id: UUID, *, user_id: UUID) -> None:
         await session.delete(workspace)
 
 
-async def save_workspace_crdt_state(workspace_id: UUID, crdt_state: bytes) -> bool:
-    """Save CRDT state to a workspace.
+async def save_workspace_crdt_state(
+    workspace_id: UUID,
+    crdt_state: bytes,
+    *,
+    search: SearchFragmentPatch | None = None,
+) -> bool:
+    """Save a full CRDT snapshot to a workspace.
+
+    The snapshot supersedes the append-only update log, so any pending
+    ``workspace_crdt_update`` rows are deleted in the same transaction.
+    Callers must pass state that already contains those updates (the live
+    registry document, or state loaded via ``get_workspace_crdt_state``).
 
     Args:
         workspace_id: The workspace UUID.
         crdt_state: Serialized pycrdt state bytes.
+        search: Search fragment changes from the live document.  When
+            given they are written in the same transaction instead of
+            setting ``search_dirty`` for full re-extraction.
 
     Returns:
         True if workspace was found and updated, False otherwise.
     """
     async with get_session() as session:
-        workspace = await session.get(Workspace, workspace_id)
+        workspace = await session.get(Workspace, workspace_id, with_for_update=True)
         if workspace:
             workspace.crdt_state = crdt_state
             workspace.updated_at = datetime.now(UTC)
-            workspace.search_dirty = True
+            if search is None:
+                workspace.search_dirty = True
             session.add(workspace)
+            await discard_crdt_updates_with_session(session, workspace_id)
+            if search is not None:
+                await session.flush()
+                await write_search_fragments_with_session(session, workspace_id, search)
             return True
         return False
 
 
+async def save_workspace_crdt_states(
+    states: dict[UUID, bytes],
+    *,
+    search: dict[UUID, SearchFragmentPatch] | None = None,
+) -> set[UUID]:
+    """Save full CRDT snapshots for many workspaces in one statement.
+
+    Batched counterpart of ``save_workspace_crdt_state`` for bulk flushes:
+    a single ``UPDATE ... FROM (VALUES ...)`` writes every snapshot, then
+    the superseded update-log rows are deleted, all in one transaction.
+
+    Args:
+        states: Mapping of workspace UUID to serialized pycrdt state.
+        search: Per-workspace search fragment changes from live
+            documents.  Workspaces without an entry are flagged
+            ``search_dirty`` for full re-extraction.
+
+    Returns:
+        The workspace UUIDs that were found and updated.
+    """
+    if not states:
+        return set()
+    search = search or {}
+
+    params: dict[str, object] = {"now": datetime.now(UTC)}
+    rows: list[str] = []
+    for i, (workspace_id, crdt_state) in enumerate(states.items()):
+        rows.append(
+            f"(CAST(:id_{i} AS uuid), CAST(:state_{i} AS bytea), "
+            f"CAST(:full_{i} AS boolean))"
+        )
+        params[f"id_{i}"] = workspace_id
+        params[f"state_{i}"] = crdt_state
+        params[f"full_{i}"] = workspace_id not in search
+
+    async with get_session() as session:
+        result = await session.execute(
+            text(
+                "UPDATE workspace AS w "
+                "SET crdt_state = v.state, updated_at = :now, "
+                "  search_dirty = w.search_dirty OR v.full_extract "
+                f"FROM (VALUES {', '.join(rows)}) AS v(id, state, full_extract) "
+                "WHERE w.id = v.id RETURNING w.id"
+            ),
+            params,
+        )
+        saved = {row[0] for row in result.fetchall()}
+        if saved:
+            await session.execute(
+                text(
+                    "DELETE FROM workspace_crdt_update "
+                    "WHERE workspace_id = ANY(:ws_ids)"
+                ),
+                {"ws_ids": list(saved)},
+            )
+        for workspace_id, patch in search.items():
+            if workspace_id in saved:
+                await write_search_fragments_with_session(session, workspace_id, patch)
+    return saved
+
+
 async def place_workspace_in_activity(
     workspace_id: UUID,
     activity_id: UUID,
@@ -893,6 +1047,8 @@ def _replay_crdt_state(
     doc_id_map: dict[UUID, UUID],
     tag_id_map: dict[UUID, UUID] | None = None,
     group_id_map: dict[UUID, UUID] | None = None,
+    *,
+    template_state: bytes | None = None,
 ) -> None:
     """Replay CRDT state from template into clone with ID remapping.
 
@@ -917,15 +1073,19 @@ def _replay_crdt_state(
         group_id_map: Optional mapping of {template_group_id: cloned_group_id}.
             When provided, tag group_id fields in the tags Map are remapped
             to the cloned group UUIDs.
+        template_state: Template CRDT state merged with its pending update
+            log. Defaults to ``template.crdt_state``.
     """
     from promptgrimoire.crdt.annotation_doc import AnnotationDocument as AnnotDoc
 
-    if template.crdt_state is None:
+    if template_state is None:
+        template_state = template.crdt_state
+    if template_state is None:
         return
 
     # Load template CRDT state
     template_doc = AnnotDoc("template-tmp")
-    template_doc.apply_update(template.crdt_state)
+    template_doc.apply_update(template_state)
 
     # Fresh document for clone (empty client_meta satisfies AC4.9)
     clone_doc = AnnotDoc("clone-tmp")
@@ -974,7 +1134,7 @@ def _replay_crdt_state(
     response_md = template_doc.get_response_draft_markdown()
     if response_md:
         md_field = clone_doc.response_draft_markdown
-        with clone_doc.doc.transaction():
+        with clone_doc.transaction():
             md_field += response_md
 
     # Copy tags Map entries with remapped tag IDs and group IDs
@@ -1145,11 +1305,13 @@ async def clone_workspace_from_activity(
                 INSERT INTO workspace_document
                     (id, workspace_id, type, content, source_type,
                      order_index, title, auto_number_paragraphs,
-                     paragraph_map, source_document_id, created_at)
+                     paragraph_map, text_index, source_document_id,
+                     created_at)
                 SELECT
                     gen_random_uuid(), :clone_id, type, content,
                     source_type, order_index, title,
-                    auto_number_paragraphs, paragraph_map, id, now()
+                    auto_number_paragraphs, paragraph_map, text_index, id,
+                    now()
                 FROM workspace_document
                 WHERE workspace_id = :template_id
                 RETURNING id, source_document_id
@@ -1224,7 +1386,15 @@ async def clone_workspace_from_activity(
         session.add(clone)
 
         # --- CRDT state cloning via API replay ---
-        _replay_crdt_state(template, clone, doc_id_map, tag_id_map, group_id_map)
+        template_state, _last_id = await load_crdt_state_with_session(session, template)
+        _replay_crdt_state(
+            template,
+            clone,
+            doc_id_map,
+            tag_id_map,
+            group_id_map,
+            template_state=template_state,
+        )
 
         await session.flush()
         await session.refresh(clone)
@@ -1233,6 +1403,8 @@ async def clone_workspace_from_activity(
 
 async def _update_workspace_fields(
     workspace_id: UUID,
+    *,
+    affects_access: bool = False,
     **fields: Any,
 ) -> Workspace:
     """Fetch a workspace, apply field updates, and persist.
@@ -1242,6 +1414,8 @@ async def _update_workspace_fields(
 
     Args:
         workspace_id: The workspace UUID.
+        affects_access: Whether the fields feed permission resolution;
+            if so, cached permissions on the workspace are invalidated.
         **fields: Field name/value pairs to set on the workspace.
 
     Returns:
@@ -1261,7 +1435,14 @@ async def _update_workspace_fields(
         session.add(workspace)
         await session.flush()
         await session.refresh(workspace)
-        return workspace
+        if affects_access:
+            await access_cache.queue_invalidation(
+                session, access_cache.WORKSPACE_PERMISSIONS, workspace_id
+            )
+
+    if affects_access:
+        access_cache.invalidate(access_cache.WORKSPACE_PERMISSIONS, workspace_id)
+    return workspace
 
 
 async def update_workspace_sharing(
@@ -1281,7 +1462,7 @@ async def update_workspace_sharing(
         ValueError: If workspace not found.
     """
     return await _update_workspace_fields(
-        workspace_id, shared_with_class=shared_with_class
+        workspace_id, affects_access=True, shared_with_class=shared_with_class
     )
 
 
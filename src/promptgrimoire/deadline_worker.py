@@ -3,18 +3,18 @@
 Polls for WargameTeam rows with current_deadline in the past and
 round_state='drafting', then fires on_deadline_fired() for each
 affected activity. Follows the same polling-loop pattern as
-search_worker.py.
+search_worker.py, woken early by LISTEN/NOTIFY (see db/notify.py).
 """
 
 from __future__ import annotations
 
-import asyncio
 from datetime import UTC, datetime
 
 import structlog
 from sqlalchemy import text
 
 from promptgrimoire.db.engine import get_session
+from promptgrimoire.db.notify import DEADLINE_TOPIC, wait_for_wakeup
 
 logger = structlog.get_logger()
 
@@ -94,6 +94,7 @@ async def start_deadline_worker(
     Runs check_expired_deadlines() in a loop. Sleep duration adapts:
     if a deadline is imminent (within max_interval), sleeps until 1
     second after that deadline. Otherwise sleeps for max_interval.
+    A deadline notification from the database ends the sleep early.
 
     Parameters
     ----------
@@ -121,4 +122,5 @@ async def start_deadline_worker(
         else:
             sleep_for = max_interval
 
-        await asyncio.sleep(sleep_for)
+        # A deadline set or moved elsewhere wakes us to re-plan the sleep.
+        await wait_for_wakeup(DEADLINE_TOPIC, sleep_for)
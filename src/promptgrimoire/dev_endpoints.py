@@ -5,6 +5,7 @@ Gated behind DEV__AUTH_MOCK=true — never available in production.
 Endpoints:
     POST /api/dev/admission  — manipulate admission state (set cap, etc.)
     POST /api/dev/block-loop — block the event loop for N ms (triggers AIMD)
+    GET  /api/dev/metrics    — loop lag, admission queue and DB pool usage
 """
 
 from __future__ import annotations
@@ -142,3 +143,41 @@ async def block_loop_handler(request: Request) -> JSONResponse:
             "cap_after": cap_after,
         }
     )
+
+
+async def metrics_handler(_request: Request) -> JSONResponse:
+    """Report server health for the ``load-test-run`` sampler.
+
+    Returns event-loop lag (one ``measure_event_loop_lag()`` probe),
+    connected NiceGUI clients, admission gate state (null when the gate
+    is not initialised) and DB pool usage (null under NullPool).
+    """
+    from nicegui import Client  # noqa: PLC0415
+
+    from promptgrimoire.admission import get_admission_state  # noqa: PLC0415
+    from promptgrimoire.db.engine import pool_usage  # noqa: PLC0415
+    from promptgrimoire.diagnostics import measure_event_loop_lag  # noqa: PLC0415
+
+    lag_ms = await measure_event_loop_lag()
+
+    admission: dict[str, object] | None
+    try:
+        state = get_admission_state()
+        admission = {
+            "enabled": state.enabled,
+            "cap": state.cap,
+            "queue_depth": state.queue_depth,
+        }
+    except RuntimeError:
+        admission = None
+
+    return JSONResponse(
+        {
+            "event_loop_lag_ms": round(lag_ms, 2),
+            "clients_connected": sum(
+                1 for c in Client.instances.values() if c.has_socket_connection
+            ),
+            "admission": admission,
+            "db_pool": pool_usage(),
+        }
+    )
@@ -75,11 +75,18 @@ def _collect_memory() -> dict[str, Any]:
     return result
 
 
+def current_rss_mb() -> int | None:
+    """Return this process's resident set size in MB, or None without /proc."""
+    rss_bytes = _collect_memory()["current_rss_bytes"]
+    return None if rss_bytes is None else rss_bytes // (1024 * 1024)
+
+
 def collect_snapshot() -> dict[str, Any]:
     """Collect a flattened diagnostics snapshot for structlog emission.
 
     Includes NiceGUI client counts, memory metrics, asyncio task count,
-    and PromptGrimoire-specific CRDT registry/presence sizes.
+    and PromptGrimoire-specific CRDT registry/presence and access-cache
+    sizes.
     """
     from nicegui import Client  # noqa: PLC0415 -- lazy to avoid import-time cost
 
@@ -90,11 +97,19 @@ def collect_snapshot() -> dict[str, Any]:
     from promptgrimoire.pages.restart import _get_annotation_state  # noqa: PLC0415
 
     workspace_presence, workspace_registry = _get_annotation_state()
-    ws_registry_size = (
-        len(workspace_registry._documents) if workspace_registry is not None else 0
+    ws_registry_stats = (
+        workspace_registry.stats()
+        if workspace_registry is not None
+        else {"size": 0, "hits": 0, "misses": 0, "evictions": 0}
     )
     ws_presence_workspaces = len(workspace_presence)
     ws_presence_clients = sum(len(v) for v in workspace_presence.values())
+    presence_mod = sys.modules.get("promptgrimoire.pages.annotation.presence")
+    fanout_stats = (
+        presence_mod.stats()
+        if presence_mod is not None
+        else {"events": 0, "coalesced": 0, "messages": 0}
+    )
 
     from promptgrimoire.auth.client_registry import (  # noqa: PLC0415
         _registry as auth_registry,
@@ -105,6 +120,10 @@ def collect_snapshot() -> dict[str, Any]:
     authed_users = sum(1 for clients in auth_registry.values() if clients)
     authed_clients = sum(len(clients) for clients in auth_registry.values())
 
+    from promptgrimoire.db import access_cache  # noqa: PLC0415
+
+    access_stats = access_cache.stats()
+
     return {
         # Memory
         "current_rss_bytes": memory["current_rss_bytes"],
@@ -119,9 +138,21 @@ def collect_snapshot() -> dict[str, Any]:
         # Asyncio tasks
         "asyncio_tasks_total": len(asyncio.all_tasks()),
         # PromptGrimoire application state
-        "app_ws_registry": ws_registry_size,
+        "app_ws_registry": ws_registry_stats["size"],
+        "app_ws_registry_hits": ws_registry_stats["hits"],
+        "app_ws_registry_misses": ws_registry_stats["misses"],
+        "app_ws_registry_evictions": ws_registry_stats["evictions"],
         "app_ws_presence_workspaces": ws_presence_workspaces,
         "app_ws_presence_clients": ws_presence_clients,
+        "app_presence_events": fanout_stats["events"],
+        "app_presence_coalesced": fanout_stats["coalesced"],
+        "app_presence_messages": fanout_stats["messages"],
+        "app_access_cache_permission": access_stats["permission"]["size"],
+        "app_access_cache_permission_hits": access_stats["permission"]["hits"],
+        "app_access_cache_permission_misses": access_stats["permission"]["misses"],
+        "app_access_cache_ban": access_stats["ban"]["size"],
+        "app_access_cache_ban_hits": access_stats["ban"]["hits"],
+        "app_access_cache_ban_misses": access_stats["ban"]["misses"],
         # Event loop responsiveness (filled by async caller)
         "event_loop_lag_ms": None,
     }
@@ -0,0 +1,204 @@
+"""Content-addressed cache for export artefacts (PDF and .tex).
+
+Entries are keyed on a SHA-256 of the canonical JSON of every input that
+shapes the output (documents, highlights, tag colours, notes, word-count
+badge) plus a fingerprint of the export package itself, so a deploy that
+changes rendering code, Lua filters or the .sty never serves stale output.
+Output names (filename, output directory) are not part of the key: a hit
+is linked or copied into the caller's directory under the requested name.
+
+Entries live in ``EXPORT__CACHE_DIR`` (default: a directory under the
+system temp dir), sharded by the first two hex digits of the key.  Hits
+refresh the entry's mtime, and :func:`evict_export_cache` deletes the
+least recently used entries until the cache fits ``EXPORT__CACHE_MAX_MB``.
+Setting the budget to 0 disables the cache.
+
+Besides whole artefacts, the cache holds per-document LaTeX body
+fragments (``kind="fragment"``) so a multi-document export re-runs
+Pandoc only for the documents whose content or highlights changed.
+
+Writes are atomic (temp file + ``os.replace``), so concurrent worker
+processes can share one cache directory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from promptgrimoire.config import get_settings
+
+logger = structlog.get_logger()
+
+_PACKAGE_DIR = Path(__file__).parent
+_FINGERPRINT_SUFFIXES = frozenset({".py", ".lua", ".sty", ".tex"})
+_FRAGMENT_SUFFIX = ".frag"
+# Temp files older than this belong to interrupted stores, not live ones.
+_STALE_TMP_SECONDS = 3600
+
+
+@lru_cache(maxsize=1)
+def _pipeline_fingerprint() -> str:
+    """Hash the export package sources that determine rendered output."""
+    digest = hashlib.sha256()
+    for path in sorted(_PACKAGE_DIR.rglob("*")):
+        if path.suffix in _FINGERPRINT_SUFFIXES and path.is_file():
+            digest.update(str(path.relative_to(_PACKAGE_DIR)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def export_cache_key(kind: str, inputs: dict[str, Any]) -> str:
+    """Return the cache key for an export of *kind* built from *inputs*.
+
+    Args:
+        kind: Artefact kind (``"pdf"`` or ``"tex"``); the two pipelines
+            emit different preambles so they never share entries.
+        inputs: Every argument that affects the artefact's content.
+    """
+    canonical = json.dumps(
+        {"kind": kind, "pipeline": _pipeline_fingerprint(), "inputs": inputs},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def export_cache_dir() -> Path | None:
+    """Return the cache directory, or None when the cache is disabled."""
+    config = get_settings().export
+    if config.cache_max_mb <= 0:
+        return None
+    return config.cache_dir or Path(tempfile.gettempdir()) / "promptgrimoire_cache"
+
+
+def _entry_path(cache_dir: Path, key: str, suffix: str) -> Path:
+    return cache_dir / key[:2] / f"{key}{suffix}"
+
+
+def _reserve_tmp(entry: Path) -> Path:
+    """Create an empty temp file beside *entry* for an atomic replace."""
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=entry.parent, suffix=".tmp")
+    os.close(fd)
+    return Path(tmp_name)
+
+
+def fetch_cached_export(key: str, suffix: str, dest: Path) -> Path | None:
+    """Place the cached artefact for *key* at *dest*.
+
+    Hard-links where possible and falls back to a copy.  An entry evicted
+    between lookup and link is treated as a miss.
+
+    Returns:
+        *dest* on a hit, None on a miss or when the cache is disabled.
+    """
+    cache_dir = export_cache_dir()
+    if cache_dir is None:
+        return None
+    entry = _entry_path(cache_dir, key, suffix)
+    try:
+        os.utime(entry)
+        dest.unlink(missing_ok=True)
+        try:
+            os.link(entry, dest)
+        except OSError:
+            # Cache on another filesystem, or links unsupported.
+            logger.debug("export_cache_link_failed", key=key)
+            shutil.copyfile(entry, dest)
+    except FileNotFoundError:
+        logger.debug("export_cache_miss", key=key, suffix=suffix)
+        return None
+    return dest
+
+
+def store_cached_export(key: str, suffix: str, artefact: Path) -> None:
+    """Copy *artefact* into the cache under *key*.
+
+    Failures are logged and otherwise ignored: the export itself has
+    already succeeded.
+    """
+    cache_dir = export_cache_dir()
+    if cache_dir is None:
+        return
+    try:
+        tmp_path = _reserve_tmp(_entry_path(cache_dir, key, suffix))
+        shutil.copyfile(artefact, tmp_path)
+        tmp_path.replace(_entry_path(cache_dir, key, suffix))
+    except OSError:
+        logger.warning("export_cache_store_failed", key=key, exc_info=True)
+
+
+def fetch_cached_fragment(key: str) -> str | None:
+    """Return the cached LaTeX body fragment for *key*, or None on a miss."""
+    cache_dir = export_cache_dir()
+    if cache_dir is None:
+        return None
+    entry = _entry_path(cache_dir, key, _FRAGMENT_SUFFIX)
+    try:
+        os.utime(entry)
+        return entry.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        logger.debug("export_cache_miss", key=key, suffix=_FRAGMENT_SUFFIX)
+        return None
+
+
+def store_cached_fragment(key: str, latex: str) -> None:
+    """Cache one document's converted LaTeX body under *key*."""
+    cache_dir = export_cache_dir()
+    if cache_dir is None:
+        return
+    try:
+        tmp_path = _reserve_tmp(_entry_path(cache_dir, key, _FRAGMENT_SUFFIX))
+        tmp_path.write_text(latex, encoding="utf-8")
+        tmp_path.replace(_entry_path(cache_dir, key, _FRAGMENT_SUFFIX))
+    except OSError:
+        logger.warning("export_fragment_store_failed", key=key, exc_info=True)
+
+
+def evict_export_cache() -> int:
+    """Delete least recently used entries until the cache fits its budget.
+
+    Also removes stale temp files left behind by interrupted stores.
+
+    Returns:
+        Number of files deleted.
+    """
+    cache_dir = export_cache_dir()
+    if cache_dir is None or not cache_dir.is_dir():
+        return 0
+    budget = get_settings().export.cache_max_mb * 1024 * 1024
+
+    entries: list[tuple[float, int, Path]] = []
+    deleted = 0
+    stale_before = time.time() - _STALE_TMP_SECONDS
+    for path in cache_dir.glob("*/*"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        if path.suffix != ".tmp":
+            entries.append((stat.st_mtime, stat.st_size, path))
+        elif stat.st_mtime < stale_before:
+            path.unlink(missing_ok=True)
+            deleted += 1
+
+    total = sum(size for _mtime, size, _path in entries)
+    for _mtime, size, path in sorted(entries):
+        if total <= budget:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        deleted += 1
+    return deleted
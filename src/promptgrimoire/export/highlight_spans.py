@@ -15,7 +15,8 @@ Architecture:
 
 from __future__ import annotations
 
-from typing import Any
+import bisect
+from typing import TYPE_CHECKING, Any
 
 import structlog
 
@@ -44,6 +45,9 @@ from promptgrimoire.input_pipeline.html_input import (
 )
 from promptgrimoire.input_pipeline.paragraph_map import lookup_para_ref
 
+if TYPE_CHECKING:
+    from promptgrimoire.export.text_index import TextNodeIndex
+
 logger = structlog.get_logger()
 # ---------------------------------------------------------------------------
 # Region data structure
@@ -164,13 +168,18 @@ def _migrate_annotations_backward(
 
 def _overlaps_any_text_node(
     region: _HlRegion,
-    text_nodes: list[TextNodeInfo],
+    starts: list[int],
+    ends: list[int],
 ) -> bool:
-    """Return True if the region overlaps at least one text node."""
-    for tn in text_nodes:
-        if tn.char_start < region.end and region.start < tn.char_end:
-            return True
-    return False
+    """Return True if the region overlaps at least one text node.
+
+    *starts* and *ends* are the text nodes' char ranges, in document order
+    (text nodes never overlap, so both are sorted).
+    """
+    # First node ending after the region starts; it overlaps iff it also
+    # starts before the region ends.
+    i = bisect.bisect_right(ends, region.start)
+    return i < len(starts) and starts[i] < region.end
 
 
 def _migrate_gap_annotations(
@@ -194,9 +203,11 @@ def _migrate_gap_annotations(
         return regions
 
     valid: list[_HlRegion] = []
+    starts = [tn.char_start for tn in text_nodes]
+    ends = [tn.char_end for tn in text_nodes]
 
     for region in regions:
-        if _overlaps_any_text_node(region, text_nodes):
+        if _overlaps_any_text_node(region, starts, ends):
             valid.append(region)
         else:
             _migrate_annotations_backward(region.annots, valid)
@@ -336,6 +347,8 @@ def _insert_spans_into_html(
 
     # Build list of (byte_position, tag_string) insertions
     insertions: list[tuple[int, str]] = []
+    starts = [tn.char_start for tn in text_nodes]
+    ends = [tn.char_end for tn in text_nodes]
 
     for region in regions:
         open_tag, close_tag = _build_span_tag(
@@ -344,11 +357,21 @@ def _insert_spans_into_html(
 
         # Find the byte position for the start of this region
         start_byte = _char_to_byte_pos(
-            region.start, text_nodes, byte_offsets, is_region_end=False
+            region.start,
+            text_nodes,
+            byte_offsets,
+            is_region_end=False,
+            starts=starts,
+            ends=ends,
         )
         # Find the byte position for the end of this region
         end_byte = _char_to_byte_pos(
-            region.end, text_nodes, byte_offsets, is_region_end=True
+            region.end,
+            text_nodes,
+            byte_offsets,
+            is_region_end=True,
+            starts=starts,
+            ends=ends,
         )
 
         if start_byte is not None and end_byte is not None:
@@ -422,11 +445,15 @@ def _char_to_byte_pos(
     text_nodes: list[TextNodeInfo],
     byte_offsets: list[int],
     is_region_end: bool = False,
+    *,
+    starts: list[int] | None = None,
+    ends: list[int] | None = None,
 ) -> int | None:
     """Map a character index to a byte position in the serialized HTML.
 
-    Finds the text node containing ``char_idx`` and computes the
-    byte offset within it using ``collapsed_to_html_offset``.
+    Finds the text node containing ``char_idx`` by binary search over the
+    text nodes' char ranges and computes the byte offset within it using
+    ``collapsed_to_html_offset``.
 
     At block boundaries where char_idx equals the char_end of one node AND
     the char_start of the next:
@@ -440,29 +467,39 @@ def _char_to_byte_pos(
         is_region_end: If True, map to position AFTER the last character
             (for region close tags). If False, map to position AT the character
             (for region open tags and positions within nodes).
+        starts: ``char_start`` of each text node; computed if omitted.
+        ends: ``char_end`` of each text node; computed if omitted.
     """
+    if starts is None:
+        starts = [tn.char_start for tn in text_nodes]
+    if ends is None:
+        ends = [tn.char_end for tn in text_nodes]
+
+    # Text nodes are disjoint and in document order, so the only candidate
+    # for each check below is found by bisection.
+    i = bisect.bisect_right(starts, char_idx) - 1
+
     # Match char_idx strictly within a text node's interior
-    for i, tn in enumerate(text_nodes):
-        if tn.char_start < char_idx < tn.char_end:
-            offset_in_collapsed = char_idx - tn.char_start
-            raw_offset = collapsed_to_html_offset(
-                tn.html_text, tn.decoded_text, offset_in_collapsed
-            )
-            return byte_offsets[i] + raw_offset
+    if i >= 0 and starts[i] < char_idx < ends[i]:
+        tn = text_nodes[i]
+        offset_in_collapsed = char_idx - tn.char_start
+        raw_offset = collapsed_to_html_offset(
+            tn.html_text, tn.decoded_text, offset_in_collapsed
+        )
+        return byte_offsets[i] + raw_offset
 
     # At block boundaries: char_idx == prev_node.char_end == next_node.char_start.
-    for i, tn in enumerate(text_nodes):
-        if char_idx == tn.char_start:
-            return _resolve_boundary(i, text_nodes, byte_offsets, is_region_end)
+    if i >= 0 and starts[i] == char_idx:
+        return _resolve_boundary(i, text_nodes, byte_offsets, is_region_end)
 
     # Match char_idx at the end of any text node.
     # Handles both the last text node (end of document) and non-last nodes
     # followed by a gap (e.g. from <br> tags where char_end < next.char_start).
     # At boundaries WITHOUT gaps, check 2 above already matched char_start
     # of the next node, so this only fires for gap positions.  Fixes #160.
-    for i, tn in enumerate(text_nodes):
-        if char_idx == tn.char_end:
-            return _byte_pos_at_node_end(tn, byte_offsets[i])
+    j = bisect.bisect_left(ends, char_idx)
+    if j < len(ends) and ends[j] == char_idx:
+        return _byte_pos_at_node_end(text_nodes[j], byte_offsets[j])
 
     # Fallback: char_idx truly beyond all text nodes -> end of last text node.
     # Gap positions (between text nodes, e.g. from <br>) return None so the
@@ -489,6 +526,7 @@ def compute_highlight_spans(
     highlights: list[dict[str, Any]],
     tag_colours: dict[str, str],
     word_to_legal_para: dict[int, int | None] | None = None,
+    text_index: TextNodeIndex | None = None,
 ) -> str:
     """Transform HTML + highlight list into HTML with highlight ``<span>`` elements.
 
@@ -505,6 +543,9 @@ def compute_highlight_spans(
             (e.g. ``{"jurisdiction": "#3366cc"}``).
         word_to_legal_para: Optional mapping of char index to legal
             paragraph number.
+        text_index: Persisted text-node index for *html* (see
+            ``export.text_index``).  When given, replaces the DOM walk,
+            text-node search and boundary detection.
 
     Returns:
         HTML with ``<span>`` elements inserted.  If *highlights* is empty,
@@ -525,14 +566,16 @@ def compute_highlight_spans(
         ),
     )
 
-    # Pass 1: DOM walk to build character position map
-    _chars, text_nodes = walk_and_map(html)
-
-    if not text_nodes:
-        return html
-
-    # Pass 2a: Find byte offsets of each text node in serialized HTML
-    byte_offsets = find_text_node_offsets(html, text_nodes)
+    if text_index is not None:
+        # Passes 1 and 2a from the persisted index
+        text_nodes, byte_offsets = text_index.text_nodes(html)
+    else:
+        # Pass 1: DOM walk to build character position map
+        _chars, text_nodes = walk_and_map(html)
+        if not text_nodes:
+            return html
+        # Pass 2a: Find byte offsets of each text node in serialized HTML
+        byte_offsets = find_text_node_offsets(html, text_nodes)
 
     # Compute non-overlapping regions
     regions = _compute_regions(sorted_highlights)
@@ -541,8 +584,11 @@ def compute_highlight_spans(
         return html
 
     # Detect block and inline formatting boundaries
-    boundaries = _detect_block_boundaries(html, text_nodes, byte_offsets)
-    boundaries |= _detect_inline_boundaries(html, text_nodes, byte_offsets)
+    if text_index is not None:
+        boundaries = text_index.block_boundaries() | text_index.inline_boundaries()
+    else:
+        boundaries = _detect_block_boundaries(html, text_nodes, byte_offsets)
+        boundaries |= _detect_inline_boundaries(html, text_nodes, byte_offsets)
 
     # Split regions at boundaries
     regions = _split_regions_at_boundaries(regions, boundaries)
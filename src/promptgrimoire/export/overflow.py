@@ -0,0 +1,190 @@
+"""Pre-compile estimate of marginalia overflow.
+
+When the margin notes on a page need more height than the page has,
+marginalia reports "Problems in placement" and some notes end up
+invisible.  :func:`promptgrimoire.export.pdf.compile_latex` detects that
+from the LaTeX log and recompiles with ``\\annotforceendnotestrue``, which
+doubles the cost of the most expensive stage for exactly the documents
+that are already slowest to compile.
+
+This module predicts the overflow before the first pass, so the export
+pipeline can set the flag up front.  The model is deliberately simple and
+conservative, mirroring the page geometry in ``promptgrimoire-export.sty``:
+
+- Body text flows at a fixed number of characters per line; each block
+  element (paragraph, list item, table cell) starts a new line.  This
+  places each annotation anchor (the end of its highlight, where
+  ``compute_highlight_spans`` attaches the ``\\annot``) on a page.  Line
+  starts come from the document's persisted text-node index when it
+  matches, so only documents without one are parsed.
+- Each note's height comes from its ``format_annot_latex`` output: the
+  ``\\scriptsize`` byline/attribution segments and the ``\\footnotesize``
+  body wrap at the margin width.  Notes taller than ``\\annotmaxht`` are
+  replaced by a one-line "(see endnotes)" stub, as the .sty does.
+- A page overflows only when its notes, stacked with marginalia's
+  ``ysep``, are taller than the whole text block -- no placement could fit
+  them.  Pages that marginalia fails to lay out for subtler reasons are
+  still caught by the log check after compilation.
+
+A false positive moves every annotation to endnotes unnecessarily, so the
+model errs towards under-predicting; a miss only costs the second pass it
+would have cost anyway.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from promptgrimoire.export.latex_format import format_annot_latex
+from promptgrimoire.export.text_index import export_html, line_starts, load_text_index
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+# Page geometry from promptgrimoire-export.sty (a4paper, 2.5cm top/bottom,
+# 2.5cm left, 6cm right; 12pt article class).  Lengths in points.
+_TEXT_HEIGHT_PT = 700.0  # 297mm - 2 * 25mm
+_BODY_CHARS_PER_LINE = 68  # 12pt serif across a 125mm text block
+_BODY_LINE_PT = 14.5
+_SECTION_HEADING_LINES = 3  # \section* heading between source documents
+
+# Margin note box: \hsize=4.3cm, \footnotesize (10pt) / \scriptsize (8pt).
+_NOTE_CHARS_PER_LINE = 27
+_NOTE_LINE_PT = 12.0
+_SCRIPT_CHARS_PER_LINE = 34
+_SCRIPT_LINE_PT = 9.5
+_NOTE_NUMBER_CHARS = 4  # "23. " prefix added by \annot
+_ANNOT_MAX_HT_PT = 113.8  # \annotmaxht = 4cm
+_YSEP_PT = 3.0
+
+_LATEX_COMMAND = re.compile(r"\\[A-Za-z]+\*?|\\.|[{}]")
+
+
+@dataclass(frozen=True)
+class MarginEstimate:
+    """Estimated margin-note load of an export.
+
+    Attributes:
+        pages: Estimated number of body pages.
+        notes: Number of annotations placed in the margin.
+        peak_fill: Height of the fullest page's margin notes as a fraction
+            of the text block height.
+    """
+
+    pages: int
+    notes: int
+    peak_fill: float
+
+    @property
+    def overflows(self) -> bool:
+        """True when some page's notes cannot fit its margin."""
+        return self.peak_fill > 1.0
+
+
+def _visible_length(latex: str) -> int:
+    """Approximate the number of printed characters in a LaTeX fragment."""
+    return len(_LATEX_COMMAND.sub("", latex).strip())
+
+
+def _note_height(annot_latex: str) -> float:
+    """Estimate the rendered height of one ``\\annot`` margin note."""
+    height = 0.0
+    for index, segment in enumerate(annot_latex.split(r"\par")):
+        if r"\hrulefill" in segment:
+            height += _NOTE_LINE_PT
+            continue
+        chars = _visible_length(segment)
+        if index == 0:
+            chars += _NOTE_NUMBER_CHARS
+        if r"\scriptsize" in segment:
+            # Attribution line, optionally followed by footnotesize comment text
+            attribution, _, text = segment.partition("}")
+            lines = math.ceil(
+                max(_visible_length(attribution), 1) / _SCRIPT_CHARS_PER_LINE
+            )
+            height += lines * _SCRIPT_LINE_PT
+            chars = _visible_length(text)
+            if not chars:
+                continue
+        height += math.ceil(max(chars, 1) / _NOTE_CHARS_PER_LINE) * _NOTE_LINE_PT
+    if height > _ANNOT_MAX_HT_PT:
+        # Long note: the .sty writes it to endnotes and leaves a stub
+        return _NOTE_LINE_PT
+    return height
+
+
+def _anchor_lines(
+    html: str, text_index: bytes | str | None, anchors: list[int], first_line: float
+) -> tuple[list[float], float]:
+    """Map char offsets to body line numbers for one document.
+
+    Returns:
+        The line number of each anchor and the line after the document.
+    """
+    starts, length = line_starts(html, load_text_index(text_index, html))
+    ends = [*starts[1:], length]
+    block_first_line: list[float] = []
+    line = first_line
+    for start, end in zip(starts, ends, strict=True):
+        block_first_line.append(line)
+        line += max(1, math.ceil((end - start) / _BODY_CHARS_PER_LINE))
+
+    positions: list[float] = []
+    for anchor in anchors:
+        block = max(bisect.bisect_right(starts, anchor) - 1, 0)
+        offset = max(anchor - starts[block], 0)
+        positions.append(block_first_line[block] + offset // _BODY_CHARS_PER_LINE)
+    return positions, line
+
+
+def estimate_margin_overflow(
+    documents: Iterable[tuple[str, list[dict[str, Any]], bytes | str | None]],
+) -> MarginEstimate:
+    """Estimate whether the margin notes of an export will overflow.
+
+    Args:
+        documents: ``(html, highlights, text_index)`` per source document,
+            in export order, with the document's stored HTML and persisted
+            text-node index (or None).  Documents follow each other on the
+            same page, separated by a section heading when there is more
+            than one.
+
+    Returns:
+        A :class:`MarginEstimate`; check :attr:`MarginEstimate.overflows`.
+        Exports without highlights are not laid out and report no pages.
+    """
+    documents = list(documents)
+    if not any(highlights for _html, highlights, _index in documents):
+        return MarginEstimate(pages=0, notes=0, peak_fill=0.0)
+
+    lines_per_page = _TEXT_HEIGHT_PT / _BODY_LINE_PT
+    page_heights: dict[int, float] = {}
+    notes = 0
+    line = 0.0
+    for content, highlights, text_index in documents:
+        if len(documents) > 1:
+            line += _SECTION_HEADING_LINES
+        # Highlight offsets refer to the HTML compute_highlight_spans sees
+        html = export_html(content)
+        if not html:
+            continue
+        anchors = [
+            int(hl.get("end_char", hl.get("start_char", 0))) for hl in highlights
+        ]
+        positions, line = _anchor_lines(html, text_index, anchors, line)
+        for hl, position in zip(highlights, positions, strict=True):
+            page = int(position // lines_per_page)
+            height = _note_height(format_annot_latex(hl, hl.get("para_ref", "")))
+            page_heights[page] = page_heights.get(page, 0.0) + height + _YSEP_PT
+            notes += 1
+
+    peak = max(page_heights.values(), default=0.0)
+    return MarginEstimate(
+        pages=max(1, math.ceil(line / lines_per_page)),
+        notes=notes,
+        peak_fill=round(peak / _TEXT_HEIGHT_PT, 3),
+    )
@@ -25,6 +25,7 @@ from promptgrimoire.export.html_normaliser import (
     strip_scripts_and_styles,
 )
 from promptgrimoire.export.list_normalizer import normalize_list_values
+from promptgrimoire.export.text_index import load_text_index
 from promptgrimoire.input_pipeline.paragraph_map import (
     inject_paragraph_markers_for_export,
 )
@@ -372,6 +373,8 @@ async def convert_html_with_annotations(
     tag_colours: dict[str, str],
     filter_paths: list[Path] | None = None,
     word_to_legal_para: dict[int, int | None] | None = None,
+    *,
+    text_index: bytes | str | None = None,
 ) -> str:
     """Convert HTML to LaTeX with annotations via highlight spans + Lua filter.
 
@@ -390,6 +393,8 @@ async def convert_html_with_annotations(
         filter_paths: Optional additional Lua filters (e.g. libreoffice.lua).
         word_to_legal_para: Optional mapping of char index to legal
             paragraph number.
+        text_index: The document's persisted text-node index, if any.
+            Ignored unless it was built from this HTML.
 
     Returns:
         LaTeX body with highlight + annotation commands.
@@ -412,6 +417,7 @@ async def convert_html_with_annotations(
         highlights,
         tag_colours,
         word_to_legal_para=word_to_legal_para,
+        text_index=load_text_index(text_index, html) if highlights else None,
     )
 
     # Inject paragraph number markers for PDF margin display
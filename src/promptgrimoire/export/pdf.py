@@ -173,6 +173,8 @@ async def compile_latex(tex_path: Path, output_dir: Path | None = None) -> Path:
     If marginalia reports placement problems (annotation overflow), the
     .tex is patched with ``\\annotforceendnotestrue`` and recompiled so
     all annotations appear as endnotes instead of invisible margin notes.
+    A .tex that already sets the flag (overflow predicted before the first
+    pass) is compiled once.
 
     Args:
         tex_path: Path to the .tex file.
@@ -191,6 +193,10 @@ async def compile_latex(tex_path: Path, output_dir: Path | None = None) -> Path:
     if _TEST_FLAGS["short_circuit_latexmk"]:
         raise LaTeXCompileStageShortCircuit(tex_path)
 
+    # Set up front when the export pipeline predicted the overflow
+    # (export/overflow.py); the recompile fallback is then moot.
+    forced_endnotes = r"\annotforceendnotestrue" in tex_path.read_text()
+
     async with _get_compile_semaphore():
         pdf_path = await _run_latexmk(tex_path, output_dir)
 
@@ -198,7 +204,8 @@ async def compile_latex(tex_path: Path, output_dir: Path | None = None) -> Path:
         # the margin column and are invisible in the PDF.  Recompile with
         # all annotations routed to endnotes.
         log_file = output_dir / (tex_path.stem + ".log")
-        if has_marginalia_placement_warnings(log_file):
+        recompiled = not forced_endnotes and has_marginalia_placement_warnings(log_file)
+        if recompiled:
             logger.warning(
                 "marginalia_placement_overflow",
                 export_stage="latex_compile",
@@ -210,6 +217,12 @@ async def compile_latex(tex_path: Path, output_dir: Path | None = None) -> Path:
             pdf_path.unlink(missing_ok=True)
             pdf_path = await _run_latexmk(tex_path, output_dir)
 
+        logger.info(
+            "latex_compile_passes",
+            export_stage="latex_compile",
+            forced_endnotes=forced_endnotes,
+            recompiled=recompiled,
+        )
         return pdf_path
 
 
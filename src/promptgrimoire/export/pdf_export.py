@@ -22,8 +22,17 @@ from uuid import uuid4
 
 import structlog
 
+from promptgrimoire.config import get_settings
+from promptgrimoire.export.cache import (
+    export_cache_key,
+    fetch_cached_export,
+    fetch_cached_fragment,
+    store_cached_export,
+    store_cached_fragment,
+)
+from promptgrimoire.export.overflow import estimate_margin_overflow
 from promptgrimoire.export.pandoc import convert_html_with_annotations
-from promptgrimoire.export.pdf import compile_latex
+from promptgrimoire.export.pdf import compile_latex, inject_annot_force_endnotes
 from promptgrimoire.export.platforms import preprocess_for_export
 from promptgrimoire.export.preamble import build_annotation_preamble
 from promptgrimoire.export.unicode_latex import detect_scripts, escape_unicode_latex
@@ -275,14 +284,23 @@ def _build_general_notes_section(
 # Path to Lua filter for LibreOffice HTML handling (tables, margins, etc.)
 _LIBREOFFICE_FILTER = Path(__file__).parent / "filters" / "libreoffice.lua"
 
+# Pandoc processes run at once for one multi-document export.
+_PANDOC_CONCURRENCY = 4
+
 
 async def _convert_single_document(
     html_content: str,
     highlights: list[dict[str, Any]],
     tag_colours: dict[str, str],
     word_to_legal_para: dict[int, int | None] | None = None,
+    text_index: bytes | str | None = None,
 ) -> str:
-    """Convert one document's HTML + highlights to a LaTeX body fragment."""
+    """Convert one document's HTML + highlights to a LaTeX body fragment.
+
+    Preprocessing here and in ``convert_html_with_annotations`` must stay
+    in step with ``text_index.export_html``, or stored text indexes stop
+    matching and exports fall back to the DOM walk.
+    """
     processed_html = preprocess_for_export(html_content) if html_content else ""
     return await convert_html_with_annotations(
         html=processed_html,
@@ -290,32 +308,96 @@ async def _convert_single_document(
         tag_colours=tag_colours,
         filter_paths=[_LIBREOFFICE_FILTER],
         word_to_legal_para=word_to_legal_para,
+        text_index=text_index,
     )
 
 
+async def _convert_cached_document(
+    doc: dict[str, Any],
+    tag_colours: dict[str, str],
+) -> tuple[str, bool]:
+    """Convert one document, reusing a cached fragment when unchanged.
+
+    The fragment key covers everything :func:`_convert_single_document`
+    reads: the document HTML, its highlights, the tag colours and the
+    legal paragraph map.  Titles are excluded; headings are added by the
+    caller.
+
+    Returns:
+        The LaTeX body fragment and whether it came from the cache.
+    """
+    key = export_cache_key(
+        "fragment",
+        {
+            "html_content": doc["html_content"],
+            "highlights": doc.get("highlights", []),
+            "tag_colours": tag_colours,
+            "word_to_legal_para": doc.get("word_to_legal_para"),
+        },
+    )
+    cached = fetch_cached_fragment(key)
+    if cached is not None:
+        return cached, True
+    latex = await _convert_single_document(
+        doc["html_content"],
+        doc.get("highlights", []),
+        tag_colours,
+        word_to_legal_para=doc.get("word_to_legal_para"),
+        text_index=doc.get("text_index"),
+    )
+    store_cached_fragment(key, latex)
+    return latex, False
+
+
 async def _build_multi_doc_body(
     documents: list[dict[str, Any]],
     tag_colours: dict[str, str],
+    *,
+    use_cache: bool = False,
 ) -> str:
     """Process multiple documents into a combined LaTeX body.
 
     Each document is converted independently (so highlight char offsets
     remain relative to their own HTML), then joined with section headings.
     Single-document workspaces omit the heading for backwards compatibility.
+
+    With *use_cache*, documents unchanged since an earlier export reuse
+    their cached LaTeX fragment and skip Pandoc.  Pandoc runs for the
+    remaining documents overlap, up to ``_PANDOC_CONCURRENCY`` at a time,
+    so a cold process start is paid once per batch rather than per document.
     """
+    semaphore = asyncio.Semaphore(_PANDOC_CONCURRENCY)
+
+    async def _convert(doc: dict[str, Any]) -> tuple[str, bool]:
+        async with semaphore:
+            if use_cache:
+                return await _convert_cached_document(doc, tag_colours)
+            latex = await _convert_single_document(
+                doc["html_content"],
+                doc.get("highlights", []),
+                tag_colours,
+                word_to_legal_para=doc.get("word_to_legal_para"),
+                text_index=doc.get("text_index"),
+            )
+            return latex, False
+
+    converted = await asyncio.gather(*(_convert(doc) for doc in documents))
+
     parts: list[str] = []
-    for i, doc in enumerate(documents):
-        latex = await _convert_single_document(
-            doc["html_content"],
-            doc.get("highlights", []),
-            tag_colours,
-            word_to_legal_para=doc.get("word_to_legal_para"),
-        )
+    for i, (doc, (latex, _hit)) in enumerate(zip(documents, converted, strict=True)):
         if len(documents) > 1:
             title = doc.get("title", f"Source {i + 1}")
             escaped = escape_unicode_latex(title)
             parts.append(f"\\section*{{{escaped}}}")
         parts.append(latex)
+    if use_cache:
+        hits = sum(hit for _latex, hit in converted)
+        logger.debug(
+            "export_fragment_cache",
+            documents=len(documents),
+            hits=hits,
+            misses=len(documents) - hits,
+        )
     return "\n\n".join(parts)
 
 
@@ -407,6 +489,96 @@ def _build_word_count_badge(
     return r"\noindent\textit{" + label + "}\n" + r"\vspace{1em}" + "\n"
 
 
+def _cache_inputs(
+    *,
+    html_content: str,
+    highlights: list[dict[str, Any]],
+    tag_colours: dict[str, str],
+    general_notes: str,
+    notes_latex: str,
+    word_to_legal_para: dict[int, int | None] | None,
+    word_count: int | None,
+    word_minimum: int | None,
+    word_limit: int | None,
+    documents: list[dict[str, Any]] | None,
+) -> dict[str, Any]:
+    """Collect the export arguments that determine the artefact's content.
+
+    The legacy single-document fields are ignored when *documents* is
+    given, matching how the pipeline itself chooses its input.
+    """
+    inputs: dict[str, Any] = {
+        "tag_colours": tag_colours,
+        "general_notes": general_notes,
+        "notes_latex": notes_latex,
+        "word_count": word_count,
+        "word_minimum": word_minimum,
+        "word_limit": word_limit,
+    }
+    if documents:
+        inputs["documents"] = documents
+    else:
+        inputs |= {
+            "html_content": html_content,
+            "highlights": highlights,
+            "word_to_legal_para": word_to_legal_para,
+        }
+    return inputs
+
+
+def _cached_export(
+    dest: Path, *, use_cache: bool, **inputs: Any
+) -> tuple[str | None, Path | None]:
+    """Look up the artefact *dest* would hold in the export cache.
+
+    The artefact kind is *dest*'s suffix; *inputs* are passed to
+    :func:`_cache_inputs`.
+
+    Returns:
+        ``(cache_key, cached_path)``.  The key is None when *use_cache*
+        is off, so there is nothing to store afterwards; the path is set
+        on a cache hit, with the artefact copied to *dest*.
+    """
+    if not use_cache:
+        return None, None
+    cache_key = export_cache_key(dest.suffix.removeprefix("."), _cache_inputs(**inputs))
+    return cache_key, fetch_cached_export(cache_key, dest.suffix, dest)
+
+
+def _choose_layout(
+    tex_path: Path,
+    html_content: str,
+    highlights: list[dict[str, Any]],
+    documents: list[dict[str, Any]] | None,
+    log: Any,
+) -> None:
+    """Route annotations to endnotes up front when the margin will overflow.
+
+    Saves :func:`compile_latex` its post-compile recompile for documents
+    whose notes cannot fit (see :mod:`promptgrimoire.export.overflow`).
+    Disabled by ``EXPORT__PREDICT_MARGIN_OVERFLOW``.
+    """
+    if not get_settings().export.predict_margin_overflow:
+        return
+    if documents:
+        inputs = [
+            (d["html_content"], d.get("highlights", []), d.get("text_index"))
+            for d in documents
+        ]
+    else:
+        inputs = [(html_content, highlights, None)]
+    estimate = estimate_margin_overflow(inputs)
+    log.info(
+        "marginalia_overflow_prediction",
+        predicted=estimate.overflows,
+        peak_fill=estimate.peak_fill,
+        notes=estimate.notes,
+        pages=estimate.pages,
+    )
+    if estimate.overflows:
+        inject_annot_force_endnotes(tex_path)
+
+
 async def generate_tex_only(
     html_content: str,
     highlights: list[dict[str, Any]],
@@ -421,6 +593,7 @@ async def generate_tex_only(
     word_minimum: int | None = None,
     word_limit: int | None = None,
     documents: list[dict[str, Any]] | None = None,
+    use_cache: bool = False,
 ) -> Path:
     """Generate a .tex file from HTML + annotations without compiling to PDF.
 
@@ -434,6 +607,9 @@ async def generate_tex_only(
     The legacy *html_content* / *highlights* parameters are used as a
     single-document fallback.
 
+    With *use_cache*, an identical earlier export is served from the
+    export cache (see :mod:`promptgrimoire.export.cache`).
+
     Returns:
         Path to the generated .tex file.
 
@@ -442,10 +618,31 @@ async def generate_tex_only(
     """
     # Ensure .sty is in the output directory before writing .tex
     ensure_sty_in_dir(output_dir)
+    tex_path = output_dir / f"{filename}.tex"
+
+    cache_key, cached = _cached_export(
+        tex_path,
+        use_cache=use_cache,
+        html_content=html_content,
+        highlights=highlights,
+        tag_colours=tag_colours,
+        general_notes=general_notes,
+        notes_latex=notes_latex,
+        word_to_legal_para=word_to_legal_para,
+        word_count=word_count,
+        word_minimum=word_minimum,
+        word_limit=word_limit,
+        documents=documents,
+    )
+    if cached is not None:
+        logger.info("export_cache_hit", artefact="tex", tex_path=str(tex_path))
+        return tex_path
 
     # Build LaTeX body from documents list or legacy single-doc params
     if documents:
-        latex_body = await _build_multi_doc_body(documents, tag_colours)
+        latex_body = await _build_multi_doc_body(
+            documents, tag_colours, use_cache=use_cache
+        )
     else:
         if highlights and (not html_content or not html_content.strip()):
             raise ValueError(
@@ -478,8 +675,9 @@ async def generate_tex_only(
         general_notes_section=notes_section,
     )
 
-    tex_path = output_dir / f"{filename}.tex"
     tex_path.write_text(document)
+    if cache_key is not None:
+        store_cached_export(cache_key, ".tex", tex_path)
 
     return tex_path
 
@@ -500,6 +698,8 @@ async def export_annotation_pdf(
     word_minimum: int | None = None,
     word_limit: int | None = None,
     documents: list[dict[str, Any]] | None = None,
+    stage_timings: dict[str, int] | None = None,
+    use_cache: bool = False,
 ) -> Path:
     """Generate PDF with annotations from live annotation data.
 
@@ -512,9 +712,19 @@ async def export_annotation_pdf(
     The legacy *html_content* / *highlights* parameters are used as a
     single-document fallback.
 
+    When *stage_timings* is given, each completed stage's duration in
+    milliseconds is stored under its stage name, so callers can record
+    how far a failed export got.
+
+    With *use_cache*, an identical earlier export is served from the
+    export cache without running pandoc or LaTeX, and successful
+    compilations are added to it.
+
     Returns:
         Path to the generated PDF file.
     """
+    if stage_timings is None:
+        stage_timings = {}
     t_export_start = time.monotonic()
     export_id = str(uuid4())
     log = logger.bind(export_id=export_id)
@@ -529,10 +739,34 @@ async def export_annotation_pdf(
         output_dir,
     )
 
+    cache_key, cached = _cached_export(
+        output_dir / f"{filename}.pdf",
+        use_cache=use_cache,
+        html_content=html_content,
+        highlights=highlights,
+        tag_colours=tag_colours,
+        general_notes=general_notes,
+        notes_latex=notes_latex,
+        word_to_legal_para=word_to_legal_para,
+        word_count=word_count,
+        word_minimum=word_minimum,
+        word_limit=word_limit,
+        documents=documents,
+    )
+    if cached is not None:
+        log.info(
+            "export_complete",
+            cache_hit=True,
+            total_duration_ms=round((time.monotonic() - t_export_start) * 1000),
+        )
+        return cached
+
     # --- Stage: pandoc_convert ---
     t0 = time.monotonic()
     if documents:
-        latex_body = await _build_multi_doc_body(documents, tag_colours)
+        latex_body = await _build_multi_doc_body(
+            documents, tag_colours, use_cache=use_cache
+        )
     else:
         if highlights and (not html_content or not html_content.strip()):
             raise ValueError(
@@ -542,10 +776,11 @@ async def export_annotation_pdf(
         latex_body = await _convert_single_document(
             html_content, highlights, tag_colours, word_to_legal_para
         )
+    stage_timings["pandoc_convert"] = round((time.monotonic() - t0) * 1000)
     log.info(
         "export_stage_complete",
         export_stage="pandoc_convert",
-        stage_duration_ms=round((time.monotonic() - t0) * 1000),
+        stage_duration_ms=stage_timings["pandoc_convert"],
     )
 
     # --- Stage: tex_generate ---
@@ -573,19 +808,24 @@ async def export_annotation_pdf(
     )
     tex_path = output_dir / f"{filename}.tex"
     tex_path.write_text(document)
+    _choose_layout(tex_path, html_content, highlights, documents, log)
+    stage_timings["tex_generate"] = round((time.monotonic() - t0) * 1000)
     log.info(
         "export_stage_complete",
         export_stage="tex_generate",
-        stage_duration_ms=round((time.monotonic() - t0) * 1000),
+        stage_duration_ms=stage_timings["tex_generate"],
     )
 
     # --- Stage: latex_compile ---
     t0 = time.monotonic()
     pdf_path = await compile_latex(tex_path, output_dir)
+    if cache_key is not None:
+        store_cached_export(cache_key, ".pdf", pdf_path)
+    stage_timings["latex_compile"] = round((time.monotonic() - t0) * 1000)
     log.info(
         "export_stage_complete",
         export_stage="latex_compile",
-        stage_duration_ms=round((time.monotonic() - t0) * 1000),
+        stage_duration_ms=stage_timings["latex_compile"],
     )
 
     # --- Export complete ---
@@ -24,7 +24,12 @@ import structlog
 if TYPE_CHECKING:
     from selectolax.lexbor import LexborHTMLParser
 
-__all__ = ["PlatformHandler", "get_handler", "preprocess_for_export"]
+__all__ = [
+    "PlatformHandler",
+    "get_handler",
+    "preprocess_for_export",
+    "preprocess_tree",
+]
 
 logger = structlog.get_logger()
 # Registry of platform handlers, populated by autodiscovery
@@ -123,6 +128,39 @@ def preprocess_for_export(html: str, platform_hint: str | None = None) -> str:
     """
     from selectolax.lexbor import LexborHTMLParser  # noqa: PLC0415
 
+    tree = LexborHTMLParser(html)
+    labelled = _preprocess(tree, html, platform_hint)
+    if labelled is not None:
+        return labelled
+    return tree.html or html
+
+
+def preprocess_tree(
+    tree: LexborHTMLParser,
+    html: str,
+    platform_hint: str | None = None,
+) -> LexborHTMLParser:
+    """Tree form of :func:`preprocess_for_export` for multi-stage pipelines.
+
+    Modifies *tree* (parsed from *html*, which is still used for platform
+    detection) in place and returns it.  Speaker-label injection is a regex
+    over the serialised HTML, so when labels are injected the labelled HTML
+    is parsed into a new tree and that is returned instead.
+    """
+    from selectolax.lexbor import LexborHTMLParser  # noqa: PLC0415
+
+    labelled = _preprocess(tree, html, platform_hint)
+    if labelled is not None:
+        return LexborHTMLParser(labelled)
+    return tree
+
+
+def _preprocess(
+    tree: LexborHTMLParser,
+    html: str,
+    platform_hint: str | None,
+) -> str | None:
+    """Run the tree stages on *tree*; return labelled HTML if labels were added."""
     from promptgrimoire.export.platforms.base import (  # noqa: PLC0415
         collapse_wrapper_divs,
         remove_common_chrome,
@@ -139,8 +177,6 @@ def preprocess_for_export(html: str, platform_hint: str | None = None) -> str:
     else:
         handler = get_handler(html)
 
-    tree = LexborHTMLParser(html)
-
     # Platform-specific preprocessing (if handler found)
     if handler:
         handler.preprocess(tree)
@@ -151,26 +187,27 @@ def preprocess_for_export(html: str, platform_hint: str | None = None) -> str:
     # Collapse bare wrapper divs so Pandoc sees flat structure
     collapse_wrapper_divs(tree)
 
-    # Get processed HTML
-    result = tree.html or html
+    if not handler:
+        return None
 
-    # Inject speaker labels (if handler found AND not already present).
+    # Inject speaker labels (if not already present).
     # Client-side paste handler may have already injected labels —
     # skip to avoid double-injection (P1 root cause).
-    already_has_labels = "data-speaker=" in result
-    if handler and not already_has_labels:
-        markers = handler.get_turn_markers()
-
-        for role, pattern in markers.items():
-            if not _ROLE_NAME_RE.match(role):
-                msg = f"Role name {role!r} is not safe for HTML attribute injection"
-                raise ValueError(msg)
-            result = re.sub(
-                pattern,
-                rf'<div data-speaker="{role}" class="speaker-turn"></div>\1',
-                result,
-                flags=re.IGNORECASE,
-            )
+    result = tree.html or html
+    if "data-speaker=" in result:
+        return None
+    markers = handler.get_turn_markers()
+
+    for role, pattern in markers.items():
+        if not _ROLE_NAME_RE.match(role):
+            msg = f"Role name {role!r} is not safe for HTML attribute injection"
+            raise ValueError(msg)
+        result = re.sub(
+            pattern,
+            rf'<div data-speaker="{role}" class="speaker-turn"></div>\1',
+            result,
+            flags=re.IGNORECASE,
+        )
 
     return result
 
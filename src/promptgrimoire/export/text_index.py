@@ -0,0 +1,292 @@
+"""Persisted text-node offset index for export.
+
+``compute_highlight_spans`` needs, for every text node in a document, its
+range in the collapsed character stream and its byte range in the
+serialised HTML.  Rebuilding that with ``walk_and_map`` +
+``find_text_node_offsets`` on every export parses the whole document and
+then re-scans the HTML backwards from every text node to find block and
+inline boundaries -- quadratic on long judgments.
+
+Those facts depend only on the document content, so
+:func:`build_text_index` computes them once when the content is written
+(``add_document`` / ``update_document_content``) and packs them into a
+compact binary blob stored beside ``paragraph_map``.  The index describes
+the HTML as the export pipeline sees it after its own preprocessing, not
+the stored HTML, since that preprocessing is not idempotent.
+
+:func:`load_text_index` maps a stored blob onto memoryviews without
+copying, after checking it was built from exactly the HTML being
+exported.  Any mismatch (edited content, a changed export preprocessing
+step, an older index format) returns ``None`` and the caller falls back to
+the DOM walk, so a stale index costs time, never correctness.
+
+Blob layout (little-endian)::
+
+    header   magic b"PGTI", format version (u16), reserved (u16),
+             node count n (u32), blake2b-128 digest of the export HTML
+    arrays   char_start[n], char_end[n], html_start[n], html_end[n] (i32)
+    flags    n bytes: bit 0 = block boundary, bit 1 = inline boundary
+             at the node's char_start
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import bisect
+import hashlib
+import html as html_module
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+
+import structlog
+
+from promptgrimoire.export.html_normaliser import (
+    fix_midword_font_splits,
+    strip_scripts_and_styles,
+)
+from promptgrimoire.export.platforms import preprocess_for_export
+from promptgrimoire.export.span_boundaries import (
+    _detect_block_boundaries,
+    _detect_inline_boundaries,
+)
+from promptgrimoire.input_pipeline.marker_insertion import find_text_node_offsets
+from promptgrimoire.input_pipeline.text_extraction import (
+    _WHITESPACE_RUN,
+    TextNodeInfo,
+    walk_and_map,
+)
+
+logger = structlog.get_logger()
+
+_MAGIC = b"PGTI"
+# Bump whenever walk_and_map, find_text_node_offsets or the boundary
+# detection in span_boundaries changes what they compute.  Changes to the
+# export preprocessing need no bump: they change the digest instead.
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHHI16s")
+_ARRAYS = 4
+_BLOCK_BOUNDARY = 0x01
+_INLINE_BOUNDARY = 0x02
+
+
+def _digest(html: str) -> bytes:
+    return hashlib.blake2b(html.encode(), digest_size=16).digest()
+
+
+def _int32_view(blob: memoryview, start: int, count: int) -> memoryview | array[int]:
+    """View *count* little-endian int32 values at *start* without copying."""
+    chunk = blob[start : start + 4 * count]
+    if sys.byteorder == "little":
+        return chunk.cast("i")
+    values = array("i", chunk)
+    values.byteswap()
+    return values
+
+
+@dataclass(frozen=True)
+class TextNodeIndex:
+    """Text-node offsets for one document, as loaded by :func:`load_text_index`.
+
+    Attributes:
+        char_starts: Start of each text node in the collapsed char stream.
+        char_ends: End (exclusive) of each text node in the char stream.
+        html_starts: Offset of each text node in the serialised HTML.
+        html_ends: End (exclusive) of each text node in the HTML.
+        flags: Boundary flags per text node.
+    """
+
+    char_starts: memoryview | array[int]
+    char_ends: memoryview | array[int]
+    html_starts: memoryview | array[int]
+    html_ends: memoryview | array[int]
+    flags: memoryview
+
+    def __len__(self) -> int:
+        return len(self.char_starts)
+
+    def node_at(self, char_idx: int) -> int:
+        """Return the index of the last text node starting at or before *char_idx*.
+
+        Returns ``-1`` when *char_idx* precedes the first text node.
+        """
+        return bisect.bisect_right(self.char_starts, char_idx) - 1
+
+    def text_nodes(self, html: str) -> tuple[list[TextNodeInfo], list[int]]:
+        """Rebuild ``walk_and_map`` text nodes and their HTML offsets.
+
+        Equivalent to ``walk_and_map(html)`` followed by
+        ``find_text_node_offsets(html, text_nodes)``, without parsing.
+        """
+        nodes: list[TextNodeInfo] = []
+        for start, end, html_start, html_end in zip(
+            self.char_starts,
+            self.char_ends,
+            self.html_starts,
+            self.html_ends,
+            strict=True,
+        ):
+            html_text = html[html_start:html_end]
+            decoded = html_module.unescape(html_text)
+            nodes.append(
+                TextNodeInfo(
+                    html_text=html_text,
+                    decoded_text=decoded,
+                    collapsed_text=_WHITESPACE_RUN.sub(" ", decoded),
+                    char_start=start,
+                    char_end=end,
+                )
+            )
+        return nodes, list(self.html_starts)
+
+    def block_boundaries(self) -> set[int]:
+        """Char positions where a new block starts (``_detect_block_boundaries``)."""
+        return {
+            self.char_starts[i]
+            for i, flag in enumerate(self.flags)
+            if flag & _BLOCK_BOUNDARY
+        }
+
+    def inline_boundaries(self) -> set[int]:
+        """Char positions where inline formatting changes."""
+        return {
+            self.char_starts[i]
+            for i, flag in enumerate(self.flags)
+            if flag & _INLINE_BOUNDARY
+        }
+
+
+def export_html(content: str) -> str:
+    """Apply the export pipeline's preprocessing to stored document HTML.
+
+    Mirrors ``pdf_export._convert_single_document`` followed by the first
+    steps of ``pandoc.convert_html_with_annotations``: the HTML that
+    ``compute_highlight_spans`` receives.
+    """
+    html = preprocess_for_export(content) if content else ""
+    return fix_midword_font_splits(strip_scripts_and_styles(html))
+
+
+def line_starts(html: str, index: TextNodeIndex | None = None) -> tuple[list[int], int]:
+    """Return the char offsets where body text starts a new line, and its length.
+
+    A new line starts at every block boundary and after every ``<br>``.
+    With *index* (loaded for *html*) no parsing is needed; ``<br>``
+    newlines are the chars that fall between consecutive text nodes, so
+    trailing ``<br>`` after the last text node are not counted.
+    """
+    if index is None:
+        chars, text_nodes = walk_and_map(html)
+        if not text_nodes:
+            return [0], 0
+        starts = _detect_block_boundaries(
+            html, text_nodes, find_text_node_offsets(html, text_nodes)
+        )
+        starts.update(i + 1 for i, char in enumerate(chars) if char == "\n")
+        length = len(chars)
+    else:
+        if not len(index):
+            return [0], 0
+        starts = index.block_boundaries()
+        previous_end = 0
+        for start, end in zip(index.char_starts, index.char_ends, strict=True):
+            starts.update(range(previous_end + 1, start + 1))
+            previous_end = end
+        length = index.char_ends[-1]
+    starts.add(0)
+    return sorted(b for b in starts if b <= length), length
+
+
+def build_text_index(content: str) -> bytes | None:
+    """Build the persisted text-node index for a document's stored HTML.
+
+    Returns ``None`` when the document has no text, or when a text node
+    cannot be reconstructed from the stored offsets alone (the
+    HTML-decoded source slice differs from the parser's decoding, which
+    only happens for malformed entities).  Documents without an index use
+    the DOM walk.
+    """
+    html = export_html(content)
+    if not html:
+        return None
+    _chars, text_nodes = walk_and_map(html)
+    if not text_nodes:
+        return None
+    try:
+        offsets = find_text_node_offsets(html, text_nodes)
+    except ValueError:
+        logger.warning("text_index_offsets_unresolved", exc_info=True)
+        return None
+
+    count = len(text_nodes)
+    columns = [array("i", [0]) * count for _ in range(_ARRAYS)]
+    for i, (info, offset) in enumerate(zip(text_nodes, offsets, strict=True)):
+        if html_module.unescape(info.html_text) != info.decoded_text:
+            logger.debug("text_index_not_reconstructible", node=i)
+            return None
+        columns[0][i] = info.char_start
+        columns[1][i] = info.char_end
+        columns[2][i] = offset
+        columns[3][i] = offset + len(info.html_text)
+
+    flags = bytearray(count)
+    position = {info.char_start: i for i, info in enumerate(text_nodes)}
+    for char_pos in _detect_block_boundaries(html, text_nodes, offsets):
+        flags[position[char_pos]] |= _BLOCK_BOUNDARY
+    for char_pos in _detect_inline_boundaries(html, text_nodes, offsets):
+        flags[position[char_pos]] |= _INLINE_BOUNDARY
+
+    if sys.byteorder != "little":
+        for column in columns:
+            column.byteswap()
+    header = _HEADER.pack(_MAGIC, _FORMAT_VERSION, 0, count, _digest(html))
+    return b"".join([header, *(column.tobytes() for column in columns), flags])
+
+
+def load_text_index(blob: bytes | str | None, html: str) -> TextNodeIndex | None:
+    """Load a stored index, or ``None`` if it does not describe *html*.
+
+    Args:
+        blob: Index bytes from ``WorkspaceDocument.text_index``, or their
+            base64 text form (see :func:`text_index_to_json`) from an
+            export job payload.
+        html: The HTML passed to ``compute_highlight_spans``.  The index
+            is only returned if it was built from exactly this HTML.
+    """
+    if not blob:
+        return None
+    if isinstance(blob, str):
+        try:
+            blob = base64.b64decode(blob, validate=True)
+        except binascii.Error:
+            logger.warning("text_index_invalid_base64")
+            return None
+    view = memoryview(blob)
+    if len(view) < _HEADER.size:
+        return None
+    magic, version, _reserved, count, digest = _HEADER.unpack_from(view)
+    expected = _HEADER.size + count * (4 * _ARRAYS + 1)
+    if magic != _MAGIC or version != _FORMAT_VERSION or len(view) != expected:
+        return None
+    if digest != _digest(html):
+        return None
+
+    columns = [
+        _int32_view(view, _HEADER.size + 4 * count * n, count) for n in range(_ARRAYS)
+    ]
+    return TextNodeIndex(
+        char_starts=columns[0],
+        char_ends=columns[1],
+        html_starts=columns[2],
+        html_ends=columns[3],
+        flags=view[_HEADER.size + 4 * count * _ARRAYS :],
+    )
+
+
+def text_index_to_json(blob: bytes | None) -> str | None:
+    """Encode stored index bytes for a JSON export job payload."""
+    if blob is None:
+        return None
+    return base64.b64encode(blob).decode("ascii")
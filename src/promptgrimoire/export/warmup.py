@@ -0,0 +1,84 @@
+"""Toolchain warm-up for the standalone export worker.
+
+The first export after a deploy or reboot pays for much more than its own
+work: LuaLaTeX builds the luaotfload font-name database and per-font
+caches, and every Pandoc, Lua filter and TeX tree file is read cold from
+disk.  Later exports reuse those on-disk caches but would otherwise still
+be the ones paying for them.
+
+:func:`warm_export_toolchain` runs one throwaway export through the real
+pipeline (Pandoc with the Lua filters, then latexmk with the export
+preamble) in a temporary directory, so that cost is paid at worker start
+instead of by a student's first export.  Warm-up failures are logged and
+never stop the worker; a broken toolchain surfaces on real jobs as before.
+
+A precompiled LuaLaTeX format or a resident Pandoc server would cut
+further, but neither fits this pipeline: luaotfload's fonts and Lua state
+cannot be dumped into a format, and ``pandoc server`` does not run Lua
+filters.
+"""
+
+from __future__ import annotations
+
+import tempfile
+import time
+from pathlib import Path
+
+import structlog
+
+from promptgrimoire.export.pdf import compile_latex
+from promptgrimoire.export.pdf_export import generate_tex_only
+
+logger = structlog.get_logger()
+
+# Exercises the Lua filters, a tag colour and the notes section.
+_WARMUP_HTML = "<h1>Warm-up</h1><p>PromptGrimoire export warm-up.</p>"
+_WARMUP_TAG_COLOURS = {"warmup": "#1f77b4"}
+_WARMUP_HIGHLIGHTS = [
+    {
+        "id": "warmup",
+        "start_char": 0,
+        "end_char": 7,
+        "tag": "warmup",
+        "text": "Warm-up",
+        "author": "warm-up",
+        "created_at": "2026-01-01T00:00:00+00:00",
+        "comments": [],
+    }
+]
+
+
+async def warm_export_toolchain() -> bool:
+    """Run one throwaway export to warm Pandoc and LuaLaTeX caches.
+
+    Returns:
+        True if the warm-up export compiled, False if it failed.
+    """
+    started = time.monotonic()
+    with tempfile.TemporaryDirectory(prefix="promptgrimoire_warmup_") as tmp:
+        output_dir = Path(tmp)
+        try:
+            tex_path = await generate_tex_only(
+                html_content=_WARMUP_HTML,
+                highlights=_WARMUP_HIGHLIGHTS,
+                tag_colours=_WARMUP_TAG_COLOURS,
+                output_dir=output_dir,
+                notes_latex="Warm-up notes.",
+                filename="warmup",
+            )
+            tex_ms = round((time.monotonic() - started) * 1000)
+            await compile_latex(tex_path, output_dir)
+        except Exception:
+            logger.warning(
+                "export_toolchain_warmup_failed",
+                elapsed_ms=round((time.monotonic() - started) * 1000),
+                exc_info=True,
+            )
+            return False
+
+    logger.info(
+        "export_toolchain_warmed",
+        tex_generate_ms=tex_ms,
+        total_ms=round((time.monotonic() - started) * 1000),
+    )
+    return True
@@ -1,16 +1,19 @@
 """Background worker for processing PDF export jobs.
 
 Polls for queued ExportJob rows, runs the export pipeline, and
-manages job lifecycle (claim, complete, fail). Follows the same
-polling-loop pattern as deadline_worker.py and search_worker.py.
+manages job lifecycle (claim, complete, fail), recording per-stage
+timings to ExportJobMetric. Follows the same polling-loop pattern as
+deadline_worker.py and search_worker.py.
 """
 
 from __future__ import annotations
 
 import asyncio
+import os
 import secrets
 import shutil
 import tempfile
+import time
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -21,10 +24,16 @@ from structlog.contextvars import bind_contextvars, clear_contextvars
 from promptgrimoire.db.export_jobs import (
     claim_next_job,
     cleanup_expired_jobs,
+    cleanup_job_metrics,
     complete_job,
     fail_job,
     fail_orphaned_jobs,
+    record_job_metric,
 )
+from promptgrimoire.db.models import ExportJobMetric
+from promptgrimoire.db.notify import EXPORT_TOPIC, wait_for_wakeup
+from promptgrimoire.diagnostics import current_rss_mb
+from promptgrimoire.export.cache import evict_export_cache
 from promptgrimoire.export.pdf import LaTeXCompilationError
 from promptgrimoire.export.pdf_export import export_annotation_pdf
 
@@ -35,6 +44,9 @@ if TYPE_CHECKING:
 
 logger = structlog.get_logger()
 
+# Metrics are kept well past job retention for capacity planning.
+_METRIC_RETENTION = timedelta(days=30)
+
 _LATEX_USER_MESSAGE = (
     "PDF export failed due to a server configuration issue."
     " Retrying will not help."
@@ -78,6 +90,8 @@ async def _process_job(job: ExportJob) -> None:
     # given one, and we'd have no reference to it on failure.
     ws_prefix = str(job.workspace_id)[:8]
     output_dir = Path(tempfile.mkdtemp(prefix=f"promptgrimoire_export_{ws_prefix}_"))
+    stage_timings: dict[str, int] = {}
+    t_start = time.monotonic()
 
     try:
         payload = job.payload or {}
@@ -95,11 +109,14 @@ async def _process_job(job: ExportJob) -> None:
             word_minimum=payload.get("word_minimum"),
             word_limit=payload.get("word_limit"),
             documents=payload.get("documents"),
+            stage_timings=stage_timings,
+            use_cache=True,
         )
 
         download_token = secrets.token_urlsafe(48)
         await complete_job(job.id, download_token, str(pdf_path))
         log.info("export_worker_job_completed", pdf_path=str(pdf_path))
+        outcome = "completed"
 
     except Exception as exc:
         # CancelledError is not a subclass of Exception, so it propagates
@@ -109,69 +126,148 @@ async def _process_job(job: ExportJob) -> None:
         # Clean up the temp dir — failed jobs have no pdf_path,
         # so cleanup_expired_jobs would never delete it.
         shutil.rmtree(output_dir, ignore_errors=True)
+        outcome = "failed"
 
     finally:
         clear_contextvars()
 
+    await _record_metric(job, outcome, stage_timings, t_start)
+
+
+async def _record_metric(
+    job: ExportJob,
+    outcome: str,
+    stage_timings: dict[str, int],
+    t_start: float,
+) -> None:
+    """Store per-stage timings and memory use for a processed job.
+
+    Metrics are best-effort: a failed insert is logged, never surfaced
+    as a job failure.
+    """
+    metric = ExportJobMetric(
+        job_id=job.id,
+        worker_pid=os.getpid(),
+        outcome=outcome,
+        pandoc_convert_ms=stage_timings.get("pandoc_convert"),
+        tex_generate_ms=stage_timings.get("tex_generate"),
+        latex_compile_ms=stage_timings.get("latex_compile"),
+        total_ms=round((time.monotonic() - t_start) * 1000),
+        rss_mb=current_rss_mb(),
+    )
+    try:
+        await record_job_metric(metric)
+    except Exception:
+        logger.warning("export_job_metric_failed", job_id=str(job.id), exc_info=True)
+
+
+def _should_recycle(job: ExportJob | None, max_rss_mb: int) -> bool:
+    """Return True (and log) when the worker should exit to be replaced.
+
+    Resident memory is sampled only after a job ran, since an idle poll
+    does not grow it, and compared against *max_rss_mb* (0 disables).
+    """
+    if job is None or not max_rss_mb:
+        return False
+    rss_mb = current_rss_mb()
+    if rss_mb is None or rss_mb <= max_rss_mb:
+        return False
+    logger.warning(
+        "export_worker_rss_cap_reached", rss_mb=rss_mb, max_rss_mb=max_rss_mb
+    )
+    return True
+
 
 async def _run_cleanup() -> None:
-    """Delete expired jobs older than 24 hours."""
+    """Delete expired jobs older than 24 hours and trim the export cache."""
     cutoff = datetime.now(UTC) - timedelta(hours=24)
     count = await cleanup_expired_jobs(cutoff)
     if count:
         logger.info("export_worker_cleanup", deleted_count=count)
+    metrics = await cleanup_job_metrics(datetime.now(UTC) - _METRIC_RETENTION)
+    if metrics:
+        logger.info("export_worker_metric_cleanup", deleted_count=metrics)
+    evicted = await asyncio.to_thread(evict_export_cache)
+    if evicted:
+        logger.info("export_cache_evicted", deleted_count=evicted)
+
+
+async def _poll_once(*, run_cleanup: bool) -> ExportJob | None:
+    """Claim and process the next queued job, then optionally clean up.
+
+    Failures are logged rather than raised so the worker loop carries on.
+
+    Returns:
+        The claimed job, or None if the queue was empty.
+    """
+    job = None
+    try:
+        job = await claim_next_job()
+        if job is not None:
+            await _process_job(job)
+
+        if run_cleanup:
+            try:
+                await _run_cleanup()
+            except Exception:
+                logger.exception("export_worker_cleanup_failed")
+
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        logger.exception("export_worker_iteration_failed")
+    return job
 
 
 async def start_export_worker(
     poll_interval: float = 5.0,
     cleanup_interval: int = 60,
     on_poll_cycle: Callable[[], None] | None = None,
+    *,
+    recover_orphans: bool = True,
+    max_rss_mb: int = 0,
 ) -> None:
     """Start the background export polling worker.
 
-    Claims queued jobs and processes them in a loop. Runs cleanup
-    every ``cleanup_interval`` iterations.
+    Claims queued jobs and processes them in a loop, claiming the next
+    job straight away after each one. Runs cleanup every
+    ``cleanup_interval`` iterations.
 
     Parameters
     ----------
     poll_interval : float
-        Sleep duration between polling cycles (seconds).
+        Fallback polling interval (seconds) while the queue is empty;
+        an ``export_job`` insert notification wakes the worker sooner.
     cleanup_interval : int
         Run cleanup every N iterations.
     on_poll_cycle : Callable[[], None] | None
         Optional callback invoked at the end of each poll iteration,
         before sleeping. Used by the standalone worker to send
         systemd watchdog heartbeats.
+    recover_orphans : bool
+        Fail queued/running jobs left by a previous shutdown before
+        starting.  Pooled children pass False: the supervisor recovers
+        once, before any child can claim a job.
+    max_rss_mb : int
+        Return after a job once resident memory exceeds this many MB,
+        so a supervisor can replace the process.  0 disables the cap.
     """
-    # Fail any jobs orphaned by a previous server shutdown.
-    orphaned = await fail_orphaned_jobs()
-    if orphaned:
-        logger.warning("export_worker_orphaned_jobs_failed", count=orphaned)
+    if recover_orphans:
+        # Fail any jobs orphaned by a previous server shutdown.
+        orphaned = await fail_orphaned_jobs()
+        if orphaned:
+            logger.warning("export_worker_orphaned_jobs_failed", count=orphaned)
 
     logger.info(
         "export_worker_started",
         poll_interval=poll_interval,
         cleanup_interval=cleanup_interval,
+        max_rss_mb=max_rss_mb,
     )
     iteration = 0
     while True:
-        try:
-            iteration += 1
-
-            job = await claim_next_job()
-            if job is not None:
-                await _process_job(job)
-
-            if iteration % cleanup_interval == 0:
-                try:
-                    await _run_cleanup()
-                except Exception:
-                    logger.exception("export_worker_cleanup_failed")
-
-        except asyncio.CancelledError:
-            raise
-        except Exception:
-            logger.exception("export_worker_iteration_failed")
+        iteration += 1
+        job = await _poll_once(run_cleanup=iteration % cleanup_interval == 0)
 
         if on_poll_cycle is not None:
             try:
@@ -179,4 +275,8 @@ async def start_export_worker(
             except Exception:
                 logger.warning("on_poll_cycle_failed", exc_info=True)
 
-        await asyncio.sleep(poll_interval)
+        if _should_recycle(job, max_rss_mb):
+            return
+
+        if job is None:
+            await wait_for_wakeup(EXPORT_TOPIC, poll_interval)
@@ -3,27 +3,54 @@
 Entry point for running the export worker outside the NiceGUI app process.
 Invoked as: python -m promptgrimoire.export.worker_main
 
-Initialises logging, database engine, runs the poll loop, and handles
-SIGTERM by cancelling the current job and shutting down.
+Initialises logging, database engine, warms the Pandoc/LuaLaTeX caches
+with a throwaway export (``EXPORT__WARM_TOOLCHAIN``), runs the poll loop,
+and handles SIGTERM by cancelling the current job and shutting down.
+
+With ``EXPORT__WORKER_PROCESSES`` > 1 the process instead supervises a
+pool of spawned children, each running its own poll loop (jobs are
+claimed with SKIP LOCKED, so children never collide).  Children that
+exit -- crashed, or recycled after exceeding ``EXPORT__WORKER_MAX_RSS_MB``
+-- are replaced, with backoff for children that keep failing at startup.
 """
 
 from __future__ import annotations
 
 import asyncio
 import contextlib
+import multiprocessing
 import signal
 import sys
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 import structlog
 
 from promptgrimoire import sd_notify
 from promptgrimoire.config import get_settings
-from promptgrimoire.db import close_db, init_db
+from promptgrimoire.db import close_db, fail_orphaned_jobs, init_db
+from promptgrimoire.db.notify import start_wakeup_listener
+from promptgrimoire.export.warmup import warm_export_toolchain
 from promptgrimoire.export.worker import start_export_worker
 from promptgrimoire.logging_config import setup_logging
 
+if TYPE_CHECKING:
+    from multiprocessing.context import SpawnContext
+    from multiprocessing.process import BaseProcess
+
 logger = structlog.get_logger()
 
+# Seconds between child liveness checks (also the watchdog heartbeat).
+_SUPERVISE_INTERVAL = 1.0
+# Seconds a child gets to finish cleanup after SIGTERM before SIGKILL.
+_CHILD_STOP_TIMEOUT = 20.0
+# A child exiting sooner than this after spawn counts as a startup failure.
+_CHILD_MIN_UPTIME = 30.0
+# Respawn delay after consecutive startup failures doubles up to this cap.
+_CHILD_RESPAWN_BACKOFF_MAX = 60.0
+# Consecutive startup failures after which a pool slot is abandoned.
+_CHILD_MAX_FAST_EXITS = 5
+
 # Mutable container so _handle_signal can reference the event created
 # inside main()'s event loop.  Avoids binding to a stale loop at import time.
 _shutdown_event: asyncio.Event | None = None
@@ -69,25 +96,188 @@ async def main() -> int:
     for sig in (signal.SIGTERM, signal.SIGINT):
         loop.add_signal_handler(sig, _handle_signal, sig)
 
-    worker_task = asyncio.create_task(
-        start_export_worker(
-            on_poll_cycle=lambda: sd_notify.notify("WATCHDOG=1"),
-        ),
-    )
+    # Pool children share the on-disk font and TeX caches, so one warm-up
+    # here covers them all.
+    if settings.export.warm_toolchain:
+        await warm_export_toolchain()
+
+    pool_size = settings.export.worker_processes
+    if pool_size > 1:
+        listener_task = None
+        worker_task = asyncio.create_task(_supervise_pool(pool_size))
+    else:
+        listener_task = asyncio.create_task(start_wakeup_listener())
+        worker_task = asyncio.create_task(
+            start_export_worker(
+                on_poll_cycle=lambda: sd_notify.notify("WATCHDOG=1"),
+            ),
+        )
 
     # Wait for shutdown signal
     await _shutdown_event.wait()
 
     sd_notify.notify("STOPPING=1")
     logger.info("worker_shutting_down")
-    worker_task.cancel()
-    with contextlib.suppress(asyncio.CancelledError):
-        await worker_task
+    for task in (worker_task, listener_task):
+        if task is None:
+            continue
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
 
     await close_db()
     logger.info("worker_stopped")
     return 0
 
 
+@dataclass
+class _ChildSlot:
+    """One pool slot: its current child and startup-failure bookkeeping."""
+
+    index: int
+    process: BaseProcess | None = None
+    started_at: float = 0.0
+    fast_exits: int = 0
+    respawn_at: float | None = None
+
+    @property
+    def active(self) -> bool:
+        """Whether the slot has a running child or a respawn pending."""
+        return self.process is not None or self.respawn_at is not None
+
+    def spawn(self, ctx: SpawnContext, now: float) -> None:
+        child = ctx.Process(
+            target=_child_entry, args=(self.index,), name=f"export-worker-{self.index}"
+        )
+        child.start()
+        self.process = child
+        self.started_at = now
+        self.respawn_at = None
+        logger.info("export_worker_child_started", child=self.index, pid=child.pid)
+
+    def poll(self, ctx: SpawnContext, now: float) -> None:
+        """Reap an exited child and respawn it once its backoff has passed."""
+        child = self.process
+        if child is not None and not child.is_alive():
+            child.join()
+            self.process = None
+            logger.info(
+                "export_worker_child_exited",
+                child=self.index,
+                pid=child.pid,
+                exitcode=child.exitcode,
+            )
+            self._schedule_respawn(child, now)
+        if self.respawn_at is not None and self.respawn_at <= now:
+            self.spawn(ctx, now)
+
+    def _schedule_respawn(self, child: BaseProcess, now: float) -> None:
+        if now - self.started_at < _CHILD_MIN_UPTIME:
+            self.fast_exits += 1
+        else:
+            self.fast_exits = 0
+        if self.fast_exits >= _CHILD_MAX_FAST_EXITS:
+            logger.error(
+                "export_worker_child_abandoned",
+                child=self.index,
+                exitcode=child.exitcode,
+                fast_exits=self.fast_exits,
+            )
+            return
+        delay = 0.0
+        if self.fast_exits:
+            delay = min(
+                _SUPERVISE_INTERVAL * 2 ** (self.fast_exits - 1),
+                _CHILD_RESPAWN_BACKOFF_MAX,
+            )
+        self.respawn_at = now + delay
+
+
+async def _supervise_pool(size: int) -> None:
+    """Keep *size* child workers running until cancelled.
+
+    Orphaned jobs are failed once here, before any child starts, so a
+    child starting later can never fail a job a sibling is running.
+
+    A child that exits within ``_CHILD_MIN_UPTIME`` of starting is
+    respawned with exponential backoff; after ``_CHILD_MAX_FAST_EXITS``
+    such exits in a row its slot is abandoned.  When every slot is
+    abandoned the supervisor returns, which stops the watchdog heartbeat
+    so systemd restarts the service.
+    """
+    orphaned = await fail_orphaned_jobs()
+    if orphaned:
+        logger.warning("export_worker_orphaned_jobs_failed", count=orphaned)
+
+    loop = asyncio.get_running_loop()
+    ctx = multiprocessing.get_context("spawn")
+    slots = [_ChildSlot(index) for index in range(size)]
+
+    logger.info("export_worker_pool_started", size=size)
+    try:
+        for slot in slots:
+            slot.spawn(ctx, loop.time())
+        while True:
+            sd_notify.notify("WATCHDOG=1")
+            now = loop.time()
+            for slot in slots:
+                slot.poll(ctx, now)
+            if not any(slot.active for slot in slots):
+                logger.error("export_worker_pool_failed", size=size)
+                return
+            await asyncio.sleep(_SUPERVISE_INTERVAL)
+    finally:
+        children = [slot.process for slot in slots if slot.process is not None]
+        await asyncio.to_thread(_stop_children, children)
+
+
+def _stop_children(children: list[BaseProcess]) -> None:
+    """SIGTERM every child, then SIGKILL any still running after the timeout."""
+    for child in children:
+        if child.is_alive():
+            child.terminate()
+    for child in children:
+        child.join(_CHILD_STOP_TIMEOUT)
+        if child.is_alive():
+            logger.warning("export_worker_child_killed", pid=child.pid)
+            child.kill()
+            child.join()
+
+
+def _child_entry(index: int) -> None:
+    """Spawned process entry point for one pooled export worker."""
+    # Ctrl-C reaches the whole process group; let the supervisor decide.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    sys.exit(asyncio.run(_run_child(index)))
+
+
+async def _run_child(index: int) -> int:
+    """Run one pooled worker until SIGTERM or its RSS cap is reached."""
+    setup_logging()
+    await init_db()
+
+    stop = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+
+    listener_task = asyncio.create_task(start_wakeup_listener())
+    worker_task = asyncio.create_task(
+        start_export_worker(
+            recover_orphans=False,
+            max_rss_mb=get_settings().export.worker_max_rss_mb,
+        ),
+    )
+    stop_task = asyncio.create_task(stop.wait())
+    await asyncio.wait({worker_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+
+    for task in (worker_task, stop_task, listener_task):
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    await close_db()
+    logger.info("export_worker_child_stopped", child=index)
+    return 0
+
+
 if __name__ == "__main__":
     sys.exit(asyncio.run(main()))
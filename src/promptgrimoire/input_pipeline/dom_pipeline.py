@@ -0,0 +1,77 @@
+"""Single-parse DOM pipeline for the input cleaning stages.
+
+``process_input`` used to hand an HTML string from stage to stage:
+platform preprocessing, attribute stripping and empty-element removal
+each parsed the document and serialised it again.  On large AustLII
+judgments and long PDF conversions those round trips dominated import
+time and held several copies of the document in memory at once.
+
+:class:`DomPipeline` parses once into a ``LexborHTMLParser`` tree, runs
+each stage on that tree in place and serialises once at the end::
+
+    html = (
+        DomPipeline(raw_html)
+        .preprocess(platform_hint)
+        .strip_heavy_attributes()
+        .remove_empty_elements()
+        .serialise()
+    )
+
+Read-only analysis of the result (paragraph maps, numbering detection,
+text extraction) accepts a parsed tree too (see
+:func:`~promptgrimoire.input_pipeline.text_extraction.as_tree`), but must
+use a parse of the *serialised* output rather than the mutated tree:
+removing or unwrapping nodes leaves adjacent text nodes unmerged, and
+char offsets are defined on the HTML the client receives.
+"""
+
+from __future__ import annotations
+
+from selectolax.lexbor import LexborHTMLParser
+
+from promptgrimoire.input_pipeline.sanitisation import (
+    remove_empty_elements_tree,
+    strip_heavy_attributes_tree,
+)
+
+
+class DomPipeline:
+    """Run input cleaning stages over one parsed tree.
+
+    Stages return ``self`` so they can be chained.  The pipeline is not
+    thread-safe; run a whole pipeline in one thread (e.g. via
+    ``asyncio.to_thread``).
+    """
+
+    def __init__(self, html: str) -> None:
+        self._source = html
+        self._tree = LexborHTMLParser(html)
+
+    @property
+    def tree(self) -> LexborHTMLParser:
+        """The tree being transformed."""
+        return self._tree
+
+    def preprocess(self, platform_hint: str | None = None) -> DomPipeline:
+        """Remove platform chrome and inject speaker labels."""
+        # Lazy import to break circular dependency:
+        # input_pipeline -> export.platforms -> export -> highlight_spans
+        # -> input_pipeline
+        from promptgrimoire.export.platforms import preprocess_tree  # noqa: PLC0415
+
+        self._tree = preprocess_tree(self._tree, self._source, platform_hint)
+        return self
+
+    def strip_heavy_attributes(self) -> DomPipeline:
+        """Drop inline styles, data attributes and other heavy attributes."""
+        strip_heavy_attributes_tree(self._tree)
+        return self
+
+    def remove_empty_elements(self) -> DomPipeline:
+        """Remove paragraphs and divs holding only whitespace or ``<br>``."""
+        remove_empty_elements_tree(self._tree)
+        return self
+
+    def serialise(self) -> str:
+        """Serialise the tree, falling back to the input for empty documents."""
+        return self._tree.html or self._source
@@ -5,7 +5,8 @@ All input types (HTML, RTF, DOCX, PDF, plain text) go through the same
 HTML-based pipeline for character-level annotation support.
 
 Text extraction and marker insertion live in ``text_extraction``.
-HTML sanitisation lives in ``sanitisation``.  This module re-exports
+HTML sanitisation lives in ``sanitisation`` and runs over a single
+parsed tree via ``dom_pipeline``.  This module re-exports
 their public API for backward compatibility.
 """
 
@@ -25,15 +26,12 @@ from promptgrimoire.input_pipeline.converters import (
     convert_docx_to_html,
     convert_pdf_to_html,
 )
+from promptgrimoire.input_pipeline.dom_pipeline import DomPipeline
 from promptgrimoire.input_pipeline.marker_insertion import (
     collapsed_to_html_offset,
     find_text_node_offsets,
     insert_markers_into_dom,
 )
-from promptgrimoire.input_pipeline.sanitisation import (
-    remove_empty_elements,
-    strip_heavy_attributes,
-)
 from promptgrimoire.input_pipeline.text_extraction import (
     TextNodeInfo,
     extract_text_from_html,
@@ -248,6 +246,17 @@ def _text_to_html(text: str) -> str:
 # ---------------------------------------------------------------------------
 
 
+def _clean_html(html: str, platform_hint: str | None) -> str:
+    """Preprocess and sanitise *html* with a single parse and serialise."""
+    return (
+        DomPipeline(html)
+        .preprocess(platform_hint)
+        .strip_heavy_attributes()
+        .remove_empty_elements()
+        .serialise()
+    )
+
+
 async def process_input(
     content: str | bytes,
     source_type: ContentType,
@@ -270,6 +279,9 @@ async def process_input(
         2. Preprocess for export (remove chrome, inject speaker labels)
         3. Strip heavy attributes and empty elements
 
+        Steps 2 and 3 share one parsed tree (see ``DomPipeline``) and
+        run in a worker thread.
+
     Note:
         DOCX and PDF conversion supported via converters module.
         RTF conversion is not yet implemented.
@@ -324,27 +336,13 @@ async def process_input(
         html_size / max(input_size, 1),
     )
 
-    # Step 2: Preprocess (remove chrome, inject speaker labels)
-    # Lazy import to break circular dependency:
-    # input_pipeline -> export.platforms -> export -> highlight_spans -> input_pipeline
-    from promptgrimoire.export.platforms import preprocess_for_export
-
-    preprocessed = preprocess_for_export(html, platform_hint=platform_hint)
-    preproc_size = len(preprocessed)
-    logger.debug(
-        "[PIPELINE] After preprocess: size=%d bytes (%.1f KB), ratio=%.1fx",
-        preproc_size,
-        preproc_size / 1024,
-        preproc_size / max(input_size, 1),
-    )
-
-    # Step 3: Strip unnecessary attributes to reduce size
-    # (pasted HTML often has huge inline styles, data attributes, etc.)
-    stripped = strip_heavy_attributes(preprocessed)
-
-    # Step 4: Remove empty paragraphs/divs that only contain <br> tags
-    # (Office apps use these for spacing, creates excessive whitespace)
-    cleaned = remove_empty_elements(stripped)
+    # Steps 2-4 run over one parsed tree, off the event loop:
+    # - preprocess (remove chrome, inject speaker labels)
+    # - strip unnecessary attributes to reduce size (pasted HTML often
+    #   has huge inline styles, data attributes, etc.)
+    # - remove empty paragraphs/divs that only contain <br> tags (Office
+    #   apps use these for spacing, creates excessive whitespace)
+    cleaned = await asyncio.to_thread(_clean_html, html, platform_hint)
     final_size = len(cleaned)
     logger.debug(
         "[PIPELINE] Final output: size=%d bytes (%.1f KB), ratio=%.1fx from input",
@@ -26,6 +26,7 @@ from promptgrimoire.input_pipeline.text_extraction import (
     _BLOCK_TAGS,
     _STRIP_TAGS,
     _WHITESPACE_RUN,
+    as_tree,
 )
 
 # Block elements that participate in paragraph-map traversal.
@@ -240,7 +241,7 @@ def _walk(node: Any, state: _WalkState) -> None:
 
 
 def build_paragraph_map(
-    html: str,
+    html: str | LexborHTMLParser,
     *,
     auto_number: bool = True,
 ) -> dict[int, int]:
@@ -252,7 +253,8 @@ def build_paragraph_map(
     output.
 
     Args:
-        html: Document HTML (clean, no char-span wrappers).
+        html: Document HTML (clean, no char-span wrappers), or a parse
+            of it (see ``as_tree()``).
         auto_number: If ``True``, assign sequential paragraph
             numbers to block elements.  If ``False``, use
             ``<li value="N">`` attributes (source-number mode).
@@ -265,7 +267,7 @@ def build_paragraph_map(
     if not html:
         return {}
 
-    tree = LexborHTMLParser(html)
+    tree = as_tree(html)
     body = tree.body
     root = body if body else tree.root
     if root is None:
@@ -282,7 +284,7 @@ def build_paragraph_map(
 
 
 def build_paragraph_map_for_json(
-    html: str,
+    html: str | LexborHTMLParser,
     *,
     auto_number: bool = True,
 ) -> dict[str, int]:
@@ -293,7 +295,8 @@ def build_paragraph_map_for_json(
     JSONB and JavaScript ``Object`` keys.
 
     Args:
-        html: Document HTML (clean, no char-span wrappers).
+        html: Document HTML (clean, no char-span wrappers), or a parse
+            of it.
         auto_number: If ``True``, assign sequential paragraph
             numbers.  If ``False``, use ``<li value="N">``
             attributes (source-number mode).
@@ -593,20 +596,19 @@ def inject_paragraph_markers_for_export(
     )
 
 
-def detect_source_numbering(html: str) -> bool:
+def detect_source_numbering(html: str | LexborHTMLParser) -> bool:
     """Detect whether *html* uses explicit source paragraph numbering.
 
     Returns ``True`` if 2 or more ``<li>`` elements have an explicit
     ``value`` attribute, indicating AustLII-style numbered paragraphs.
 
     Args:
-        html: Document HTML to inspect.
+        html: Document HTML to inspect, or a parse of it.
 
     Returns:
         ``True`` if source-numbered, ``False`` otherwise.
     """
     if not html:
         return False
-    tree = LexborHTMLParser(html)
-    matches = tree.css("li[value]")
+    matches = as_tree(html).css("li[value]")
     return len(matches) >= 2
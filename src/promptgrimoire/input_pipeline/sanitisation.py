@@ -82,12 +82,15 @@ def strip_heavy_attributes(html: str) -> str:
         return html
 
     tree = LexborHTMLParser(html)
+    strip_heavy_attributes_tree(tree)
+    return tree.html or html
+
 
+def strip_heavy_attributes_tree(tree: LexborHTMLParser) -> None:
+    """In-place form of :func:`strip_heavy_attributes` on a parsed tree."""
     for node in tree.css("*"):
         _strip_node_attrs(node)
 
-    return tree.html or html
-
 
 def _is_empty_element(node: Any) -> bool:
     """Return whether *node* is empty (whitespace-only, <br>-only, or no children).
@@ -106,14 +109,6 @@ def _is_empty_element(node: Any) -> bool:
     return all(child.tag == "br" for child in node.iter())
 
 
-def _is_sole_content_element(node: Any, tree: LexborHTMLParser) -> bool:
-    """Return whether *node* is the only content element inside ``<body>``."""
-    body = tree.css_first("body")
-    if not body:
-        return False
-    return all(n == node for n in body.css("p, div, span"))
-
-
 def remove_empty_elements(html: str) -> str:
     """Remove empty paragraphs and divs that only contain whitespace or <br> tags.
 
@@ -126,16 +121,28 @@ def remove_empty_elements(html: str) -> str:
         return html
 
     tree = LexborHTMLParser(html)
+    remove_empty_elements_tree(tree)
+    return tree.html or html
+
 
+def remove_empty_elements_tree(tree: LexborHTMLParser) -> None:
+    """In-place form of :func:`remove_empty_elements` on a parsed tree."""
     changed = True
     while changed:
         changed = False
-        for node in tree.css("p, div, span"):
+        candidates = tree.css("p, div, span")
+        # An empty element only has <br> children, so removing one never
+        # removes another candidate: the count of remaining p/div/span
+        # elements drops by exactly one per removal.  Tracking it avoids
+        # re-querying <body> for every node (quadratic on large documents).
+        body = tree.css_first("body")
+        remaining = len(body.css("p, div, span")) if body else 0
+        for node in candidates:
             if not _is_empty_element(node):
                 continue
-            if _is_sole_content_element(node, tree):
+            if body is not None and remaining == 1:
+                # Sole content element inside <body> -- keep it
                 continue
             node.decompose()
+            remaining -= 1
             changed = True
-
-    return tree.html or html
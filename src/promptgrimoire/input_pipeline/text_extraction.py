@@ -97,9 +97,23 @@ def _collapse_text_node(node: Any) -> str | None:
     return _WHITESPACE_RUN.sub(" ", text)
 
 
-def _get_dom_root(html: str) -> Any | None:
+def as_tree(html: str | LexborHTMLParser) -> LexborHTMLParser:
+    """Return *html* parsed, or unchanged when it is already a parsed tree.
+
+    Lets read-only stages (text extraction, paragraph mapping, numbering
+    detection) share one parse of the same document instead of each
+    parsing the HTML string again.  Callers must not pass a tree that has
+    been mutated since it was parsed from the stored HTML: char offsets
+    are defined on a fresh parse of that HTML.
+    """
+    if isinstance(html, LexborHTMLParser):
+        return html
+    return LexborHTMLParser(html)
+
+
+def _get_dom_root(html: str | LexborHTMLParser) -> Any | None:
     """Parse *html* and return the root element for text walking."""
-    tree = LexborHTMLParser(html)
+    tree = as_tree(html)
     body = tree.body
     root = body if body else tree.root
     return root
@@ -149,7 +163,7 @@ def _walk_dom(
         child = child.next
 
 
-def extract_text_from_html(html: str) -> list[str]:
+def extract_text_from_html(html: str | LexborHTMLParser) -> list[str]:
     """Extract text characters from clean HTML, matching JS walkTextNodes.
 
     Walks the DOM via selectolax child/next iteration (which exposes text
@@ -164,7 +178,8 @@ def extract_text_from_html(html: str) -> list[str]:
     - Whitespace runs (including ``\\u00a0``) -> collapsed to single space
 
     Args:
-        html: Clean HTML without char span wrappers.
+        html: Clean HTML without char span wrappers, or a parse of it
+            (see :func:`as_tree`).
 
     Returns:
         List of characters in document order.
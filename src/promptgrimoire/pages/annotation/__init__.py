@@ -8,7 +8,7 @@ This page provides the new workspace-based annotation flow:
 
 Route: /annotation
 
-Package structure (31 authored modules):
+Package structure (33 authored modules):
     __init__                Core types, globals, route definition
     broadcast               Multi-client sync and remote presence
     card_shared             Shared card helpers (author display, initials)
@@ -25,6 +25,7 @@ Package structure (31 authored modules):
     paste_script            Client-side paste interception JavaScript
     pdf_export              PDF export orchestration
     placement               Placement dialog (course/activity assignment)
+    presence                Coalesced cursor/selection fan-out to peers
     respond                 Respond tab (reference panel, editor)
     sharing                 Sharing controls and per-user sharing dialog
     sidebar                 Vue annotation sidebar component (AnnotationSidebar)
@@ -40,6 +41,7 @@ Package structure (31 authored modules):
     word_count_badge        Word count badge UI component
     word_count_enforcement  Export-time word count violation check
     workspace               Workspace view, document rendering, tag callbacks
+    yjs_relay               Binary socket.io relay for Milkdown Yjs updates
 """
 
 from __future__ import annotations
@@ -113,6 +115,7 @@ class _RemotePresence:
     selection_start: int | None = None
     selection_end: int | None = None
     has_milkdown_editor: bool = False
+    yjs_outbox: Any = None  # yjs_relay.YjsOutbox, set once the editor is ready
     user_id: str | None = None
     viewer_is_privileged: bool = False
     is_owner: bool = False
@@ -235,6 +238,11 @@ class PageState:
     word_count_badge: ui.label | None = None
     # UI elements set during page build
     highlight_style: ui.element | None = None
+    # What the browser's CSS highlights were last built from, so pushes
+    # send only the difference: (document_id, doc_container_id, CRDT
+    # highlight_seq), and highlight id -> (tag, start_char, end_char).
+    pushed_highlights_at: tuple[str | None, str, int] | None = None
+    pushed_highlights: dict[str, tuple[str, int, int]] = field(default_factory=dict)
     highlight_menu: ui.element | None = None
     save_status: ui.label | None = None
     user_count_badge: ui.label | None = None  # Shows connected user count
@@ -27,12 +27,19 @@ from promptgrimoire.pages.annotation import (
     _workspace_registry,
 )
 from promptgrimoire.pages.annotation.highlights import _update_highlight_css
+from promptgrimoire.pages.annotation.presence import (
+    _PresenceUpdate,
+    drop_fanout,
+    get_fanout,
+)
 
 if TYPE_CHECKING:
     from uuid import UUID
 
     from nicegui import Client
 
+    from promptgrimoire.config import CrdtRegistryConfig
+
 logger = structlog.get_logger()
 
 
@@ -139,41 +146,12 @@ def _broadcast_cursor_update(
     state: PageState,
     char_index: int | None,
 ) -> None:
-    """Broadcast cursor position to all other clients (fire-and-forget)."""
+    """Queue a cursor position for the next coalesced presence flush."""
     clients = _workspace_presence.get(workspace_key, {})
     if client_id in clients:
         clients[client_id].cursor_char = char_index
-    if char_index is None:
-        js = _render_js(t"removeRemoteCursor({client_id})")
-        _broadcast_js_to_others(workspace_key, client_id, js)
-        return
-    color = state.user_color
-    ctnr_id = state.doc_container_id
-    for cid, presence in list(clients.items()):
-        if cid == client_id or presence.nicegui_client is None:
-            continue
-        name = resolve_broadcast_label(
-            sender_name=state.user_name,
-            sender_user_id=state.user_id,
-            receiver_user_id=presence.user_id,
-            is_anonymous=state.is_anonymous,
-            receiver_is_privileged=presence.viewer_is_privileged,
-            sender_is_privileged=state.viewer_is_privileged,
-        )
-        js = _render_js(
-            t"if (typeof renderRemoteCursor"
-            t"    === 'function')"
-            t"  renderRemoteCursor("
-            t"    document.getElementById("
-            t"      {ctnr_id}),"
-            t"    {client_id}, {char_index},"
-            t"    {name}, {color})"
-        )
-        with contextlib.suppress(Exception):
-            presence.nicegui_client.run_javascript(
-                js,
-                timeout=2.0,
-            )
+    value = None if char_index is None else (char_index,)
+    get_fanout(workspace_key).submit(_PresenceUpdate(client_id, state, "cursor", value))
 
 
 def _broadcast_selection_update(
@@ -183,40 +161,15 @@ def _broadcast_selection_update(
     start: int | None,
     end: int | None,
 ) -> None:
-    """Broadcast text selection to all other clients (fire-and-forget)."""
+    """Queue a text selection for the next coalesced presence flush."""
     clients = _workspace_presence.get(workspace_key, {})
     if client_id in clients:
         clients[client_id].selection_start = start
         clients[client_id].selection_end = end
-    if start is None or end is None:
-        js = _render_js(t"removeRemoteSelection({client_id})")
-        _broadcast_js_to_others(workspace_key, client_id, js)
-        return
-    color = state.user_color
-    for cid, presence in list(clients.items()):
-        if cid == client_id or presence.nicegui_client is None:
-            continue
-        name = resolve_broadcast_label(
-            sender_name=state.user_name,
-            sender_user_id=state.user_id,
-            receiver_user_id=presence.user_id,
-            is_anonymous=state.is_anonymous,
-            receiver_is_privileged=presence.viewer_is_privileged,
-            sender_is_privileged=state.viewer_is_privileged,
-        )
-        ctnr = state.doc_container_id
-        js = _render_js(
-            t"if (typeof renderRemoteSelection"
-            t"    === 'function')"
-            t"  renderRemoteSelection("
-            t"    {client_id}, {start}, {end},"
-            t"    {name}, {color}, {ctnr})"
-        )
-        with contextlib.suppress(Exception):
-            presence.nicegui_client.run_javascript(
-                js,
-                timeout=2.0,
-            )
+    value = None if start is None or end is None else (start, end)
+    get_fanout(workspace_key).submit(
+        _PresenceUpdate(client_id, state, "selection", value)
+    )
 
 
 def _replay_existing_cursors(
@@ -295,7 +248,10 @@ async def _handle_client_delete(
         _workspace_presence[workspace_key].pop(client_id, None)
         if not _workspace_presence[workspace_key]:
             del _workspace_presence[workspace_key]
+            drop_fanout(workspace_key)
             last_client = True
+        else:
+            get_fanout(workspace_key).forget(client_id)
         removal_js = _render_js(
             t"removeRemoteCursor({client_id});removeRemoteSelection({client_id})"
         )
@@ -330,6 +286,30 @@ async def _handle_client_delete(
     )
 
 
+def _workspace_has_presence(doc_id: str) -> bool:
+    """Return True if the registry document's workspace has presence."""
+    return bool(_workspace_presence.get(doc_id.removeprefix("ws-")))
+
+
+async def start_registry_eviction_worker(config: CrdtRegistryConfig) -> None:
+    """Periodically evict idle or excess CRDT documents from the registry.
+
+    Workspaces with connected clients are pinned; everything else is
+    subject to the idle TTL, document cap and byte budget in *config*.
+    """
+    while True:
+        await asyncio.sleep(config.sweep_interval_seconds)
+        try:
+            await _workspace_registry.evict(
+                idle_seconds=config.idle_seconds,
+                max_documents=config.max_documents,
+                max_bytes=config.max_bytes,
+                is_pinned=_workspace_has_presence,
+            )
+        except Exception:
+            logger.exception("crdt_registry_eviction_failed")
+
+
 async def _handle_remote_update(state: PageState) -> None:
     """Process a CRDT update received from another client.
 
@@ -455,21 +435,20 @@ def _setup_client_sync(
 
 
 def _broadcast_yjs_update(
-    workspace_id: UUID, origin_client_id: str, b64_update: str
+    workspace_id: UUID, origin_client_id: str, update: bytes
 ) -> None:
     """Relay a Yjs update from one client's Milkdown editor to all others.
 
-    Sends ``window._applyRemoteUpdate(b64)`` to every connected client
-    that has initialised the Milkdown editor, except the originating client.
+    Queues the raw update on the binary outbox (see ``yjs_relay``) of every
+    connected client that has initialised the Milkdown editor, except the
+    originating client.
     """
     ws_key = str(workspace_id)
     for cid, cstate in list(_workspace_presence.get(ws_key, {}).items()):
         if cid == origin_client_id:
             continue
-        if cstate.has_milkdown_editor and cstate.nicegui_client:
-            cstate.nicegui_client.run_javascript(
-                f"window._applyRemoteUpdate('{b64_update}')"
-            )
+        if cstate.has_milkdown_editor and cstate.yjs_outbox is not None:
+            cstate.yjs_outbox.push(update)
             logger.debug(
                 "YJS_RELAY ws=%s from=%s to=%s",
                 ws_key,
@@ -24,6 +24,7 @@ from promptgrimoire.pages.annotation.css import (
 from promptgrimoire.pages.annotation.highlights import (
     _add_highlight,
     _build_highlight_json,
+    _push_highlights_to_client,
 )
 
 logger = structlog.get_logger()
@@ -255,7 +256,13 @@ def _inject_highlight_scripts(state: PageState) -> None:
     Injects script tags via ``add_body_html`` for full page loads, plus a
     dynamic loader for SPA navigations where ``add_body_html`` scripts are
     absent.
+
+    Pushes made before init runs take precedence over the snapshot
+    embedded here: a parked full push is applied instead, and highlights
+    already patched in place are left alone. The browser asks for a full
+    push via ``highlights_resync`` when it has nothing to patch.
     """
+    ui.on("highlights_resync", lambda _e: _push_highlights_to_client(state, full=True))
     ui.add_body_html('<script src="/static/annotation-highlight.js"></script>')
     ui.add_body_html('<script src="/static/annotation-card-sync.js"></script>')
     ui.add_body_html('<script src="/static/annotation-copy-protection.js"></script>')
@@ -272,7 +279,10 @@ def _inject_highlight_scripts(state: PageState) -> None:
         t"    var c = document.getElementById({state.doc_container_id});"
         t"    if (!c) return;"
         t"    window._textNodes = walkTextNodes(c);"
-        t"    applyHighlights(c, {highlight_json});"
+        t"    var pending = window._pendingHighlights;"
+        t"    delete window._pendingHighlights;"
+        t"    if (pending && pending.id === c.id) applyHighlights(c, pending.data);"
+        t"    else if (!hasLiveHighlights(c)) applyHighlights(c, {highlight_json});"
         t"    setupAnnotationSelection({state.doc_container_id}, function(sel) {{"
         t"      emitEvent('selection_made', sel);"
         t"    }}, {state.highlight_menu_id});"
@@ -109,7 +109,7 @@ def _get_annotation_count(state: PageState, doc_id: UUID) -> int:
     """
     if state.crdt_doc is None:
         return 0
-    return len(state.crdt_doc.get_highlights_for_document(str(doc_id)))
+    return state.crdt_doc.count_highlights_for_document(str(doc_id))
 
 
 def _render_delete_button(
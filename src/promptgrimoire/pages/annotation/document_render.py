@@ -8,6 +8,7 @@ on tab_bar.py.
 
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Awaitable, Callable
 from typing import TYPE_CHECKING, Any
 
@@ -20,8 +21,8 @@ from promptgrimoire.pages.annotation.document import (
     _render_document_with_highlights,
 )
 from promptgrimoire.pages.annotation.highlights import _add_highlight
-from promptgrimoire.pages.annotation.respond import word_count
 from promptgrimoire.pages.annotation.word_count_badge import format_word_count_badge
+from promptgrimoire.word_count import word_count
 
 if TYPE_CHECKING:
     from uuid import UUID
@@ -89,7 +90,7 @@ async def render_document_container(
     # Initialise word count badge from existing CRDT content
     if state.word_count_badge is not None:
         initial_md = str(crdt_doc.response_draft_markdown)
-        initial_count = word_count(initial_md)
+        initial_count = await asyncio.to_thread(word_count, initial_md)
         badge_state = format_word_count_badge(
             initial_count, state.word_minimum, state.word_limit
         )
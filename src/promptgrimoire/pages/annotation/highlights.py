@@ -104,18 +104,35 @@ def _execute_pending_scroll(state: PageState) -> None:
     ui.run_javascript(js)
 
 
+def _highlight_region(hl: dict[str, Any]) -> tuple[str, int, int]:
+    """Return the ``(tag, start_char, end_char)`` the browser renders."""
+    return (
+        hl.get("tag", "highlight"),
+        int(hl.get("start_char", 0)),
+        int(hl.get("end_char", 0)),
+    )
+
+
+def _document_key(state: PageState) -> str | None:
+    return str(state.document_id) if state.document_id is not None else None
+
+
 def _build_highlight_json(state: PageState) -> str:
     """Build JSON highlight data from CRDT state for ``applyHighlights()``.
 
     Groups highlights by tag into the format expected by the JS function:
     ``{tag: [{start_char, end_char, id}, ...], ...}``
 
+    Also records what was serialised on ``state``, so later pushes can
+    send only what changed (see ``_push_highlights_to_client``).
+
     Returns:
         JSON string ready for injection into ``applyHighlights()`` call.
     """
     if state.crdt_doc is None:
         return "{}"
 
+    seq = state.crdt_doc.highlight_seq
     if state.document_id is not None:
         highlights = state.crdt_doc.get_highlights_for_document(str(state.document_id))
     else:
@@ -123,49 +140,126 @@ def _build_highlight_json(state: PageState) -> str:
 
     # Group by tag
     by_tag: dict[str, list[dict[str, Any]]] = {}
+    pushed: dict[str, tuple[str, int, int]] = {}
     for hl in highlights:
-        tag = hl.get("tag", "highlight")
-        entry = {
-            "start_char": int(hl.get("start_char", 0)),
-            "end_char": int(hl.get("end_char", 0)),
-            "id": hl.get("id", ""),
-        }
+        tag, start_char, end_char = region = _highlight_region(hl)
+        hl_id = hl.get("id", "")
+        pushed[hl_id] = region
+        entry = {"start_char": start_char, "end_char": end_char, "id": hl_id}
         by_tag.setdefault(tag, []).append(entry)
 
+    state.pushed_highlights = pushed
+    state.pushed_highlights_at = (_document_key(state), state.doc_container_id, seq)
     return json.dumps(by_tag)
 
 
-def _push_highlights_to_client(state: PageState) -> None:
-    """Push current highlight state to the client via ``applyHighlights()``.
+def _build_highlight_delta(state: PageState) -> dict[str, list[Any]] | None:
+    """Diff CRDT highlights against what the browser last received.
+
+    Only highlights in the CRDT change journal since the last push are
+    examined, so the cost follows the number of edits, not highlights.
+
+    Returns:
+        ``{"upsert": [{id, tag, start_char, end_char}, ...],
+        "remove": [id, ...]}``, or None when the browser's highlights
+        cannot be patched: nothing pushed yet, another document or
+        container, or the journal no longer reaches back far enough.
+    """
+    crdt_doc = state.crdt_doc
+    pushed_at = state.pushed_highlights_at
+    doc_key = _document_key(state)
+    if crdt_doc is None or pushed_at is None:
+        return None
+    if pushed_at[:2] != (doc_key, state.doc_container_id):
+        return None
+    changed = crdt_doc.highlight_changes_since(pushed_at[2])
+    if changed is None:
+        return None
+
+    pushed = state.pushed_highlights
+    upsert: list[dict[str, Any]] = []
+    remove: list[str] = []
+    for hl_id in changed:
+        hl = crdt_doc.get_highlight(hl_id)
+        if hl is None or (doc_key is not None and hl.get("document_id") != doc_key):
+            if pushed.pop(hl_id, None) is not None:
+                remove.append(hl_id)
+            continue
+        region = _highlight_region(hl)
+        # Comment and para_ref edits leave the rendered region unchanged
+        if pushed.get(hl_id) == region:
+            continue
+        pushed[hl_id] = region
+        tag, start_char, end_char = region
+        upsert.append(
+            {"id": hl_id, "tag": tag, "start_char": start_char, "end_char": end_char}
+        )
+
+    state.pushed_highlights_at = (
+        doc_key,
+        state.doc_container_id,
+        crdt_doc.highlight_seq,
+    )
+    return {"upsert": upsert, "remove": remove}
 
-    Rebuilds the highlight JSON from CRDT and calls the JS function to
-    re-register all ``CSS.highlights`` entries. Called after any highlight
-    mutation (add, delete, tag change) and on tab switch back to Annotate.
+
+def _push_highlights_to_client(state: PageState, *, full: bool = False) -> None:
+    """Bring the client's ``CSS.highlights`` up to date with CRDT state.
+
+    Sends only the highlights added, removed, moved or retagged since the
+    last push, via ``applyHighlightDelta()``, which updates the affected
+    ranges in place; nothing is sent when no rendered region changed.
+    Rebuilds everything via ``applyHighlights()`` when *full* is set or
+    the delta cannot be computed (see ``_build_highlight_delta``).
+    Called after any highlight mutation (add, delete, tag change) and,
+    with *full*, on tab switch back to Annotate and when the browser has
+    no highlight model to patch (the ``highlights_resync`` event). A full
+    push that lands before the annotation scripts have loaded is parked
+    in ``window._pendingHighlights`` for page init to apply.
 
     Looks up the NiceGUI client from ``_workspace_presence`` to use
     ``client.run_javascript()`` -- this avoids slot-stack errors when called
     from background contexts (CRDT sync callbacks).
     """
-    highlight_json = _RawJS(_build_highlight_json(state))
-    js = _render_js(
-        t"(function() {{"
-        t"  const c = document.getElementById({state.doc_container_id});"
-        t"  if (c) applyHighlights(c, {highlight_json});"
-        t"}})()"
-    )
     # Look up the NiceGUI client from the connected clients registry.
     # Using client.run_javascript() is safe in background contexts (CRDT
     # sync callbacks) where ui.run_javascript() would crash with a
     # slot-stack RuntimeError.
     workspace_key = str(state.workspace_id)
     client_state = _workspace_presence.get(workspace_key, {}).get(state.client_id)
-    if client_state and client_state.nicegui_client:
-        client_state.nicegui_client.run_javascript(js)
-    else:
+    if not (client_state and client_state.nicegui_client):
         logger.warning(
             "PUSH_HIGHLIGHTS: no client ref for client_id=%s -- skipping JS push",
             state.client_id[:8] if state.client_id else "?",
         )
+        return
+
+    delta = None if full else _build_highlight_delta(state)
+    if delta is None:
+        highlight_json = _RawJS(_build_highlight_json(state))
+        js = _render_js(
+            t"(function() {{"
+            t"  const c = document.getElementById({state.doc_container_id});"
+            t"  if (!c) return;"
+            t"  const data = {highlight_json};"
+            t"  if (typeof applyHighlights === 'function') applyHighlights(c, data);"
+            t"  else window._pendingHighlights = {{id: c.id, data: data}};"
+            t"}})()"
+        )
+    elif not (delta["upsert"] or delta["remove"]):
+        return
+    else:
+        delta_json = _RawJS(json.dumps(delta))
+        js = _render_js(
+            t"(function() {{"
+            t"  const c = document.getElementById({state.doc_container_id});"
+            t"  if (!c) return;"
+            t"  if (typeof applyHighlightDelta === 'function')"
+            t"    applyHighlightDelta(c, {delta_json});"
+            t"  else emitEvent('highlights_resync', {{}});"
+            t"}})()"
+        )
+    client_state.nicegui_client.run_javascript(js)
 
 
 def _update_highlight_css(state: PageState) -> None:
@@ -173,7 +267,8 @@ def _update_highlight_css(state: PageState) -> None:
 
     With the CSS Custom Highlight API, the ``::highlight()`` pseudo-element
     rules are static (one rule per tag). The actual highlight ranges are
-    registered in ``CSS.highlights`` by JS ``applyHighlights()``. This
+    registered in ``CSS.highlights`` by JS ``applyHighlights()`` and
+    patched by ``applyHighlightDelta()``. This
     function ensures both the CSS and the JS highlight state are current.
     """
     if state.highlight_style is None or state.crdt_doc is None:
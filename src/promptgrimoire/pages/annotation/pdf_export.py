@@ -39,12 +39,13 @@ from promptgrimoire.export.filename import (
 from promptgrimoire.export.pdf_export import (
     markdown_to_latex_notes,
 )
-from promptgrimoire.word_count import word_count
+from promptgrimoire.export.text_index import text_index_to_json
 from promptgrimoire.word_count_enforcement import (
     WordCountViolation,
     check_word_count_violation,
     format_violation_message,
 )
+from promptgrimoire.word_count_pool import word_count_many
 
 if TYPE_CHECKING:
     from promptgrimoire.pages.annotation import PageState
@@ -210,8 +211,8 @@ def _extract_response_markdown(state: PageState) -> str:
     """Extract response draft markdown from the CRDT mirror.
 
     The response_draft_markdown field is kept current by the
-    respond_yjs_update event handler (which includes markdown in
-    every event payload). No JS round-trip needed.
+    binary Yjs relay handler (the editor sends markdown with every
+    update). No JS round-trip needed.
     """
     if state.crdt_doc is not None:
         return state.crdt_doc.get_response_draft_markdown()
@@ -243,7 +244,7 @@ async def _check_word_count_enforcement(
     if not has_limits:
         return True, None
 
-    count = word_count(response_text) if response_text else 0
+    (count,) = await word_count_many([response_text])
     violation = check_word_count_violation(count, state.word_minimum, state.word_limit)
 
     if not violation.has_violation:
@@ -479,6 +480,7 @@ async def _handle_pdf_export(state: PageState, workspace_id: UUID) -> bool:
                 "html_content": doc.content,
                 "highlights": enriched,
                 "word_to_legal_para": legal_para_map,
+                "text_index": text_index_to_json(doc.text_index),
             }
         )
 
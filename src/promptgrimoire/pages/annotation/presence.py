@@ -0,0 +1,211 @@
+"""Coalesced fan-out of remote cursors and selections.
+
+Every cursor move or selection change used to send its own
+``run_javascript`` call to every peer, so a workspace with *n* active
+clients produced O(n²) websocket messages per second.
+:class:`PresenceFanout` keeps only the latest cursor and selection per
+sender and flushes at most once per ``APP__PRESENCE_FLUSH_MS``: each
+receiver then gets one script carrying every pending sender's update.
+A flush that is already due runs immediately, so an isolated event is
+not delayed.
+
+Anonymised labels depend on the receiver only through its class
+(privileged, the sender's own user, or a peer), so they are cached per
+(sender, receiver class) rather than recomputed per receiver per event.
+A sender's cached labels are dropped when its own label inputs (name,
+user, anonymous sharing, privilege) change.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal
+
+from promptgrimoire.auth.anonymise import anonymise_author
+from promptgrimoire.config import get_settings
+from promptgrimoire.pages.annotation import _render_js, _workspace_presence
+
+if TYPE_CHECKING:
+    from promptgrimoire.pages.annotation import PageState, _RemotePresence
+
+type _Kind = Literal["cursor", "selection"]
+type _ReceiverClass = Literal["privileged", "self", "peer"]
+
+
+@dataclass
+class _PresenceUpdate:
+    """Latest cursor or selection of one sender; ``value`` None removes it."""
+
+    sender_id: str
+    sender: PageState
+    kind: _Kind
+    value: tuple[int, ...] | None
+
+
+# Process-wide counters for the diagnostics snapshot
+_stats = {"events": 0, "coalesced": 0, "flushes": 0, "messages": 0}
+
+
+def _receiver_class(sender: PageState, receiver: _RemotePresence) -> _ReceiverClass:
+    """Classify *receiver* by the inputs ``anonymise_author`` reads from it."""
+    if receiver.viewer_is_privileged:
+        return "privileged"
+    if sender.user_id is not None and receiver.user_id == sender.user_id:
+        return "self"
+    return "peer"
+
+
+class PresenceFanout:
+    """Per-workspace aggregator for cursor and selection broadcasts."""
+
+    def __init__(self, workspace_key: str, interval: float) -> None:
+        self._workspace_key = workspace_key
+        self._interval = interval
+        self._pending: dict[tuple[str, _Kind], _PresenceUpdate] = {}
+        # sender_id -> (sender's label inputs, labels per receiver class)
+        self._labels: dict[
+            str, tuple[tuple[object, ...], dict[_ReceiverClass, str]]
+        ] = {}
+        self._last_flush = float("-inf")
+        self._scheduled: asyncio.TimerHandle | None = None
+
+    def submit(self, update: _PresenceUpdate) -> None:
+        """Queue *update*, replacing the sender's pending one of the same kind."""
+        _stats["events"] += 1
+        key = (update.sender_id, update.kind)
+        if key in self._pending:
+            _stats["coalesced"] += 1
+        self._pending[key] = update
+        if self._scheduled is not None:
+            return
+        delay = self._last_flush + self._interval - time.monotonic()
+        if delay <= 0:
+            self.flush()
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        self._scheduled = loop.call_later(delay, self.flush)
+
+    def forget(self, sender_id: str) -> None:
+        """Drop a departed sender's pending updates and cached labels."""
+        for key in [k for k in self._pending if k[0] == sender_id]:
+            del self._pending[key]
+        self._labels.pop(sender_id, None)
+
+    def close(self) -> None:
+        """Cancel any scheduled flush."""
+        if self._scheduled is not None:
+            self._scheduled.cancel()
+            self._scheduled = None
+
+    def flush(self) -> None:
+        """Send every receiver one script with all pending peers' updates."""
+        self._scheduled = None
+        self._last_flush = time.monotonic()
+        pending, self._pending = list(self._pending.values()), {}
+        if not pending:
+            return
+        _stats["flushes"] += 1
+        clients = _workspace_presence.get(self._workspace_key, {})
+        for cid, presence in list(clients.items()):
+            if presence.nicegui_client is None:
+                continue
+            parts = [
+                self._render(update, presence)
+                for update in pending
+                if update.sender_id != cid
+            ]
+            if not parts:
+                continue
+            _stats["messages"] += 1
+            with contextlib.suppress(Exception):
+                presence.nicegui_client.run_javascript(";".join(parts), timeout=2.0)
+
+    def _label(self, update: _PresenceUpdate, receiver: _RemotePresence) -> str:
+        sender = update.sender
+        inputs = (
+            sender.user_name,
+            sender.user_id,
+            sender.is_anonymous,
+            sender.viewer_is_privileged,
+        )
+        cached = self._labels.get(update.sender_id)
+        if cached is None or cached[0] != inputs:
+            cached = self._labels[update.sender_id] = (inputs, {})
+        labels = cached[1]
+        receiver_class = _receiver_class(sender, receiver)
+        label = labels.get(receiver_class)
+        if label is None:
+            label = anonymise_author(
+                author=sender.user_name,
+                user_id=sender.user_id,
+                viewing_user_id=receiver.user_id,
+                anonymous_sharing=sender.is_anonymous,
+                viewer_is_privileged=receiver.viewer_is_privileged,
+                author_is_privileged=sender.viewer_is_privileged,
+            )
+            labels[receiver_class] = label
+        return label
+
+    def _render(self, update: _PresenceUpdate, receiver: _RemotePresence) -> str:
+        cid = update.sender_id
+        if update.kind == "cursor":
+            if update.value is None:
+                return _render_js(t"removeRemoteCursor({cid})")
+            char_index = update.value[0]
+            name = self._label(update, receiver)
+            color = update.sender.user_color
+            ctnr_id = update.sender.doc_container_id
+            return _render_js(
+                t"if (typeof renderRemoteCursor"
+                t"    === 'function')"
+                t"  renderRemoteCursor("
+                t"    document.getElementById("
+                t"      {ctnr_id}),"
+                t"    {cid}, {char_index},"
+                t"    {name}, {color})"
+            )
+        if update.value is None:
+            return _render_js(t"removeRemoteSelection({cid})")
+        start, end = update.value[0], update.value[-1]
+        name = self._label(update, receiver)
+        color = update.sender.user_color
+        ctnr = update.sender.doc_container_id
+        return _render_js(
+            t"if (typeof renderRemoteSelection"
+            t"    === 'function')"
+            t"  renderRemoteSelection("
+            t"    {cid}, {start}, {end},"
+            t"    {name}, {color}, {ctnr})"
+        )
+
+
+# workspace_key -> aggregator, created on first presence event
+_fanouts: dict[str, PresenceFanout] = {}
+
+
+def get_fanout(workspace_key: str) -> PresenceFanout:
+    """Return the workspace's aggregator, creating it on first use."""
+    fanout = _fanouts.get(workspace_key)
+    if fanout is None:
+        interval = get_settings().app.presence_flush_ms / 1000
+        fanout = _fanouts[workspace_key] = PresenceFanout(workspace_key, interval)
+    return fanout
+
+
+def drop_fanout(workspace_key: str) -> None:
+    """Discard a workspace's aggregator once its last client has left."""
+    fanout = _fanouts.pop(workspace_key, None)
+    if fanout is not None:
+        fanout.close()
+
+
+def stats() -> dict[str, int]:
+    """Fan-out counters and live aggregator count for diagnostics."""
+    return {**_stats, "workspaces": len(_fanouts)}
@@ -20,7 +20,9 @@ Traceability:
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import binascii
 import html as _html
 import json
 import time
@@ -32,7 +34,12 @@ from nicegui import ui
 from promptgrimoire.crdt.persistence import get_persistence_manager
 from promptgrimoire.pages.annotation.card_shared import anonymise_display_author
 from promptgrimoire.pages.annotation.word_count_badge import format_word_count_badge
-from promptgrimoire.word_count import word_count
+from promptgrimoire.pages.annotation.yjs_relay import (
+    YJS_EVENT,
+    YjsOutbox,
+    register_inbound,
+)
+from promptgrimoire.word_count import IncrementalWordCounter
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -456,7 +463,7 @@ def _update_markdown_mirror(
     text_field = crdt_doc.response_draft_markdown
     current = str(text_field)
     if current != md:
-        with crdt_doc.doc.transaction():
+        with crdt_doc.transaction():
             current_len = len(text_field)
             if current_len > 0:
                 del text_field[:current_len]
@@ -470,6 +477,48 @@ def _update_markdown_mirror(
         )
 
 
+class _WordCountRefresher:
+    """Keep the word count badge current without blocking the event loop.
+
+    Counting runs in a worker thread through an
+    :class:`~promptgrimoire.word_count.IncrementalWordCounter`, so each
+    keystroke only re-tokenises the paragraph it changed.  Refreshes
+    requested while a count is in flight are coalesced: the running
+    refresh picks up the latest markdown when it finishes, and
+    intermediate drafts are never counted.
+    """
+
+    def __init__(self, state: PageState) -> None:
+        self._state = state
+        self._counter = IncrementalWordCounter()
+        self._pending: str | None = None
+        self._running = False
+
+    async def refresh(self, markdown: str) -> None:
+        """Count *markdown* and update the badge, or queue it if busy."""
+        self._pending = markdown
+        if self._running:
+            return
+        self._running = True
+        try:
+            while self._pending is not None:
+                text, self._pending = self._pending, None
+                count = await asyncio.to_thread(self._counter.count, text)
+                self._apply(count)
+        finally:
+            self._running = False
+
+    def _apply(self, count: int) -> None:
+        badge = self._state.word_count_badge
+        if badge is None:
+            return
+        badge_state = format_word_count_badge(
+            count, self._state.word_minimum, self._state.word_limit
+        )
+        badge.set_text(badge_state.text)
+        badge.classes(replace=badge_state.css_classes)
+
+
 def _setup_yjs_event_handler(
     crdt_doc: AnnotationDocument,
     workspace_key: str,
@@ -478,30 +527,30 @@ def _setup_yjs_event_handler(
     on_yjs_update_broadcast: Any,
     state: PageState,
 ) -> None:
-    """Register the NiceGUI event handler for Yjs updates from the Milkdown editor.
+    """Register the binary relay handler for Yjs updates from the Milkdown editor.
 
-    Receives base64-encoded Yjs updates from the browser, applies them to the
-    server-side CRDT Doc, broadcasts to other clients, syncs the markdown
-    mirror to the CRDT Text field, and updates the word count badge.
+    Receives raw Yjs updates from the browser (see ``yjs_relay``), applies
+    them to the server-side CRDT Doc, broadcasts to other clients, syncs the
+    markdown mirror to the CRDT Text field, and updates the word count badge
+    off the event loop (see :class:`_WordCountRefresher`).
 
     Args:
         crdt_doc: The CRDT annotation document.
         workspace_key: Workspace identifier for broadcast lookup.
         workspace_id: Workspace UUID for persistence.
         client_id: This client's unique ID (for echo prevention).
-        on_yjs_update_broadcast: Callable(b64_update, origin_client_id) to
+        on_yjs_update_broadcast: Callable(update, origin_client_id) to
             broadcast Yjs updates to other clients.
         state: PageState containing word count limits and badge reference.
     """
+    word_counts = _WordCountRefresher(state)
 
-    async def on_yjs_update(e: object) -> None:
+    async def on_yjs_update(raw: bytes, md: str | None) -> None:
         """Receive a Yjs update from the JS Milkdown editor."""
-        b64_update: str = e.args["update"]  # type: ignore[union-attr]  # NiceGUI GenericEventArguments.args is untyped
-        raw = base64.b64decode(b64_update)
         # Apply to server-side CRDT Doc
         crdt_doc.apply_update(raw, origin_client_id=client_id)
         # Broadcast to other clients
-        on_yjs_update_broadcast(b64_update, client_id)
+        on_yjs_update_broadcast(raw, client_id)
         logger.debug(
             "RESPOND_YJS_UPDATE ws=%s client=%s bytes=%d",
             workspace_key,
@@ -509,17 +558,7 @@ def _setup_yjs_event_handler(
             len(raw),
         )
         # Write markdown from event payload to CRDT mirror (no JS round-trip).
-        md: str | None = e.args.get("markdown")  # type: ignore[union-attr]  # NiceGUI GenericEventArguments.args is untyped
         _update_markdown_mirror(crdt_doc, md, workspace_key, client_id)
-        # Update word count badge if limits configured
-        if state.word_count_badge is not None:
-            markdown = str(crdt_doc.response_draft_markdown)
-            count = word_count(markdown)
-            badge_state = format_word_count_badge(
-                count, state.word_minimum, state.word_limit
-            )
-            state.word_count_badge.set_text(badge_state.text)
-            state.word_count_badge.classes(replace=badge_state.css_classes)
         # Persist CRDT state to database (debounced by persistence manager)
         pm = get_persistence_manager()
         pm.mark_dirty_workspace(
@@ -527,8 +566,11 @@ def _setup_yjs_event_handler(
             crdt_doc.doc_id,
             last_editor=client_id,
         )
+        # Update word count badge if limits configured
+        if state.word_count_badge is not None:
+            await word_counts.refresh(str(crdt_doc.response_draft_markdown))
 
-    ui.on("respond_yjs_update", on_yjs_update)
+    register_inbound(ui.context.client, on_yjs_update)
 
 
 def _on_markdown_flush(
@@ -558,7 +600,7 @@ def _on_markdown_flush(
     text_field = crdt_doc.response_draft_markdown
     current = str(text_field)
     if current != md:
-        with crdt_doc.doc.transaction():
+        with crdt_doc.transaction():
             current_len = len(text_field)
             if current_len > 0:
                 del text_field[:current_len]
@@ -645,15 +687,29 @@ def _build_editor_init_js(
                     return;
                 }}
                 await window._createMilkdownEditor(
-                    root, '', function(b64Update) {{
-                        emitEvent('respond_yjs_update',
-                                  {{update: b64Update,
-                                   markdown: window._getMilkdownMarkdown()}});
+                    root, '', function(update) {{
+                        window.socket.emit('{YJS_EVENT}', {{
+                            client_id: window.clientId,
+                            update: update,
+                            markdown: window._getMilkdownMarkdown()
+                        }});
                     }}, '{fragment_name}'
                 );
+                if (!window._yjsRelayBound) {{
+                    window._yjsRelayBound = true;
+                    window.socket.on('{YJS_EVENT}', function(update, ack) {{
+                        window._applyRemoteYjsBytes(new Uint8Array(update));
+                        if (ack) ack(window._getYjsStateVector());
+                    }});
+                }}
                 {b64_js}
                 {seed_js}
-                emitEvent('editor_ready', {{status: 'ok'}});
+                emitEvent('editor_ready', {{
+                    status: 'ok',
+                    state_vector: window._yjsUpdateToBase64(
+                        window._getYjsStateVector()
+                    )
+                }});
             }} catch (e) {{
                 console.error('[respond-tab] init failed', e);
                 emitEvent('editor_ready', {{
@@ -669,6 +725,16 @@ def _build_editor_init_js(
         """
 
 
+def _decode_state_vector(b64: object) -> bytes | None:
+    """Decode the base64 state vector sent with ``editor_ready``."""
+    if not isinstance(b64, str) or not b64:
+        return None
+    try:
+        return base64.b64decode(b64, validate=True)
+    except binascii.Error:
+        return None
+
+
 def _handle_editor_ready(
     e: object,
     state: PageState,
@@ -678,7 +744,8 @@ def _handle_editor_ready(
     """Handle the ``editor_ready`` event emitted by the bundled init JS.
 
     Sets ``has_milkdown_editor`` on both ``PageState`` and the
-    ``_RemotePresence`` entry so Yjs relay includes this client.
+    ``_RemotePresence`` entry, and gives the presence a binary
+    ``YjsOutbox``, so Yjs relay includes this client.
     On failure, logs the error and leaves the flag unset.
     """
     from promptgrimoire.pages.annotation import (  # noqa: PLC0415
@@ -689,21 +756,22 @@ def _handle_editor_ready(
     if args.get("status") == "ok":
         state.has_milkdown_editor = True
         clients = _workspace_presence.get(workspace_key, {})
-        if client_id in clients:
-            clients[client_id].has_milkdown_editor = True
+        presence = clients.get(client_id)
+        if presence is not None:
+            presence.has_milkdown_editor = True
         # Catch-up: any Yjs updates that arrived between the initial
         # full-state snapshot (computed at JS send time) and now were
         # skipped by _broadcast_yjs_update because has_milkdown_editor
-        # was False. Send a fresh full-state to converge.
-        if state.crdt_doc is not None:
-            full_state = state.crdt_doc.get_full_state()
-            if len(full_state) > 2:
-                b64_state = base64.b64encode(full_state).decode("ascii")
-                presence = clients.get(client_id)
-                if presence and presence.nicegui_client:
-                    presence.nicegui_client.run_javascript(
-                        f"window._applyRemoteUpdate('{b64_state}')"
-                    )
+        # was False. Send only what the editor's state vector lacks.
+        crdt_doc = state.crdt_doc
+        if crdt_doc is not None and presence and presence.nicegui_client:
+            state_vector = _decode_state_vector(args.get("state_vector"))
+            presence.yjs_outbox = YjsOutbox(
+                presence.nicegui_client, crdt_doc.get_update_since, state_vector
+            )
+            missing = crdt_doc.get_update_since(state_vector)
+            if len(missing) > 2:
+                presence.yjs_outbox.push(missing)
         logger.debug(
             "EDITOR_READY ws=%s client=%s",
             workspace_key,
@@ -747,7 +815,7 @@ async def render_respond_tab(
         crdt_doc: The CRDT annotation document.
         workspace_key: String key for the workspace (for broadcast lookup).
         client_id: This client's unique ID (for echo prevention).
-        on_yjs_update_broadcast: Callable(b64_update, origin_client_id) to
+        on_yjs_update_broadcast: Callable(update, origin_client_id) to
             broadcast Yjs updates to other clients.
         on_locate: Optional async callback(start_char, end_char) to warp to
             a highlight in Tab 1.
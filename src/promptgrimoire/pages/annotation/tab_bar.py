@@ -288,8 +288,8 @@ async def _initialise_respond_tab(state: PageState, workspace_id: UUID) -> None:
 
     tags = state.tag_info_list or []
 
-    def _on_broadcast(b64_update: str, origin_client_id: str) -> None:
-        _broadcast_yjs_update(workspace_id, origin_client_id, b64_update)
+    def _on_broadcast(update: bytes, origin_client_id: str) -> None:
+        _broadcast_yjs_update(workspace_id, origin_client_id, update)
 
     async def _on_respond_locate(
         start_char: int, end_char: int, document_id: str | None = None
@@ -313,7 +313,7 @@ async def _initialise_respond_tab(state: PageState, workspace_id: UUID) -> None:
 
 def _refresh_source_tab(state: PageState) -> None:
     """Refresh a source tab on return visit (highlights + cards + CSS)."""
-    _push_highlights_to_client(state)
+    _push_highlights_to_client(state, full=True)
     if state.refresh_annotations:
         state.refresh_annotations(trigger="tab_switch_annotate")
     _update_highlight_css(state)
@@ -131,12 +131,7 @@ def _highlight_count_for_tag(
     """
     if not crdt_doc:
         return 0
-    tag_str = str(tag_id)
-    return sum(
-        1
-        for hl in crdt_doc.get_all_highlights()  # type: ignore[union-attr]
-        if hl.get("tag") == tag_str
-    )
+    return len(crdt_doc.get_highlight_ids_with_tag(str(tag_id)))  # type: ignore[attr-defined]
 
 
 def _delete_confirmation_body(highlight_count: int) -> str:
@@ -78,11 +78,13 @@ async def _refresh_tag_state(
             _populate_highlight_menu(state, on_tag_click, on_add_click=on_add_click)
 
     if reload_crdt and state.crdt_doc is not None:
-        from promptgrimoire.db.workspaces import get_workspace  # noqa: PLC0415
+        from promptgrimoire.db.crdt_updates import (  # noqa: PLC0415
+            get_workspace_crdt_state,
+        )
 
-        ws = await get_workspace(state.workspace_id)
-        if ws and ws.crdt_state:
-            state.crdt_doc.apply_update(ws.crdt_state)
+        crdt_state = await get_workspace_crdt_state(state.workspace_id)
+        if crdt_state:
+            state.crdt_doc.apply_update(crdt_state)
         _push_highlights_to_client(state)
 
     if not skip_card_rebuild:
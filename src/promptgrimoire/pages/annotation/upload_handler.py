@@ -21,6 +21,7 @@ from promptgrimoire.input_pipeline.paragraph_map import (
     build_paragraph_map_for_json,
     detect_source_numbering,
 )
+from promptgrimoire.input_pipeline.text_extraction import as_tree
 from promptgrimoire.pages.dialogs import show_content_type_dialog
 
 if TYPE_CHECKING:
@@ -77,8 +78,9 @@ def detect_paragraph_numbering(
         Tuple of (auto_number_paragraphs, paragraph_map) ready for
         persistence (map keys converted to strings for JSON storage).
     """
-    auto_number = not detect_source_numbering(processed_html)
-    para_map = build_paragraph_map_for_json(processed_html, auto_number=auto_number)
+    tree = as_tree(processed_html)
+    auto_number = not detect_source_numbering(tree)
+    para_map = build_paragraph_map_for_json(tree, auto_number=auto_number)
     return auto_number, para_map
 
 
@@ -18,18 +18,14 @@ import structlog
 from nicegui import app, ui
 
 from promptgrimoire.auth import is_privileged_user
-from promptgrimoire.crdt.annotation_doc import (
-    _ensure_crdt_tag_consistency,
-)
 from promptgrimoire.db.acl import (
     grant_permission,
 )
-from promptgrimoire.db.workspace_documents import list_document_headers
 from promptgrimoire.db.workspaces import (
     AnnotationContext,
     PlacementContext,
     create_workspace,
-    resolve_annotation_context,
+    load_annotation_page,
 )
 from promptgrimoire.pages.annotation import (
     PageState,
@@ -217,7 +213,7 @@ async def _resolve_db_context(
         return None
 
     assert auth_user is not None  # narrowing — guarded by user_id_str check
-    context = await resolve_annotation_context(
+    page = await load_annotation_page(
         workspace_id,
         user_id=UUID(user_id_str),
         is_admin=bool(auth_user.get("is_admin")),
@@ -226,35 +222,31 @@ async def _resolve_db_context(
     if client._deleted:
         return None
 
-    if context is None:
+    if page is None:
         _show_error_ui(
             client, content_container, "Workspace not found", show_create=True
         )
         return None
 
+    context = page.context
     if context.permission is None:
         _show_error_ui(
             client, content_container, "You do not have access to this workspace"
         )
         return None
 
-    documents = await list_document_headers(workspace_id)
-    if client._deleted:
-        return None
-
-    # Hydrate CRDT with pre-fetched workspace (avoids redundant DB fetch)
-    crdt_doc = await _workspace_registry.get_or_create_for_workspace(
+    # Hydrate CRDT from the page-load row: workspace snapshot, update log
+    # and tags are all pre-fetched, so a cold load issues no further reads.
+    # Tag reconciliation runs on a miss or when tag_version has moved.
+    await _workspace_registry.get_or_create_for_workspace(
         workspace_id,
         workspace=context.workspace,
-    )
-    await _ensure_crdt_tag_consistency(
-        crdt_doc,
-        workspace_id,
+        pending_updates=page.pending_crdt_updates,
         tags=context.tags,
         tag_groups=context.tag_groups,
     )
 
-    return None if client._deleted else (context, documents)
+    return None if client._deleted else (context, page.documents)
 
 
 def _log_page_load_profile(
@@ -0,0 +1,162 @@
+"""Binary Yjs relay between Milkdown editors.
+
+Milkdown edits used to travel as base64 strings inside ``emitEvent``
+payloads and ``run_javascript("window._applyRemoteUpdate('...')")``
+calls, costing string formatting, a JS eval and ~33% base64 inflation
+per receiver per keystroke.  Updates now ride a dedicated socket.io
+event, :data:`YJS_EVENT`, whose payload carries the raw update bytes as
+a binary attachment in both directions.
+
+Inbound, the browser emits ``{client_id, update, markdown}``; the
+handler checks that the socket belongs to the claimed NiceGUI client
+and dispatches to the callback the Respond tab registered for it.
+
+Outbound, each receiver has an outbox with at most one frame in flight.
+The browser acknowledges every frame; updates arriving meanwhile are
+merged with ``pycrdt.merge_updates`` into the next frame, so a slow
+client receives fewer, larger frames instead of an unbounded backlog.
+The browser acknowledges with its Yjs state vector.  A frame not
+acknowledged within :data:`_ACK_TIMEOUT_SECONDS` may have been lost on
+a reconnect, so the next frame instead carries everything missing from
+the last acknowledged state vector.  The same catch-up frame is sent
+when the socket reconnects, so a client coming back from a dropped
+connection receives only the operations it missed, not the document.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import TYPE_CHECKING, Any
+
+import structlog
+from nicegui import Client, core
+from pycrdt import merge_updates
+
+from promptgrimoire.pages.annotation import _background_tasks
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+logger = structlog.get_logger()
+
+YJS_EVENT = "pg_yjs_update"
+
+_ACK_TIMEOUT_SECONDS = 5.0
+
+type InboundHandler = Callable[[bytes, str | None], Awaitable[None]]
+type SyncSince = Callable[[bytes | None], bytes]
+
+# NiceGUI client id -> Respond tab callback for that client's editor
+_inbound: dict[str, InboundHandler] = {}
+_installed = False
+
+
+def _socket_id(client: Client) -> str | None:
+    """Return the client's current socket.io session id, if connected."""
+    return next(iter(client._socket_to_document_id), None)
+
+
+async def _on_update(sid: str, msg: dict[str, Any]) -> None:
+    client = Client.instances.get(msg.get("client_id", ""))
+    # The client id comes from the browser: only accept it from a socket
+    # that handshook as that client.
+    if client is None or sid not in client._socket_to_document_id:
+        return
+    handler = _inbound.get(client.id)
+    update = msg.get("update")
+    if handler is None or not isinstance(update, bytes):
+        return
+    with client:
+        await handler(update, msg.get("markdown"))
+
+
+def register_inbound(client: Client, handler: InboundHandler) -> None:
+    """Route *client*'s binary Yjs updates to *handler* until it is deleted."""
+    global _installed  # noqa: PLW0603
+    if not _installed:
+        core.sio.on(YJS_EVENT, _on_update)
+        _installed = True
+    _inbound[client.id] = handler
+    client.on_delete(lambda: _inbound.pop(client.id, None))
+
+
+class YjsOutbox:
+    """Outbound Yjs frames for one receiver, merged under back-pressure."""
+
+    def __init__(
+        self, client: Client, sync_since: SyncSince, state_vector: bytes | None
+    ) -> None:
+        """Create the outbox for *client*.
+
+        Args:
+            client: The receiving NiceGUI client.
+            sync_since: Returns the update a peer holding the given state
+                vector is missing (``None``: the full state).
+            state_vector: The receiver's state vector when it joined.
+        """
+        self._client = client
+        self._sync_since = sync_since
+        self._state_vector = state_vector
+        self._pending: list[bytes] = []
+        self._resync = False
+        self._task: asyncio.Task[None] | None = None
+        client.on_connect(self.resync)
+
+    def resync(self) -> None:
+        """Send the receiver everything it is missing on the next frame."""
+        self._resync = True
+        self._kick()
+
+    def push(self, update: bytes) -> None:
+        """Queue *update* and start draining if no frame is in flight."""
+        self._pending.append(update)
+        self._kick()
+
+    def _kick(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._drain())
+            _background_tasks.add(self._task)
+            self._task.add_done_callback(_background_tasks.discard)
+
+    def _next_frame(self) -> bytes:
+        """Take everything queued as one frame.
+
+        After a resync request this is the catch-up update since the last
+        acknowledged state vector, which covers the queued updates too.
+        """
+        updates, self._pending = self._pending, []
+        if self._resync:
+            self._resync = False
+            return self._sync_since(self._state_vector)
+        return updates[0] if len(updates) == 1 else merge_updates(*updates)
+
+    async def _drain(self) -> None:
+        try:
+            while (self._pending or self._resync) and not self._client._deleted:
+                if not await self._send(self._next_frame()):
+                    # Wait for the next update or reconnect to catch up.
+                    self._resync = True
+                    return
+        finally:
+            self._task = None
+
+    async def _send(self, frame: bytes) -> bool:
+        """Emit one frame; return False if it was not acknowledged in time."""
+        sid = _socket_id(self._client)
+        if sid is None:
+            return False
+        acked = asyncio.Event()
+
+        def on_ack(state_vector: bytes | None = None, *_args: Any) -> None:
+            if isinstance(state_vector, bytes):
+                self._state_vector = state_vector
+            acked.set()
+
+        await core.sio.emit(YJS_EVENT, frame, to=sid, callback=on_ack)
+        with contextlib.suppress(TimeoutError):
+            async with asyncio.timeout(_ACK_TIMEOUT_SECONDS):
+                await acked.wait()
+        if not acked.is_set():
+            logger.debug("YJS_RELAY_ACK_TIMEOUT client=%s", self._client.id[:8])
+        return acked.is_set()
@@ -189,8 +189,9 @@ async def milkdown_spike_page() -> None:
         f"""
         const root = document.getElementById('milkdown-editor');
         if (root && window._createMilkdownEditor) {{
-            window._createMilkdownEditor(root, `{escaped_md}`, function(b64Update) {{
-                emitEvent('yjs_update', {{update: b64Update}});
+            window._createMilkdownEditor(root, `{escaped_md}`, function(update) {{
+                emitEvent('yjs_update',
+                          {{update: window._yjsUpdateToBase64(update)}});
             }});
             'editor-init-started';
         }} else {{
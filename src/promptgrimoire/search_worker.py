@@ -1,24 +1,76 @@
 """Background worker for extracting searchable text from dirty workspaces.
 
 Polls for workspaces with search_dirty=True, deserialises their CRDT
-state, extracts text via extract_searchable_text(), and writes the
-result to workspace.search_text.
+state (snapshot merged with any uncompacted update-log rows), extracts
+text via extract_searchable_text(), and writes the result to
+workspace.search_text.
+
+Workspaces whose live document patched their search fragments
+(``search_fragments_dirty``) skip extraction entirely: their search_text
+is re-aggregated from ``workspace_search_fragment`` in SQL.
+
+Extraction for a whole batch runs off the event loop: in a process pool
+when ``FEATURES__SEARCH_WORKER_PROCESSES`` is positive, otherwise in the
+default thread executor.
 """
 
 from __future__ import annotations
 
 import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+from uuid import UUID
 
 import structlog
 from sqlalchemy import text
 
 from promptgrimoire.db.crdt_extraction import extract_searchable_text
+from promptgrimoire.db.crdt_updates import merge_crdt_state
 from promptgrimoire.db.engine import get_session
+from promptgrimoire.db.notify import SEARCH_TOPIC, wait_for_wakeup
+from promptgrimoire.db.search_fragments import refresh_search_text_from_fragments
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
 logger = structlog.get_logger()
 
+# Workspace ID, snapshot, pending log updates, tag names, workspace and
+# activity titles
+_ExtractionItem = tuple[UUID, bytes | None, list[bytes], dict[str, str], str, str]
+
 
-async def process_dirty_workspaces(batch_size: int = 500) -> int:
+def _extract_batch(items: list[_ExtractionItem]) -> list[str | None]:
+    """Build search_text for each item; None marks a failed extraction.
+
+    Module-level and free of I/O so it can run in a worker process.
+    Failures are reported as None rather than raised so one corrupt
+    workspace does not discard the rest of the batch.
+    """
+    results: list[str | None] = []
+    for workspace_id, crdt_state, pending, tag_names, ws_title, activity_title in items:
+        try:
+            # Uncompacted update-log rows are merged onto the snapshot.
+            crdt_bytes = merge_crdt_state(crdt_state, pending)
+            crdt_text = extract_searchable_text(crdt_bytes, tag_names)
+        except Exception:
+            logger.exception(
+                "Failed to process workspace %s for search extraction",
+                workspace_id,
+            )
+            results.append(None)
+            continue
+        # Prepend titles so search_text contains everything needed for FTS
+        # (matching the GIN index on
+        # to_tsvector('english', COALESCE(search_text, ''))).
+        title_prefix = f"{ws_title} {activity_title}".strip()
+        results.append(f"{title_prefix}\n{crdt_text}" if title_prefix else crdt_text)
+    return results
+
+
+async def process_dirty_workspaces(
+    batch_size: int = 500, executor: Executor | None = None
+) -> int:
     """Process workspaces with search_dirty=True.
 
     For each dirty workspace:
@@ -28,6 +80,8 @@ async def process_dirty_workspaces(batch_size: int = 500) -> int:
 
     Args:
         batch_size: Maximum number of workspaces to process per call.
+        executor: Where to run extraction; None uses the loop's default
+            thread executor.
 
     Returns:
         Count of workspaces processed.
@@ -46,7 +100,10 @@ async def process_dirty_workspaces(batch_size: int = 500) -> int:
             text(
                 "SELECT w.id, w.crdt_state, "
                 "  COALESCE(w.title, '') AS ws_title, "
-                "  COALESCE(a.title, '') AS activity_title "
+                "  COALESCE(a.title, '') AS activity_title, "
+                '  ARRAY(SELECT u."update" FROM workspace_crdt_update u '
+                "        WHERE u.workspace_id = w.id ORDER BY u.id) "
+                "    AS pending_updates "
                 "FROM workspace w "
                 "LEFT JOIN activity a ON a.id = w.activity_id "
                 "WHERE w.search_dirty = true "
@@ -72,31 +129,43 @@ async def process_dirty_workspaces(batch_size: int = 500) -> int:
             for tag_row in tag_result.fetchall():
                 tag_map[str(tag_row[0])][str(tag_row[1])] = tag_row[2]
 
-    for workspace_id, crdt_state, ws_title, activity_title in rows:
+    items: list[_ExtractionItem] = [
+        (
+            workspace_id,
+            bytes(crdt_state) if crdt_state is not None else None,
+            [bytes(u) for u in pending or ()],
+            tag_map.get(str(workspace_id), {}),
+            ws_title,
+            activity_title,
+        )
+        for workspace_id, crdt_state, ws_title, activity_title, pending in rows
+    ]
+    extracted = (
+        await asyncio.get_running_loop().run_in_executor(
+            executor, _extract_batch, items
+        )
+        if items
+        else []
+    )
+
+    for row, extracted_text in zip(rows, extracted, strict=True):
+        workspace_id = row[0]
+        if extracted_text is None:
+            # Logged by _extract_batch; search_dirty stays set for retry
+            continue
         try:
-            tag_names = tag_map.get(str(workspace_id), {})
-
-            # Extract CRDT content and prepend titles so search_text
-            # contains everything needed for FTS (matching the GIN index
-            # on to_tsvector('english', COALESCE(search_text, ''))).
-            crdt_bytes: bytes | None = (
-                bytes(crdt_state) if crdt_state is not None else None
-            )
-            crdt_text = extract_searchable_text(crdt_bytes, tag_names)
-            title_prefix = f"{ws_title} {activity_title}".strip()
-            extracted_text = (
-                f"{title_prefix}\n{crdt_text}" if title_prefix else crdt_text
-            )
-
             # Update workspace.  The CAS guard (AND search_dirty = true) ensures
             # that if a concurrent CRDT save set search_dirty = true between the
             # read and this write, the flag is NOT cleared here -- the worker
-            # will re-process the workspace on the next poll cycle.
+            # will re-process the workspace on the next poll cycle.  Pending
+            # fragment refreshes are subsumed by the full extraction; leaving
+            # the flag set would let older fragments overwrite this text.
             async with get_session() as session:
                 await session.execute(
                     text(
                         "UPDATE workspace "
-                        "SET search_text = :search_text, search_dirty = false "
+                        "SET search_text = :search_text, search_dirty = false, "
+                        "  search_fragments_dirty = false "
                         "WHERE id = :ws_id AND search_dirty = true"
                     ),
                     {"search_text": extracted_text, "ws_id": str(workspace_id)},
@@ -116,30 +185,69 @@ async def process_dirty_workspaces(batch_size: int = 500) -> int:
     return processed
 
 
+async def _run_pass(batch_size: int, executor: Executor | None) -> bool:
+    """Run one extraction and fragment-refresh pass.
+
+    Returns:
+        True if either batch was full, so more work is likely waiting.
+    """
+    try:
+        processed = await process_dirty_workspaces(
+            batch_size=batch_size, executor=executor
+        )
+        refreshed = await refresh_search_text_from_fragments(batch_size)
+    except Exception:
+        logger.exception("Search extraction worker iteration failed")
+        return False
+    if refreshed:
+        logger.debug("search_text_refreshed", workspaces=refreshed)
+    return max(processed, refreshed) >= batch_size
+
+
+async def _wait_for_work(interval_seconds: float, debounce_seconds: float) -> None:
+    """Wait for a search wake-up or the polling interval, whichever is first."""
+    if await wait_for_wakeup(SEARCH_TOPIC, interval_seconds):
+        # Let a burst of saves land before the next pass.
+        await asyncio.sleep(debounce_seconds)
+
+
 async def start_search_worker(
     interval_seconds: float = 30.0,
     batch_size: int = 500,
+    processes: int = 0,
+    wakeup_debounce_seconds: float = 1.0,
 ) -> None:
     """Start the background search extraction worker.
 
-    Runs process_dirty_workspaces() in a loop.  When a batch is full
-    (processed == batch_size), loops immediately to drain the queue.
-    Only sleeps when a batch comes back short (queue drained).
+    Runs process_dirty_workspaces() and refresh_search_text_from_fragments()
+    in a loop.  When either batch is full, loops immediately to drain the
+    queue.
+    Only waits when a batch comes back short (queue drained), and wakes
+    early when the database notifies that a workspace became dirty.
 
     Parameters
     ----------
     interval_seconds : float
-        Sleep duration between polling cycles when queue is drained.
+        Fallback polling interval when the queue is drained.
     batch_size : int
         Maximum workspaces per batch.
+    processes : int
+        Size of the extraction process pool; 0 extracts in a thread.
+    wakeup_debounce_seconds : float
+        Delay after a notification so bursts are handled in one pass.
     """
-    logger.info("Search extraction worker started (interval=%.1fs)", interval_seconds)
-    while True:
-        try:
-            processed = await process_dirty_workspaces(batch_size=batch_size)
-            if processed >= batch_size:
+    executor = ProcessPoolExecutor(max_workers=processes) if processes > 0 else None
+    logger.info(
+        "Search extraction worker started (interval=%.1fs, processes=%d)",
+        interval_seconds,
+        processes,
+    )
+    try:
+        while True:
+            if await _run_pass(batch_size, executor):
                 # Batch was full — likely more work waiting.  Loop immediately.
                 continue
-        except Exception:
-            logger.exception("Search extraction worker iteration failed")
-        await asyncio.sleep(interval_seconds)
+            await _wait_for_work(interval_seconds, wakeup_debounce_seconds)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -1,12 +1,13 @@
 /**
  * annotation-highlight.js — CSS Custom Highlight API text walker and selection.
  *
- * Provides five capabilities:
+ * Provides six capabilities:
  * 1. walkTextNodes(root) — flat character offset map of all text nodes
  * 2. applyHighlights(container, highlightData, tagColors) — register CSS highlights
- * 3. clearHighlights() — remove all hl-* entries from CSS.highlights
- * 4. setupSelection(container) — mouseup listener emitting hl_demo_selection (demo)
- * 5. setupAnnotationSelection(container, emitCallback) — mouseup listener with callback
+ * 3. applyHighlightDelta(container, delta) — patch registered highlights in place
+ * 4. clearHighlights() — remove all hl-* entries from CSS.highlights
+ * 5. setupSelection(container) — mouseup listener emitting hl_demo_selection (demo)
+ * 6. setupAnnotationSelection(container, emitCallback) — mouseup listener with callback
  *
  * All functions are in the global scope (no ES modules) for compatibility
  * with NiceGUI's <script src="..."> loading.
@@ -93,6 +94,41 @@ function clearHighlights() {
     }
 }
 
+// Model behind the last applyHighlights() build, patched by
+// applyHighlightDelta(): the container and text nodes the ranges were
+// built against, each highlight's region and range by id, and the
+// priority assigned to each tag.
+let _hlModel = null;
+
+/**
+ * Build the range for one highlight region, or null if it is invalid.
+ */
+function _regionRange(textNodes, totalChars, tag, startChar, endChar) {
+    // Validate offsets (AC1.4)
+    if (startChar < 0 || endChar < 0) {
+        console.warn(
+            `applyHighlights: negative offset for tag "${tag}":`,
+            `start=${startChar}, end=${endChar} — skipping`);
+        return null;
+    }
+    if (startChar >= endChar) {
+        console.warn(
+            `applyHighlights: start >= end for tag "${tag}":`,
+            `start=${startChar}, end=${endChar} — skipping`);
+        return null;
+    }
+    if (startChar >= totalChars) {
+        console.warn(
+            `applyHighlights: start beyond document length for tag "${tag}":`,
+            `start=${startChar}, totalChars=${totalChars} — skipping`);
+        return null;
+    }
+
+    // Clamp end to document length (don't skip, just clamp)
+    const clampedEnd = Math.min(endChar, totalChars);
+    return charOffsetToRange(textNodes, startChar, clampedEnd);
+}
+
 /**
  * Apply highlight data to a container using the CSS Custom Highlight API.
  *
@@ -116,6 +152,11 @@ function applyHighlights(container, highlightData, tagColors) {
 
     window._highlightsReady = false;
     clearHighlights();
+    const model = {
+        container, textNodes, totalChars,
+        regions: new Map(), tagOrder: new Map(),
+    };
+    _hlModel = model;
 
     if (!textNodes.length) {
         if (window.__perfInstrumented) console.timeEnd('applyHighlights');
@@ -125,6 +166,7 @@ function applyHighlights(container, highlightData, tagColors) {
     if (window.__perfInstrumented) console.time('applyHighlights:rangeCreation');
     let tagIdx = 0;
     for (const [tag, regions] of Object.entries(highlightData)) {
+        model.tagOrder.set(tag, tagIdx);
         const ranges = [];
         for (const region of regions) {
             // Support both annotation format (start_char/end_char) and
@@ -134,29 +176,13 @@ function applyHighlights(container, highlightData, tagColors) {
             const endChar = region.end_char !== undefined
                 ? region.end_char : region.end;
 
-            // Validate offsets (AC1.4)
-            if (startChar < 0 || endChar < 0) {
-                console.warn(
-                    `applyHighlights: negative offset for tag "${tag}":`,
-                    `start=${startChar}, end=${endChar} — skipping`);
-                continue;
-            }
-            if (startChar >= endChar) {
-                console.warn(
-                    `applyHighlights: start >= end for tag "${tag}":`,
-                    `start=${startChar}, end=${endChar} — skipping`);
-                continue;
-            }
-            if (startChar >= totalChars) {
-                console.warn(
-                    `applyHighlights: start beyond document length for tag "${tag}":`,
-                    `start=${startChar}, totalChars=${totalChars} — skipping`);
-                continue;
+            const range = _regionRange(
+                textNodes, totalChars, tag, startChar, endChar);
+            if (region.id !== undefined) {
+                model.regions.set(region.id, {
+                    tag, start_char: startChar, end_char: endChar, range,
+                });
             }
-
-            // Clamp end to document length (don't skip, just clamp)
-            const clampedEnd = Math.min(endChar, totalChars);
-            const range = charOffsetToRange(textNodes, startChar, clampedEnd);
             if (range) ranges.push(range);
         }
         if (ranges.length) {
@@ -173,6 +199,98 @@ function applyHighlights(container, highlightData, tagColors) {
     if (window.__perfInstrumented) console.timeEnd('applyHighlights');
 }
 
+/** Whether the model's ranges still point into the live container. */
+function _modelIsLive(model, container) {
+    const nodes = model.textNodes;
+    return model.container === container && nodes.length > 0
+        && container.contains(nodes[0].node)
+        && container.contains(nodes[nodes.length - 1].node);
+}
+
+/**
+ * Whether highlights for *container* are already rendered from a push,
+ * so page init must not overwrite them with its initial snapshot.
+ */
+function hasLiveHighlights(container) {
+    return !!_hlModel && _modelIsLive(_hlModel, container);
+}
+
+function _removeRegion(model, id) {
+    const old = model.regions.get(id);
+    if (!old) return;
+    model.regions.delete(id);
+    const name = 'hl-' + old.tag;
+    const hl = old.range && CSS.highlights.get(name);
+    if (!hl) return;
+    hl.delete(old.range);
+    if (hl.size === 0) CSS.highlights.delete(name);
+}
+
+function _addRegion(model, region) {
+    const range = _regionRange(model.textNodes, model.totalChars,
+        region.tag, region.start_char, region.end_char);
+    model.regions.set(region.id, {
+        tag: region.tag, start_char: region.start_char,
+        end_char: region.end_char, range,
+    });
+    if (!range) return;
+    const name = 'hl-' + region.tag;
+    let hl = CSS.highlights.get(name);
+    if (!hl) {
+        if (!model.tagOrder.has(region.tag)) {
+            model.tagOrder.set(region.tag, model.tagOrder.size);
+        }
+        hl = new Highlight();
+        hl.priority = model.tagOrder.get(region.tag);
+        CSS.highlights.set(name, hl);
+    }
+    hl.add(range);
+}
+
+/**
+ * Patch annotation highlights in place from a server-computed delta.
+ *
+ * Only the listed highlights' ranges are touched, so the cost follows
+ * the size of the change rather than the number of highlights. If the
+ * container's DOM was replaced since the last build, every range is
+ * rebuilt from the local model with the delta applied. With no model
+ * for this container (page not initialised yet, or another page's
+ * build) the delta alone is not the full set, so the server is asked
+ * for a full rebuild via the 'highlights_resync' event instead.
+ *
+ * @param {Element} container - DOM element containing the document text
+ * @param {Object} delta - {upsert: [{id, tag, start_char, end_char}, ...],
+ *     remove: [id, ...]}
+ */
+function applyHighlightDelta(container, delta) {
+    const model = _hlModel;
+    if (!model || model.container !== container) {
+        emitEvent('highlights_resync', {});
+        return;
+    }
+    if (!_modelIsLive(model, container)) {
+        const regions = new Map(model.regions);
+        for (const id of delta.remove) regions.delete(id);
+        for (const r of delta.upsert) regions.set(r.id, r);
+        const data = {};
+        // Keep the previous build's tag priorities
+        for (const tag of model.tagOrder.keys()) data[tag] = [];
+        for (const [id, r] of regions) {
+            (data[r.tag] = data[r.tag] || []).push(
+                {id, start_char: r.start_char, end_char: r.end_char});
+        }
+        applyHighlights(container, data);
+        return;
+    }
+    for (const id of delta.remove) _removeRegion(model, id);
+    for (const region of delta.upsert) {
+        _removeRegion(model, region.id);
+        _addRegion(model, region);
+    }
+    window._highlightsReady = true;
+    document.dispatchEvent(new Event('highlights-ready'));
+}
+
 function charOffsetToRange(textNodes, startChar, endChar) {
     let startNode = null, startOff = 0, endNode = null, endOff = 0;
 
@@ -30,7 +30,7 @@ function base64ToUint8Array(b64) {
  *
  * @param {HTMLElement} rootEl - DOM element to mount the editor in.
  * @param {string} initialMd - Initial markdown content (used only if no CRDT state exists).
- * @param {function} onYjsUpdate - Callback called with (base64Update: string) on local Yjs changes.
+ * @param {function} onYjsUpdate - Callback called with (update: Uint8Array) on local Yjs changes.
  * @param {string} [fragmentName] - Optional XmlFragment name within the Yjs Doc. When provided,
  *   binds to the named fragment via CollabService.bindXmlFragment() instead of bindDoc().
  *   This allows multiple editors to bind to different fragments in the same Doc.
@@ -93,8 +93,7 @@ async function createEditor(rootEl, initialMd, onYjsUpdate, fragmentName) {
     ydoc.on("update", (update, origin) => {
       // Skip updates that came from the remote relay to avoid echo loops
       if (origin === "remote") return;
-      const b64 = uint8ArrayToBase64(update);
-      onYjsUpdate(b64);
+      onYjsUpdate(update);
     });
   }
 
@@ -129,6 +128,30 @@ window._applyRemoteUpdate = function (b64) {
   Y.applyUpdate(window.__milkdownYDoc, update, "remote");
 };
 
+/**
+ * Apply a remote Yjs update received as raw bytes.
+ * Called by the binary socket.io relay (pages/annotation/yjs_relay.py).
+ */
+window._applyRemoteYjsBytes = function (update) {
+  if (!window.__milkdownYDoc) {
+    console.error("[milkdown-bundle] No Yjs doc — cannot apply remote update");
+    return;
+  }
+  Y.applyUpdate(window.__milkdownYDoc, update, "remote");
+};
+
+/**
+ * Get the local Yjs state vector, so the server can reply with only the
+ * operations this client is missing instead of the full document.
+ */
+window._getYjsStateVector = function () {
+  if (!window.__milkdownYDoc) return new Uint8Array();
+  return Y.encodeStateVector(window.__milkdownYDoc);
+};
+
+/** Encode a Yjs update as base64 (for callers still using string transport). */
+window._yjsUpdateToBase64 = uint8ArrayToBase64;
+
 /**
  * Get the full Yjs document state as a base64-encoded update.
  * Used for full-state sync when a new client joins.
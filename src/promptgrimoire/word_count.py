@@ -10,6 +10,7 @@ External tokenisers:
 
 from __future__ import annotations
 
+import hashlib
 import re
 import unicodedata
 import warnings
@@ -53,6 +54,12 @@ _HTML_BR_RE = re.compile(r"<br\s*/?>")
 _MARKDOWN_IMAGE_RE = re.compile(r"!\[")
 _MARKDOWN_LINK_URL_RE = re.compile(r"\]\([^)]*\)")
 
+# Blank line between markdown blocks.  Link URLs may span blank lines, but
+# once normalise_text() has stripped them every later stage of word_count()
+# breaks at whitespace, so counting normalised blocks separately gives the
+# same total.
+_BLOCK_BREAK_RE = re.compile(r"\n[ \t]*\n")
+
 
 def normalise_text(text: str) -> str:
     """Normalise text for word counting.
@@ -184,7 +191,11 @@ def word_count(text: str) -> int:
     MeCab for Japanese), so exact counts may vary slightly across dictionary
     versions.
     """
-    text = normalise_text(text)
+    return _count_normalised(normalise_text(text))
+
+
+def _count_normalised(text: str) -> int:
+    """Count words in text that has already been through ``normalise_text()``."""
     segments = segment_by_script(text)
 
     tokens: list[str] = []
@@ -204,3 +215,36 @@ def word_count(text: str) -> int:
         return any(unicodedata.category(c).startswith("L") for c in s)
 
     return sum(1 for token in tokens for sub in token.split("-") if _has_letter(sub))
+
+
+class IncrementalWordCounter:
+    """``word_count()`` for a draft that changes a little at a time.
+
+    Normalises the whole text, splits it into markdown blocks at blank
+    lines and caches each block's count under a hash of its text, so a
+    keystroke only recounts the block it touched.  Only the latest text's
+    blocks stay cached.
+
+    Safe to call from a worker thread: each call reads the previous cache
+    and replaces it whole.
+    """
+
+    def __init__(self) -> None:
+        self._counts: dict[bytes, int] = {}
+
+    def count(self, text: str) -> int:
+        """Return ``word_count(text)``, recounting only changed blocks."""
+        previous = self._counts
+        counts: dict[bytes, int] = {}
+        total = 0
+        for block in _BLOCK_BREAK_RE.split(normalise_text(text)):
+            key = hashlib.blake2b(block.encode(), digest_size=16).digest()
+            n = counts.get(key)
+            if n is None:
+                n = previous.get(key)
+                if n is None:
+                    n = _count_normalised(block)
+                counts[key] = n
+            total += n
+        self._counts = counts
+        return total
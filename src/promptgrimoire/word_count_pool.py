@@ -0,0 +1,98 @@
+"""Batched word counting in a pool of pre-warmed worker processes.
+
+:func:`~promptgrimoire.word_count.word_count` is CPU-bound and mostly pure
+Python (jieba in particular), so counting in a thread still holds the GIL
+and stalls page handling.  :func:`word_count_many` counts a batch of texts
+off the event loop: in a process pool when
+``FEATURES__WORD_COUNT_PROCESSES`` is positive, otherwise in the default
+thread executor.
+
+Each pool worker loads the jieba dictionary once at start-up (see
+:func:`_warm_worker`), so a batch never pays the dictionary load.  The
+pool is created on first use and lives until :func:`shutdown_word_count_pool`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+import jieba
+import structlog
+
+from promptgrimoire.config import get_settings
+from promptgrimoire.word_count import word_count
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+logger = structlog.get_logger()
+
+# Chunks per worker: enough to balance uneven text lengths without paying
+# a pickling round trip per text.
+_CHUNKS_PER_WORKER = 4
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def _warm_worker() -> None:
+    """Load the jieba dictionary in a fresh worker process."""
+    jieba.initialize()
+
+
+def _count_batch(texts: list[str]) -> list[int]:
+    """Count words in each text.  Module-level so it can run in a worker."""
+    return [word_count(text) if text else 0 for text in texts]
+
+
+def _get_executor() -> ProcessPoolExecutor | None:
+    """Return the word count pool, creating it on first use; None if disabled."""
+    global _executor  # noqa: PLW0603
+    processes = get_settings().features.word_count_processes
+    if processes <= 0:
+        return None
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=processes, initializer=_warm_worker)
+        logger.info("word_count_pool_started", processes=processes)
+    return _executor
+
+
+def _chunk(texts: list[str], chunks: int) -> list[list[str]]:
+    """Split *texts* into at most *chunks* contiguous slices, preserving order."""
+    size = max(1, math.ceil(len(texts) / chunks))
+    return [texts[i : i + size] for i in range(0, len(texts), size)]
+
+
+async def word_count_many(texts: Sequence[str]) -> list[int]:
+    """Count words in each of *texts* without blocking the event loop.
+
+    Args:
+        texts: Markdown or plain texts to count.
+
+    Returns:
+        ``word_count(text)`` for each text, in input order.
+    """
+    batch = list(texts)
+    if not batch:
+        return []
+    executor = _get_executor()
+    if executor is None:
+        return await asyncio.to_thread(_count_batch, batch)
+
+    loop = asyncio.get_running_loop()
+    processes = get_settings().features.word_count_processes
+    chunks = _chunk(batch, processes * _CHUNKS_PER_WORKER)
+    results = await asyncio.gather(
+        *(loop.run_in_executor(executor, _count_batch, chunk) for chunk in chunks)
+    )
+    return [count for chunk in results for count in chunk]
+
+
+def shutdown_word_count_pool() -> None:
+    """Stop the worker processes; the next call starts a fresh pool."""
+    global _executor  # noqa: PLW0603
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
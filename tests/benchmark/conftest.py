@@ -1,13 +1,99 @@
-"""Benchmark test configuration.
+"""Benchmark configuration for the server-side hot paths.
 
-Reuses E2E fixtures (app_server, authenticated_page) by loading them via pytest_plugins.
-This makes the fixtures available in this test directory.
+Benchmarks use pytest-benchmark and are not part of the default test
+paths.  Run them through the CLI, which also compares against the stored
+baseline and fails on regressions::
 
-Note: app_server is in tests/conftest.py (session-scoped)
-      authenticated_page is in tests/e2e/conftest.py (pre-authenticated)
+    uv run grimoire test bench --save      # record a baseline
+    uv run grimoire test bench             # compare against it
+
+Corpora come from the shared fixtures (``tests/fixtures``) and are loaded
+once per session, so setup cost never lands inside a timed round.
 """
 
 from __future__ import annotations
 
-# Load fixtures from e2e conftest
-pytest_plugins = ["tests.e2e.conftest"]
+import asyncio
+import base64
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from promptgrimoire.input_pipeline.html_input import process_input
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterator
+
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
+
+@pytest.fixture(scope="session")
+def lawlis_raw_html() -> str:
+    """AustLII judgment as pasted (about 180 KB of HTML)."""
+    return (FIXTURES_DIR / "workspace_lawlis_v_r.html").read_text()
+
+
+@pytest.fixture(scope="session")
+def lawlis_html(lawlis_raw_html: str) -> str:
+    """The judgment as stored after the input pipeline."""
+    return asyncio.run(process_input(lawlis_raw_html, "html"))
+
+
+@pytest.fixture(scope="session")
+def blns_strings() -> list[str]:
+    """Big List of Naughty Strings."""
+    return json.loads((FIXTURES_DIR / "blns.json").read_text())
+
+
+@pytest.fixture(scope="session")
+def cjk_workspace() -> dict[str, Any]:
+    """Rehydrated Japanese workspace: documents, tags and CRDT state."""
+    data = json.loads((FIXTURES_DIR / "workspace_cjk_yuki.json").read_text())
+    crdt_state = data["workspace"]["crdt_state"]
+    data["workspace"]["crdt_state"] = base64.b64decode(crdt_state["base64"])
+    return data
+
+
+def synthetic_highlights(
+    text_length: int, count: int, *, seed: int = 7919
+) -> list[dict[str, Any]]:
+    """Deterministic, overlapping highlights spread across a document."""
+    highlights = []
+    for n in range(count):
+        start = (n * seed) % max(text_length - 1, 1)
+        highlights.append(
+            {
+                "id": f"hl-{n}",
+                "start_char": start,
+                "end_char": min(text_length, start + 1 + (n * 37) % 400),
+                "tag": f"tag{n % 5}",
+                "author": f"Student {n % 11}",
+                "text": "",
+                "comments": [],
+            }
+        )
+    return highlights
+
+
+@pytest.fixture
+def bench_loop() -> Iterator[asyncio.AbstractEventLoop]:
+    """One event loop per benchmark, so pooled connections survive rounds."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def bench_async(
+    benchmark: BenchmarkFixture, bench_loop: asyncio.AbstractEventLoop
+) -> Callable[..., Any]:
+    """Benchmark a coroutine function: ``bench_async(fn, *args, **kwargs)``."""
+
+    def run(fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        return benchmark(lambda: bench_loop.run_until_complete(fn(*args, **kwargs)))
+
+    return run
@@ -0,0 +1,133 @@
+"""Benchmarks for the input pipeline, CRDT document and word count.
+
+Each benchmark asserts on its result so a broken fast path fails rather
+than reporting a flattering time.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from promptgrimoire.crdt.annotation_doc import AnnotationDocument
+from promptgrimoire.db.crdt_extraction import extract_searchable_text
+from promptgrimoire.input_pipeline.html_input import process_input
+from promptgrimoire.input_pipeline.paragraph_map import build_paragraph_map
+from promptgrimoire.input_pipeline.text_extraction import extract_text_from_html
+from promptgrimoire.word_count import IncrementalWordCounter, word_count
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+_HIGHLIGHT_COUNT = 10_000
+
+
+@pytest.fixture(scope="module")
+def crowded_doc() -> AnnotationDocument:
+    """A CRDT document carrying 10k highlights, every tenth with a comment."""
+    doc = AnnotationDocument("bench-crowded")
+    for n in range(_HIGHLIGHT_COUNT):
+        highlight_id = doc.add_highlight(
+            start_char=n * 10,
+            end_char=n * 10 + 8,
+            tag=f"tag{n % 5}",
+            text=f"highlighted passage {n}",
+            author=f"Student {n % 40}",
+            document_id="doc-1",
+        )
+        if n % 10 == 0:
+            doc.add_comment(highlight_id, f"Student {n % 40}", f"Comment on {n}")
+    return doc
+
+
+def _plain_text(workspace: dict[str, Any]) -> str:
+    """Document text of a rehydrated workspace, one block per document."""
+    return "\n\n".join(
+        "".join(extract_text_from_html(d["content"]))
+        for d in workspace["documents"]
+        if d["content"]
+    )
+
+
+class TestInputPipeline:
+    def test_process_input_lawlis(
+        self, bench_async: Callable[..., Any], lawlis_raw_html: str
+    ) -> None:
+        result = bench_async(process_input, lawlis_raw_html, "html")
+        assert "Lawlis" in result
+
+    def test_build_paragraph_map_lawlis(
+        self, benchmark: BenchmarkFixture, lawlis_html: str
+    ) -> None:
+        result = benchmark(build_paragraph_map, lawlis_html, auto_number=False)
+        assert result
+
+
+class TestAnnotationDocument:
+    def test_encode_10k_highlights(
+        self, benchmark: BenchmarkFixture, crowded_doc: AnnotationDocument
+    ) -> None:
+        state = benchmark(crowded_doc.get_full_state)
+        assert len(state) > _HIGHLIGHT_COUNT
+
+    def test_apply_10k_highlights(
+        self, benchmark: BenchmarkFixture, crowded_doc: AnnotationDocument
+    ) -> None:
+        state = crowded_doc.get_full_state()
+
+        def apply() -> AnnotationDocument:
+            doc = AnnotationDocument("bench-apply")
+            doc.apply_update(state)
+            return doc
+
+        doc = benchmark(apply)
+        assert len(doc.highlights) == _HIGHLIGHT_COUNT
+
+
+class TestSearchExtraction:
+    def test_extract_10k_highlights(
+        self, benchmark: BenchmarkFixture, crowded_doc: AnnotationDocument
+    ) -> None:
+        state = crowded_doc.get_full_state()
+        tag_names = {f"tag{n}": f"Tag {n}" for n in range(5)}
+        text = benchmark(extract_searchable_text, state, tag_names)
+        assert "Tag 3" in text
+
+    def test_extract_cjk_workspace(
+        self, benchmark: BenchmarkFixture, cjk_workspace: dict[str, Any]
+    ) -> None:
+        tag_names = {t["id"]: t["name"] for t in cjk_workspace["tags"]}
+        text = benchmark(
+            extract_searchable_text,
+            cjk_workspace["workspace"]["crdt_state"],
+            tag_names,
+        )
+        assert text
+
+
+class TestWordCount:
+    def test_blns(self, benchmark: BenchmarkFixture, blns_strings: list[str]) -> None:
+        text = "\n\n".join(blns_strings)
+        assert benchmark(word_count, text) > 0
+
+    def test_cjk(
+        self, benchmark: BenchmarkFixture, cjk_workspace: dict[str, Any]
+    ) -> None:
+        assert benchmark(word_count, _plain_text(cjk_workspace)) > 0
+
+    def test_incremental_single_edit(
+        self, benchmark: BenchmarkFixture, cjk_workspace: dict[str, Any]
+    ) -> None:
+        """Recount after a one-character edit in a long draft."""
+        draft = _plain_text(cjk_workspace)
+        counter = IncrementalWordCounter()
+        counter.count(draft)
+        edits = iter(range(1_000_000))
+
+        def edit_and_count() -> int:
+            return counter.count(f"{draft}\n\nEdit {next(edits)}")
+
+        assert benchmark(edit_and_count) > 0
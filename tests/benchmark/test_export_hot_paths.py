@@ -0,0 +1,119 @@
+"""Benchmarks for highlight span insertion and HTML-to-LaTeX conversion.
+
+``convert_html_with_annotations`` is measured twice: with Pandoc stubbed
+out, isolating our own pre- and post-processing, and with the real Pandoc
+subprocess when it is installed.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+import pytest
+
+from promptgrimoire.export.highlight_spans import compute_highlight_spans
+from promptgrimoire.export.pandoc import convert_html_with_annotations
+from promptgrimoire.export.text_index import (
+    build_text_index,
+    export_html,
+    load_text_index,
+)
+from promptgrimoire.input_pipeline.html_input import walk_and_map
+from tests.benchmark.conftest import synthetic_highlights
+from tests.conftest import requires_pandoc
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from pathlib import Path
+
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+_TAG_COLOURS = {
+    f"tag{n}": colour
+    for n, colour in enumerate(("#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd"))
+}
+
+
+@pytest.fixture(scope="module")
+def lawlis_highlights(lawlis_html: str) -> list[dict[str, Any]]:
+    length = len(walk_and_map(export_html(lawlis_html))[0])
+    return synthetic_highlights(length, 200)
+
+
+async def _stub_pandoc(html: str, filter_paths: list[Path] | None = None) -> str:  # noqa: ARG001 -- signature of convert_html_to_latex
+    return html
+
+
+@pytest.fixture
+def stub_pandoc() -> Iterator[None]:
+    with patch(
+        "promptgrimoire.export.pandoc.convert_html_to_latex", side_effect=_stub_pandoc
+    ):
+        yield
+
+
+class TestHighlightSpans:
+    def test_dom_walk(
+        self,
+        benchmark: BenchmarkFixture,
+        lawlis_html: str,
+        lawlis_highlights: list[dict[str, Any]],
+    ) -> None:
+        html = export_html(lawlis_html)
+        result = benchmark(
+            compute_highlight_spans, html, lawlis_highlights, _TAG_COLOURS
+        )
+        assert "data-hl=" in result
+
+    def test_stored_text_index(
+        self,
+        benchmark: BenchmarkFixture,
+        lawlis_html: str,
+        lawlis_highlights: list[dict[str, Any]],
+    ) -> None:
+        html = export_html(lawlis_html)
+        index = load_text_index(build_text_index(lawlis_html), html)
+        assert index is not None
+        result = benchmark(
+            compute_highlight_spans,
+            html,
+            lawlis_highlights,
+            _TAG_COLOURS,
+            text_index=index,
+        )
+        assert "data-hl=" in result
+
+
+class TestConvertHtmlWithAnnotations:
+    @pytest.mark.usefixtures("stub_pandoc")
+    def test_pandoc_stubbed(
+        self,
+        bench_async: Callable[..., Any],
+        lawlis_html: str,
+        lawlis_highlights: list[dict[str, Any]],
+    ) -> None:
+        result = bench_async(
+            convert_html_with_annotations,
+            lawlis_html,
+            lawlis_highlights,
+            _TAG_COLOURS,
+            text_index=build_text_index(lawlis_html),
+        )
+        assert "data-hl=" in result
+
+    @requires_pandoc
+    def test_pandoc_real(
+        self,
+        bench_async: Callable[..., Any],
+        lawlis_html: str,
+        lawlis_highlights: list[dict[str, Any]],
+    ) -> None:
+        result = bench_async(
+            convert_html_with_annotations,
+            lawlis_html,
+            lawlis_highlights,
+            _TAG_COLOURS,
+            text_index=build_text_index(lawlis_html),
+        )
+        assert "\\annot" in result
@@ -0,0 +1,74 @@
+"""Benchmark for the workspace navigator query at load-test scale.
+
+Needs ``DEV__TEST_DATABASE_URL`` pointing at a database seeded with
+``uv run load-test-data``; skipped otherwise, like the AC5.5 scale test
+in ``tests/integration/test_navigator_loader.py``.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from sqlalchemy import func
+from sqlmodel import select
+
+from promptgrimoire.config import get_settings
+from promptgrimoire.db.engine import close_db, get_session
+from promptgrimoire.db.models import CourseEnrollment, User, Workspace
+from promptgrimoire.db.navigator import load_navigator_page
+
+if TYPE_CHECKING:
+    import asyncio
+    from collections.abc import Callable
+    from uuid import UUID
+
+pytestmark = pytest.mark.skipif(
+    not get_settings().dev.test_database_url,
+    reason="DEV__TEST_DATABASE_URL not configured",
+)
+
+_INSTRUCTOR_EMAIL = "lt-instructor-torts@test.local"
+
+
+async def _instructor_scope() -> tuple[UUID, list[UUID]] | None:
+    """Return the load-test instructor and their courses, if seeded."""
+    async with get_session() as session:
+        ws_count = (
+            await session.execute(select(func.count()).select_from(Workspace))
+        ).scalar()
+        if ws_count is None or ws_count < 2000:
+            return None
+        instructor = (
+            await session.exec(select(User).where(User.email == _INSTRUCTOR_EMAIL))
+        ).first()
+        if instructor is None:
+            return None
+        enrolled = await session.exec(
+            select(CourseEnrollment.course_id).where(
+                CourseEnrollment.user_id == instructor.id
+            )
+        )
+        return instructor.id, list(enrolled.all())
+
+
+def test_instructor_first_page(
+    bench_async: Callable[..., Any], bench_loop: asyncio.AbstractEventLoop
+) -> None:
+    scope = bench_loop.run_until_complete(_instructor_scope())
+    if scope is None:
+        bench_loop.run_until_complete(close_db())
+        pytest.skip("Load-test data not seeded")
+    user_id, course_ids = scope
+
+    try:
+        rows, _cursor = bench_async(
+            load_navigator_page,
+            user_id=user_id,
+            is_privileged=True,
+            enrolled_course_ids=course_ids,
+            limit=50,
+        )
+    finally:
+        bench_loop.run_until_complete(close_db())
+    assert rows
@@ -559,3 +559,86 @@ class TestResolveAnnotationContextNonexistent:
         result = await resolve_annotation_context(uuid4(), uuid4())
 
         assert result is None
+
+
+class TestLoadAnnotationPage:
+    """Tests for the single-statement page-load loader."""
+
+    @pytest.mark.asyncio
+    async def test_documents_tags_and_crdt_log_in_one_query(self) -> None:
+        """Headers, tags and pending updates arrive from one SQL statement."""
+        from sqlalchemy.orm.exc import DetachedInstanceError
+
+        from promptgrimoire.db.acl import grant_permission
+        from promptgrimoire.db.crdt_updates import append_workspace_crdt_update
+        from promptgrimoire.db.engine import _state
+        from promptgrimoire.db.tags import create_tag
+        from promptgrimoire.db.users import create_user
+        from promptgrimoire.db.workspace_documents import add_document
+        from promptgrimoire.db.workspaces import (
+            create_workspace,
+            load_annotation_page,
+        )
+        from tests.integration.test_query_efficiency import count_queries
+
+        tag_hex = uuid4().hex[:8]
+        user = await create_user(
+            email=f"ctx-page-{tag_hex}@test.local",
+            display_name=f"Ctx Page {tag_hex}",
+        )
+        ws = await create_workspace()
+        await grant_permission(ws.id, user.id, "owner")
+        first = await add_document(
+            workspace_id=ws.id,
+            type="source",
+            content="<p>First</p>",
+            source_type="html",
+            title="First",
+        )
+        await add_document(
+            workspace_id=ws.id,
+            type="source",
+            content="<p>Second</p>",
+            source_type="html",
+            title="Second",
+        )
+        tag = await create_tag(ws.id, name=f"Tag-{tag_hex}", color="#1f77b4")
+        await append_workspace_crdt_update(ws.id, b"update-1")
+        await append_workspace_crdt_update(ws.id, b"update-2")
+
+        # Warm the process-lifetime staff roles cache
+        await load_annotation_page(ws.id, user.id)
+        assert _state.engine is not None
+        with count_queries(_state.engine.sync_engine) as counter:
+            page = await load_annotation_page(ws.id, user.id)
+
+        assert len(counter) == 1
+        assert page is not None
+        assert page.context.permission == "owner"
+        assert [d.title for d in page.documents] == ["First", "Second"]
+        assert page.documents[0].id == first.id
+        assert page.documents[0].workspace_id == ws.id
+        with pytest.raises(DetachedInstanceError):
+            _ = page.documents[0].content
+        assert [t.id for t in page.context.tags] == [tag.id]
+        assert page.context.tags[0].created_at is not None
+        assert page.pending_crdt_updates == [b"update-1", b"update-2"]
+
+    @pytest.mark.asyncio
+    async def test_empty_workspace(self) -> None:
+        """A bare workspace yields empty lists, not None."""
+        from promptgrimoire.db.workspaces import (
+            create_workspace,
+            load_annotation_page,
+        )
+
+        ws = await create_workspace()
+
+        page = await load_annotation_page(ws.id, uuid4())
+
+        assert page is not None
+        assert page.context.permission is None
+        assert page.context.tags == []
+        assert page.context.tag_groups == []
+        assert page.documents == []
+        assert page.pending_crdt_updates == []
@@ -128,6 +128,49 @@ class TestProcessJob:
         assert updated.error_message is not None
         assert "LaTeX compilation failed" in updated.error_message
 
+    @pytest.mark.asyncio
+    async def test_process_job_records_metric(self, tmp_path: Path) -> None:
+        """Each processed job writes one ExportJobMetric row with its outcome."""
+        from sqlmodel import select
+
+        from promptgrimoire.db.engine import get_session
+        from promptgrimoire.db.export_jobs import create_export_job
+        from promptgrimoire.db.models import ExportJobMetric
+        from promptgrimoire.export.worker import _process_job
+        from tests.integration.conftest import claim_own_job
+
+        user_id, workspace_id = await _create_user_and_workspace()
+        created = await create_export_job(user_id, workspace_id, {"filename": "m"})
+        job = await claim_own_job({created.id})
+        assert job is not None
+
+        fake_pdf = tmp_path / "output.pdf"
+        fake_pdf.write_text("fake pdf content")
+
+        async def fake_export(**kwargs: object) -> Path:
+            timings = kwargs["stage_timings"]
+            assert isinstance(timings, dict)
+            timings.update(pandoc_convert=12, tex_generate=3, latex_compile=800)
+            return fake_pdf
+
+        with patch(
+            "promptgrimoire.export.worker.export_annotation_pdf",
+            side_effect=fake_export,
+        ):
+            await _process_job(job)
+
+        async with get_session() as session:
+            metrics = (
+                await session.exec(
+                    select(ExportJobMetric).where(ExportJobMetric.job_id == job.id)
+                )
+            ).all()
+
+        assert len(metrics) == 1
+        assert metrics[0].outcome == "completed"
+        assert metrics[0].latex_compile_ms == 800
+        assert metrics[0].total_ms >= 0
+
 
 class TestContextVarPropagation:
     """Verify workspace_id propagates via contextvars to downstream loggers."""
@@ -245,7 +288,7 @@ class TestWorkerLoop:
                 side_effect=mock_cleanup_expired,
             ),
             patch(
-                "promptgrimoire.export.worker.asyncio.sleep",
+                "promptgrimoire.export.worker.wait_for_wakeup",
                 new_callable=AsyncMock,
             ),
             pytest.raises(asyncio.CancelledError),
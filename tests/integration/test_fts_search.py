@@ -223,6 +223,137 @@ class TestSearchDirtyOnCRDTSave:
         assert reloaded.search_dirty is True
 
 
+class TestIncrementalSearchFragments:
+    """Live-document saves patch fragments instead of forcing re-extraction."""
+
+    @pytest.mark.asyncio
+    async def test_patched_fragments_rebuild_search_text(self) -> None:
+        """search_text is re-aggregated from fragments with tag names resolved."""
+        from promptgrimoire.crdt.annotation_doc import AnnotationDocument
+        from promptgrimoire.db.search_fragments import (
+            SearchFragmentPatch,
+            refresh_search_text_from_fragments,
+        )
+        from promptgrimoire.db.tags import create_tag
+        from promptgrimoire.db.workspaces import (
+            create_workspace,
+            get_workspace,
+            save_workspace_crdt_state,
+            update_workspace_title,
+        )
+
+        workspace = await create_workspace()
+        await update_workspace_title(workspace.id, "Fragment Workspace")
+        tag = await create_tag(workspace.id, name="Causation", color="#123456")
+        async with get_session() as session:
+            await session.execute(
+                text("UPDATE workspace SET search_dirty = false WHERE id = :id"),
+                {"id": workspace.id},
+            )
+
+        doc = AnnotationDocument("fragment-test")
+        hl_id = doc.add_highlight(0, 5, str(tag.id), "proximate", "tester")
+        changes = doc.drain_search_changes()
+        patch = SearchFragmentPatch(doc.build_search_fragments(changes), replace=True)
+
+        await save_workspace_crdt_state(
+            workspace.id, doc.get_full_state(), search=patch
+        )
+        flagged = await get_workspace(workspace.id)
+        assert flagged is not None
+        assert flagged.search_dirty is False
+        assert flagged.search_fragments_dirty is True
+
+        assert await refresh_search_text_from_fragments() >= 1
+        refreshed = await get_workspace(workspace.id)
+        assert refreshed is not None
+        assert refreshed.search_fragments_dirty is False
+        assert refreshed.search_text is not None
+        assert "Fragment Workspace" in refreshed.search_text
+        assert "proximate" in refreshed.search_text
+        assert "Causation" in refreshed.search_text
+
+        # Removing the highlight deletes its fragment
+        doc.remove_highlight(hl_id)
+        removal = SearchFragmentPatch(
+            doc.build_search_fragments(doc.drain_search_changes())
+        )
+        await save_workspace_crdt_state(
+            workspace.id, doc.get_full_state(), search=removal
+        )
+        await refresh_search_text_from_fragments()
+        emptied = await get_workspace(workspace.id)
+        assert emptied is not None
+        assert "proximate" not in (emptied.search_text or "")
+
+    @pytest.mark.asyncio
+    async def test_renamed_tag_is_searchable(self) -> None:
+        """Renaming a tag re-aggregates search_text with the new name."""
+        from promptgrimoire.crdt.annotation_doc import AnnotationDocument
+        from promptgrimoire.db.search_fragments import (
+            SearchFragmentPatch,
+            refresh_search_text_from_fragments,
+        )
+        from promptgrimoire.db.tags import create_tag, update_tag
+        from promptgrimoire.db.workspaces import (
+            get_workspace,
+            save_workspace_crdt_state,
+        )
+
+        user_id, ws_id = await _create_owned_workspace_with_document(
+            "<p>Unrelated content here</p>"
+        )
+        tag = await create_tag(ws_id, name="Remoteness", color="#123456")
+
+        doc = AnnotationDocument("rename-test")
+        doc.add_highlight(0, 5, str(tag.id), "damage", "tester")
+        patch = SearchFragmentPatch(
+            doc.build_search_fragments(doc.drain_search_changes()), replace=True
+        )
+        await save_workspace_crdt_state(ws_id, doc.get_full_state(), search=patch)
+        async with get_session() as session:
+            await session.execute(
+                text("UPDATE workspace SET search_dirty = false WHERE id = :id"),
+                {"id": ws_id},
+            )
+        await refresh_search_text_from_fragments()
+
+        await update_tag(tag.id, name="Foreseeability")
+        flagged = await get_workspace(ws_id)
+        assert flagged is not None
+        assert flagged.search_fragments_dirty is True
+
+        await refresh_search_text_from_fragments()
+        results = await _search("foreseeability", user_id)
+        assert any(h.row.workspace_id == ws_id for h in results)
+        assert not any(
+            h.row.workspace_id == ws_id for h in await _search("remoteness", user_id)
+        )
+
+    @pytest.mark.asyncio
+    async def test_full_extraction_clears_fragment_flag(self) -> None:
+        """Full extraction supersedes pending fragment refreshes."""
+        from promptgrimoire.db.workspaces import create_workspace, get_workspace
+        from promptgrimoire.search_worker import process_dirty_workspaces
+
+        workspace = await create_workspace()
+        async with get_session() as session:
+            await session.execute(
+                text(
+                    "UPDATE workspace SET search_dirty = true, "
+                    "search_fragments_dirty = true WHERE id = :id"
+                ),
+                {"id": workspace.id},
+            )
+
+        await process_dirty_workspaces()
+
+        refreshed = await get_workspace(workspace.id)
+        assert refreshed is not None
+        assert refreshed.search_dirty is False
+        assert refreshed.search_fragments_dirty is False
+
+
 # ── HTML stripping ────────────────────────────────────────────────────
 
 
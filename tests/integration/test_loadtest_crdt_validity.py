@@ -129,3 +129,12 @@ class TestLoadtestCrdtTagValidity:
             f"Highlight tag UUIDs not found in DB: {highlight_tag_ids - db_tag_ids}. "
             f"DB has: {db_tag_ids}"
         )
+
+    @pytest.mark.asyncio
+    async def test_seeding_tags_bumps_tag_version(self) -> None:
+        """Seeded tags must invalidate warm registry entries via tag_version."""
+        from promptgrimoire.db.tags import get_workspace_tag_version
+
+        fixture = await _build_crdt_fixture()
+
+        assert await get_workspace_tag_version(fixture.workspace_id) == 1
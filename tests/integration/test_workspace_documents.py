@@ -5,6 +5,7 @@ These tests require a running PostgreSQL instance. Set DEV__TEST_DATABASE_URL.
 Covers:
 - file-upload-109.AC3.1: update_document_content() persists new HTML
 - file-upload-109.AC3.3: paragraph_map rebuilt consistently after update
+- text_index built on add and rebuilt after update
 """
 
 from __future__ import annotations
@@ -86,6 +87,39 @@ class TestUpdateDocumentContent:
         # Should have 3 paragraph entries
         assert len(updated.paragraph_map) == 3
 
+    @pytest.mark.asyncio
+    async def test_rebuilds_text_index(self) -> None:
+        """text_index is built on add and rebuilt for the new content."""
+        from promptgrimoire.db.workspace_documents import (
+            add_document,
+            get_document,
+            update_document_content,
+        )
+        from promptgrimoire.db.workspaces import create_workspace
+        from promptgrimoire.export.text_index import export_html, load_text_index
+
+        workspace = await create_workspace()
+        doc = await add_document(
+            workspace_id=workspace.id,
+            type="source",
+            content="<p>One</p>",
+            source_type="html",
+        )
+        assert load_text_index(doc.text_index, export_html("<p>One</p>"))
+
+        new_html = "<p>First</p><p>Second</p>"
+        await update_document_content(
+            document_id=doc.id,
+            content=new_html,
+            workspace_id=workspace.id,
+        )
+
+        refetched = await get_document(doc.id)
+        assert refetched is not None
+        index = load_text_index(refetched.text_index, export_html(new_html))
+        assert index is not None
+        assert len(index) == 2
+
     @pytest.mark.asyncio
     async def test_sets_search_dirty_on_workspace(self) -> None:
         """Parent workspace gets search_dirty=True after content update."""
@@ -316,3 +316,104 @@ class TestWorkspaceCRDTRoundTrip:
         assert len(doc_b_highlights) == 1
         assert all(h["document_id"] == doc_a_id for h in doc_a_highlights)
         assert all(h["document_id"] == doc_b_id for h in doc_b_highlights)
+
+
+class TestWorkspaceCRDTUpdateLog:
+    """Tests for incremental update logging and compaction."""
+
+    @pytest.mark.asyncio
+    async def test_logged_updates_survive_reload_and_compaction(self) -> None:
+        """Appended updates are visible before and after compaction."""
+        from promptgrimoire.crdt.annotation_doc import AnnotationDocument
+        from promptgrimoire.crdt.persistence import PersistenceManager
+        from promptgrimoire.db.crdt_updates import (
+            compact_workspace_crdt_updates,
+            get_workspace_crdt_state,
+            list_pending_crdt_updates,
+        )
+        from promptgrimoire.db.workspaces import create_workspace
+
+        workspace = await create_workspace()
+        doc_uuid = str(uuid4())
+        doc = AnnotationDocument(f"ws-{workspace.id}")
+        doc.enable_update_log()
+        pm = PersistenceManager()
+        pm.register_document(doc)
+
+        # First save writes the snapshot
+        doc.add_highlight(0, 5, "issue", "first", "Author", document_id=doc_uuid)
+        pm.mark_dirty_workspace(workspace.id, doc.doc_id)
+        await pm.force_persist_workspace(workspace.id)
+
+        # Second save appends to the log
+        doc.add_highlight(6, 9, "issue", "second", "Author", document_id=doc_uuid)
+        pm._workspace_dirty[workspace.id] = doc.doc_id
+        await pm._persist_workspace(workspace.id, incremental=True)
+        assert len(await list_pending_crdt_updates(workspace.id)) == 1
+
+        state = await get_workspace_crdt_state(workspace.id)
+        assert state is not None
+        reloaded = AnnotationDocument("reloaded")
+        reloaded.apply_update(state)
+        assert len(reloaded.get_all_highlights()) == 2
+
+        await compact_workspace_crdt_updates()
+        assert await list_pending_crdt_updates(workspace.id) == []
+        compacted_state = await get_workspace_crdt_state(workspace.id)
+        assert compacted_state is not None
+        compacted = AnnotationDocument("compacted")
+        compacted.apply_update(compacted_state)
+        assert len(compacted.get_all_highlights()) == 2
+
+
+class TestBatchedWorkspaceFlush:
+    """Tests for the multi-row snapshot write used by bulk flushes."""
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_every_dirty_workspace(self) -> None:
+        """One batch saves all snapshots and clears their update logs."""
+        from promptgrimoire.crdt.annotation_doc import AnnotationDocument
+        from promptgrimoire.crdt.persistence import PersistenceManager
+        from promptgrimoire.db.crdt_updates import (
+            append_workspace_crdt_update,
+            get_workspace_crdt_state,
+            list_pending_crdt_updates,
+        )
+        from promptgrimoire.db.workspaces import create_workspace
+
+        pm = PersistenceManager()
+        workspaces = [await create_workspace() for _ in range(3)]
+        for workspace in workspaces:
+            doc = AnnotationDocument(f"ws-{workspace.id}")
+            doc.add_highlight(0, 4, "issue", "text", "Author")
+            pm.register_document(doc)
+            pm._workspace_dirty[workspace.id] = doc.doc_id
+            await append_workspace_crdt_update(workspace.id, doc.get_full_state())
+
+        await pm.persist_all_dirty_workspaces()
+
+        for workspace in workspaces:
+            assert not pm.is_workspace_dirty(workspace.id)
+            assert await list_pending_crdt_updates(workspace.id) == []
+            state = await get_workspace_crdt_state(workspace.id)
+            assert state is not None
+            reloaded = AnnotationDocument("reloaded")
+            reloaded.apply_update(state)
+            assert len(reloaded.get_all_highlights()) == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_workspace_not_reported_saved(self) -> None:
+        """Unknown workspace IDs are omitted from the returned set."""
+        from promptgrimoire.db.workspaces import (
+            create_workspace,
+            save_workspace_crdt_states,
+        )
+
+        workspace = await create_workspace()
+        missing = uuid4()
+
+        saved = await save_workspace_crdt_states(
+            {workspace.id: b"state", missing: b"state"}
+        )
+
+        assert saved == {workspace.id}
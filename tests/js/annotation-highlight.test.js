@@ -472,6 +472,105 @@ describe('annotation-highlight.js', () => {
     });
   });
 
+  describe('applyHighlightDelta', () => {
+    afterEach(() => {
+      delete window.emitEvent;
+    });
+
+    function built() {
+      const container = dom('<p>Hello World</p>');
+      applyHighlights(container, {
+        "a": [{ start_char: 0, end_char: 5, id: "h1" }],
+      });
+      return container;
+    }
+
+    function delta(upsert = [], remove = []) {
+      return { upsert, remove };
+    }
+
+    test('upsert adds a range to the existing highlight in place', () => {
+      const container = built();
+      const hl = CSS.highlights.get('hl-a');
+      applyHighlightDelta(container, delta(
+        [{ id: "h2", tag: "a", start_char: 6, end_char: 11 }]));
+      expect(CSS.highlights.get('hl-a')).toBe(hl);
+      expect(hl.ranges).toHaveLength(2);
+      expect(hl.ranges[1].startOffset).toBe(6);
+    });
+
+    test('upsert of a known id moves its range', () => {
+      const container = built();
+      applyHighlightDelta(container, delta(
+        [{ id: "h1", tag: "a", start_char: 6, end_char: 11 }]));
+      const ranges = CSS.highlights.get('hl-a').ranges;
+      expect(ranges).toHaveLength(1);
+      expect(ranges[0].startOffset).toBe(6);
+    });
+
+    test('remove drops the range and the emptied highlight', () => {
+      const container = built();
+      applyHighlightDelta(container, delta([], ["h1"]));
+      expect(CSS.highlights.has('hl-a')).toBe(false);
+    });
+
+    test('retag moves the range to the new tag after existing ones', () => {
+      const container = built();
+      applyHighlightDelta(container, delta(
+        [{ id: "h1", tag: "b", start_char: 0, end_char: 5 }]));
+      expect(CSS.highlights.has('hl-a')).toBe(false);
+      expect(CSS.highlights.get('hl-b').ranges).toHaveLength(1);
+      expect(CSS.highlights.get('hl-b').priority).toBe(1);
+    });
+
+    test('dispatches highlights-ready', () => {
+      const container = built();
+      let dispatched = false;
+      document.addEventListener('highlights-ready', () => { dispatched = true; }, { once: true });
+      applyHighlightDelta(container, delta([], ["h1"]));
+      expect(dispatched).toBe(true);
+    });
+
+    test('replaced DOM rebuilds every range from the model', () => {
+      const container = built();
+      container.innerHTML = '<p>Hello World</p>';
+      const textNode = container.firstChild.firstChild;
+      applyHighlightDelta(container, delta(
+        [{ id: "h2", tag: "a", start_char: 6, end_char: 11 }]));
+      const ranges = CSS.highlights.get('hl-a').ranges;
+      expect(ranges).toHaveLength(2);
+      expect(ranges.every(r => r.startContainer === textNode)).toBe(true);
+      expect(hasLiveHighlights(container)).toBe(true);
+    });
+
+    test('without a model for the container, requests a full push', () => {
+      built();
+      window.emitEvent = vi.fn();
+      const container = dom('<p>Hello World</p>');
+      CSS.highlights.clear();
+      applyHighlightDelta(container, delta(
+        [{ id: "h2", tag: "a", start_char: 6, end_char: 11 }]));
+      expect(window.emitEvent).toHaveBeenCalledWith('highlights_resync', {});
+      expect(CSS.highlights.has('hl-a')).toBe(false);
+    });
+  });
+
+  describe('hasLiveHighlights', () => {
+    test('true only for the container last built', () => {
+      const container = dom('<p>Hello World</p>');
+      applyHighlights(container, { "a": [{ start_char: 0, end_char: 5, id: "h1" }] });
+      expect(hasLiveHighlights(container)).toBe(true);
+      expect(hasLiveHighlights(dom('<p>Hello World</p>'))).toBe(false);
+    });
+
+    test('false once the container DOM is replaced', () => {
+      const container = dom('<p>Hello World</p>');
+      applyHighlights(container, { "a": [{ start_char: 0, end_char: 5, id: "h1" }] });
+      container.innerHTML = '<p>Hello World</p>';
+      expect(hasLiveHighlights(container)).toBe(false);
+    });
+  });
+
   describe('setupAnnotationSelection', () => {
     test('calls emitCallback with char offsets on valid selection', () => {
       const { container, textNodes } = domWithNodes('<p id="test-container">Hello World</p>');
@@ -7,38 +7,50 @@ const __filename = fileURLToPath(import.meta.url);
 const __dirname = dirname(__filename);
 
 /**
- * Verify that the Python f-string in respond.py emits both `update` and
- * `markdown` fields in the `respond_yjs_update` event payload.
+ * Verify that the editor init script in respond.py sends Yjs updates as
+ * binary socket.io frames carrying `client_id`, `update` and `markdown`,
+ * the fields `yjs_relay._on_update` reads.
  *
  * This is a static source analysis test — it reads the Python source and
  * checks the JS template string structure.
  */
-describe('respond_yjs_update event payload', () => {
-  const respondSrc = readFileSync(
-    resolve(__dirname, '../../src/promptgrimoire/pages/annotation/respond.py'),
-    'utf-8'
+describe('Yjs update socket.io payload', () => {
+  const annotationDir = resolve(
+    __dirname, '../../src/promptgrimoire/pages/annotation'
   );
+  const respondSrc = readFileSync(resolve(annotationDir, 'respond.py'), 'utf-8');
+  const relaySrc = readFileSync(resolve(annotationDir, 'yjs_relay.py'), 'utf-8');
 
-  test('emitEvent includes update field', () => {
-    expect(respondSrc).toContain("emitEvent('respond_yjs_update'");
-    expect(respondSrc).toMatch(/emitEvent\('respond_yjs_update'.*update:\s*b64Update/s);
+  function emitPayload() {
+    // Extract the socket.emit block for the relay event
+    const match = respondSrc.match(
+      /window\.socket\.emit\('\{YJS_EVENT\}',\s*\{\{([\s\S]*?)\}\}\)/
+    );
+    expect(match).not.toBeNull();
+    return match[1];
+  }
+
+  test('emits on the relay event', () => {
+    expect(relaySrc).toMatch(/^YJS_EVENT = "[a-z_]+"$/m);
+    expect(respondSrc).toContain("window.socket.emit('{YJS_EVENT}'");
+    expect(respondSrc).not.toContain("emitEvent('respond_yjs_update'");
   });
 
-  test('emitEvent includes markdown field from _getMilkdownMarkdown', () => {
-    // The emitEvent call must include markdown: window._getMilkdownMarkdown()
-    expect(respondSrc).toMatch(
-      /emitEvent\('respond_yjs_update'.*markdown:\s*window\._getMilkdownMarkdown\(\)/s
-    );
+  test('sends the raw update bytes, not base64', () => {
+    const payload = emitPayload();
+    expect(payload).toMatch(/update:\s*update\b/);
+    expect(payload).not.toContain('b64');
   });
 
-  test('both fields appear in the same emitEvent call', () => {
-    // Extract the emitEvent block for respond_yjs_update
-    const match = respondSrc.match(
-      /emitEvent\('respond_yjs_update',\s*\{\{([\s\S]*?)\}\}\)/
-    );
-    expect(match).not.toBeNull();
-    const payload = match[1];
-    expect(payload).toContain('update: b64Update');
-    expect(payload).toContain('markdown: window._getMilkdownMarkdown()');
+  test('includes client_id and markdown from _getMilkdownMarkdown', () => {
+    const payload = emitPayload();
+    expect(payload).toMatch(/client_id:\s*window\.clientId/);
+    expect(payload).toMatch(/markdown:\s*window\._getMilkdownMarkdown\(\)/);
+  });
+
+  test('server reads the same fields', () => {
+    for (const field of ['client_id', 'update', 'markdown']) {
+      expect(relaySrc).toContain(`msg.get("${field}"`);
+    }
   });
 });
@@ -29,6 +29,19 @@ globalThis.Highlight = class Highlight {
     this.ranges = ranges;
     this.priority = 0;
   }
+  add(range) {
+    if (!this.ranges.includes(range)) this.ranges.push(range);
+    return this;
+  }
+  delete(range) {
+    const idx = this.ranges.indexOf(range);
+    if (idx === -1) return false;
+    this.ranges.splice(idx, 1);
+    return true;
+  }
+  get size() {
+    return this.ranges.length;
+  }
 };
 
 globalThis.StaticRange = class StaticRange {
@@ -57,7 +70,8 @@ globalThis.Quasar = {
 // Explicitly bind evaluated global functions to globalThis so vi.spyOn works on them
 const functionNames = [
   'initToolbarObserver', 'setupCopyProtection',
-  'walkTextNodes', 'clearHighlights', 'applyHighlights', 'charOffsetToRange',
+  'walkTextNodes', 'clearHighlights', 'applyHighlights', 'applyHighlightDelta',
+  'hasLiveHighlights', 'charOffsetToRange',
   'findLocalOffset', 'charOffsetToRect', 'scrollToCharOffset', 'showHoverHighlight',
   'clearHoverHighlight', 'throbHighlight', 'setupSelection', 'setupAnnotationSelection',
   'rangePointToCharOffset', '_boundaryFromSiblings', 'countCollapsed',
@@ -108,6 +108,11 @@ class TestSkipClassification:
                 new_callable=AsyncMock,
                 return_value=[mock_doc],
             ),
+            patch(
+                "promptgrimoire.cli.export.get_workspace_crdt_state",
+                new_callable=AsyncMock,
+                return_value=None,
+            ),
             patch(
                 "promptgrimoire.cli.export.list_tags_for_workspace",
                 new_callable=AsyncMock,
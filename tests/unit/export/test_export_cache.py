@@ -0,0 +1,279 @@
+"""Tests for the content-addressed export cache (export/cache.py)."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from promptgrimoire.config import ExportConfig, Settings
+from promptgrimoire.export.cache import (
+    evict_export_cache,
+    export_cache_key,
+    fetch_cached_export,
+    fetch_cached_fragment,
+    store_cached_export,
+    store_cached_fragment,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+def _settings(cache_dir: Path, cache_max_mb: int = 64) -> Settings:
+    return Settings(
+        _env_file=None,  # type: ignore[call-arg]
+        export=ExportConfig(cache_dir=cache_dir, cache_max_mb=cache_max_mb),
+    )
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path) -> Iterator[Path]:
+    directory = tmp_path / "cache"
+    with patch(
+        "promptgrimoire.export.cache.get_settings",
+        return_value=_settings(directory),
+    ):
+        yield directory
+
+
+def _artefact(tmp_path: Path, name: str, content: bytes) -> Path:
+    path = tmp_path / name
+    path.write_bytes(content)
+    return path
+
+
+class TestExportCacheKey:
+    """Tests for export_cache_key()."""
+
+    def test_independent_of_dict_order(self) -> None:
+        a = export_cache_key("pdf", {"tag_colours": {"x": "red", "y": "blue"}})
+        b = export_cache_key("pdf", {"tag_colours": {"y": "blue", "x": "red"}})
+        assert a == b
+
+    def test_content_changes_key(self) -> None:
+        base = {"highlights": [{"start_char": 0, "end_char": 5, "tag": "t"}]}
+        moved = {"highlights": [{"start_char": 0, "end_char": 6, "tag": "t"}]}
+        assert export_cache_key("pdf", base) != export_cache_key("pdf", moved)
+
+    def test_kind_changes_key(self) -> None:
+        inputs = {"notes_latex": "x"}
+        assert export_cache_key("pdf", inputs) != export_cache_key("tex", inputs)
+
+
+class TestFetchAndStore:
+    """Tests for store_cached_export() / fetch_cached_export()."""
+
+    def test_miss_returns_none(self, cache_dir: Path, tmp_path: Path) -> None:
+        assert fetch_cached_export("ab" * 32, ".pdf", tmp_path / "out.pdf") is None
+        assert not cache_dir.exists()
+
+    def test_round_trip_uses_requested_name(
+        self, cache_dir: Path, tmp_path: Path
+    ) -> None:
+        key = export_cache_key("pdf", {"notes_latex": "hello"})
+        store_cached_export(key, ".pdf", _artefact(tmp_path, "a.pdf", b"%PDF-1"))
+
+        dest = tmp_path / "renamed.pdf"
+        assert fetch_cached_export(key, ".pdf", dest) == dest
+        assert dest.read_bytes() == b"%PDF-1"
+        assert list(cache_dir.glob("*/*.tmp")) == []
+
+    def test_disabled_when_budget_zero(self, tmp_path: Path) -> None:
+        key = export_cache_key("pdf", {})
+        with patch(
+            "promptgrimoire.export.cache.get_settings",
+            return_value=_settings(tmp_path / "cache", cache_max_mb=0),
+        ):
+            store_cached_export(key, ".pdf", _artefact(tmp_path, "a.pdf", b"x"))
+            assert fetch_cached_export(key, ".pdf", tmp_path / "b.pdf") is None
+
+        assert not (tmp_path / "cache").exists()
+
+    def test_fragment_round_trip(self, cache_dir: Path) -> None:
+        key = export_cache_key("fragment", {"html_content": "<p>x</p>"})
+        assert fetch_cached_fragment(key) is None
+
+        store_cached_fragment(key, "\\textbf{x}")
+
+        assert fetch_cached_fragment(key) == "\\textbf{x}"
+        assert cache_dir.exists()
+
+
+class TestEviction:
+    """Tests for evict_export_cache()."""
+
+    def test_least_recently_used_evicted_first(self, tmp_path: Path) -> None:
+        directory = tmp_path / "cache"
+        keys = [export_cache_key("pdf", {"n": n}) for n in range(3)]
+        blob = _artefact(tmp_path, "blob.pdf", b"x" * (600 * 1024))
+        now = time.time()
+        with patch(
+            "promptgrimoire.export.cache.get_settings",
+            return_value=_settings(directory, cache_max_mb=1),
+        ):
+            for age, key in zip((300, 200, 100), keys, strict=True):
+                store_cached_export(key, ".pdf", blob)
+                entry = directory / key[:2] / f"{key}.pdf"
+                os.utime(entry, (now - age, now - age))
+            # A hit refreshes the oldest entry
+            fetch_cached_export(keys[0], ".pdf", tmp_path / "hit.pdf")
+
+            assert evict_export_cache() == 2
+            assert fetch_cached_export(keys[0], ".pdf", tmp_path / "a.pdf")
+            assert fetch_cached_export(keys[1], ".pdf", tmp_path / "b.pdf") is None
+            assert fetch_cached_export(keys[2], ".pdf", tmp_path / "c.pdf") is None
+
+    def test_only_stale_temp_files_removed(self, cache_dir: Path) -> None:
+        shard = cache_dir / "ab"
+        shard.mkdir(parents=True)
+        stale = shard / "stale.tmp"
+        live = shard / "live.tmp"
+        stale.write_bytes(b"x")
+        live.write_bytes(b"x")
+        old = time.time() - 7200
+        os.utime(stale, (old, old))
+
+        assert evict_export_cache() == 1
+        assert not stale.exists()
+        assert live.exists()
+
+
+class TestExportAnnotationPdfCache:
+    """export_annotation_pdf(use_cache=True) skips the pipeline on a hit."""
+
+    @pytest.mark.asyncio
+    async def test_second_export_served_from_cache(
+        self, cache_dir: Path, tmp_path: Path
+    ) -> None:
+        from promptgrimoire.export.pdf_export import export_annotation_pdf
+
+        async def fake_compile(tex_path: Path, output_dir: Path) -> Path:
+            pdf = output_dir / tex_path.with_suffix(".pdf").name
+            pdf.write_bytes(b"%PDF-1.4 compiled")
+            return pdf
+
+        convert = AsyncMock(return_value="Body text")
+        compile_latex = AsyncMock(side_effect=fake_compile)
+        kwargs = {
+            "html_content": "<p>Body text</p>",
+            "highlights": [],
+            "tag_colours": {},
+            "use_cache": True,
+        }
+        with (
+            patch(
+                "promptgrimoire.export.pdf_export._convert_single_document",
+                convert,
+            ),
+            patch("promptgrimoire.export.pdf_export.compile_latex", compile_latex),
+        ):
+            first_dir = tmp_path / "first"
+            first_dir.mkdir()
+            await export_annotation_pdf(output_dir=first_dir, **kwargs)
+
+            second_dir = tmp_path / "second"
+            second_dir.mkdir()
+            pdf = await export_annotation_pdf(
+                output_dir=second_dir, filename="again", **kwargs
+            )
+
+        assert pdf == second_dir / "again.pdf"
+        assert pdf.read_bytes() == b"%PDF-1.4 compiled"
+        assert convert.await_count == 1
+        assert compile_latex.await_count == 1
+        assert cache_dir.exists()
+
+
+class TestMultiDocFragmentCache:
+    """_build_multi_doc_body reuses fragments for unchanged documents."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("cache_dir")
+    async def test_only_changed_document_reconverted(self, tmp_path: Path) -> None:
+        from promptgrimoire.export.pdf_export import generate_tex_only
+
+        async def fake_convert(html_content: str, *_args, **_kwargs) -> str:
+            return f"converted {html_content}"
+
+        convert = AsyncMock(side_effect=fake_convert)
+        documents = [
+            {"html_content": "<p>One</p>", "highlights": [], "title": "One"},
+            {"html_content": "<p>Two</p>", "highlights": [], "title": "Two"},
+        ]
+        edited = [
+            documents[0],
+            documents[1]
+            | {"highlights": [{"start_char": 0, "end_char": 3, "tag": "jurisdiction"}]},
+        ]
+        common = {
+            "html_content": "",
+            "highlights": [],
+            "tag_colours": {"jurisdiction": "#1f77b4"},
+            "use_cache": True,
+        }
+        with patch(
+            "promptgrimoire.export.pdf_export._convert_single_document", convert
+        ):
+            await generate_tex_only(
+                output_dir=tmp_path, filename="first", documents=documents, **common
+            )
+            tex = await generate_tex_only(
+                output_dir=tmp_path, filename="second", documents=edited, **common
+            )
+
+        converted = [c.args[0] for c in convert.await_args_list]
+        assert converted == ["<p>One</p>", "<p>Two</p>", "<p>Two</p>"]
+        assert "converted <p>One</p>" in tex.read_text()
+
+    @pytest.mark.asyncio
+    async def test_without_cache_always_converts(self, cache_dir: Path) -> None:
+        from promptgrimoire.export.pdf_export import _build_multi_doc_body
+
+        convert = AsyncMock(return_value="body")
+        documents = [{"html_content": "<p>One</p>", "highlights": []}]
+        with patch(
+            "promptgrimoire.export.pdf_export._convert_single_document", convert
+        ):
+            await _build_multi_doc_body(documents, {})
+            await _build_multi_doc_body(documents, {})
+
+        assert convert.await_count == 2
+        assert not cache_dir.exists()
+
+    @pytest.mark.asyncio
+    async def test_documents_convert_concurrently_in_order(self) -> None:
+        from promptgrimoire.export.pdf_export import (
+            _PANDOC_CONCURRENCY,
+            _build_multi_doc_body,
+        )
+
+        in_flight = 0
+        peak = 0
+
+        async def slow_convert(html_content: str, *_args, **_kwargs) -> str:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return html_content
+
+        documents = [
+            {"html_content": f"doc{n}", "title": f"T{n}"}
+            for n in range(_PANDOC_CONCURRENCY + 2)
+        ]
+        with patch(
+            "promptgrimoire.export.pdf_export._convert_single_document",
+            side_effect=slow_convert,
+        ):
+            body = await _build_multi_doc_body(documents, {})
+
+        assert peak == _PANDOC_CONCURRENCY
+        positions = [body.index(f"doc{n}") for n in range(len(documents))]
+        assert positions == sorted(positions)
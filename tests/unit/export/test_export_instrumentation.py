@@ -230,6 +230,41 @@ class TestExportStageTiming:
             assert isinstance(duration, int)
             assert duration >= 0
 
+    async def test_stage_timings_out_param(self, tmp_path: Path) -> None:
+        """stage_timings receives the same per-stage durations that are logged."""
+        log_file = _setup_json_logging(tmp_path)
+
+        output_dir = tmp_path / "export_out"
+        output_dir.mkdir()
+
+        fake_pdf = output_dir / "annotated_document.pdf"
+        fake_pdf.write_bytes(b"%PDF-1.4 fake")
+        timings: dict[str, int] = {}
+
+        with patch(
+            "promptgrimoire.export.pdf_export.compile_latex",
+            new_callable=AsyncMock,
+            return_value=fake_pdf,
+        ):
+            from promptgrimoire.export.pdf_export import export_annotation_pdf
+
+            await export_annotation_pdf(
+                html_content="<p>Hello world</p>",
+                highlights=[],
+                tag_colours={},
+                output_dir=output_dir,
+                stage_timings=timings,
+            )
+
+        all_events = _flush_and_read_all(log_file)
+        logged = {
+            e["export_stage"]: e["stage_duration_ms"]
+            for e in all_events
+            if e.get("export_stage") is not None
+        }
+        assert timings == logged
+        assert set(timings) == {"pandoc_convert", "tex_generate", "latex_compile"}
+
 
 # ---------------------------------------------------------------------------
 # AC3.3: LaTeX error extraction
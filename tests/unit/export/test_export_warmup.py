@@ -0,0 +1,71 @@
+"""Tests for the export toolchain warm-up (export/warmup.py)."""
+
+from __future__ import annotations
+
+import subprocess
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from promptgrimoire.export.warmup import warm_export_toolchain
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestWarmExportToolchain:
+    """warm_export_toolchain() runs one throwaway export end to end."""
+
+    @pytest.mark.asyncio
+    async def test_compiles_generated_tex_in_temp_dir(self) -> None:
+        compiled: list[Path] = []
+
+        async def fake_compile(tex_path: Path, output_dir: Path) -> Path:
+            assert tex_path.exists()
+            assert (output_dir / "promptgrimoire-export.sty").exists()
+            compiled.append(output_dir)
+            return output_dir / "warmup.pdf"
+
+        with (
+            patch(
+                "promptgrimoire.export.pdf_export._convert_single_document",
+                new_callable=AsyncMock,
+                return_value="Warm-up body",
+            ),
+            patch(
+                "promptgrimoire.export.warmup.compile_latex",
+                side_effect=fake_compile,
+            ),
+        ):
+            assert await warm_export_toolchain() is True
+
+        assert len(compiled) == 1
+        # Temp directory is removed afterwards
+        assert not compiled[0].exists()
+
+    @pytest.mark.asyncio
+    async def test_exports_a_tagged_highlight(self) -> None:
+        """The warm-up document carries a highlight in a known tag colour."""
+        generate = AsyncMock(side_effect=RuntimeError("stop"))
+        with patch("promptgrimoire.export.warmup.generate_tex_only", generate):
+            assert await warm_export_toolchain() is False
+
+        kwargs = generate.await_args.kwargs
+        assert kwargs["highlights"]
+        assert {hl["tag"] for hl in kwargs["highlights"]} <= set(kwargs["tag_colours"])
+
+    @pytest.mark.asyncio
+    async def test_failure_is_reported_not_raised(self) -> None:
+        compile_latex = AsyncMock()
+        with (
+            patch(
+                "promptgrimoire.export.pdf_export._convert_single_document",
+                new_callable=AsyncMock,
+                side_effect=subprocess.CalledProcessError(1, ["pandoc"]),
+            ),
+            patch("promptgrimoire.export.warmup.compile_latex", compile_latex),
+        ):
+            assert await warm_export_toolchain() is False
+
+        compile_latex.assert_not_awaited()
@@ -7,15 +7,24 @@ and recompiles with all annotations routed to endnotes.
 
 from __future__ import annotations
 
+import json
 from pathlib import Path
+from unittest.mock import AsyncMock, patch
 
+import pytest
+
+from promptgrimoire.export.overflow import estimate_margin_overflow
 from promptgrimoire.export.pdf import (
     LaTeXCompilationError,
+    compile_latex,
     has_marginalia_placement_warnings,
     inject_annot_force_endnotes,
 )
+from promptgrimoire.export.text_index import build_text_index
 from promptgrimoire.export.worker import user_facing_error
 
+_FIXTURES = Path(__file__).resolve().parents[2] / "fixtures"
+
 
 class TestHasMarginaliaPlacementWarnings:
     """Detection of marginalia placement problems in LaTeX logs."""
@@ -150,3 +159,189 @@ class TestUserFacingError:
     def test_generic_error_passes_through(self) -> None:
         exc = RuntimeError("something broke")
         assert user_facing_error(exc) == "something broke"
+
+
+def _load_fixture(name: str) -> tuple[str, list[dict]]:
+    data = json.loads((_FIXTURES / name).read_text())
+    return data["html_content"], data["highlights"]
+
+
+def _highlight(end_char: int, comment: str = "") -> dict:
+    comments = [{"author": "Tutor", "text": comment}] if comment else []
+    return {
+        "start_char": max(end_char - 5, 0),
+        "end_char": end_char,
+        "tag": "jurisdiction",
+        "author": "Student",
+        "comments": comments,
+    }
+
+
+class TestEstimateMarginOverflow:
+    """Pre-compile overflow estimate, validated against known fixtures."""
+
+    def test_dogs_breakfast_fixture_overflows(self) -> None:
+        """23 commented highlights on a one-page document overflow the margin."""
+        estimate = estimate_margin_overflow(
+            [(*_load_fixture("workspace_dogs_breakfast_overflow.json"), None)]
+        )
+        assert estimate.notes == 23
+        assert estimate.pages == 1
+        assert estimate.overflows
+
+    def test_lightly_annotated_fixture_fits(self) -> None:
+        estimate = estimate_margin_overflow(
+            [(*_load_fixture("workspace_pabai_latex_specials.json"), None)]
+        )
+        assert estimate.notes == 5
+        assert not estimate.overflows
+
+    def test_long_document_spreads_notes_over_pages(self) -> None:
+        data = json.loads((_FIXTURES / "workspace_lawlis_v_r.json").read_text())
+        html = (_FIXTURES / "workspace_lawlis_v_r.html").read_text()
+
+        estimate = estimate_margin_overflow([(html, data["highlights"], None)])
+
+        assert estimate.pages > 1
+        assert not estimate.overflows
+
+    def test_no_highlights(self) -> None:
+        estimate = estimate_margin_overflow([("<p>Plain text</p>", [], None)])
+        assert estimate.notes == 0
+        assert estimate.peak_fill == 0.0
+
+    def test_no_highlights_skips_layout(self) -> None:
+        """Exports without highlights never parse their documents."""
+        with patch("promptgrimoire.export.overflow.line_starts") as line_starts:
+            estimate = estimate_margin_overflow([("<p>Plain text</p>", [], None)] * 3)
+
+        line_starts.assert_not_called()
+        assert not estimate.overflows
+
+    def test_stored_text_index_matches_dom_walk(self) -> None:
+        """A persisted text index yields the same estimate without parsing."""
+        html, highlights = _load_fixture("workspace_dogs_breakfast_overflow.json")
+        index = build_text_index(html)
+        assert index is not None
+
+        walked = estimate_margin_overflow([(html, highlights, None)])
+        with patch(
+            "promptgrimoire.export.text_index.walk_and_map",
+            side_effect=AssertionError("DOM walk with a valid index"),
+        ):
+            indexed = estimate_margin_overflow([(html, highlights, index)])
+
+        assert indexed == walked
+
+    def test_long_comment_counts_as_endnote_stub(self) -> None:
+        """Notes over \\annotmaxht become one-line stubs, not margin overflow."""
+        html = "<p>" + "word " * 40 + "</p>"
+        essay = "A very long tutor comment. " * 200
+
+        estimate = estimate_margin_overflow([(html, [_highlight(20, essay)], None)])
+
+        assert estimate.peak_fill < 0.05
+
+    def test_notes_on_different_pages_do_not_accumulate(self) -> None:
+        """The same notes fit when the text spreads them over several pages."""
+        paragraphs = "".join(f"<p>{'word ' * 60}</p>" for _ in range(120))
+        chars_per_paragraph = 300
+        comment = "Consider the authority here. " * 3
+        crowded = [_highlight(10 + i, comment) for i in range(30)]
+        spread = [_highlight(i * 4 * chars_per_paragraph, comment) for i in range(30)]
+
+        assert estimate_margin_overflow([(paragraphs, crowded, None)]).overflows
+        assert not estimate_margin_overflow([(paragraphs, spread, None)]).overflows
+
+    def test_documents_share_the_page_flow(self) -> None:
+        """Notes from consecutive short documents land on the same page."""
+        html = "<p>Short source document.</p>"
+        comment = "Consider the authority here. " * 3
+        documents = [(html, [_highlight(5, comment) for _ in range(4)], None)] * 4
+
+        single = estimate_margin_overflow(documents[:1])
+        combined = estimate_margin_overflow(documents)
+
+        assert combined.notes == 16
+        assert combined.peak_fill == pytest.approx(single.peak_fill * 4, rel=0.01)
+
+
+class TestCompileLatexWithPredictedOverflow:
+    r"""A .tex with \annotforceendnotestrue already set compiles once."""
+
+    @staticmethod
+    def _fake_latexmk(warn: bool):
+        async def run(tex_path: Path, output_dir: Path) -> Path:
+            (output_dir / f"{tex_path.stem}.log").write_text(
+                "Package marginalia Warning: Problems in placement.\n" if warn else ""
+            )
+            pdf = output_dir / f"{tex_path.stem}.pdf"
+            pdf.write_bytes(b"%PDF")
+            return pdf
+
+        return run
+
+    @staticmethod
+    def _tex(tmp_path: Path, *, forced: bool) -> Path:
+        tex = tmp_path / "doc.tex"
+        tex.write_text(
+            "\\documentclass{article}\n"
+            "\\usepackage{promptgrimoire-export}\n"
+            + ("\\annotforceendnotestrue\n" if forced else "")
+            + "\\begin{document}\n\\end{document}\n"
+        )
+        return tex
+
+    @pytest.mark.asyncio
+    async def test_forced_endnotes_skips_recompile(self, tmp_path: Path) -> None:
+        run = AsyncMock(side_effect=self._fake_latexmk(warn=True))
+        with patch("promptgrimoire.export.pdf._run_latexmk", run):
+            await compile_latex(self._tex(tmp_path, forced=True), tmp_path)
+
+        assert run.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unpredicted_overflow_still_recompiles(self, tmp_path: Path) -> None:
+        run = AsyncMock(side_effect=self._fake_latexmk(warn=True))
+        tex = self._tex(tmp_path, forced=False)
+        with patch("promptgrimoire.export.pdf._run_latexmk", run):
+            await compile_latex(tex, tmp_path)
+
+        assert run.await_count == 2
+        assert "\\annotforceendnotestrue" in tex.read_text()
+
+
+class TestExportAppliesPrediction:
+    """export_annotation_pdf sets the endnote flag before compiling."""
+
+    @staticmethod
+    async def _export(tmp_path: Path, fixture: str) -> str:
+        from promptgrimoire.export.pdf_export import export_annotation_pdf
+
+        html, highlights = _load_fixture(fixture)
+        compile_mock = AsyncMock(return_value=tmp_path / "annotated_document.pdf")
+        with (
+            patch(
+                "promptgrimoire.export.pdf_export._convert_single_document",
+                new_callable=AsyncMock,
+                return_value="Body",
+            ),
+            patch("promptgrimoire.export.pdf_export.compile_latex", compile_mock),
+        ):
+            await export_annotation_pdf(
+                html_content=html,
+                highlights=highlights,
+                tag_colours={},
+                output_dir=tmp_path,
+            )
+        return (tmp_path / "annotated_document.tex").read_text()
+
+    @pytest.mark.asyncio
+    async def test_predicted_overflow_sets_flag(self, tmp_path: Path) -> None:
+        tex = await self._export(tmp_path, "workspace_dogs_breakfast_overflow.json")
+        assert "\\annotforceendnotestrue" in tex
+
+    @pytest.mark.asyncio
+    async def test_no_flag_when_margin_fits(self, tmp_path: Path) -> None:
+        tex = await self._export(tmp_path, "workspace_pabai_latex_specials.json")
+        assert "\\annotforceendnotestrue" not in tex
@@ -0,0 +1,160 @@
+"""Tests for the persisted text-node index (export/text_index.py)."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from promptgrimoire.export.highlight_spans import compute_highlight_spans
+from promptgrimoire.export.span_boundaries import (
+    _detect_block_boundaries,
+    _detect_inline_boundaries,
+)
+from promptgrimoire.export.text_index import (
+    build_text_index,
+    export_html,
+    load_text_index,
+    text_index_to_json,
+)
+from promptgrimoire.input_pipeline.html_input import (
+    find_text_node_offsets,
+    process_input,
+    walk_and_map,
+)
+from tests.conftest import load_conversation_fixture
+
+_FIXTURES = [
+    "austlii",
+    "claude_cooking",
+    "openai_biblatex",
+    "google_gemini_debug",
+    "translation_japanese_sample",
+]
+
+
+def _stored(fixture: str) -> str:
+    """Fixture HTML as stored after the input pipeline."""
+    return asyncio.run(process_input(load_conversation_fixture(fixture), "html"))
+
+
+class TestBuildAndLoad:
+    """build_text_index() / load_text_index() round trip."""
+
+    @pytest.mark.parametrize("fixture", _FIXTURES)
+    def test_matches_dom_walk(self, fixture: str) -> None:
+        content = _stored(fixture)
+        html = export_html(content)
+        index = load_text_index(build_text_index(content), html)
+        assert index is not None
+
+        _chars, text_nodes = walk_and_map(html)
+        offsets = find_text_node_offsets(html, text_nodes)
+        assert index.text_nodes(html) == (text_nodes, offsets)
+        assert index.block_boundaries() == _detect_block_boundaries(
+            html, text_nodes, offsets
+        )
+        assert index.inline_boundaries() == _detect_inline_boundaries(
+            html, text_nodes, offsets
+        )
+
+    def test_rejects_other_html(self) -> None:
+        blob = build_text_index("<p>Original</p>")
+        assert load_text_index(blob, export_html("<p>Original</p>")) is not None
+        assert load_text_index(blob, export_html("<p>Edited</p>")) is None
+
+    def test_base64_form_accepted(self) -> None:
+        blob = build_text_index("<p>One &amp; two</p>")
+        html = export_html("<p>One &amp; two</p>")
+        index = load_text_index(text_index_to_json(blob), html)
+        assert index is not None
+        assert index.text_nodes(html)[0][0].decoded_text == "One & two"
+
+    @pytest.mark.parametrize(
+        "blob",
+        [None, b"", b"PGTI", "not base64!", b"XXXX" + bytes(28)],
+    )
+    def test_invalid_blob_is_none(self, blob: bytes | str | None) -> None:
+        assert load_text_index(blob, "<p>x</p>") is None
+
+    def test_truncated_blob_is_none(self) -> None:
+        blob = build_text_index("<p>One</p><p>Two</p>")
+        assert blob is not None
+        assert load_text_index(blob[:-1], export_html("<p>One</p><p>Two</p>")) is None
+
+    def test_empty_document_has_no_index(self) -> None:
+        assert build_text_index("") is None
+        assert build_text_index("<p></p>") is None
+
+    def test_node_at_bisects(self) -> None:
+        content = "<p>Alpha</p><p>Beta</p>"
+        index = load_text_index(build_text_index(content), export_html(content))
+        assert index is not None
+        assert [index.node_at(c) for c in (0, 4, 5, 8)] == [0, 0, 1, 1]
+
+
+class TestHighlightSpansWithIndex:
+    """compute_highlight_spans() gives identical output from the index."""
+
+    @pytest.mark.parametrize("fixture", _FIXTURES)
+    def test_same_output_without_dom_walk(self, fixture: str) -> None:
+        content = _stored(fixture)
+        html = export_html(content)
+        length = len(walk_and_map(html)[0])
+        highlights = []
+        for n in range(30):
+            # Spread overlapping highlights across the document
+            start = (n * 7919) % length
+            highlights.append(
+                {
+                    "start_char": start,
+                    "end_char": min(length, start + 1 + (n * 37) % 400),
+                    "tag": f"tag{n % 3}",
+                    "author": "Tester",
+                    "text": "",
+                    "comments": [],
+                }
+            )
+        expected = compute_highlight_spans(html, highlights, {})
+        index = load_text_index(build_text_index(content), html)
+
+        with patch(
+            "promptgrimoire.export.highlight_spans.walk_and_map",
+            side_effect=AssertionError("DOM walk with an index"),
+        ):
+            assert compute_highlight_spans(html, highlights, {}, text_index=index) == (
+                expected
+            )
+
+    @pytest.mark.asyncio
+    async def test_export_path_uses_stored_index(self) -> None:
+        """The HTML reaching compute_highlight_spans matches export_html()."""
+        from promptgrimoire.export.pdf_export import _convert_single_document
+
+        content = await process_input(
+            load_conversation_fixture("claude_cooking"), "html"
+        )
+        seen: dict[str, object] = {}
+
+        def capture(*_args: object, **kwargs: object) -> str:
+            seen["index"] = kwargs["text_index"]
+            raise _StopError
+
+        highlights = [{"start_char": 0, "end_char": 5, "tag": "t"}]
+        with (
+            patch(
+                "promptgrimoire.export.pandoc.compute_highlight_spans",
+                side_effect=capture,
+            ),
+            pytest.raises(_StopError),
+        ):
+            await _convert_single_document(
+                content, highlights, {}, text_index=build_text_index(content)
+            )
+
+        assert seen["index"] is not None
+
+
+class _StopError(Exception):
+    """Stops the export once compute_highlight_spans has been reached."""
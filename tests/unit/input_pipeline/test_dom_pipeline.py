@@ -0,0 +1,112 @@
+"""Tests for the single-parse DOM pipeline (input_pipeline/dom_pipeline.py).
+
+The pipeline must produce exactly what the string stages produced when
+chained, and read-only analysis must give the same answers for a parsed
+tree as for the HTML string.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from promptgrimoire.export.platforms import preprocess_for_export
+from promptgrimoire.input_pipeline.dom_pipeline import DomPipeline
+from promptgrimoire.input_pipeline.paragraph_map import (
+    build_paragraph_map,
+    detect_source_numbering,
+)
+from promptgrimoire.input_pipeline.sanitisation import (
+    remove_empty_elements,
+    strip_heavy_attributes,
+)
+from promptgrimoire.input_pipeline.text_extraction import (
+    as_tree,
+    extract_text_from_html,
+)
+from tests.conftest import load_conversation_fixture
+
+_FIXTURES = [
+    "austlii",
+    "claude_cooking",
+    "chatcraft_prd",
+    "google_gemini_debug",
+    "openai_biblatex",
+    "scienceos_loc",
+    "lawlis_v_r_austlii",
+]
+
+
+def _string_stages(html: str, platform_hint: str | None = None) -> str:
+    """The pre-pipeline implementation: one parse per stage."""
+    preprocessed = preprocess_for_export(html, platform_hint=platform_hint)
+    return remove_empty_elements(strip_heavy_attributes(preprocessed))
+
+
+def _pipeline(html: str, platform_hint: str | None = None) -> str:
+    return (
+        DomPipeline(html)
+        .preprocess(platform_hint)
+        .strip_heavy_attributes()
+        .remove_empty_elements()
+        .serialise()
+    )
+
+
+class TestDomPipelineEquivalence:
+    """DomPipeline output is byte-identical to the chained string stages."""
+
+    @pytest.mark.parametrize("fixture", _FIXTURES)
+    def test_conversation_fixtures(self, fixture: str) -> None:
+        html = load_conversation_fixture(fixture)
+        assert _pipeline(html) == _string_stages(html)
+
+    def test_speaker_labels_injected_once(self) -> None:
+        html = load_conversation_fixture("claude_cooking")
+        result = _pipeline(html)
+        assert result == _string_stages(html)
+        assert "data-speaker=" in result
+
+    @pytest.mark.parametrize(
+        "html",
+        [
+            "<p>Text</p><p><br></p><div>  </div><p>More</p>",
+            "<div><p><br><br></p></div>",
+            "<p>Only</p>",
+            "<p></p>",
+        ],
+    )
+    def test_small_documents(self, html: str) -> None:
+        assert _pipeline(html) == _string_stages(html)
+
+
+class TestRemoveEmptyElementsLarge:
+    """Empty-element removal stays linear on large documents."""
+
+    def test_many_empty_paragraphs_removed(self) -> None:
+        html = "".join(f"<p>Para {n}</p><p><br></p><div> </div>" for n in range(5000))
+        result = DomPipeline(html).remove_empty_elements().serialise()
+        assert result.count("<p>") == 5000
+        assert "<div>" not in result
+
+    def test_sole_empty_element_kept(self) -> None:
+        result = DomPipeline("<p><br></p><div></div>").remove_empty_elements()
+        assert len(result.tree.css("body p, body div")) == 1
+
+
+class TestAnalysisAcceptsTree:
+    """Read-only analysis gives the same answers for a tree as a string."""
+
+    @pytest.mark.parametrize("fixture", ["austlii", "claude_cooking"])
+    def test_paragraph_map_and_text(self, fixture: str) -> None:
+        html = _pipeline(load_conversation_fixture(fixture))
+        tree = as_tree(html)
+        for auto_number in (True, False):
+            assert build_paragraph_map(
+                tree, auto_number=auto_number
+            ) == build_paragraph_map(html, auto_number=auto_number)
+        assert detect_source_numbering(tree) == detect_source_numbering(html)
+        assert extract_text_from_html(tree) == extract_text_from_html(html)
+
+    def test_as_tree_returns_parsed_tree_unchanged(self) -> None:
+        tree = as_tree("<p>x</p>")
+        assert as_tree(tree) is tree
@@ -0,0 +1,176 @@
+"""Unit tests for the permission and ban cache (db/access_cache.py)."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from promptgrimoire.config import AccessCacheConfig, Settings
+from promptgrimoire.db import access_cache
+from promptgrimoire.db.notify import WAKEUP_CHANNEL
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture(autouse=True)
+def config() -> Iterator[AccessCacheConfig]:
+    """Default cache settings, mutable per test, on an empty cache."""
+    settings = Settings(
+        _env_file=None,  # type: ignore[call-arg]
+        access_cache=AccessCacheConfig(),
+    )
+    with patch("promptgrimoire.db.access_cache.get_settings", return_value=settings):
+        access_cache.invalidate_all()
+        yield settings.access_cache
+        access_cache.invalidate_all()
+
+
+class TestCachedPermission:
+    """Tests for cached_permission() hits, misses and expiry."""
+
+    @pytest.mark.asyncio
+    async def test_second_lookup_is_a_hit(self) -> None:
+        ws, user = uuid4(), uuid4()
+        load = AsyncMock(return_value="editor")
+        hits = access_cache.stats()["permission"]["hits"]
+
+        assert await access_cache.cached_permission(ws, user, load) == "editor"
+        assert await access_cache.cached_permission(ws, user, load) == "editor"
+
+        load.assert_awaited_once()
+        stats = access_cache.stats()["permission"]
+        assert stats["size"] == 1
+        assert stats["hits"] == hits + 1
+
+    @pytest.mark.asyncio
+    async def test_denial_is_cached(self) -> None:
+        """None (deny) is a real answer, not a miss."""
+        load = AsyncMock(return_value=None)
+        ws, user = uuid4(), uuid4()
+
+        await access_cache.cached_permission(ws, user, load)
+        assert await access_cache.cached_permission(ws, user, load) is None
+
+        load.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_entry_expires_after_ttl(self) -> None:
+        ws, user = uuid4(), uuid4()
+        load = AsyncMock(side_effect=["viewer", "editor"])
+
+        with patch("promptgrimoire.db.access_cache.time.monotonic", return_value=0.0):
+            await access_cache.cached_permission(ws, user, load)
+        with patch("promptgrimoire.db.access_cache.time.monotonic", return_value=31.0):
+            assert await access_cache.cached_permission(ws, user, load) == "editor"
+
+    @pytest.mark.asyncio
+    async def test_zero_ttl_disables_cache(self, config: AccessCacheConfig) -> None:
+        config.permission_ttl_seconds = 0
+        ws, user = uuid4(), uuid4()
+        load = AsyncMock(return_value="owner")
+
+        await access_cache.cached_permission(ws, user, load)
+        await access_cache.cached_permission(ws, user, load)
+
+        assert load.await_count == 2
+        assert access_cache.stats()["permission"]["size"] == 0
+
+    @pytest.mark.asyncio
+    async def test_full_cache_drops_oldest(self, config: AccessCacheConfig) -> None:
+        config.max_entries = 2
+        users = [uuid4() for _ in range(3)]
+        ws = uuid4()
+        for user in users:
+            await access_cache.cached_permission(ws, user, AsyncMock(return_value="x"))
+
+        load = AsyncMock(return_value="y")
+        assert await access_cache.cached_permission(ws, users[0], load) == "y"
+        assert access_cache.stats()["permission"]["size"] == 2
+
+    @pytest.mark.asyncio
+    async def test_load_racing_an_invalidation_is_not_stored(self) -> None:
+        """A load that may have read the pre-mutation row is not cached."""
+        ws, user = uuid4(), uuid4()
+
+        async def load() -> str:
+            access_cache.invalidate(access_cache.PERMISSION, ws, user)
+            return "editor"
+
+        assert await access_cache.cached_permission(ws, user, load) == "editor"
+        assert access_cache.stats()["permission"]["size"] == 0
+
+
+class TestInvalidate:
+    """Tests for invalidate() and apply_invalidation()."""
+
+    @staticmethod
+    async def _fill(*keys: tuple) -> None:
+        for ws, user in keys:
+            await access_cache.cached_permission(
+                ws, user, AsyncMock(return_value="viewer")
+            )
+
+    @pytest.mark.asyncio
+    async def test_permission_drops_one_pair(self) -> None:
+        ws, user, other = uuid4(), uuid4(), uuid4()
+        await self._fill((ws, user), (ws, other))
+
+        access_cache.invalidate(access_cache.PERMISSION, ws, user)
+
+        assert access_cache.stats()["permission"]["size"] == 1
+
+    @pytest.mark.asyncio
+    async def test_user_permissions_drop_every_workspace(self) -> None:
+        user, other = uuid4(), uuid4()
+        await self._fill((uuid4(), user), (uuid4(), user), (uuid4(), other))
+
+        access_cache.invalidate(access_cache.USER_PERMISSIONS, user)
+
+        assert access_cache.stats()["permission"]["size"] == 1
+
+    @pytest.mark.asyncio
+    async def test_workspace_permissions_drop_every_user(self) -> None:
+        ws = uuid4()
+        await self._fill((ws, uuid4()), (ws, uuid4()), (uuid4(), uuid4()))
+
+        access_cache.invalidate(access_cache.WORKSPACE_PERMISSIONS, ws)
+
+        assert access_cache.stats()["permission"]["size"] == 1
+
+    @pytest.mark.asyncio
+    async def test_ban_notification_payload(self) -> None:
+        user = uuid4()
+        await access_cache.cached_ban(user, AsyncMock(return_value=False))
+
+        access_cache.apply_invalidation(f"access:ban:{user}")
+
+        load = AsyncMock(return_value=True)
+        assert await access_cache.cached_ban(user, load) is True
+        load.assert_awaited_once()
+
+    def test_unknown_kind_is_ignored(self) -> None:
+        access_cache.apply_invalidation(f"access:future:{uuid4()}")
+
+
+class TestQueueInvalidation:
+    """Tests for queue_invalidation()."""
+
+    @pytest.mark.asyncio
+    async def test_notifies_wakeup_channel(self) -> None:
+        session = MagicMock()
+        session.execute = AsyncMock()
+        ws, user = uuid4(), uuid4()
+
+        await access_cache.queue_invalidation(
+            session, access_cache.PERMISSION, ws, user
+        )
+
+        params = session.execute.await_args.args[1]
+        assert params == {
+            "channel": WAKEUP_CHANNEL,
+            "payload": f"access:acl:{ws}:{user}",
+        }
@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 from typing import Any
+from uuid import uuid4
 
 import pytest
 
 from promptgrimoire.crdt.annotation_doc import AnnotationDocument
+from promptgrimoire.crdt.search_fragments import SearchFragment
 
 
 class TestGeneralNotes:
@@ -1625,3 +1627,286 @@ class TestRemoveHighlightsForDocument:
         removed = doc.remove_highlights_for_document("doc-a")
 
         assert removed == 0
+
+
+class TestUpdateLog:
+    """Tests for the incremental update buffer used by the persistence log."""
+
+    def test_updates_not_captured_until_enabled(self) -> None:
+        """Edits before enable_update_log() are not buffered."""
+        doc = AnnotationDocument("test-doc")
+
+        doc.set_general_notes("before")
+
+        assert doc.drain_pending_updates() == []
+
+    def test_drain_returns_updates_that_rebuild_state(self) -> None:
+        """Drained updates applied to a copy of the base state reproduce edits."""
+        doc = AnnotationDocument("test-doc")
+        doc.set_general_notes("base")
+        base = doc.get_full_state()
+        doc.enable_update_log()
+
+        doc.set_general_notes("edited")
+        updates = doc.drain_pending_updates()
+
+        assert updates
+        replica = AnnotationDocument("replica")
+        replica.apply_update(base)
+        for update in updates:
+            replica.apply_update(update)
+        assert replica.get_general_notes() == "edited"
+        assert doc.drain_pending_updates() == []
+
+    def test_restore_prepends_updates(self) -> None:
+        """Restored updates are replayed before anything captured since."""
+        doc = AnnotationDocument("test-doc")
+        doc.enable_update_log()
+        doc.set_general_notes("first")
+        first = doc.drain_pending_updates()
+        doc.set_general_notes("second")
+
+        doc.restore_pending_updates(first)
+
+        drained = doc.drain_pending_updates()
+        assert drained[: len(first)] == first
+        assert len(drained) > len(first)
+
+
+class TestStateVectorSync:
+    """Tests for the cached snapshot and state-vector catch-up."""
+
+    def test_full_state_is_cached_until_next_update(self) -> None:
+        doc = AnnotationDocument("test-doc")
+        doc.set_general_notes("one")
+
+        first = doc.get_full_state()
+        assert doc.get_full_state() is first
+
+        doc.set_general_notes("two")
+        replica = AnnotationDocument("replica")
+        replica.apply_update(doc.get_full_state())
+        assert replica.get_general_notes() == "two"
+
+    def test_full_state_inside_transaction_sees_pending_edits(self) -> None:
+        doc = AnnotationDocument("test-doc")
+        doc.get_full_state()
+
+        with doc.transaction():
+            doc.general_notes.insert(0, "pending")
+            state = doc.get_full_state()
+
+        replica = AnnotationDocument("replica")
+        replica.apply_update(state)
+        assert replica.get_general_notes() == "pending"
+
+    def test_update_since_carries_only_missing_operations(self) -> None:
+        doc = AnnotationDocument("test-doc")
+        doc.set_general_notes("x" * 2000)
+        replica = AnnotationDocument("replica")
+        replica.apply_update(doc.get_full_state())
+
+        doc.add_highlight(0, 5, "tag", "text", "author")
+        missing = doc.get_update_since(replica.get_state_vector())
+
+        assert len(missing) < len(doc.get_full_state()) // 4
+        replica.apply_update(missing)
+        assert len(replica.get_all_highlights()) == 1
+        assert replica.get_general_notes() == "x" * 2000
+
+    def test_update_since_up_to_date_peer_is_empty(self) -> None:
+        doc = AnnotationDocument("test-doc")
+        doc.set_general_notes("notes")
+
+        assert doc.get_update_since(doc.get_state_vector()) == b"\x00\x00"
+
+    @pytest.mark.parametrize("state_vector", [None, b"", b"\xff\xff"])
+    def test_unusable_state_vector_falls_back_to_full_state(
+        self, state_vector: bytes | None
+    ) -> None:
+        doc = AnnotationDocument("test-doc")
+        doc.set_general_notes("notes")
+
+        assert doc.get_update_since(state_vector) == doc.get_full_state()
+
+
+class TestHighlightJournal:
+    """Tests for highlight_changes_since(), used for incremental pushes."""
+
+    def test_reports_only_changes_after_seq(self) -> None:
+        doc = AnnotationDocument("test-doc")
+        first = doc.add_highlight(0, 5, "tag", "text", "author")
+        seq = doc.highlight_seq
+
+        second = doc.add_highlight(10, 15, "tag", "text", "author")
+        doc.update_highlight_tag(first, "other")
+
+        assert doc.highlight_changes_since(seq) == [first, second]
+        assert doc.highlight_changes_since(doc.highlight_seq) == []
+
+    def test_removal_is_reported(self) -> None:
+        doc = AnnotationDocument("test-doc")
+        hl_id = doc.add_highlight(0, 5, "tag", "text", "author")
+        seq = doc.highlight_seq
+
+        doc.remove_highlight(hl_id)
+
+        assert doc.highlight_changes_since(seq) == [hl_id]
+
+    def test_remote_update_is_journaled(self) -> None:
+        source = AnnotationDocument("source")
+        replica = AnnotationDocument("replica")
+        seq = replica.highlight_seq
+
+        hl_id = source.add_highlight(0, 5, "tag", "text", "author")
+        replica.apply_update(source.get_full_state())
+
+        assert replica.highlight_changes_since(seq) == [hl_id]
+
+    def test_seq_older_than_journal_returns_none(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            "promptgrimoire.crdt.annotation_doc._HIGHLIGHT_JOURNAL_MAX", 2
+        )
+        doc = AnnotationDocument("test-doc")
+        for start in range(3):
+            doc.add_highlight(start, start + 1, "tag", "text", "author")
+
+        assert doc.highlight_changes_since(0) is None
+        assert len(doc.highlight_changes_since(1) or []) == 2
+
+
+class TestHighlightIndexQueries:
+    """Indexed queries agree with the highlights Map they are built from."""
+
+    def test_queries_follow_edits(self) -> None:
+        doc = AnnotationDocument("test-doc")
+        late = doc.add_highlight(50, 60, "a", "t", "x", document_id="d1")
+        early = doc.add_highlight(0, 10, "b", "t", "x", document_id="d1")
+        other = doc.add_highlight(5, 8, "a", "t", "x", document_id="d2")
+
+        doc.update_highlight_tag(early, "a")
+        doc.remove_highlight(other)
+
+        assert [h["id"] for h in doc.get_all_highlights()] == [early, late]
+        assert [h["id"] for h in doc.get_highlights_for_document("d1")] == [
+            early,
+            late,
+        ]
+        assert doc.count_highlights_for_document("d2") == 0
+        assert doc.get_highlight_ids_with_tag("a") == {early, late}
+        assert doc.get_highlight_ids_with_tag("b") == set()
+
+    def test_overlapping(self) -> None:
+        doc = AnnotationDocument("test-doc")
+        hit = doc.add_highlight(0, 20, "a", "t", "x", document_id="d1")
+        doc.add_highlight(30, 40, "a", "t", "x", document_id="d1")
+
+        found = doc.get_highlights_overlapping(15, 25, document_id="d1")
+
+        assert [h["id"] for h in found] == [hit]
+
+    def test_index_built_from_applied_state(self) -> None:
+        source = AnnotationDocument("source")
+        hl_id = source.add_highlight(0, 5, "a", "t", "x", document_id="d1")
+
+        replica = AnnotationDocument("replica")
+        replica.apply_update(source.get_full_state())
+
+        assert [h["id"] for h in replica.get_highlights_for_document("d1")] == [hl_id]
+
+    def test_reads_inside_transaction_see_pending_edits(self) -> None:
+        doc = AnnotationDocument("test-doc")
+
+        with doc.transaction():
+            hl_id = doc.add_highlight(0, 5, "a", "t", "x", document_id="d1")
+            assert doc.count_highlights_for_document("d1") == 1
+            assert doc.get_highlight_ids_with_tag("a") == {hl_id}
+
+
+class TestSearchChangeTracking:
+    """Tests for search fragment change tracking."""
+
+    def test_first_drain_requests_full_rebuild(self) -> None:
+        """Nothing has been persisted yet, so every fragment is rebuilt."""
+        doc = AnnotationDocument("test-doc")
+        doc.set_general_notes("loaded")
+
+        assert doc.drain_search_changes() is None
+        assert doc.drain_search_changes() == set()
+
+    def test_changed_parts_tracked(self) -> None:
+        """Highlight, comment and text-field edits record their fragment keys."""
+        doc = AnnotationDocument("test-doc")
+        hl_id = doc.add_highlight(0, 5, "tag-1", "hello", "Author")
+        doc.drain_search_changes()
+
+        doc.add_comment(hl_id, "Author", "a comment")
+        doc.set_general_notes("notes")
+        doc.response_draft_markdown.insert(0, "draft")
+
+        assert doc.drain_search_changes() == {
+            f"highlight:{hl_id}",
+            "general_notes",
+            "response_draft_markdown",
+        }
+
+    def test_non_search_changes_not_tracked(self) -> None:
+        """Tag metadata edits do not touch search fragments."""
+        doc = AnnotationDocument("test-doc")
+        doc.drain_search_changes()
+
+        doc.set_tag(uuid4(), name="Issue", colour="#fff", order_index=0)
+
+        assert doc.drain_search_changes() == set()
+
+    def test_build_fragments(self) -> None:
+        """Fragments hold highlight text with comments; removals map to None."""
+        doc = AnnotationDocument("test-doc")
+        kept = doc.add_highlight(0, 5, "tag-1", "hello", "Author")
+        removed = doc.add_highlight(6, 9, "tag-2", "bye", "Author")
+        doc.add_comment(kept, "Author", "a comment")
+        doc.remove_highlight(removed)
+
+        fragments = doc.build_search_fragments(
+            {f"highlight:{kept}", f"highlight:{removed}", "general_notes"}
+        )
+
+        assert fragments[f"highlight:{kept}"] == SearchFragment(
+            "hello\na comment", "tag-1"
+        )
+        assert fragments[f"highlight:{removed}"] is None
+        assert fragments["general_notes"] is None
+
+    def test_build_all_fragments(self) -> None:
+        """None builds every highlight plus both text fields."""
+        doc = AnnotationDocument("test-doc")
+        hl_id = doc.add_highlight(0, 5, "tag-1", "hello", "Author")
+        doc.set_general_notes("notes")
+
+        fragments = doc.build_search_fragments(None)
+
+        assert set(fragments) == {
+            f"highlight:{hl_id}",
+            "general_notes",
+            "response_draft_markdown",
+        }
+        assert fragments["general_notes"] == SearchFragment("notes")
+
+    def test_restore_merges_or_forces_rebuild(self) -> None:
+        """Restored changes merge with new ones; a restored None wins."""
+        doc = AnnotationDocument("test-doc")
+        first = doc.drain_search_changes()
+        doc.set_general_notes("x")
+        second = doc.drain_search_changes()
+        doc.response_draft_markdown.insert(0, "y")
+
+        doc.restore_search_changes(second)
+        assert doc.drain_search_changes() == {
+            "general_notes",
+            "response_draft_markdown",
+        }
+
+        doc.restore_search_changes(first)
+        assert doc.drain_search_changes() is None
@@ -0,0 +1,58 @@
+"""Unit tests for the pure permission rules used by load_annotation_page()."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+from promptgrimoire.db.workspaces import _enrollment_permission, _highest_permission
+
+_STAFF = frozenset({"coordinator", "instructor", "tutor"})
+_LEVELS = {"viewer": 10, "peer": 15, "editor": 20, "owner": 30}
+
+
+def _course(**overrides: Any) -> Any:
+    return SimpleNamespace(
+        default_instructor_permission="editor",
+        default_allow_sharing=False,
+        **overrides,
+    )
+
+
+class TestEnrollmentPermission:
+    def test_staff_get_instructor_permission(self) -> None:
+        workspace = SimpleNamespace(shared_with_class=False)
+        result = _enrollment_permission(workspace, _course(), None, "tutor", _STAFF)
+        assert result == "editor"
+
+    def test_student_without_class_sharing_gets_nothing(self) -> None:
+        workspace = SimpleNamespace(shared_with_class=False)
+        activity = SimpleNamespace(allow_sharing=True)
+        result = _enrollment_permission(
+            workspace, _course(), activity, "student", _STAFF
+        )
+        assert result is None
+
+    def test_activity_override_allows_peer(self) -> None:
+        workspace = SimpleNamespace(shared_with_class=True)
+        activity = SimpleNamespace(allow_sharing=True)
+        result = _enrollment_permission(
+            workspace, _course(), activity, "student", _STAFF
+        )
+        assert result == "peer"
+
+    def test_course_default_applies_without_activity(self) -> None:
+        workspace = SimpleNamespace(shared_with_class=True)
+        result = _enrollment_permission(workspace, _course(), None, "student", _STAFF)
+        assert result is None
+
+
+class TestHighestPermission:
+    def test_higher_level_wins(self) -> None:
+        assert _highest_permission("viewer", "editor", _LEVELS) == "editor"
+        assert _highest_permission("owner", "peer", _LEVELS) == "owner"
+
+    def test_single_source(self) -> None:
+        assert _highest_permission("viewer", None, {}) == "viewer"
+        assert _highest_permission(None, "peer", {}) == "peer"
+        assert _highest_permission(None, None, {}) is None
@@ -0,0 +1,167 @@
+"""Unit tests for AnnotationDocumentRegistry cache policy and counters."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from promptgrimoire.crdt.annotation_doc import AnnotationDocumentRegistry
+from promptgrimoire.crdt.persistence import PersistenceManager
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+def _add_docs(
+    registry: AnnotationDocumentRegistry, count: int, *, age_seconds: float = 0
+) -> list[str]:
+    """Create workspace docs, oldest first, last accessed *age_seconds* ago."""
+    doc_ids = []
+    for i in range(count):
+        doc_id = f"ws-{uuid4()}"
+        registry.get_or_create(doc_id)
+        registry._last_access[doc_id] = time.monotonic() - age_seconds - count + i
+        doc_ids.append(doc_id)
+    return doc_ids
+
+
+@pytest.fixture
+def pm() -> Iterator[PersistenceManager]:
+    manager = PersistenceManager()
+    manager.force_persist_workspace = AsyncMock()  # type: ignore[method-assign]
+    with patch(
+        "promptgrimoire.crdt.persistence.get_persistence_manager",
+        return_value=manager,
+    ):
+        yield manager
+
+
+class TestRegistryEviction:
+    """Tests for AnnotationDocumentRegistry.evict()."""
+
+    @pytest.mark.asyncio
+    async def test_idle_documents_evicted(self, pm: PersistenceManager) -> None:
+        """Documents idle longer than idle_seconds are persisted and evicted."""
+        registry = AnnotationDocumentRegistry()
+        stale = _add_docs(registry, 2, age_seconds=3600)
+        fresh = _add_docs(registry, 1, age_seconds=120)
+
+        evicted = await registry.evict(idle_seconds=1800)
+
+        assert evicted == 2
+        assert registry.list_ids() == fresh
+        assert pm.force_persist_workspace.await_count == 2
+        assert registry.evictions == 2
+        assert all(doc_id not in registry._last_access for doc_id in stale)
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("pm")
+    async def test_lru_cap_evicts_least_recent(self) -> None:
+        """max_documents evicts the least recently used documents first."""
+        registry = AnnotationDocumentRegistry()
+        doc_ids = _add_docs(registry, 4, age_seconds=300)
+        # Touch the oldest so it becomes most recently used
+        registry.get_or_create(doc_ids[0])
+        registry._last_access[doc_ids[0]] = time.monotonic() - 300
+
+        evicted = await registry.evict(max_documents=2)
+
+        assert evicted == 2
+        assert set(registry.list_ids()) == {doc_ids[0], doc_ids[3]}
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("pm")
+    async def test_byte_budget(self) -> None:
+        """max_bytes evicts until the encoded state fits the budget."""
+        registry = AnnotationDocumentRegistry()
+        doc_ids = _add_docs(registry, 3, age_seconds=300)
+        for doc_id in doc_ids:
+            registry.get(doc_id).set_general_notes("x" * 1000)  # type: ignore[union-attr]
+        one_doc = len(registry.get(doc_ids[0]).get_full_state())  # type: ignore[union-attr]
+
+        await registry.evict(max_bytes=one_doc + 10)
+
+        assert registry.list_ids() == [doc_ids[2]]
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("pm")
+    async def test_pinned_and_recent_documents_kept(self) -> None:
+        """Pinned documents and those inside the grace period are never evicted."""
+        registry = AnnotationDocumentRegistry()
+        pinned, idle = _add_docs(registry, 2, age_seconds=3600)
+        recent = f"ws-{uuid4()}"
+        registry.get_or_create(recent)
+
+        evicted = await registry.evict(
+            idle_seconds=1,
+            max_documents=1,
+            is_pinned=lambda doc_id: doc_id == pinned,
+        )
+
+        assert evicted == 1
+        assert set(registry.list_ids()) == {pinned, recent}
+        assert idle not in registry.list_ids()
+
+    @pytest.mark.asyncio
+    async def test_dirty_after_persist_is_kept(self, pm: PersistenceManager) -> None:
+        """A document whose save failed stays resident."""
+        registry = AnnotationDocumentRegistry()
+        (doc_id,) = _add_docs(registry, 1, age_seconds=3600)
+        pm.is_workspace_dirty = lambda _wid: True  # type: ignore[method-assign]
+
+        evicted = await registry.evict(idle_seconds=1800)
+
+        assert evicted == 0
+        assert registry.list_ids() == [doc_id]
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("pm")
+    async def test_non_workspace_documents_ignored(self) -> None:
+        """Only ``ws-`` documents are subject to eviction."""
+        registry = AnnotationDocumentRegistry()
+        registry.get_or_create("demo-doc")
+        registry._last_access["demo-doc"] = time.monotonic() - 3600
+
+        assert await registry.evict(idle_seconds=1) == 0
+        assert registry.list_ids() == ["demo-doc"]
+
+
+class TestRegistryStats:
+    """Tests for hit/miss counters."""
+
+    @pytest.mark.asyncio
+    async def test_hits_and_misses_counted(self) -> None:
+        registry = AnnotationDocumentRegistry()
+        workspace_id = uuid4()
+
+        with (
+            patch(
+                "promptgrimoire.db.workspaces.get_workspace",
+                new_callable=AsyncMock,
+                return_value=None,
+            ),
+            patch(
+                "promptgrimoire.db.tags.get_workspace_tag_version",
+                new_callable=AsyncMock,
+                return_value=None,
+            ),
+            patch(
+                "promptgrimoire.crdt.annotation_doc._ensure_crdt_tag_consistency",
+                new_callable=AsyncMock,
+            ),
+            patch("promptgrimoire.crdt.persistence.get_persistence_manager"),
+        ):
+            await registry.get_or_create_for_workspace(workspace_id)
+            await registry.get_or_create_for_workspace(workspace_id)
+            await registry.get_or_create_for_workspace(workspace_id)
+
+        assert registry.stats() == {
+            "size": 1,
+            "hits": 2,
+            "misses": 1,
+            "evictions": 0,
+        }
@@ -0,0 +1,112 @@
+"""Unit tests for tag-version gating of registry tag reconciliation."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from promptgrimoire.crdt.annotation_doc import AnnotationDocumentRegistry
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture
+def ensure_consistency() -> Iterator[AsyncMock]:
+    """Patch DB access for a cold load and yield the consistency-check mock."""
+    workspace = SimpleNamespace(crdt_state=None, tag_version=3)
+    with (
+        patch(
+            "promptgrimoire.db.workspaces.get_workspace",
+            new_callable=AsyncMock,
+            return_value=workspace,
+        ),
+        patch(
+            "promptgrimoire.db.crdt_updates.list_pending_crdt_updates",
+            new_callable=AsyncMock,
+            return_value=[],
+        ),
+        patch(
+            "promptgrimoire.crdt.annotation_doc._ensure_crdt_tag_consistency",
+            new_callable=AsyncMock,
+        ) as mock_ensure,
+        patch("promptgrimoire.crdt.persistence.get_persistence_manager"),
+    ):
+        yield mock_ensure
+
+
+class TestTagVersionGate:
+    """Warm registry hits only reconcile tags when the version changed."""
+
+    @pytest.mark.asyncio
+    async def test_cold_load_records_version(
+        self, ensure_consistency: AsyncMock
+    ) -> None:
+        registry = AnnotationDocumentRegistry()
+
+        doc = await registry.get_or_create_for_workspace(uuid4())
+
+        assert doc.tag_version == 3
+        ensure_consistency.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_warm_hit_with_same_version_skips_reconcile(
+        self, ensure_consistency: AsyncMock
+    ) -> None:
+        registry = AnnotationDocumentRegistry()
+        workspace_id = uuid4()
+        await registry.get_or_create_for_workspace(workspace_id)
+
+        with patch(
+            "promptgrimoire.db.tags.get_workspace_tag_version",
+            new_callable=AsyncMock,
+            return_value=3,
+        ):
+            await registry.get_or_create_for_workspace(workspace_id)
+
+        ensure_consistency.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_warm_hit_with_new_version_reconciles(
+        self, ensure_consistency: AsyncMock
+    ) -> None:
+        registry = AnnotationDocumentRegistry()
+        workspace_id = uuid4()
+        await registry.get_or_create_for_workspace(workspace_id)
+
+        with patch(
+            "promptgrimoire.db.tags.get_workspace_tag_version",
+            new_callable=AsyncMock,
+            return_value=4,
+        ) as mock_version:
+            doc = await registry.get_or_create_for_workspace(workspace_id)
+            await registry.get_or_create_for_workspace(workspace_id)
+
+        assert ensure_consistency.await_count == 2
+        assert mock_version.await_count == 2
+        assert doc.tag_version == 4
+
+    @pytest.mark.asyncio
+    async def test_prefetched_workspace_skips_version_query(
+        self, ensure_consistency: AsyncMock
+    ) -> None:
+        registry = AnnotationDocumentRegistry()
+        workspace_id = uuid4()
+        await registry.get_or_create_for_workspace(workspace_id)
+        prefetched = SimpleNamespace(crdt_state=None, tag_version=3)
+
+        with patch(
+            "promptgrimoire.db.tags.get_workspace_tag_version",
+            new_callable=AsyncMock,
+        ) as mock_version:
+            await registry.get_or_create_for_workspace(
+                workspace_id,
+                workspace=prefetched,  # type: ignore[arg-type]
+            )
+
+        mock_version.assert_not_awaited()
+        ensure_consistency.assert_awaited_once()
@@ -120,34 +120,35 @@ class TestBroadcastIterationSafety:
         # _broadcast_yjs_update converts UUID to str internally
         ws_key = str(workspace_uuid)
 
-        # Client A: synchronous run_javascript that removes client B
-        client_a = MagicMock()
+        # Client A: outbox push that removes client B
+        outbox_a = MagicMock()
 
         def remove_b_sync(*_args, **_kwargs):
             _workspace_presence[ws_key].pop("client-b", None)
 
-        client_a.run_javascript = MagicMock(side_effect=remove_b_sync)
+        outbox_a.push = MagicMock(side_effect=remove_b_sync)
 
         # Client B: normal mock
-        client_b = MagicMock()
-        client_b.run_javascript = MagicMock()
+        outbox_b = MagicMock()
 
         _workspace_presence[ws_key] = {
             "client-a": _RemotePresence(
                 name="user-a",
                 color="#ff0000",
-                nicegui_client=client_a,
+                nicegui_client=MagicMock(),
                 callback=None,
                 has_milkdown_editor=True,
+                yjs_outbox=outbox_a,
             ),
             "client-b": _RemotePresence(
                 name="user-b",
                 color="#00ff00",
-                nicegui_client=client_b,
+                nicegui_client=MagicMock(),
                 callback=None,
                 has_milkdown_editor=True,
+                yjs_outbox=outbox_b,
             ),
         }
 
         # Must not raise — list() snapshot protects iteration
-        _broadcast_yjs_update(workspace_uuid, "sender", "base64data")
+        _broadcast_yjs_update(workspace_uuid, "sender", b"update")
@@ -0,0 +1,139 @@
+"""Tests for the load-test-run report and the dev metrics endpoint."""
+
+from __future__ import annotations
+
+import json
+import math
+from unittest.mock import MagicMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from promptgrimoire.cli_loadrun import (
+    LoadRunResults,
+    _main,
+    percentile,
+    summarise_latencies,
+    summarise_server,
+)
+
+
+def _sample(
+    lag: float,
+    *,
+    queue_depth: int | None = None,
+    checked_out: int | None = None,
+    capacity: int = 20,
+) -> dict[str, object]:
+    return {
+        "event_loop_lag_ms": lag,
+        "clients_connected": 3,
+        "admission": None
+        if queue_depth is None
+        else {"enabled": True, "cap": 10, "queue_depth": queue_depth},
+        "db_pool": None
+        if checked_out is None
+        else {"checked_out": checked_out, "overflow": 0, "capacity": capacity},
+    }
+
+
+class TestPercentile:
+    def test_nearest_rank(self) -> None:
+        values = [float(n) for n in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile(values, 100) == 100.0
+
+    def test_small_sample_uses_largest_for_p99(self) -> None:
+        assert percentile([30.0, 10.0, 20.0], 99) == 30.0
+        assert percentile([30.0, 10.0, 20.0], 0) == 10.0
+
+    def test_empty_is_nan(self) -> None:
+        assert math.isnan(percentile([], 50))
+
+
+class TestSummaries:
+    def test_latency_rows_include_failed_only_actions(self) -> None:
+        results = LoadRunResults()
+        results.latencies["highlight"].extend([100.0, 300.0, 200.0])
+        results.errors["export"] += 2
+
+        rows = {row["action"]: row for row in summarise_latencies(results)}
+
+        assert rows["highlight"]["count"] == 3
+        assert rows["highlight"]["p50_ms"] == 200.0
+        assert rows["highlight"]["max_ms"] == 300.0
+        assert rows["export"]["count"] == 0
+        assert rows["export"]["errors"] == 2
+        assert math.isnan(rows["export"]["p99_ms"])
+
+    def test_server_summary(self) -> None:
+        samples = [
+            _sample(1.0, queue_depth=0, checked_out=5),
+            _sample(40.0, queue_depth=7, checked_out=15),
+            _sample(3.0, queue_depth=2, checked_out=10),
+        ]
+        summary = summarise_server(samples)
+
+        assert summary["samples"] == 3
+        assert summary["lag_p50_ms"] == 3.0
+        assert summary["lag_max_ms"] == 40.0
+        assert summary["queue_depth_max"] == 7
+        assert summary["pool_saturation_max"] == 0.75
+
+    def test_server_summary_without_gate_or_pool(self) -> None:
+        summary = summarise_server([_sample(2.0)])
+        assert summary["queue_depth_max"] is None
+        assert summary["pool_saturation_max"] is None
+
+
+class TestCli:
+    def test_requires_database_url(self) -> None:
+        import typer
+
+        settings = MagicMock()
+        settings.database.url = None
+        app = typer.Typer()
+        app.command()(_main)
+        with patch("promptgrimoire.cli_loadrun.get_settings", return_value=settings):
+            result = CliRunner().invoke(app, ["--clients", "2"])
+        assert result.exit_code == 1
+        assert "DATABASE__URL" in result.output
+
+
+class TestMetricsHandler:
+    @pytest.mark.asyncio
+    async def test_reports_lag_admission_and_pool(self) -> None:
+        from promptgrimoire.dev_endpoints import metrics_handler
+
+        admission = MagicMock(enabled=True, cap=25, queue_depth=4)
+        pool = {"checked_out": 3, "overflow": 0, "capacity": 20}
+        with (
+            patch(
+                "promptgrimoire.admission.get_admission_state", return_value=admission
+            ),
+            patch("promptgrimoire.db.engine.pool_usage", return_value=pool),
+        ):
+            response = await metrics_handler(MagicMock())
+
+        body = json.loads(bytes(response.body))
+        assert body["event_loop_lag_ms"] >= 0
+        assert body["admission"] == {"enabled": True, "cap": 25, "queue_depth": 4}
+        assert body["db_pool"] == pool
+
+    @pytest.mark.asyncio
+    async def test_uninitialised_gate_and_engine_are_null(self) -> None:
+        from promptgrimoire.dev_endpoints import metrics_handler
+
+        with (
+            patch(
+                "promptgrimoire.admission.get_admission_state",
+                side_effect=RuntimeError("not initialised"),
+            ),
+            patch("promptgrimoire.db.engine._state.engine", None),
+        ):
+            response = await metrics_handler(MagicMock())
+
+        body = json.loads(bytes(response.body))
+        assert body["admission"] is None
+        assert body["db_pool"] is None
@@ -549,6 +549,39 @@ class TestTestingCommands:
         addopts_idx = default_args.index("-o")
         assert default_args[addopts_idx + 1] == "addopts="
 
+    def test_test_bench_compares_against_baseline(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from promptgrimoire.cli import testing
+
+        monkeypatch.setattr(testing, "_has_benchmark_baseline", lambda: True)
+        captured = _capture_run_pytest(monkeypatch)
+
+        result = runner.invoke(app, ["test", "bench"])
+
+        assert result.exit_code == 0, result.output
+        default_args = _captured_default_args(captured)
+        assert default_args[0] == "tests/benchmark"
+        assert "--benchmark-compare" in default_args
+        assert "--benchmark-compare-fail=median:25%" in default_args
+        assert not any(a.startswith("--benchmark-save") for a in default_args)
+
+    def test_test_bench_records_first_baseline(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Without a baseline, compare-fail would error; record one instead."""
+        from promptgrimoire.cli import testing
+
+        monkeypatch.setattr(testing, "_has_benchmark_baseline", lambda: False)
+        captured = _capture_run_pytest(monkeypatch)
+
+        result = runner.invoke(app, ["test", "bench", "--fail-on", "mean:10%"])
+
+        assert result.exit_code == 0, result.output
+        default_args = _captured_default_args(captured)
+        assert "--benchmark-save=baseline" in default_args
+        assert "--benchmark-compare" not in default_args
+
     def test_test_all_fixtures_removed(self) -> None:
         """AC4.2: all-fixtures command no longer exists."""
         result = runner.invoke(app, ["test", "all-fixtures"])
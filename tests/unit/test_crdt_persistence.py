@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
-from uuid import uuid4
+from typing import Any
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
+from uuid import UUID, uuid4
 
 import pytest
 
+from promptgrimoire.crdt.annotation_doc import AnnotationDocument
 from promptgrimoire.crdt.persistence import PersistenceManager
+from promptgrimoire.crdt.search_fragments import SearchFragment
 
 
 class TestPersistenceManager:
@@ -98,7 +101,7 @@ class TestWorkspacePersistence:
             mock_save.return_value = True
             await pm.force_persist_workspace(workspace_id)
 
-            mock_save.assert_called_once_with(workspace_id, b"state")
+            mock_save.assert_called_once_with(workspace_id, b"state", search=ANY)
 
         assert workspace_id not in pm._workspace_dirty
 
@@ -138,15 +141,19 @@ class TestWorkspacePersistence:
             pm._workspace_dirty[workspace_id] = doc_id
 
         with patch(
-            "promptgrimoire.db.workspaces.save_workspace_crdt_state",
+            "promptgrimoire.db.workspaces.save_workspace_crdt_states",
             new_callable=AsyncMock,
         ) as mock_save:
-            mock_save.return_value = True
+            mock_save.return_value = set(workspace_ids)
             await pm.persist_all_dirty_workspaces()
 
-            assert mock_save.call_count == 2
+            # One multi-row write for both workspaces
+            mock_save.assert_awaited_once_with(
+                dict.fromkeys(workspace_ids, b"state"), search=ANY
+            )
 
         assert len(pm._workspace_dirty) == 0
+        assert all(pm._workspace_log_lengths[wid] == 0 for wid in workspace_ids)
 
     @pytest.mark.asyncio
     async def test_debounced_workspace_save_fires_after_delay(self) -> None:
@@ -175,7 +182,7 @@ class TestWorkspacePersistence:
             await asyncio.sleep(pm.debounce_seconds + 0.05)
 
             # Should have saved now
-            mock_save.assert_called_once_with(workspace_id, b"state")
+            mock_save.assert_called_once_with(workspace_id, b"state", search=ANY)
 
     @pytest.mark.asyncio
     async def test_debounce_resets_on_new_workspace_edit(self) -> None:
@@ -250,3 +257,323 @@ class TestWorkspacePersistence:
 
         # Clean up
         second_task.cancel()
+
+
+class TestIncrementalWorkspacePersistence:
+    """Tests for the append-only update log path."""
+
+    @staticmethod
+    def _dirty_doc(
+        pm: PersistenceManager, updates: list[bytes]
+    ) -> tuple[UUID, MagicMock]:
+        workspace_id = uuid4()
+        doc_id = f"ws-{workspace_id}"
+        mock_doc = MagicMock()
+        mock_doc.doc_id = doc_id
+        mock_doc.get_full_state.return_value = b"state"
+        mock_doc.drain_pending_updates.return_value = updates
+        pm.register_document(mock_doc)
+        pm._workspace_dirty[workspace_id] = doc_id
+        return workspace_id, mock_doc
+
+    @pytest.mark.asyncio
+    async def test_first_save_is_full_snapshot(self) -> None:
+        """Without a prior snapshot from this process, save the full state."""
+        pm = PersistenceManager()
+        workspace_id, _doc = self._dirty_doc(pm, [b"u1"])
+
+        with (
+            patch(
+                "promptgrimoire.db.workspaces.save_workspace_crdt_state",
+                new_callable=AsyncMock,
+                return_value=True,
+            ) as mock_save,
+            patch(
+                "promptgrimoire.db.crdt_updates.append_workspace_crdt_update",
+                new_callable=AsyncMock,
+            ) as mock_append,
+        ):
+            await pm._persist_workspace(workspace_id, incremental=True)
+
+        mock_save.assert_called_once_with(workspace_id, b"state", search=ANY)
+        mock_append.assert_not_called()
+        assert pm._workspace_log_lengths[workspace_id] == 0
+
+    @pytest.mark.asyncio
+    async def test_incremental_save_appends_update(self) -> None:
+        """After a snapshot, debounced saves append to the log."""
+        pm = PersistenceManager()
+        workspace_id, _doc = self._dirty_doc(pm, [b"u1"])
+        pm._workspace_log_lengths[workspace_id] = 0
+
+        with (
+            patch(
+                "promptgrimoire.db.workspaces.save_workspace_crdt_state",
+                new_callable=AsyncMock,
+            ) as mock_save,
+            patch(
+                "promptgrimoire.db.crdt_updates.append_workspace_crdt_update",
+                new_callable=AsyncMock,
+                return_value=True,
+            ) as mock_append,
+        ):
+            await pm._persist_workspace(workspace_id, incremental=True)
+
+        mock_append.assert_called_once_with(workspace_id, b"u1", search=ANY)
+        mock_save.assert_not_called()
+        assert pm._workspace_log_lengths[workspace_id] == 1
+        assert workspace_id not in pm._workspace_dirty
+
+    @pytest.mark.asyncio
+    async def test_no_captured_updates_falls_back_to_snapshot(self) -> None:
+        """An empty update buffer falls back to a full snapshot save."""
+        pm = PersistenceManager()
+        workspace_id, _doc = self._dirty_doc(pm, [])
+        pm._workspace_log_lengths[workspace_id] = 3
+
+        with patch(
+            "promptgrimoire.db.workspaces.save_workspace_crdt_state",
+            new_callable=AsyncMock,
+            return_value=True,
+        ) as mock_save:
+            await pm._persist_workspace(workspace_id, incremental=True)
+
+        mock_save.assert_called_once_with(workspace_id, b"state", search=ANY)
+        assert pm._workspace_log_lengths[workspace_id] == 0
+
+    @pytest.mark.asyncio
+    async def test_log_threshold_forces_snapshot(self) -> None:
+        """Reaching compact_after_updates rewrites the full snapshot."""
+        pm = PersistenceManager()
+        workspace_id, _doc = self._dirty_doc(pm, [b"u1"])
+        pm._workspace_log_lengths[workspace_id] = pm.compact_after_updates
+
+        with (
+            patch(
+                "promptgrimoire.db.workspaces.save_workspace_crdt_state",
+                new_callable=AsyncMock,
+                return_value=True,
+            ) as mock_save,
+            patch(
+                "promptgrimoire.db.crdt_updates.append_workspace_crdt_update",
+                new_callable=AsyncMock,
+            ) as mock_append,
+        ):
+            await pm._persist_workspace(workspace_id, incremental=True)
+
+        mock_save.assert_called_once()
+        mock_append.assert_not_called()
+        assert pm._workspace_log_lengths[workspace_id] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_append_restores_updates(self) -> None:
+        """A failed append keeps the updates and the dirty marker for retry."""
+        pm = PersistenceManager()
+        workspace_id, doc = self._dirty_doc(pm, [b"u1", b"u2"])
+        pm._workspace_log_lengths[workspace_id] = 0
+
+        with (
+            patch(
+                "pycrdt.merge_updates",
+                return_value=b"merged",
+            ),
+            patch(
+                "promptgrimoire.db.crdt_updates.append_workspace_crdt_update",
+                new_callable=AsyncMock,
+                side_effect=RuntimeError("db down"),
+            ),
+        ):
+            await pm._persist_workspace(workspace_id, incremental=True)
+
+        doc.restore_pending_updates.assert_called_once_with([b"u1", b"u2"])
+        assert workspace_id in pm._workspace_dirty
+        assert pm._workspace_log_lengths[workspace_id] == 0
+
+    def test_evict_workspace_clears_log_length(self) -> None:
+        """evict_workspace forgets the log length so reloads start fresh."""
+        pm = PersistenceManager()
+        workspace_id, doc = self._dirty_doc(pm, [])
+        pm._workspace_log_lengths[workspace_id] = 4
+
+        pm.evict_workspace(workspace_id, doc.doc_id)
+
+        assert workspace_id not in pm._workspace_log_lengths
+
+
+class TestBatchedFlush:
+    """Tests for persist_all_dirty_workspaces batching and latency histogram."""
+
+    @staticmethod
+    def _dirty_docs(pm: PersistenceManager, count: int) -> list[UUID]:
+        workspace_ids = []
+        for i in range(count):
+            workspace_id = uuid4()
+            doc = MagicMock()
+            doc.doc_id = f"ws-{workspace_id}"
+            doc.get_full_state.return_value = f"state-{i}".encode()
+            pm.register_document(doc)
+            pm._workspace_dirty[workspace_id] = doc.doc_id
+            workspace_ids.append(workspace_id)
+        return workspace_ids
+
+    @pytest.mark.asyncio
+    async def test_batches_respect_size_and_concurrency(self) -> None:
+        """Dirty docs are split into flush_batch_size chunks, bounded in flight."""
+        pm = PersistenceManager()
+        pm.flush_batch_size = 2
+        pm.flush_concurrency = 2
+        workspace_ids = self._dirty_docs(pm, 5)
+        in_flight = 0
+        max_in_flight = 0
+        batch_sizes: list[int] = []
+
+        async def _save(states: dict[UUID, bytes], **_kwargs: Any) -> set[UUID]:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            batch_sizes.append(len(states))
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return set(states)
+
+        with patch(
+            "promptgrimoire.db.workspaces.save_workspace_crdt_states",
+            side_effect=_save,
+        ):
+            await pm.persist_all_dirty_workspaces()
+
+        assert sorted(batch_sizes) == [1, 2, 2]
+        assert max_in_flight == 2
+        assert not any(pm.is_workspace_dirty(wid) for wid in workspace_ids)
+        assert sum(pm.flush_latency_histogram().values()) == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_stays_dirty(self) -> None:
+        """A batch whose write raises keeps its workspaces dirty for retry."""
+        pm = PersistenceManager()
+        pm.flush_batch_size = 1
+        failing, saved = self._dirty_docs(pm, 2)
+
+        async def _save(states: dict[UUID, bytes], **_kwargs: Any) -> set[UUID]:
+            if failing in states:
+                raise RuntimeError("db down")
+            return set(states)
+
+        with patch(
+            "promptgrimoire.db.workspaces.save_workspace_crdt_states",
+            side_effect=_save,
+        ):
+            await pm.persist_all_dirty_workspaces()
+
+        assert pm.is_workspace_dirty(failing)
+        assert not pm.is_workspace_dirty(saved)
+        # A failed snapshot must force the next save to be a full snapshot
+        assert failing not in pm._workspace_log_lengths
+        assert pm._workspace_log_lengths[saved] == 0
+
+    @pytest.mark.asyncio
+    async def test_pending_debounced_saves_cancelled(self) -> None:
+        """Flushing cancels debounced saves for the flushed workspaces."""
+        pm = PersistenceManager()
+        (workspace_id,) = self._dirty_docs(pm, 1)
+        pending = asyncio.create_task(asyncio.sleep(60))
+        pm._workspace_pending_saves[workspace_id] = pending
+
+        with patch(
+            "promptgrimoire.db.workspaces.save_workspace_crdt_states",
+            new_callable=AsyncMock,
+            return_value={workspace_id},
+        ):
+            await pm.persist_all_dirty_workspaces()
+
+        await asyncio.sleep(0)
+        assert pending.cancelled()
+        assert workspace_id not in pm._workspace_pending_saves
+
+    def test_latency_histogram_buckets(self) -> None:
+        """Latencies land in the first bucket whose bound they do not exceed."""
+        pm = PersistenceManager()
+        pm._record_flush_latency(0.005)
+        pm._record_flush_latency(0.2)
+        pm._record_flush_latency(60)
+
+        histogram = pm.flush_latency_histogram()
+
+        assert histogram["le_10"] == 1
+        assert histogram["le_250"] == 1
+        assert histogram["le_inf"] == 1
+        assert sum(histogram.values()) == 3
+
+
+class TestSearchFragmentPatches:
+    """Saves carry the live document's search fragment changes."""
+
+    @staticmethod
+    def _live_doc(pm: PersistenceManager) -> tuple[UUID, AnnotationDocument]:
+        workspace_id = uuid4()
+        doc = AnnotationDocument(f"ws-{workspace_id}")
+        pm.register_document(doc)
+        pm._workspace_dirty[workspace_id] = doc.doc_id
+        return workspace_id, doc
+
+    @pytest.mark.asyncio
+    async def test_first_save_replaces_then_patches(self) -> None:
+        """The first save rebuilds every fragment; later saves send only changes."""
+        pm = PersistenceManager()
+        workspace_id, doc = self._live_doc(pm)
+        hl_id = doc.add_highlight(0, 5, "tag-1", "hello", "Author")
+
+        with patch(
+            "promptgrimoire.db.workspaces.save_workspace_crdt_state",
+            new_callable=AsyncMock,
+            return_value=True,
+        ) as mock_save:
+            await pm.force_persist_workspace(workspace_id)
+            first = mock_save.call_args.kwargs["search"]
+
+            doc.set_general_notes("notes")
+            pm._workspace_dirty[workspace_id] = doc.doc_id
+            await pm.force_persist_workspace(workspace_id)
+            second = mock_save.call_args.kwargs["search"]
+
+        assert first.replace
+        assert first.fragments[f"highlight:{hl_id}"] == SearchFragment("hello", "tag-1")
+        assert not second.replace
+        assert second.fragments == {"general_notes": SearchFragment("notes")}
+
+    @pytest.mark.asyncio
+    async def test_failed_save_keeps_changes(self) -> None:
+        """Changes from a failed save are sent again with the next one."""
+        pm = PersistenceManager()
+        workspace_id, doc = self._live_doc(pm)
+        doc.drain_search_changes()
+        doc.set_general_notes("notes")
+
+        with patch(
+            "promptgrimoire.db.workspaces.save_workspace_crdt_state",
+            new_callable=AsyncMock,
+            side_effect=[RuntimeError("db down"), True],
+        ) as mock_save:
+            await pm.force_persist_workspace(workspace_id)
+            await pm.force_persist_workspace(workspace_id)
+
+        retried = mock_save.call_args.kwargs["search"]
+        assert retried.fragments == {"general_notes": SearchFragment("notes")}
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_keeps_changes(self) -> None:
+        """A failed batched flush restores each document's changes."""
+        pm = PersistenceManager()
+        workspace_id, doc = self._live_doc(pm)
+        doc.drain_search_changes()
+        doc.set_general_notes("notes")
+
+        with patch(
+            "promptgrimoire.db.workspaces.save_workspace_crdt_states",
+            new_callable=AsyncMock,
+            side_effect=RuntimeError("db down"),
+        ):
+            await pm.persist_all_dirty_workspaces()
+
+        assert pm.is_workspace_dirty(workspace_id)
+        assert doc.drain_search_changes() == {"general_notes"}
@@ -28,6 +28,7 @@ def test_all_models_registered() -> None:
         "course_enrollment",
         "course_role",
         "export_job",
+        "export_job_metric",
         "export_job_status",
         "permission",
         "student_group",
@@ -40,7 +41,9 @@ def test_all_models_registered() -> None:
         "wargame_message",
         "wargame_team",
         "workspace",
+        "workspace_crdt_update",
         "workspace_document",
+        "workspace_search_fragment",
     }
     actual_tables = set(SQLModel.metadata.tables.keys())
 
@@ -54,12 +57,12 @@ def test_all_models_registered() -> None:
 
 
 def test_get_expected_tables_returns_all_tables() -> None:
-    """get_expected_tables() returns all 19 table names."""
+    """get_expected_tables() returns all 22 table names."""
     from promptgrimoire.db import get_expected_tables
 
     tables = get_expected_tables()
 
-    assert len(tables) == 19
+    assert len(tables) == 22
     assert "acl_entry" in tables
     assert "activity" in tables
     assert "course" in tables
@@ -42,6 +42,12 @@ class TestWorkspaceExports:
 
         assert callable(save_workspace_crdt_state)
 
+    def test_save_workspace_crdt_states_exported(self) -> None:
+        """save_workspace_crdt_states function is exported."""
+        from promptgrimoire.db import save_workspace_crdt_states
+
+        assert callable(save_workspace_crdt_states)
+
     def test_add_document_exported(self) -> None:
         """add_document function is exported."""
         from promptgrimoire.db import add_document
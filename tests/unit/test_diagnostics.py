@@ -70,8 +70,20 @@ class TestCollectSnapshot:
             "users_authenticated",
             "asyncio_tasks_total",
             "app_ws_registry",
+            "app_ws_registry_hits",
+            "app_ws_registry_misses",
+            "app_ws_registry_evictions",
             "app_ws_presence_workspaces",
             "app_ws_presence_clients",
+            "app_presence_events",
+            "app_presence_coalesced",
+            "app_presence_messages",
+            "app_access_cache_permission",
+            "app_access_cache_permission_hits",
+            "app_access_cache_permission_misses",
+            "app_access_cache_ban",
+            "app_access_cache_ban_hits",
+            "app_access_cache_ban_misses",
             "event_loop_lag_ms",
         }
         assert expected_keys == set(snapshot.keys())
@@ -10,8 +10,9 @@ Traceability: Issue #454
 
 from __future__ import annotations
 
+import base64
 from typing import Any
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from uuid import UUID
 
 import pytest
@@ -89,14 +90,14 @@ class TestEditorReadyOk:
 
         assert presence.has_milkdown_editor is True
 
-    def test_sends_catchup_full_state_on_ready(self) -> None:
-        """After editor_ready, a fresh full-state sync is sent to
-        converge any Yjs updates missed during the init window."""
+    def test_sends_catchup_diff_on_ready(self) -> None:
+        """After editor_ready, only the updates missing from the editor's
+        state vector are sent, converging any missed during init."""
         state = PageState(workspace_id=_TEST_UUID)
         state.client_id = "client-1"
 
         mock_crdt = MagicMock()
-        mock_crdt.get_full_state.return_value = b"\x01\x02\x03"
+        mock_crdt.get_update_since.return_value = b"\x01\x02\x03"
         state.crdt_doc = mock_crdt
 
         ws_key = str(_TEST_UUID)
@@ -109,17 +110,54 @@ class TestEditorReadyOk:
         )
         _workspace_presence[ws_key] = {"client-1": presence}
 
-        _handle_editor_ready(
-            _make_event({"status": "ok"}),
-            state,
-            ws_key,
-            "client-1",
+        state_vector = b"\x01\x05\x07"
+        with patch("promptgrimoire.pages.annotation.respond.YjsOutbox") as outbox_cls:
+            _handle_editor_ready(
+                _make_event(
+                    {
+                        "status": "ok",
+                        "state_vector": base64.b64encode(state_vector).decode(),
+                    }
+                ),
+                state,
+                ws_key,
+                "client-1",
+            )
+
+        # Catch-up diff must have been queued on the binary relay
+        mock_crdt.get_update_since.assert_called_once_with(state_vector)
+        outbox_cls.assert_called_once_with(
+            mock_client, mock_crdt.get_update_since, state_vector
         )
+        assert presence.yjs_outbox is outbox_cls.return_value
+        presence.yjs_outbox.push.assert_called_once_with(b"\x01\x02\x03")
+        mock_client.run_javascript.assert_not_called()
+
+    def test_invalid_state_vector_falls_back_to_full_state(self) -> None:
+        state = PageState(workspace_id=_TEST_UUID)
+        state.client_id = "client-1"
+        mock_crdt = MagicMock()
+        mock_crdt.get_update_since.return_value = b"\x01\x02\x03"
+        state.crdt_doc = mock_crdt
+        ws_key = str(_TEST_UUID)
+        _workspace_presence[ws_key] = {
+            "client-1": _RemotePresence(
+                name="test",
+                color="#ff0000",
+                nicegui_client=MagicMock(),
+                callback=None,
+            ),
+        }
+
+        with patch("promptgrimoire.pages.annotation.respond.YjsOutbox"):
+            _handle_editor_ready(
+                _make_event({"status": "ok", "state_vector": "not base64!"}),
+                state,
+                ws_key,
+                "client-1",
+            )
 
-        # Catch-up full-state sync must have been sent
-        mock_client.run_javascript.assert_called_once()
-        call_js = mock_client.run_javascript.call_args[0][0]
-        assert "_applyRemoteUpdate" in call_js
+        mock_crdt.get_update_since.assert_called_once_with(None)
 
     def test_skips_catchup_when_crdt_empty(self) -> None:
         """No catch-up sync for empty CRDT docs (2 bytes = empty)."""
@@ -127,7 +165,7 @@ class TestEditorReadyOk:
         state.client_id = "client-1"
 
         mock_crdt = MagicMock()
-        mock_crdt.get_full_state.return_value = b"\x01\x00"
+        mock_crdt.get_update_since.return_value = b"\x00\x00"
         state.crdt_doc = mock_crdt
 
         ws_key = str(_TEST_UUID)
@@ -140,15 +178,16 @@ class TestEditorReadyOk:
         )
         _workspace_presence[ws_key] = {"client-1": presence}
 
-        _handle_editor_ready(
-            _make_event({"status": "ok"}),
-            state,
-            ws_key,
-            "client-1",
-        )
+        with patch("promptgrimoire.pages.annotation.respond.YjsOutbox"):
+            _handle_editor_ready(
+                _make_event({"status": "ok"}),
+                state,
+                ws_key,
+                "client-1",
+            )
 
         # No catch-up needed — doc is empty
-        mock_client.run_javascript.assert_not_called()
+        presence.yjs_outbox.push.assert_not_called()
 
 
 class TestEditorReadyError:
@@ -214,8 +253,8 @@ class TestYjsRelaySkipsUnready:
         )
 
         ws_key = str(_TEST_UUID)
-        client_ready = MagicMock()
-        client_not_ready = MagicMock()
+        outbox_ready = MagicMock()
+        outbox_not_ready = MagicMock()
 
         _workspace_presence[ws_key] = {
             "sender": _RemotePresence(
@@ -228,20 +267,22 @@ class TestYjsRelaySkipsUnready:
             "ready": _RemotePresence(
                 name="ready",
                 color="#00ff00",
-                nicegui_client=client_ready,
+                nicegui_client=MagicMock(),
                 callback=None,
                 has_milkdown_editor=True,
+                yjs_outbox=outbox_ready,
             ),
             "not-ready": _RemotePresence(
                 name="not-ready",
                 color="#0000ff",
-                nicegui_client=client_not_ready,
+                nicegui_client=MagicMock(),
                 callback=None,
                 has_milkdown_editor=False,
+                yjs_outbox=outbox_not_ready,
             ),
         }
 
-        _broadcast_yjs_update(_TEST_UUID, "sender", "base64data")
+        _broadcast_yjs_update(_TEST_UUID, "sender", b"update")
 
-        client_ready.run_javascript.assert_called_once()
-        client_not_ready.run_javascript.assert_not_called()
+        outbox_ready.push.assert_called_once_with(b"update")
+        outbox_not_ready.push.assert_not_called()
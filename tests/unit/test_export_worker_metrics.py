@@ -0,0 +1,120 @@
+"""Unit tests for export worker metrics and the per-process RSS cap."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from promptgrimoire.db.models import ExportJob, ExportJobMetric
+from promptgrimoire.export.worker import (
+    _record_metric,
+    _should_recycle,
+    start_export_worker,
+)
+
+
+def _job() -> ExportJob:
+    return ExportJob(user_id=uuid4(), workspace_id=uuid4(), payload={})
+
+
+class TestRecordMetric:
+    """Tests for _record_metric()."""
+
+    @pytest.mark.asyncio
+    async def test_stage_timings_recorded(self) -> None:
+        job = _job()
+        record = AsyncMock()
+        with (
+            patch("promptgrimoire.export.worker.record_job_metric", record),
+            patch("promptgrimoire.export.worker.current_rss_mb", return_value=321),
+        ):
+            await _record_metric(
+                job,
+                "failed",
+                {"pandoc_convert": 40, "tex_generate": 5},
+                t_start=0.0,
+            )
+
+        metric = record.await_args.args[0]
+        assert isinstance(metric, ExportJobMetric)
+        assert metric.job_id == job.id
+        assert metric.outcome == "failed"
+        assert metric.pandoc_convert_ms == 40
+        assert metric.tex_generate_ms == 5
+        assert metric.latex_compile_ms is None
+        assert metric.rss_mb == 321
+        assert metric.total_ms > 0
+
+    @pytest.mark.asyncio
+    async def test_insert_failure_is_swallowed(self) -> None:
+        """Metrics are best-effort and never fail the job."""
+        record = AsyncMock(side_effect=OSError("db down"))
+        with patch("promptgrimoire.export.worker.record_job_metric", record):
+            await _record_metric(_job(), "completed", {}, t_start=0.0)
+
+        record.assert_awaited_once()
+
+
+class TestRssCap:
+    """start_export_worker(max_rss_mb=...) exits after a job over the cap."""
+
+    @staticmethod
+    def _patches(claims: AsyncMock, rss_mb: int) -> tuple:
+        return (
+            patch("promptgrimoire.export.worker.claim_next_job", claims),
+            patch("promptgrimoire.export.worker._process_job", new_callable=AsyncMock),
+            patch(
+                "promptgrimoire.export.worker.wait_for_wakeup",
+                new_callable=AsyncMock,
+            ),
+            patch("promptgrimoire.export.worker.current_rss_mb", return_value=rss_mb),
+        )
+
+    @pytest.mark.asyncio
+    async def test_returns_after_job_over_cap(self) -> None:
+        claims = AsyncMock(side_effect=[MagicMock(), MagicMock()])
+        orphans = AsyncMock(return_value=0)
+        p1, p2, p3, p4 = self._patches(claims, rss_mb=900)
+        with (
+            p1,
+            p2,
+            p3,
+            p4,
+            patch("promptgrimoire.export.worker.fail_orphaned_jobs", orphans),
+        ):
+            await start_export_worker(recover_orphans=False, max_rss_mb=512)
+
+        assert claims.await_count == 1
+        orphans.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_keeps_running_under_cap(self) -> None:
+        claims = AsyncMock(side_effect=[MagicMock(), None, asyncio.CancelledError()])
+        p1, p2, p3, p4 = self._patches(claims, rss_mb=100)
+        with (
+            p1,
+            p2,
+            p3,
+            p4,
+            patch(
+                "promptgrimoire.export.worker.fail_orphaned_jobs",
+                new_callable=AsyncMock,
+                return_value=0,
+            ),
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await start_export_worker(max_rss_mb=512)
+
+        assert claims.await_count == 3
+
+    def test_idle_poll_does_not_sample_rss(self) -> None:
+        rss = MagicMock(return_value=900)
+        with patch("promptgrimoire.export.worker.current_rss_mb", rss):
+            assert _should_recycle(None, 512) is False
+            assert _should_recycle(_job(), 0) is False
+            assert _should_recycle(_job(), 512) is True
+
+        rss.assert_called_once()
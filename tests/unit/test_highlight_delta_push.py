@@ -0,0 +1,153 @@
+"""Tests for incremental highlight pushes (_push_highlights_to_client)."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import MagicMock
+from uuid import UUID
+
+import pytest
+
+from promptgrimoire.crdt.annotation_doc import AnnotationDocument
+from promptgrimoire.pages.annotation import (
+    PageState,
+    _RemotePresence,
+    _workspace_presence,
+)
+from promptgrimoire.pages.annotation.highlights import _push_highlights_to_client
+
+_WS = UUID(int=1)
+_DOC = "00000000-0000-0000-0000-0000000000d1"
+_OTHER_DOC = "00000000-0000-0000-0000-0000000000d2"
+
+
+@pytest.fixture(autouse=True)
+def _clean_presence():
+    _workspace_presence.clear()
+    yield
+    _workspace_presence.clear()
+
+
+@pytest.fixture
+def client() -> MagicMock:
+    client = MagicMock()
+    _workspace_presence[str(_WS)] = {
+        "client-1": _RemotePresence(
+            name="test", color="#000", nicegui_client=client, callback=None
+        )
+    }
+    return client
+
+
+@pytest.fixture
+def state() -> PageState:
+    state = PageState(workspace_id=_WS, document_id=UUID(_DOC))
+    state.client_id = "client-1"
+    state.crdt_doc = AnnotationDocument("ws")
+    return state
+
+
+def _add(state: PageState, start: int, tag: str = "a", doc: str = _DOC) -> str:
+    assert state.crdt_doc is not None
+    return state.crdt_doc.add_highlight(
+        start, start + 5, tag, "text", "author", document_id=doc
+    )
+
+
+def _delta(client: MagicMock) -> dict:
+    js = client.run_javascript.call_args.args[0]
+    assert "applyHighlightDelta(c, " in js
+    payload = js.split("applyHighlightDelta(c, ", 1)[1]
+    return json.JSONDecoder().raw_decode(payload)[0]
+
+
+class TestHighlightDeltaPush:
+    def test_first_push_rebuilds_everything(
+        self, state: PageState, client: MagicMock
+    ) -> None:
+        _add(state, 0)
+
+        _push_highlights_to_client(state)
+
+        assert "applyHighlights(c, " in client.run_javascript.call_args.args[0]
+
+    def test_later_push_sends_only_changes(
+        self, state: PageState, client: MagicMock
+    ) -> None:
+        kept = _add(state, 0)
+        retagged = _add(state, 10)
+        removed = _add(state, 20)
+        _push_highlights_to_client(state)
+
+        assert state.crdt_doc is not None
+        added = _add(state, 30, tag="b")
+        state.crdt_doc.update_highlight_tag(retagged, "b")
+        state.crdt_doc.remove_highlight(removed)
+        _push_highlights_to_client(state)
+
+        delta = _delta(client)
+        assert sorted(u["id"] for u in delta["upsert"]) == sorted([added, retagged])
+        assert delta["remove"] == [removed]
+        assert kept not in json.dumps(delta)
+
+    def test_comment_only_change_sends_nothing(
+        self, state: PageState, client: MagicMock
+    ) -> None:
+        hl_id = _add(state, 0)
+        _push_highlights_to_client(state)
+        client.run_javascript.reset_mock()
+
+        assert state.crdt_doc is not None
+        state.crdt_doc.add_comment(hl_id, "author", "a comment")
+        _push_highlights_to_client(state)
+
+        client.run_javascript.assert_not_called()
+
+    def test_other_document_highlights_are_not_sent(
+        self, state: PageState, client: MagicMock
+    ) -> None:
+        _push_highlights_to_client(state)
+        client.run_javascript.reset_mock()
+
+        _add(state, 0, doc=_OTHER_DOC)
+        _push_highlights_to_client(state)
+
+        client.run_javascript.assert_not_called()
+
+    def test_document_switch_rebuilds_everything(
+        self, state: PageState, client: MagicMock
+    ) -> None:
+        _add(state, 0)
+        _push_highlights_to_client(state)
+
+        state.document_id = UUID(_OTHER_DOC)
+        _push_highlights_to_client(state)
+
+        assert "applyHighlights(c, " in client.run_javascript.call_args.args[0]
+
+    def test_full_flag_forces_rebuild(
+        self, state: PageState, client: MagicMock
+    ) -> None:
+        _add(state, 0)
+        _push_highlights_to_client(state)
+        _add(state, 10)
+
+        _push_highlights_to_client(state, full=True)
+
+        js = client.run_javascript.call_args.args[0]
+        assert "applyHighlights(c, " in js
+        assert js.count('"id"') == 2
+
+    def test_pushes_before_scripts_load_are_kept(
+        self, state: PageState, client: MagicMock
+    ) -> None:
+        _add(state, 0)
+        _push_highlights_to_client(state)
+
+        # A full push is parked for page init; a delta asks for a full push
+        assert "window._pendingHighlights = " in client.run_javascript.call_args.args[0]
+        _add(state, 10)
+        _push_highlights_to_client(state)
+        assert (
+            "emitEvent('highlights_resync'" in client.run_javascript.call_args.args[0]
+        )
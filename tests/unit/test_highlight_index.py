@@ -0,0 +1,95 @@
+"""Unit tests for the highlight secondary index (crdt/highlight_index.py)."""
+
+from __future__ import annotations
+
+from promptgrimoire.crdt.highlight_index import HighlightIndex
+
+
+def _hl(start: int, end: int, *, doc: str | None = "d1", tag: str = "t") -> dict:
+    return {"start_char": start, "end_char": end, "document_id": doc, "tag": tag}
+
+
+def _ids(highlights: list[dict]) -> list[str]:
+    return [h["id"] for h in highlights]
+
+
+def _index(**highlights: dict) -> HighlightIndex:
+    index = HighlightIndex()
+    for hl_id, hl in highlights.items():
+        index.put(hl_id, {**hl, "id": hl_id})
+    return index
+
+
+class TestSortedQueries:
+    def test_all_sorted_by_start(self) -> None:
+        index = _index(c=_hl(30, 35), a=_hl(0, 5), b=_hl(10, 15, doc="d2"))
+
+        assert _ids(index.all()) == ["a", "b", "c"]
+
+    def test_for_document(self) -> None:
+        index = _index(a=_hl(20, 25), b=_hl(10, 15, doc="d2"), c=_hl(0, 5))
+
+        assert _ids(index.for_document("d1")) == ["c", "a"]
+        assert index.count_for_document("d2") == 1
+        assert index.for_document("missing") == []
+
+    def test_put_replaces_previous_value(self) -> None:
+        index = _index(a=_hl(0, 5, tag="old"))
+
+        index.put("a", {**_hl(50, 55, doc="d2", tag="new"), "id": "a"})
+
+        assert index.for_document("d1") == []
+        assert index.ids_for_tag("old") == set()
+        assert index.ids_for_tag("new") == {"a"}
+        assert len(index) == 1
+
+    def test_discard_unknown_id_is_noop(self) -> None:
+        index = _index(a=_hl(0, 5))
+
+        index.discard("missing")
+        index.discard("a")
+
+        assert index.all() == []
+
+    def test_results_are_copies(self) -> None:
+        index = _index(a=_hl(0, 5))
+
+        index.all()[0]["start_char"] = 99
+
+        assert index.all()[0]["start_char"] == 0
+
+
+class TestOverlapping:
+    def test_long_highlight_starting_early_is_found(self) -> None:
+        index = _index(long=_hl(0, 100), short=_hl(40, 45), after=_hl(60, 70))
+
+        assert _ids(index.overlapping(50, 60)) == ["long"]
+
+    def test_touching_ranges_do_not_overlap(self) -> None:
+        index = _index(before=_hl(0, 10), after=_hl(20, 30))
+
+        assert index.overlapping(10, 20) == []
+
+    def test_restricted_to_document(self) -> None:
+        index = _index(a=_hl(0, 10), b=_hl(0, 10, doc="d2"))
+
+        assert _ids(index.overlapping(5, 6, "d2")) == ["b"]
+        assert index.overlapping(5, 6, "missing") == []
+
+    def test_matches_linear_scan(self) -> None:
+        # Deterministic spread of starts and lengths (prime strides)
+        spans = {}
+        for i in range(500):
+            start = i * 7919 % 10_000
+            spans[f"h{i}"] = _hl(start, start + 1 + i * 31 % 300)
+        index = _index(**spans)
+
+        for q in range(50):
+            start = q * 6007 % 10_000
+            end = start + 1 + q * 97 % 500
+            expected = {
+                hl_id
+                for hl_id, hl in spans.items()
+                if hl["start_char"] < end and hl["end_char"] > start
+            }
+            assert set(_ids(index.overlapping(start, end))) == expected
@@ -126,7 +126,7 @@ class TestValidKick:
         data = resp.json()
         assert data["kicked"] == 3
         assert data["was_banned"] is True
-        mock_is_banned.assert_awaited_once_with(user_id)
+        mock_is_banned.assert_awaited_once_with(user_id, fresh=True)
         mock_disconnect.assert_called_once_with(user_id)
 
     @pytest.mark.anyio
@@ -166,7 +166,7 @@ class TestValidKick:
         data = resp.json()
         assert data["kicked"] == 0
         assert data["was_banned"] is False
-        mock_is_banned.assert_awaited_once_with(user_id)
+        mock_is_banned.assert_awaited_once_with(user_id, fresh=True)
         mock_disconnect.assert_not_called()
 
 
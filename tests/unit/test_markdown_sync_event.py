@@ -1,4 +1,4 @@
-"""Tests for respond_yjs_update event handling — markdown sync via event payload.
+"""Tests for binary Yjs update handling — markdown sync via the update payload.
 
 Verifies:
 - AC3.1: on_yjs_update reads markdown from event args and writes to
@@ -6,13 +6,14 @@ Verifies:
 - AC3.2: on_yjs_update does NOT call run_javascript (no JS round-trip).
 
 The handler under test is the inner ``on_yjs_update`` closure registered
-by ``_setup_yjs_event_handler``. We extract it by mocking ``ui.on`` and
-capturing the callback.
+by ``_setup_yjs_event_handler``. We extract it by mocking
+``register_inbound`` and capturing the callback.
 """
 
 from __future__ import annotations
 
-import base64
+import asyncio
+import threading
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
@@ -27,8 +28,8 @@ def _make_crdt_doc() -> AnnotationDocument:
     return AnnotationDocument("test-doc")
 
 
-def _make_yjs_update() -> str:
-    """Generate a valid base64-encoded Yjs update by mutating a peer doc."""
+def _make_yjs_update() -> bytes:
+    """Generate a valid Yjs update by mutating a peer doc."""
     peer = pycrdt.Doc()
     peer_text = peer.get("response_draft", type=pycrdt.XmlFragment)
     with peer.transaction():
@@ -36,8 +37,7 @@ def _make_yjs_update() -> str:
 
     # get_update with empty state vector returns the full document as an update
     empty_state = b"\x00\x00"
-    update = peer.get_update(empty_state)
-    return base64.b64encode(update).decode("ascii")
+    return peer.get_update(empty_state)
 
 
 def _capture_on_yjs_handler(
@@ -56,7 +56,12 @@ def _capture_on_yjs_handler(
 
     mock_broadcast = MagicMock()
 
-    with patch("promptgrimoire.pages.annotation.respond.ui") as mock_ui:
+    with (
+        patch("promptgrimoire.pages.annotation.respond.ui") as mock_ui,
+        patch(
+            "promptgrimoire.pages.annotation.respond.register_inbound"
+        ) as mock_register,
+    ):
         _setup_yjs_event_handler(
             crdt_doc=crdt_doc,
             workspace_key="test-ws",
@@ -65,11 +70,11 @@ def _capture_on_yjs_handler(
             on_yjs_update_broadcast=mock_broadcast,
             state=state,
         )
-        # ui.on("respond_yjs_update", handler) was called
-        on_call = mock_ui.on.call_args
-        assert on_call is not None, "ui.on was not called"
-        event_name, handler = on_call[0]
-        assert event_name == "respond_yjs_update"
+        # register_inbound(client, handler) was called
+        register_call = mock_register.call_args
+        assert register_call is not None, "register_inbound was not called"
+        client, handler = register_call[0]
+        assert client is mock_ui.context.client
 
     return handler, mock_broadcast, mock_ui
 
@@ -81,16 +86,13 @@ class TestOnYjsUpdateMardownSync:
     async def test_writes_markdown_from_event_to_crdt(self) -> None:
         """When event args contain markdown, it is written to CRDT text field."""
         crdt_doc = _make_crdt_doc()
-        b64_update = _make_yjs_update()
+        update = _make_yjs_update()
 
         handler, _, _ = _capture_on_yjs_handler(crdt_doc)
-
-        event = SimpleNamespace(
-            args={"update": b64_update, "markdown": "# Hello World"}
-        )
+        markdown = "# Hello World"
 
         with patch("promptgrimoire.pages.annotation.respond.get_persistence_manager"):
-            await handler(event)
+            await handler(update, markdown)
 
         # The markdown text should be in the CRDT text field
         assert str(crdt_doc.response_draft_markdown) == "# Hello World"
@@ -106,13 +108,12 @@ class TestOnYjsUpdateMardownSync:
             text_field += "old content"
         assert str(crdt_doc.response_draft_markdown) == "old content"
 
-        b64_update = _make_yjs_update()
+        update = _make_yjs_update()
         handler, _, _ = _capture_on_yjs_handler(crdt_doc)
-
-        event = SimpleNamespace(args={"update": b64_update, "markdown": ""})
+        markdown = ""
 
         with patch("promptgrimoire.pages.annotation.respond.get_persistence_manager"):
-            await handler(event)
+            await handler(update, markdown)
 
         # Field should be cleared
         assert str(crdt_doc.response_draft_markdown) == ""
@@ -132,13 +133,12 @@ class TestOnYjsUpdateMardownSync:
         with crdt_doc.doc.transaction():
             text_field += "existing response"
 
-        b64_update = _make_yjs_update()
+        update = _make_yjs_update()
         handler, _, _ = _capture_on_yjs_handler(crdt_doc)
-
-        event = SimpleNamespace(args={"update": b64_update})
+        markdown = None
 
         with patch("promptgrimoire.pages.annotation.respond.get_persistence_manager"):
-            await handler(event)
+            await handler(update, markdown)
 
         # Existing content preserved — NOT blanked
         assert str(crdt_doc.response_draft_markdown) == "existing response"
@@ -147,7 +147,7 @@ class TestOnYjsUpdateMardownSync:
     async def test_markdown_write_precedes_word_count_read(self) -> None:
         """Markdown is written before word count badge reads it."""
         crdt_doc = _make_crdt_doc()
-        b64_update = _make_yjs_update()
+        update = _make_yjs_update()
 
         state = MagicMock()
         state.word_count_badge = MagicMock()
@@ -155,15 +155,12 @@ class TestOnYjsUpdateMardownSync:
         state.word_limit = 100
 
         handler, _, _ = _capture_on_yjs_handler(crdt_doc, state=state)
-
-        event = SimpleNamespace(
-            args={"update": b64_update, "markdown": "Five words are right here"}
-        )
+        markdown = "Five words are right here"
 
         with (
             patch("promptgrimoire.pages.annotation.respond.get_persistence_manager"),
             patch(
-                "promptgrimoire.pages.annotation.respond.word_count",
+                "promptgrimoire.word_count.word_count",
                 return_value=5,
             ) as mock_wc,
             patch(
@@ -173,7 +170,7 @@ class TestOnYjsUpdateMardownSync:
             mock_badge.return_value = SimpleNamespace(
                 text="5 words", css_classes="text-red"
             )
-            await handler(event)
+            await handler(update, markdown)
 
         # word_count was called with the markdown we just wrote
         mock_wc.assert_called_once()
@@ -181,6 +178,39 @@ class TestOnYjsUpdateMardownSync:
         assert md_arg == "Five words are right here"
 
 
+class TestWordCountRefresher:
+    """Badge refreshes run off the event loop and coalesce while busy."""
+
+    @pytest.mark.asyncio
+    async def test_refreshes_during_count_coalesce_to_latest(self) -> None:
+        from promptgrimoire.pages.annotation.respond import _WordCountRefresher
+
+        state = MagicMock()
+        state.word_minimum = None
+        state.word_limit = None
+        release = threading.Event()
+        counted: list[str] = []
+
+        def slow_count(text: str) -> int:
+            counted.append(text)
+            release.wait(timeout=5)
+            return len(text.split())
+
+        refresher = _WordCountRefresher(state)
+        with patch.object(refresher._counter, "count", side_effect=slow_count):
+            first = asyncio.create_task(refresher.refresh("one"))
+            while not counted:
+                await asyncio.sleep(0)
+            # Arrive while "one" is being counted: return immediately
+            await refresher.refresh("one two")
+            await refresher.refresh("one two three")
+            release.set()
+            await first
+
+        assert counted == ["one", "one two three"]
+        state.word_count_badge.set_text.assert_called_with("Words: 3")
+
+
 class TestOnYjsUpdateNoRunJavascript:
     """AC3.2: on_yjs_update does NOT call run_javascript (no JS round-trip)."""
 
@@ -188,14 +218,13 @@ class TestOnYjsUpdateNoRunJavascript:
     async def test_no_run_javascript_in_handler(self) -> None:
         """The handler must not call ui.run_javascript (no JS round-trip)."""
         crdt_doc = _make_crdt_doc()
-        b64_update = _make_yjs_update()
+        update = _make_yjs_update()
         handler, _, _mock_ui = _capture_on_yjs_handler(crdt_doc)
-
-        event = SimpleNamespace(args={"update": b64_update, "markdown": "test"})
+        markdown = "test"
 
         with (
             patch("promptgrimoire.pages.annotation.respond.get_persistence_manager"),
             patch("promptgrimoire.pages.annotation.respond.ui") as ui_in_handler,
         ):
-            await handler(event)
+            await handler(update, markdown)
             ui_in_handler.run_javascript.assert_not_called()
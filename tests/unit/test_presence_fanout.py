@@ -0,0 +1,189 @@
+"""Tests for coalesced cursor/selection fan-out (pages/annotation/presence.py)."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock, patch
+from uuid import UUID
+
+import pytest
+
+from promptgrimoire.pages.annotation import (
+    PageState,
+    _RemotePresence,
+    _workspace_presence,
+)
+from promptgrimoire.pages.annotation.presence import (
+    PresenceFanout,
+    _PresenceUpdate,
+    stats,
+)
+
+_WS = "test-ws"
+
+
+@pytest.fixture(autouse=True)
+def _clean_presence():
+    _workspace_presence.clear()
+    yield
+    _workspace_presence.clear()
+
+
+def _make_state(client_id: str, user_id: str) -> PageState:
+    state = PageState(workspace_id=UUID(int=1))
+    state.client_id = client_id
+    state.user_name = f"Name {user_id}"
+    state.user_id = user_id
+    state.user_color = "#ff0000"
+    state.doc_container_id = "doc-container-1"
+    state.is_anonymous = True
+    return state
+
+
+def _add_clients(*client_ids: str) -> dict[str, MagicMock]:
+    """Register presence entries; returns client_id -> mock NiceGUI client."""
+    clients = {}
+    for cid in client_ids:
+        client = MagicMock()
+        client._deleted = False
+        clients[cid] = client
+        _workspace_presence.setdefault(_WS, {})[cid] = _RemotePresence(
+            name=cid,
+            color="#000000",
+            nicegui_client=client,
+            callback=None,
+            user_id=f"user-{cid}",
+        )
+    return clients
+
+
+def _cursor(cid: str, char: int | None) -> _PresenceUpdate:
+    value = None if char is None else (char,)
+    return _PresenceUpdate(cid, _make_state(cid, f"user-{cid}"), "cursor", value)
+
+
+class TestCoalescing:
+    """Updates within one interval reach each receiver as one message."""
+
+    def test_one_message_per_receiver_per_flush(self) -> None:
+        clients = _add_clients("a", "b", "c")
+        fanout = PresenceFanout(_WS, interval=60.0)
+        fanout._last_flush = float("inf")  # hold updates until flush()
+
+        fanout.submit(_cursor("a", 1))
+        fanout.submit(_cursor("b", 2))
+        fanout.flush()
+
+        clients["c"].run_javascript.assert_called_once()
+        js = clients["c"].run_javascript.call_args.args[0]
+        assert '"a", 1' in js
+        assert '"b", 2' in js
+        # Senders never receive their own update
+        assert '"a", 1' not in clients["a"].run_javascript.call_args.args[0]
+
+    def test_latest_update_per_sender_wins(self) -> None:
+        clients = _add_clients("a", "b")
+        fanout = PresenceFanout(_WS, interval=60.0)
+        fanout._last_flush = float("inf")
+        coalesced = stats()["coalesced"]
+
+        for char in (1, 2, 3):
+            fanout.submit(_cursor("a", char))
+        fanout.flush()
+
+        js = clients["b"].run_javascript.call_args.args[0]
+        assert '"a", 3' in js
+        assert '"a", 1' not in js
+        assert stats()["coalesced"] == coalesced + 2
+
+    def test_removal_replaces_pending_cursor(self) -> None:
+        clients = _add_clients("a", "b")
+        fanout = PresenceFanout(_WS, interval=60.0)
+        fanout._last_flush = float("inf")
+
+        fanout.submit(_cursor("a", 5))
+        fanout.submit(_cursor("a", None))
+        fanout.flush()
+
+        js = clients["b"].run_javascript.call_args.args[0]
+        assert js == 'removeRemoteCursor("a")'
+
+    def test_forget_drops_pending_updates(self) -> None:
+        clients = _add_clients("a", "b")
+        fanout = PresenceFanout(_WS, interval=60.0)
+        fanout._last_flush = float("inf")
+
+        fanout.submit(_cursor("a", 5))
+        fanout.forget("a")
+        fanout.flush()
+
+        clients["b"].run_javascript.assert_not_called()
+
+
+class TestFlushTiming:
+    """Throttle: immediate when due, otherwise at the end of the interval."""
+
+    def test_first_update_is_sent_immediately(self) -> None:
+        clients = _add_clients("a", "b")
+        fanout = PresenceFanout(_WS, interval=60.0)
+
+        fanout.submit(_cursor("a", 1))
+
+        clients["b"].run_javascript.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_update_within_interval_is_deferred(self) -> None:
+        clients = _add_clients("a", "b")
+        fanout = PresenceFanout(_WS, interval=0.05)
+
+        fanout.submit(_cursor("a", 1))
+        fanout.submit(_cursor("a", 2))
+        fanout.submit(_cursor("a", 3))
+        assert clients["b"].run_javascript.call_count == 1
+
+        await asyncio.sleep(0.1)
+
+        assert clients["b"].run_javascript.call_count == 2
+        assert '"a", 3' in clients["b"].run_javascript.call_args.args[0]
+
+
+class TestLabelCache:
+    """Anonymised labels are resolved once per (sender, receiver class)."""
+
+    def test_peers_share_one_label_resolution(self) -> None:
+        _add_clients("a", "p1", "p2", "p3", "p4")
+        fanout = PresenceFanout(_WS, interval=60.0)
+        fanout._last_flush = float("inf")
+
+        with patch(
+            "promptgrimoire.pages.annotation.presence.anonymise_author",
+            return_value="Crystal Peccary",
+        ) as anonymise:
+            fanout.submit(_cursor("a", 1))
+            fanout.flush()
+            fanout.submit(_cursor("a", 2))
+            fanout.flush()
+
+        anonymise.assert_called_once()
+
+    def test_label_recomputed_when_sender_changes_sharing(self) -> None:
+        clients = _add_clients("a", "peer")
+        fanout = PresenceFanout(_WS, interval=60.0)
+        sender = _make_state("a", "user-a")
+
+        fanout.submit(_PresenceUpdate("a", sender, "cursor", (1,)))
+        assert "Name user-a" not in clients["peer"].run_javascript.call_args.args[0]
+
+        sender.is_anonymous = False
+        fanout.submit(_PresenceUpdate("a", sender, "cursor", (2,)))
+        assert "Name user-a" in clients["peer"].run_javascript.call_args.args[0]
+
+    def test_privileged_receiver_sees_real_name(self) -> None:
+        clients = _add_clients("a", "peer", "tutor")
+        _workspace_presence[_WS]["tutor"].viewer_is_privileged = True
+        fanout = PresenceFanout(_WS, interval=60.0)
+
+        fanout.submit(_cursor("a", 1))
+
+        assert "Name user-a" in clients["tutor"].run_javascript.call_args.args[0]
+        assert "Name user-a" not in clients["peer"].run_javascript.call_args.args[0]
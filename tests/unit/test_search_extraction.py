@@ -197,3 +197,32 @@ class TestExtractSearchableTextCombined:
         assert "Relates to duty of care" in result
         assert "Key case for tort analysis" in result
         assert "The defendant breached their duty" in result
+
+
+class TestExtractSearchableTextBareDoc:
+    """Extraction reads the root types directly from a bare pycrdt Doc."""
+
+    def test_does_not_construct_annotation_document(self) -> None:
+        """No AnnotationDocument (Awareness, observers) is built per workspace."""
+        from unittest.mock import patch
+
+        crdt_state = _build_crdt_state(
+            highlights=[{"text": "vicarious liability", "tag": "t"}],
+        )
+        with patch(
+            "promptgrimoire.crdt.annotation_doc.AnnotationDocument.__init__",
+            side_effect=AssertionError("AnnotationDocument constructed"),
+        ):
+            result = extract_searchable_text(crdt_state=crdt_state, tag_names={})
+        assert "vicarious liability" in result
+
+    def test_partial_document_extracted(self) -> None:
+        """State holding only some root types extracts what is present."""
+        from pycrdt import Doc, Text
+
+        doc = Doc()
+        doc["general_notes"] = Text("only notes here")
+
+        result = extract_searchable_text(crdt_state=doc.get_update(), tag_names={})
+
+        assert result == "only notes here"
@@ -25,12 +25,14 @@ if TYPE_CHECKING:
 # ---------------------------------------------------------------------------
 
 
-def _make_row(*values: Any) -> tuple[Any, ...]:
+def _make_row(
+    *values: Any, pending_updates: list[bytes] | None = None
+) -> tuple[Any, ...]:
     """Build a plain tuple row matching the workspace SELECT columns.
 
-    Columns: (id, crdt_state, ws_title, activity_title)
+    Columns: (id, crdt_state, ws_title, activity_title, pending_updates)
     """
-    return tuple(values)
+    return (*values, pending_updates or [])
 
 
 def _make_mock_session(
@@ -325,3 +327,75 @@ class TestProcessDirtyWorkspacesTitlePrepend:
         assert crdt_content in text
         # No trailing space from empty activity title in the prefix
         assert not text.startswith(" ")
+
+
+class TestExtractBatch:
+    """_extract_batch runs off the event loop, in a thread or process pool."""
+
+    def test_failed_item_marked_none(self) -> None:
+        """A corrupt workspace yields None without discarding the batch."""
+        from promptgrimoire.search_worker import _extract_batch
+
+        results = _extract_batch(
+            [
+                (uuid.uuid4(), b"not-a-crdt-update", [], {}, "Bad", ""),
+                (uuid.uuid4(), None, [], {}, "Empty WS", "Activity"),
+            ]
+        )
+
+        assert results == [None, "Empty WS Activity\n"]
+
+    def test_runs_in_process_pool(self) -> None:
+        """The batch function and its arguments survive a process boundary."""
+        from concurrent.futures import ProcessPoolExecutor
+
+        from promptgrimoire.crdt.annotation_doc import AnnotationDocument
+        from promptgrimoire.search_worker import _extract_batch
+
+        doc = AnnotationDocument("pool-test")
+        doc.add_highlight(0, 5, "tag-1", "duty of care", "author")
+
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            (result,) = pool.submit(
+                _extract_batch,
+                [
+                    (
+                        uuid.uuid4(),
+                        doc.get_full_state(),
+                        [],
+                        {"tag-1": "Negligence"},
+                        "WS",
+                        "",
+                    )
+                ],
+            ).result(timeout=60)
+
+        assert result is not None
+        assert "duty of care" in result
+        assert "Negligence" in result
+
+    @pytest.mark.asyncio
+    async def test_custom_executor_used(self) -> None:
+        """process_dirty_workspaces hands the batch to the given executor."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        ws_id = uuid.uuid4()
+        sessions = [
+            _make_mock_session(fetchall_results=[[_make_row(ws_id, None, "T", "")]]),
+            _make_mock_session(fetchall_results=[[]]),
+            _make_mock_session(fetchall_results=[[]]),
+        ]
+        executor = ThreadPoolExecutor(max_workers=1)
+
+        with (
+            patch(
+                "promptgrimoire.search_worker.get_session",
+                side_effect=_make_get_session_patch(sessions),
+            ),
+            patch.object(executor, "submit", wraps=executor.submit) as mock_submit,
+        ):
+            result = await process_dirty_workspaces(executor=executor)
+
+        executor.shutdown()
+        assert result == 1
+        mock_submit.assert_called_once()
@@ -117,6 +117,8 @@ class TestPathTraversal:
         "worker.py",  # tempfile.mkdtemp() export dir
         "diagnostics.py",  # .nicegui storage dir from env var
         "export_jobs.py",  # tempfile.gettempdir() for export
+        "export/cache.py",  # cache dir from config or tempfile.gettempdir()
+        "warmup.py",  # tempfile.TemporaryDirectory() for warm-up export
         "rtf.py",  # internal RTF parsing
         "download.py",  # job.pdf_path from DB row
         "anonymise.py",  # coolname module introspection
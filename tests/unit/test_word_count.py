@@ -6,9 +6,17 @@ for multilingual word counting with anti-gaming measures.
 
 from __future__ import annotations
 
+from unittest.mock import patch
+
 import pytest
 
-from promptgrimoire.word_count import normalise_text, segment_by_script, word_count
+from promptgrimoire.word_count import (
+    IncrementalWordCounter,
+    _count_normalised,
+    normalise_text,
+    segment_by_script,
+    word_count,
+)
 
 
 class TestNormaliseText:
@@ -335,3 +343,53 @@ class TestWordCountAntiGaming:
         result = word_count(text)
         # "Hello" + Chinese segment + "world" = at least 3
         assert result >= 3
+
+
+class TestIncrementalWordCounter:
+    """IncrementalWordCounter matches word_count() and caches per block."""
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "",
+            "One paragraph only.",
+            "First para.\n\nSecond para here.\n  \n- a list\n- item",
+            "word\n\n" + "<br />\n\n" * 10 + "another",
+            "The contract \u5951\u7d04\u306f\u6709\u52b9\n\n[link](http://x.com) text",
+            "Split-\nacross lines\n\n\n\nwith many blanks",
+            "See [the case](http://x.com/a\n\nb c) for details",
+            "[one](x\n\n) [two](y\n\nz\n\n) three",
+        ],
+    )
+    def test_matches_word_count(self, text: str) -> None:
+        assert IncrementalWordCounter().count(text) == word_count(text)
+
+    def test_link_url_spanning_blank_line(self) -> None:
+        """A link URL containing a blank line is stripped, not split."""
+        text = "See [the case](http://example.com/a\n\nb c) for details"
+        assert word_count(text) == 5
+        assert IncrementalWordCounter().count(text) == 5
+
+    def test_only_changed_block_recounted(self) -> None:
+        counter = IncrementalWordCounter()
+        draft = "\n\n".join(f"Paragraph {n} has five words." for n in range(20))
+        assert counter.count(draft) == word_count(draft)
+
+        edited = draft.replace("Paragraph 7 has", "Paragraph 7 now has")
+        expected = word_count(edited)
+        with patch(
+            "promptgrimoire.word_count._count_normalised",
+            side_effect=_count_normalised,
+        ) as counted:
+            assert counter.count(edited) == expected
+
+        assert [c.args[0] for c in counted.call_args_list] == [
+            "Paragraph 7 now has five words."
+        ]
+
+    def test_repeated_blocks_counted_once(self) -> None:
+        with patch(
+            "promptgrimoire.word_count._count_normalised", return_value=2
+        ) as counted:
+            assert IncrementalWordCounter().count("Same text\n\nSame text") == 4
+        counted.assert_called_once()
@@ -0,0 +1,85 @@
+"""Tests for batched word counting (word_count_pool.py)."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from promptgrimoire.config import FeaturesConfig, Settings
+from promptgrimoire.word_count import word_count
+from promptgrimoire.word_count_pool import (
+    _chunk,
+    shutdown_word_count_pool,
+    word_count_many,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_TEXTS = [
+    "The quick brown fox.",
+    "",
+    "我们今天去公园散步",
+    "First para.\n\n[a link](https://example.com) here",
+    "契約は有効である",
+]
+
+
+def _settings(processes: int) -> Settings:
+    return Settings(
+        _env_file=None,  # type: ignore[call-arg]
+        features=FeaturesConfig(word_count_processes=processes),
+    )
+
+
+@pytest.fixture
+def processes(request: pytest.FixtureRequest) -> Iterator[int]:
+    with patch(
+        "promptgrimoire.word_count_pool.get_settings",
+        return_value=_settings(request.param),
+    ):
+        yield request.param
+    shutdown_word_count_pool()
+
+
+class TestWordCountMany:
+    """word_count_many() matches word_count() with and without a pool."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("processes", [0, 2], indirect=True)
+    async def test_matches_word_count_in_order(self, processes: int) -> None:
+        texts = _TEXTS * (3 if processes else 1)
+        assert await word_count_many(texts) == [word_count(t) for t in texts]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("processes", [0], indirect=True)
+    @pytest.mark.usefixtures("processes")
+    async def test_empty_batch(self) -> None:
+        assert await word_count_many([]) == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("processes", [1], indirect=True)
+    @pytest.mark.usefixtures("processes")
+    async def test_pool_reused_until_shutdown(self) -> None:
+        from promptgrimoire import word_count_pool
+
+        await word_count_many(["one"])
+        pool = word_count_pool._executor
+        await word_count_many(["two words"])
+        assert word_count_pool._executor is pool is not None
+
+        shutdown_word_count_pool()
+        assert word_count_pool._executor is None
+
+
+class TestChunk:
+    def test_contiguous_and_bounded(self) -> None:
+        texts = [str(n) for n in range(10)]
+        chunks = _chunk(texts, 4)
+        assert len(chunks) <= 4
+        assert [t for chunk in chunks for t in chunk] == texts
+
+    def test_more_chunks_than_texts(self) -> None:
+        assert _chunk(["a", "b"], 8) == [["a"], ["b"]]
@@ -21,7 +21,18 @@ import pytest
 import promptgrimoire.export.worker_main as worker_main_mod
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterator
+
+
+@pytest.fixture(autouse=True)
+def _no_toolchain_warmup() -> Iterator[AsyncMock]:
+    """Keep main() from running a real Pandoc/LuaLaTeX warm-up export."""
+    with patch(
+        "promptgrimoire.export.worker_main.warm_export_toolchain",
+        new_callable=AsyncMock,
+        return_value=True,
+    ) as warm:
+        yield warm
 
 
 class TestWorkerMainStartup:
@@ -375,3 +386,271 @@ class TestWorkerWatchdogHeartbeat:
             await shutdown_task
 
         assert "WATCHDOG=1" in notifications
+
+
+class _FakeProcess:
+    """multiprocessing.Process stand-in driven by the test."""
+
+    def __init__(self, pid: int, *, stubborn: bool = False) -> None:
+        self.pid = pid
+        self.exitcode: int | None = None
+        self.alive = True
+        self.stubborn = stubborn
+        self.terminated = False
+        self.killed = False
+
+    def start(self) -> None:
+        pass
+
+    def is_alive(self) -> bool:
+        return self.alive
+
+    def join(self, _timeout: float | None = None) -> None:
+        pass
+
+    def terminate(self) -> None:
+        self.terminated = True
+        if not self.stubborn:
+            self.alive = False
+
+    def kill(self) -> None:
+        self.killed = True
+        self.alive = False
+
+
+class TestWorkerPool:
+    """EXPORT__WORKER_PROCESSES > 1: main() supervises a pool of children."""
+
+    @pytest.mark.asyncio
+    async def test_main_runs_pool_supervisor(self) -> None:
+        """With worker_processes > 1, main() supervises instead of polling."""
+        from promptgrimoire.config import ExportConfig, Settings
+
+        settings = Settings(
+            _env_file=None,  # type: ignore[call-arg]
+            export=ExportConfig(worker_processes=3),
+        )
+        supervise = AsyncMock()
+        start_worker = AsyncMock()
+
+        async def trigger_shutdown() -> None:
+            await asyncio.sleep(0.05)
+            if worker_main_mod._shutdown_event is not None:
+                worker_main_mod._shutdown_event.set()
+
+        with (
+            patch("promptgrimoire.export.worker_main.setup_logging"),
+            patch(
+                "promptgrimoire.export.worker_main.get_settings",
+                return_value=settings,
+            ),
+            patch(
+                "promptgrimoire.export.worker_main.init_db",
+                new_callable=AsyncMock,
+            ),
+            patch(
+                "promptgrimoire.export.worker_main.close_db",
+                new_callable=AsyncMock,
+            ),
+            patch("promptgrimoire.export.worker_main._supervise_pool", supervise),
+            patch(
+                "promptgrimoire.export.worker_main.start_export_worker",
+                start_worker,
+            ),
+        ):
+            shutdown_task = asyncio.create_task(trigger_shutdown())
+            assert await worker_main_mod.main() == 0
+            await shutdown_task
+
+        supervise.assert_awaited_once_with(3)
+        start_worker.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_supervisor_replaces_exited_children(self) -> None:
+        """A child that exits (RSS recycle or crash) is respawned."""
+        spawned: list[_FakeProcess] = []
+
+        def make_process(**_kw: object) -> _FakeProcess:
+            proc = _FakeProcess(pid=1000 + len(spawned))
+            spawned.append(proc)
+            return proc
+
+        ctx = type("Ctx", (), {"Process": staticmethod(make_process)})()
+        orphans = AsyncMock(return_value=0)
+
+        with (
+            patch(
+                "promptgrimoire.export.worker_main.multiprocessing.get_context",
+                return_value=ctx,
+            ),
+            patch("promptgrimoire.export.worker_main.fail_orphaned_jobs", orphans),
+            patch("promptgrimoire.export.worker_main._SUPERVISE_INTERVAL", 0.01),
+        ):
+            task = asyncio.create_task(worker_main_mod._supervise_pool(2))
+            await asyncio.sleep(0.03)
+            assert len(spawned) == 2
+            spawned[0].alive = False
+            spawned[0].exitcode = 0
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+        # Orphan recovery runs once in the supervisor, never per child
+        orphans.assert_awaited_once()
+        assert len(spawned) == 3
+        assert spawned[1].terminated
+        assert spawned[2].terminated
+
+    @pytest.mark.asyncio
+    async def test_supervisor_abandons_slot_after_fast_exits(self) -> None:
+        """A child crashing at startup is retried with backoff, then dropped."""
+        spawned: list[tuple[int, _FakeProcess]] = []
+
+        def make_process(**kw: object) -> _FakeProcess:
+            (index,) = cast("tuple[int]", kw["args"])
+            proc = _FakeProcess(pid=1000 + len(spawned))
+            if index == 0:
+                proc.alive = False
+                proc.exitcode = 1
+            spawned.append((index, proc))
+            return proc
+
+        ctx = type("Ctx", (), {"Process": staticmethod(make_process)})()
+
+        with (
+            patch(
+                "promptgrimoire.export.worker_main.multiprocessing.get_context",
+                return_value=ctx,
+            ),
+            patch(
+                "promptgrimoire.export.worker_main.fail_orphaned_jobs",
+                AsyncMock(return_value=0),
+            ),
+            patch("promptgrimoire.export.worker_main._SUPERVISE_INTERVAL", 0.005),
+            patch("promptgrimoire.export.worker_main._CHILD_MAX_FAST_EXITS", 3),
+        ):
+            task = asyncio.create_task(worker_main_mod._supervise_pool(2))
+            await asyncio.sleep(0.2)
+            assert not task.done()
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+        # Initial spawn plus two backed-off retries; the healthy sibling stays
+        assert [i for i, _ in spawned].count(0) == 3
+        assert [i for i, _ in spawned].count(1) == 1
+        assert spawned[1][1].terminated
+
+    @pytest.mark.asyncio
+    async def test_supervisor_returns_when_every_slot_fails(self) -> None:
+        """With no children left the supervisor returns (stopping heartbeats)."""
+        spawned: list[_FakeProcess] = []
+
+        def make_process(**_kw: object) -> _FakeProcess:
+            proc = _FakeProcess(pid=1000 + len(spawned))
+            proc.alive = False
+            proc.exitcode = 1
+            spawned.append(proc)
+            return proc
+
+        ctx = type("Ctx", (), {"Process": staticmethod(make_process)})()
+
+        with (
+            patch(
+                "promptgrimoire.export.worker_main.multiprocessing.get_context",
+                return_value=ctx,
+            ),
+            patch(
+                "promptgrimoire.export.worker_main.fail_orphaned_jobs",
+                AsyncMock(return_value=0),
+            ),
+            patch("promptgrimoire.export.worker_main._SUPERVISE_INTERVAL", 0.005),
+            patch("promptgrimoire.export.worker_main._CHILD_MAX_FAST_EXITS", 2),
+        ):
+            await asyncio.wait_for(worker_main_mod._supervise_pool(1), timeout=1)
+
+        assert len(spawned) == 2
+
+    def test_stop_children_kills_after_timeout(self) -> None:
+        """Children that ignore SIGTERM are killed."""
+        polite = _FakeProcess(pid=1)
+        stubborn = _FakeProcess(pid=2, stubborn=True)
+
+        with patch("promptgrimoire.export.worker_main._CHILD_STOP_TIMEOUT", 0):
+            worker_main_mod._stop_children(
+                cast("list", [polite, stubborn]),
+            )
+
+        assert polite.terminated
+        assert not polite.killed
+        assert stubborn.killed
+
+
+class TestToolchainWarmup:
+    """EXPORT__WARM_TOOLCHAIN: main() warms caches before taking jobs."""
+
+    @staticmethod
+    async def _run_main(warm_toolchain: bool) -> list[str]:
+        from promptgrimoire.config import ExportConfig, Settings
+
+        settings = Settings(
+            _env_file=None,  # type: ignore[call-arg]
+            export=ExportConfig(warm_toolchain=warm_toolchain),
+        )
+        call_order: list[str] = []
+
+        async def mock_warm() -> bool:
+            call_order.append("warm")
+            return True
+
+        async def mock_start_export_worker(**_kw: object) -> None:
+            call_order.append("start_export_worker")
+
+        async def trigger_shutdown() -> None:
+            await asyncio.sleep(0.05)
+            if worker_main_mod._shutdown_event is not None:
+                worker_main_mod._shutdown_event.set()
+
+        with (
+            patch("promptgrimoire.export.worker_main.setup_logging"),
+            patch(
+                "promptgrimoire.export.worker_main.get_settings",
+                return_value=settings,
+            ),
+            patch(
+                "promptgrimoire.export.worker_main.init_db",
+                new_callable=AsyncMock,
+            ),
+            patch(
+                "promptgrimoire.export.worker_main.close_db",
+                new_callable=AsyncMock,
+            ),
+            patch(
+                "promptgrimoire.export.worker_main.start_wakeup_listener",
+                new_callable=AsyncMock,
+            ),
+            patch(
+                "promptgrimoire.export.worker_main.warm_export_toolchain",
+                side_effect=mock_warm,
+            ),
+            patch(
+                "promptgrimoire.export.worker_main.start_export_worker",
+                side_effect=mock_start_export_worker,
+            ),
+        ):
+            shutdown_task = asyncio.create_task(trigger_shutdown())
+            await worker_main_mod.main()
+            await shutdown_task
+        return call_order
+
+    @pytest.mark.asyncio
+    async def test_warmup_runs_before_worker(self) -> None:
+        assert await self._run_main(warm_toolchain=True) == [
+            "warm",
+            "start_export_worker",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_warmup_disabled(self) -> None:
+        assert await self._run_main(warm_toolchain=False) == ["start_export_worker"]
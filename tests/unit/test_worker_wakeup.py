@@ -0,0 +1,274 @@
+"""Unit tests for LISTEN/NOTIFY worker wake-ups (db/notify.py).
+
+Covers the local wake-up events, the listener's reconnect behaviour
+against a fake asyncpg connection, and the worker loops replacing
+their fixed sleeps with wake-up waits.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from promptgrimoire.config import DatabaseConfig, Settings
+from promptgrimoire.db.notify import (
+    DEADLINE_TOPIC,
+    EXPORT_TOPIC,
+    SEARCH_TOPIC,
+    WAKEUP_CHANNEL,
+    WAKEUP_TOPICS,
+    _listen_dsn,
+    _on_notification,
+    signal_wakeup,
+    start_wakeup_listener,
+    wait_for_wakeup,
+)
+
+
+class TestWaitForWakeup:
+    """Tests for signal_wakeup() / wait_for_wakeup()."""
+
+    @pytest.mark.asyncio
+    async def test_timeout_returns_false(self) -> None:
+        assert await wait_for_wakeup(SEARCH_TOPIC, 0.01) is False
+
+    @pytest.mark.asyncio
+    async def test_pending_signal_returns_immediately(self) -> None:
+        """A wake-up raised while the worker was busy is not lost."""
+        signal_wakeup(EXPORT_TOPIC)
+
+        assert await wait_for_wakeup(EXPORT_TOPIC, 5.0) is True
+        # Consumed: the next wait times out again
+        assert await wait_for_wakeup(EXPORT_TOPIC, 0.01) is False
+
+    @pytest.mark.asyncio
+    async def test_notification_wakes_waiter(self) -> None:
+        waiter = asyncio.create_task(wait_for_wakeup(DEADLINE_TOPIC, 5.0))
+        await asyncio.sleep(0)
+
+        _on_notification(None, 1, WAKEUP_CHANNEL, DEADLINE_TOPIC)
+
+        assert await asyncio.wait_for(waiter, 1.0) is True
+
+    @pytest.mark.asyncio
+    async def test_topics_are_independent(self) -> None:
+        signal_wakeup(SEARCH_TOPIC)
+
+        assert await wait_for_wakeup(DEADLINE_TOPIC, 0.01) is False
+        assert await wait_for_wakeup(SEARCH_TOPIC, 0.01) is True
+
+    def test_access_invalidation_is_not_a_wakeup(self) -> None:
+        """``access:`` payloads go to the access cache, not a worker."""
+        user_id = uuid4()
+        with (
+            patch("promptgrimoire.db.notify.signal_wakeup") as signal,
+            patch("promptgrimoire.db.notify.access_cache.apply_invalidation") as apply,
+        ):
+            _on_notification(None, 1, WAKEUP_CHANNEL, f"access:ban:{user_id}")
+
+        apply.assert_called_once_with(f"access:ban:{user_id}")
+        signal.assert_not_called()
+
+    def test_unparseable_invalidation_clears_access_cache(self) -> None:
+        with patch(
+            "promptgrimoire.db.notify.access_cache.invalidate_all"
+        ) as invalidate_all:
+            _on_notification(None, 1, WAKEUP_CHANNEL, "access:acl:not-a-uuid")
+
+        invalidate_all.assert_called_once_with()
+
+
+class TestListenDsn:
+    """Tests for the LISTEN connection DSN."""
+
+    @staticmethod
+    def _settings(**kwargs: str) -> Settings:
+        return Settings(
+            _env_file=None,  # type: ignore[call-arg]
+            database=DatabaseConfig(**kwargs),
+        )
+
+    def test_defaults_to_database_url(self) -> None:
+        settings = self._settings(url="postgresql+asyncpg://u@localhost/db")
+        with (
+            patch("promptgrimoire.db.notify.get_settings", return_value=settings),
+            patch("promptgrimoire.db.engine.get_settings", return_value=settings),
+        ):
+            assert _listen_dsn() == "postgresql://u@localhost/db"
+
+    def test_listen_url_overrides(self) -> None:
+        settings = self._settings(
+            url="postgresql+asyncpg://u@/db?host=/run/pgbouncer&port=6432",
+            listen_url="postgresql+asyncpg://u@/db?host=/var/run/postgresql",
+        )
+        with patch("promptgrimoire.db.notify.get_settings", return_value=settings):
+            assert _listen_dsn() == "postgresql://u@/db?host=/var/run/postgresql"
+
+
+class _FakeConnection:
+    """Minimal asyncpg.Connection stand-in that can be 'disconnected'."""
+
+    def __init__(self) -> None:
+        self.add_listener = AsyncMock()
+        self.fetchval = AsyncMock(return_value=1)
+        self.terminated = False
+        self._on_terminate: list = []
+
+    def add_termination_listener(self, callback) -> None:
+        self._on_terminate.append(callback)
+
+    def drop(self) -> None:
+        for callback in self._on_terminate:
+            callback(self)
+
+    def is_closed(self) -> bool:
+        return self.terminated
+
+    def terminate(self) -> None:
+        self.terminated = True
+
+
+class TestWakeupListener:
+    """Tests for start_wakeup_listener()."""
+
+    @pytest.mark.asyncio
+    async def test_listens_and_wakes_all_topics_on_connect(self) -> None:
+        conn = _FakeConnection()
+        with (
+            patch("promptgrimoire.db.notify._listen_dsn", return_value="dsn"),
+            patch(
+                "promptgrimoire.db.notify.asyncpg.connect",
+                new_callable=AsyncMock,
+                return_value=conn,
+            ),
+        ):
+            task = asyncio.create_task(start_wakeup_listener())
+            woken = await asyncio.gather(
+                *(wait_for_wakeup(topic, 1.0) for topic in WAKEUP_TOPICS)
+            )
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert all(woken)
+        conn.add_listener.assert_awaited_once_with(WAKEUP_CHANNEL, _on_notification)
+
+    @pytest.mark.asyncio
+    async def test_reconnects_after_disconnect(self) -> None:
+        first, second = _FakeConnection(), _FakeConnection()
+        connect = AsyncMock(side_effect=[first, second])
+        with (
+            patch("promptgrimoire.db.notify._listen_dsn", return_value="dsn"),
+            patch("promptgrimoire.db.notify.asyncpg.connect", connect),
+        ):
+            task = asyncio.create_task(start_wakeup_listener(reconnect_delay=0))
+            await wait_for_wakeup(SEARCH_TOPIC, 1.0)
+            first.drop()
+            await wait_for_wakeup(SEARCH_TOPIC, 1.0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert connect.await_count == 2
+        assert first.terminated
+        second.add_listener.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_connect_failure_retries(self) -> None:
+        conn = _FakeConnection()
+        connect = AsyncMock(side_effect=[OSError("refused"), conn])
+        with (
+            patch("promptgrimoire.db.notify._listen_dsn", return_value="dsn"),
+            patch("promptgrimoire.db.notify.asyncpg.connect", connect),
+        ):
+            task = asyncio.create_task(start_wakeup_listener(reconnect_delay=0))
+            assert await wait_for_wakeup(EXPORT_TOPIC, 1.0) is True
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert connect.await_count == 2
+
+
+class TestWorkerLoopsWaitForWakeup:
+    """Worker loops wait on their topic with the polling interval as timeout."""
+
+    @pytest.mark.asyncio
+    async def test_export_worker_waits_only_when_queue_empty(self) -> None:
+        from promptgrimoire.export.worker import start_export_worker
+
+        job = MagicMock()
+        claims = AsyncMock(side_effect=[job, None, asyncio.CancelledError()])
+        wait = AsyncMock(return_value=True)
+        with (
+            patch(
+                "promptgrimoire.export.worker.fail_orphaned_jobs",
+                new_callable=AsyncMock,
+                return_value=0,
+            ),
+            patch("promptgrimoire.export.worker.claim_next_job", claims),
+            patch("promptgrimoire.export.worker._process_job", new_callable=AsyncMock),
+            patch("promptgrimoire.export.worker.wait_for_wakeup", wait),
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await start_export_worker(poll_interval=5.0)
+
+        # Claimed job -> straight to next claim; empty queue -> one wait
+        wait.assert_awaited_once_with(EXPORT_TOPIC, 5.0)
+
+    @pytest.mark.asyncio
+    async def test_deadline_worker_waits_on_deadline_topic(self) -> None:
+        from promptgrimoire.deadline_worker import start_deadline_worker
+
+        wait = AsyncMock(side_effect=[True, asyncio.CancelledError()])
+        with (
+            patch(
+                "promptgrimoire.deadline_worker.check_expired_deadlines",
+                new_callable=AsyncMock,
+                return_value=0,
+            ),
+            patch(
+                "promptgrimoire.deadline_worker._next_deadline_seconds",
+                new_callable=AsyncMock,
+                side_effect=[4.0, None],
+            ),
+            patch("promptgrimoire.deadline_worker.wait_for_wakeup", wait),
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await start_deadline_worker(max_interval=30.0)
+
+        assert [c.args for c in wait.await_args_list] == [
+            (DEADLINE_TOPIC, 5.0),
+            (DEADLINE_TOPIC, 30.0),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_search_worker_debounces_after_wakeup(self) -> None:
+        from promptgrimoire.search_worker import start_search_worker
+
+        wait = AsyncMock(side_effect=[True, asyncio.CancelledError()])
+        sleep = AsyncMock()
+        with (
+            patch(
+                "promptgrimoire.search_worker.process_dirty_workspaces",
+                new_callable=AsyncMock,
+                return_value=0,
+            ),
+            patch(
+                "promptgrimoire.search_worker.refresh_search_text_from_fragments",
+                new_callable=AsyncMock,
+                return_value=0,
+            ),
+            patch("promptgrimoire.search_worker.wait_for_wakeup", wait),
+            patch("promptgrimoire.search_worker.asyncio.sleep", sleep),
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await start_search_worker(
+                interval_seconds=30.0, wakeup_debounce_seconds=0.5
+            )
+
+        wait.assert_awaited_with(SEARCH_TOPIC, 30.0)
+        sleep.assert_awaited_once_with(0.5)
@@ -0,0 +1,181 @@
+"""Tests for the binary Yjs relay (pages/annotation/yjs_relay.py)."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pycrdt
+import pytest
+
+from promptgrimoire.pages.annotation import yjs_relay
+from promptgrimoire.pages.annotation.yjs_relay import YJS_EVENT, YjsOutbox
+
+
+def _make_client(client_id: str = "client-1", sid: str = "sid-1") -> MagicMock:
+    client = MagicMock()
+    client.id = client_id
+    client._deleted = False
+    client._socket_to_document_id = {sid: "doc-1"}
+    return client
+
+
+def _make_update(text: str) -> bytes:
+    doc = pycrdt.Doc()
+    doc["t"] = pycrdt.Text(text)
+    return doc.get_update()
+
+
+def _text_of(*frames: bytes) -> str:
+    doc = pycrdt.Doc()
+    field = doc.get("t", type=pycrdt.Text)
+    for frame in frames:
+        doc.apply_update(frame)
+    return str(field)
+
+
+class _FakeSio:
+    """Captures emitted frames; acks only when told to."""
+
+    def __init__(self) -> None:
+        self.frames: list[bytes] = []
+        self._callbacks: list[Any] = []
+        self.on = MagicMock()
+
+    async def emit(self, event: str, data: bytes, *, to: str, callback: Any) -> None:
+        assert event == YJS_EVENT
+        assert to == "sid-1"
+        self.frames.append(data)
+        self._callbacks.append(callback)
+
+    def ack(self, state_vector: bytes | None = None) -> None:
+        self._callbacks.pop(0)(state_vector)
+
+
+class TestInbound:
+    """Incoming binary updates reach the registered handler."""
+
+    @pytest.mark.asyncio
+    async def test_dispatches_raw_bytes_and_markdown(self) -> None:
+        client = _make_client()
+        handler = AsyncMock()
+        with (
+            patch.object(yjs_relay, "core") as core,
+            patch.object(yjs_relay, "_installed", False),
+            patch.object(yjs_relay.Client, "instances", {"client-1": client}),
+        ):
+            yjs_relay.register_inbound(client, handler)
+            await yjs_relay._on_update(
+                "sid-1", {"client_id": "client-1", "update": b"\x01", "markdown": "x"}
+            )
+
+        handler.assert_awaited_once_with(b"\x01", "x")
+        core.sio.on.assert_called_once_with(YJS_EVENT, yjs_relay._on_update)
+        yjs_relay._inbound.pop(client.id)
+
+    @pytest.mark.asyncio
+    async def test_ignores_socket_of_another_client(self) -> None:
+        client = _make_client()
+        handler = AsyncMock()
+        yjs_relay._inbound[client.id] = handler
+        with patch.object(yjs_relay.Client, "instances", {"client-1": client}):
+            await yjs_relay._on_update(
+                "sid-other", {"client_id": "client-1", "update": b"\x01"}
+            )
+
+        handler.assert_not_awaited()
+        yjs_relay._inbound.pop(client.id)
+
+
+class TestOutbox:
+    """Outbound frames: one in flight, bursts merged, catch-up after loss."""
+
+    @pytest.mark.asyncio
+    async def test_burst_during_inflight_frame_is_merged(self) -> None:
+        sio = _FakeSio()
+        outbox = YjsOutbox(_make_client(), MagicMock(), None)
+        first, second, third = (_make_update(t) for t in ("a", "b", "c"))
+
+        with patch.object(yjs_relay.core, "sio", sio):
+            outbox.push(first)
+            await asyncio.sleep(0)
+            outbox.push(second)
+            outbox.push(third)
+            await asyncio.sleep(0)
+            assert sio.frames == [first]
+
+            sio.ack()
+            await asyncio.sleep(0.01)
+            sio.ack()
+            await asyncio.sleep(0.01)
+
+        assert len(sio.frames) == 2
+        merged = sio.frames[1]
+        assert _text_of(merged) == _text_of(second, third)
+
+    @pytest.mark.asyncio
+    async def test_unacknowledged_frame_triggers_catchup(self) -> None:
+        sio = _FakeSio()
+        sync_since = MagicMock(return_value=b"MISSING")
+        outbox = YjsOutbox(_make_client(), sync_since, b"joined")
+
+        with (
+            patch.object(yjs_relay.core, "sio", sio),
+            patch.object(yjs_relay, "_ACK_TIMEOUT_SECONDS", 0.01),
+        ):
+            outbox.push(b"lost")
+            await asyncio.sleep(0.05)
+            outbox.push(b"next")
+            await asyncio.sleep(0)
+
+        assert sio.frames[-1] == b"MISSING"
+        sync_since.assert_called_once_with(b"joined")
+
+    @pytest.mark.asyncio
+    async def test_catchup_starts_from_last_acknowledged_state_vector(self) -> None:
+        sio = _FakeSio()
+        sync_since = MagicMock(return_value=b"MISSING")
+        outbox = YjsOutbox(_make_client(), sync_since, None)
+
+        with (
+            patch.object(yjs_relay.core, "sio", sio),
+            patch.object(yjs_relay, "_ACK_TIMEOUT_SECONDS", 0.01),
+        ):
+            outbox.push(b"delivered")
+            await asyncio.sleep(0)
+            sio.ack(b"sv-after-delivered")
+            await asyncio.sleep(0)
+            outbox.push(b"lost")
+            await asyncio.sleep(0.05)
+            outbox.push(b"next")
+            await asyncio.sleep(0)
+
+        sync_since.assert_called_once_with(b"sv-after-delivered")
+
+    @pytest.mark.asyncio
+    async def test_reconnect_sends_catchup_frame(self) -> None:
+        sio = _FakeSio()
+        client = _make_client()
+        sync_since = MagicMock(return_value=b"MISSING")
+        outbox = YjsOutbox(client, sync_since, b"joined")
+        client.on_connect.assert_called_once_with(outbox.resync)
+
+        with patch.object(yjs_relay.core, "sio", sio):
+            outbox.resync()
+            await asyncio.sleep(0)
+
+        assert sio.frames == [b"MISSING"]
+
+    @pytest.mark.asyncio
+    async def test_disconnected_client_sends_nothing(self) -> None:
+        sio = _FakeSio()
+        client = _make_client()
+        client._socket_to_document_id = {}
+        outbox = YjsOutbox(client, MagicMock(), None)
+
+        with patch.object(yjs_relay.core, "sio", sio):
+            outbox.push(b"update")
+            await asyncio.sleep(0.01)
+
+        assert sio.frames == []